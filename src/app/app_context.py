@@ -1,11 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 
 from core.commands.command_stack import CommandStack
+from core.commands.demo_commands import mirror_cells
+from core.commands.metrics import CommandSample
+from core.events import (
+    HISTORY_CHANGED,
+    PALETTE_CHANGED,
+    SELECTION_CHANGED,
+    TOOL_CHANGED,
+    ChangeBus,
+    SceneChangeTracker,
+)
 from core.palette import DEFAULT_PALETTE
 from core.part import Part
 from core.project import Project
+from util.log import log_slow_operation
 
 @dataclass(slots=True)
 class AppContext:
@@ -64,6 +75,11 @@ class AppContext:
     locked_palette_slots: set[int] = field(default_factory=set)
     voxel_selection_mode: bool = False
     selected_voxels: set[tuple[int, int, int]] = field(default_factory=set)
+    changes: ChangeBus = field(default_factory=ChangeBus, compare=False, repr=False)
+    _scene_tracker: SceneChangeTracker = field(
+        default_factory=SceneChangeTracker, compare=False, repr=False
+    )
+    _palette_signature: tuple | None = field(default=None, compare=False, repr=False)
     _VALID_BRUSH_SHAPES = {"cube", "sphere"}
     _VALID_PICK_MODES = {PICK_MODE_SURFACE, PICK_MODE_PLANE_LOCK}
     _VALID_EDIT_PLANES = {EDIT_PLANE_XY, EDIT_PLANE_YZ, EDIT_PLANE_XZ}
@@ -71,6 +87,10 @@ class AppContext:
     _VALID_CAMERA_PROJECTIONS = {CAMERA_PROJECTION_PERSPECTIVE, CAMERA_PROJECTION_ORTHOGRAPHIC}
     _VALID_NAVIGATION_PROFILES = {NAV_PROFILE_CLASSIC, NAV_PROFILE_MMB_ORBIT, NAV_PROFILE_BLENDER_MIX}
 
+    def __post_init__(self) -> None:
+        self.command_stack.on_change = self._on_history_changed
+        self.command_stack.metrics.on_slow = _log_slow_command
+
     @property
     def active_part(self) -> Part:
         return self.current_project.scene.get_active_part()
@@ -81,52 +101,82 @@ class AppContext:
 
     def set_active_part(self, part_id: str) -> None:
         self.current_project.scene.set_active_part(part_id)
+        self.publish_changes()
+
+    def publish_changes(self) -> None:
+        # Panels and commands edit the project and palette in place; diff them against the last
+        # published state and emit only what actually changed.
+        with self.changes.batch():
+            for event in self._scene_tracker.collect(self.current_project):
+                self.changes.emit(event.kind, event.part_id)
+            palette_signature = (
+                tuple(self.palette),
+                self.active_color_index,
+                frozenset(self.locked_palette_slots),
+                tuple(self.palette_metadata.items()),
+            )
+            if palette_signature != self._palette_signature:
+                self._palette_signature = palette_signature
+                self.changes.emit(PALETTE_CHANGED)
+
+    def _on_history_changed(self) -> None:
+        with self.changes.batch():
+            self.publish_changes()
+            self.changes.emit(HISTORY_CHANGED)
 
     def set_voxel_tool_mode(self, mode: str) -> None:
         if mode not in self._VALID_TOOL_MODES:
             raise ValueError(f"Unsupported voxel tool mode: {mode}")
         self.voxel_tool_mode = mode
+        self.changes.emit(TOOL_CHANGED)
 
     def set_voxel_tool_shape(self, shape: str) -> None:
         if shape not in self._VALID_TOOL_SHAPES:
             raise ValueError(f"Unsupported voxel tool shape: {shape}")
         self.voxel_tool_shape = shape
+        self.changes.emit(TOOL_CHANGED)
 
     def set_brush_size(self, size: int) -> None:
         size_value = int(size)
         if size_value < 1 or size_value > 3:
             raise ValueError(f"Unsupported brush size: {size_value}")
         self.brush_size = size_value
+        self.changes.emit(TOOL_CHANGED)
 
     def set_brush_shape(self, shape: str) -> None:
         shape_value = str(shape).strip().lower()
         if shape_value not in self._VALID_BRUSH_SHAPES:
             raise ValueError(f"Unsupported brush shape: {shape_value}")
         self.brush_shape = shape_value
+        self.changes.emit(TOOL_CHANGED)
 
     def set_pick_mode(self, mode: str) -> None:
         mode_value = str(mode).strip().lower()
         if mode_value not in self._VALID_PICK_MODES:
             raise ValueError(f"Unsupported pick mode: {mode_value}")
         self.pick_mode = mode_value
+        self.changes.emit(TOOL_CHANGED)
 
     def set_edit_plane(self, plane: str) -> None:
         plane_value = str(plane).strip().lower()
         if plane_value not in self._VALID_EDIT_PLANES:
             raise ValueError(f"Unsupported edit plane: {plane_value}")
         self.edit_plane = plane_value
+        self.changes.emit(TOOL_CHANGED)
 
     def set_camera_projection(self, projection: str) -> None:
         projection_value = str(projection).strip().lower()
         if projection_value not in self._VALID_CAMERA_PROJECTIONS:
             raise ValueError(f"Unsupported camera projection: {projection_value}")
         self.camera_projection = projection_value
+        self.changes.emit(TOOL_CHANGED)
 
     def set_navigation_profile(self, profile: str) -> None:
         profile_value = str(profile).strip().lower()
         if profile_value not in self._VALID_NAVIGATION_PROFILES:
             raise ValueError(f"Unsupported navigation profile: {profile_value}")
         self.navigation_profile = profile_value
+        self.changes.emit(TOOL_CHANGED)
 
     def set_camera_sensitivity(self, axis: str, value: float) -> None:
         axis_key = str(axis).strip().lower()
@@ -149,15 +199,19 @@ class AppContext:
         if mode_value not in self._VALID_FILL_CONNECTIVITY:
             raise ValueError(f"Unsupported fill connectivity: {mode_value}")
         self.fill_connectivity = mode_value
+        self.changes.emit(TOOL_CHANGED)
 
     def set_voxel_selection_mode(self, enabled: bool) -> None:
         self.voxel_selection_mode = bool(enabled)
+        self.changes.emit(TOOL_CHANGED)
 
     def set_selected_voxels(self, cells: set[tuple[int, int, int]]) -> None:
         self.selected_voxels = {tuple(cell) for cell in cells}
+        self.changes.emit(SELECTION_CHANGED)
 
     def clear_selected_voxels(self) -> None:
         self.selected_voxels.clear()
+        self.changes.emit(SELECTION_CHANGED)
 
     def set_palette_slot_locked(self, index: int, locked: bool) -> None:
         slot = int(index)
@@ -165,8 +219,9 @@ class AppContext:
             raise ValueError(f"Invalid palette slot index: {slot}")
         if locked:
             self.locked_palette_slots.add(slot)
-            return
-        self.locked_palette_slots.discard(slot)
+        else:
+            self.locked_palette_slots.discard(slot)
+        self.publish_changes()
 
     def is_palette_slot_locked(self, index: int) -> bool:
         return int(index) in self.locked_palette_slots
@@ -174,39 +229,32 @@ class AppContext:
     def set_mirror_axis(self, axis: str, enabled: bool) -> None:
         if axis == "x":
             self.mirror_x_enabled = enabled
-            return
-        if axis == "y":
+        elif axis == "y":
             self.mirror_y_enabled = enabled
-            return
-        if axis == "z":
+        elif axis == "z":
             self.mirror_z_enabled = enabled
-            return
-        raise ValueError(f"Unsupported mirror axis: {axis}")
+        else:
+            raise ValueError(f"Unsupported mirror axis: {axis}")
+        self.changes.emit(TOOL_CHANGED)
 
     def set_mirror_offset(self, axis: str, offset: int) -> None:
         if axis == "x":
             self.mirror_x_offset = int(offset)
-            return
-        if axis == "y":
+        elif axis == "y":
             self.mirror_y_offset = int(offset)
-            return
-        if axis == "z":
+        elif axis == "z":
             self.mirror_z_offset = int(offset)
-            return
-        raise ValueError(f"Unsupported mirror axis: {axis}")
+        else:
+            raise ValueError(f"Unsupported mirror axis: {axis}")
+        self.changes.emit(TOOL_CHANGED)
 
     def expand_mirrored_cells(self, cells: set[tuple[int, int, int]]) -> set[tuple[int, int, int]]:
-        expanded: set[tuple[int, int, int]] = set()
-        for x, y, z in cells:
-            mirror_x = (2 * self.mirror_x_offset) - x
-            mirror_y = (2 * self.mirror_y_offset) - y
-            mirror_z = (2 * self.mirror_z_offset) - z
-            xs = (x, mirror_x) if self.mirror_x_enabled else (x,)
-            ys = (y, mirror_y) if self.mirror_y_enabled else (y,)
-            zs = (z, mirror_z) if self.mirror_z_enabled else (z,)
-            for mirrored_x in xs:
-                for mirrored_y in ys:
-                    for mirrored_z in zs:
-                        expanded.add((mirrored_x, mirrored_y, mirrored_z))
-        return expanded
+        return mirror_cells(
+            cells,
+            enabled=(self.mirror_x_enabled, self.mirror_y_enabled, self.mirror_z_enabled),
+            offsets=(self.mirror_x_offset, self.mirror_y_offset, self.mirror_z_offset),
+        )
+
 
+def _log_slow_command(sample: CommandSample) -> None:
+    log_slow_operation({"kind": "command", **asdict(sample)})
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+FORMAT_EXTENSIONS = {
+    "project": ".json",
+    "vox": ".vox",
+    "qb": ".qb",
+    "obj": ".obj",
+    "gltf": ".gltf",
+}
+INPUT_FORMATS = ("project", "vox", "qb")
+OUTPUT_FORMATS = tuple(FORMAT_EXTENSIONS)
+
+
+@dataclass(slots=True)
+class ConversionTask:
+    source: str
+    target: str
+    target_format: str
+    greedy: bool = True
+    scale_factor: float = 1.0
+
+
+@dataclass(slots=True)
+class ConversionResult:
+    source: str
+    target: str
+    ok: bool
+    part_count: int = 0
+    voxel_count: int = 0
+    elapsed_ms: float = 0.0
+    warnings: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+def _ensure_src_on_path() -> None:
+    src_dir = Path(__file__).resolve().parents[1]
+    src_str = str(src_dir)
+    if src_str not in sys.path:
+        sys.path.insert(0, src_str)
+
+
+def format_for_path(path: str | Path) -> str | None:
+    suffix = Path(path).suffix.lower()
+    for format_name, extension in FORMAT_EXTENSIONS.items():
+        if suffix == extension:
+            return format_name
+    return None
+
+
+def collect_conversion_tasks(
+    inputs: list[str],
+    output_dir: str,
+    target_format: str,
+    *,
+    recursive: bool = False,
+    greedy: bool = True,
+    scale_factor: float = 1.0,
+) -> list[ConversionTask]:
+    if target_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{target_format}'.")
+    extension = FORMAT_EXTENSIONS[target_format]
+    output_root = Path(output_dir)
+    tasks: list[ConversionTask] = []
+    for raw_input in inputs:
+        input_path = Path(raw_input)
+        if input_path.is_dir():
+            pattern = "**/*" if recursive else "*"
+            sources = sorted(
+                candidate
+                for candidate in input_path.glob(pattern)
+                if candidate.is_file() and format_for_path(candidate) in INPUT_FORMATS
+            )
+            for source in sources:
+                relative = source.relative_to(input_path).with_suffix(extension)
+                tasks.append(
+                    ConversionTask(
+                        str(source), str(output_root / relative), target_format, greedy, scale_factor
+                    )
+                )
+        elif input_path.is_file():
+            if format_for_path(input_path) not in INPUT_FORMATS:
+                raise ValueError(f"Unsupported input file '{input_path}'.")
+            target = output_root / input_path.with_suffix(extension).name
+            tasks.append(
+                ConversionTask(str(input_path), str(target), target_format, greedy, scale_factor)
+            )
+        else:
+            raise ValueError(f"Input path '{input_path}' does not exist.")
+    return tasks
+
+
+def convert_file(task: ConversionTask) -> ConversionResult:
+    started = time.perf_counter()
+    try:
+        named_models, palette, warnings = _load_named_models(task.source)
+        Path(task.target).parent.mkdir(parents=True, exist_ok=True)
+        _write_named_models(task, named_models, palette)
+    except Exception as exc:
+        return ConversionResult(
+            source=task.source,
+            target=task.target,
+            ok=False,
+            elapsed_ms=(time.perf_counter() - started) * 1000.0,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return ConversionResult(
+        source=task.source,
+        target=task.target,
+        ok=True,
+        part_count=len(named_models),
+        voxel_count=sum(voxels.count() for _name, voxels in named_models),
+        elapsed_ms=(time.perf_counter() - started) * 1000.0,
+        warnings=list(warnings),
+    )
+
+
+def run_batch(
+    tasks: list[ConversionTask],
+    *,
+    jobs: int = 1,
+    progress: Callable[[int, int, ConversionResult], None] | None = None,
+) -> list[ConversionResult]:
+    results: list[ConversionResult] = []
+    total = len(tasks)
+    if jobs <= 1 or total <= 1:
+        for task in tasks:
+            result = convert_file(task)
+            results.append(result)
+            if progress is not None:
+                progress(len(results), total, result)
+        return results
+
+    ordered: list[ConversionResult | None] = [None] * total
+    with ProcessPoolExecutor(max_workers=min(jobs, total)) as executor:
+        futures = {
+            executor.submit(_convert_in_worker, task): index for index, task in enumerate(tasks)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            ordered[futures[future]] = result
+            if progress is not None:
+                progress(done, total, result)
+    return [result for result in ordered if result is not None]
+
+
+def build_summary(results: list[ConversionResult], *, elapsed_ms: float) -> dict[str, object]:
+    return {
+        "total": len(results),
+        "succeeded": sum(1 for result in results if result.ok),
+        "failed": sum(1 for result in results if not result.ok),
+        "voxel_count": sum(result.voxel_count for result in results),
+        "elapsed_ms": round(elapsed_ms, 3),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _convert_in_worker(task: ConversionTask) -> ConversionResult:
+    _ensure_src_on_path()
+    return convert_file(task)
+
+
+def _load_named_models(path: str):
+    from core.io.project_io import load_project
+    from core.io.qb_io import load_qb_models_with_warnings
+    from core.io.vox_io import load_vox_models_with_warnings
+    from core.palette import DEFAULT_PALETTE
+
+    source_format = format_for_path(path)
+    if source_format == "project":
+        project = load_project(path)
+        named = [(part.name, part.voxels) for _part_id, part in project.scene.iter_parts_ordered()]
+        return named, list(DEFAULT_PALETTE), []
+    if source_format == "vox":
+        models, palette, warnings = load_vox_models_with_warnings(path)
+    elif source_format == "qb":
+        models, palette, warnings = load_qb_models_with_warnings(path)
+    else:
+        raise ValueError(f"Unsupported input file '{path}'.")
+    base_name = Path(path).stem or "Imported"
+    named = [
+        (_import_part_name(base_name, index, len(models)), voxels)
+        for index, voxels in enumerate(models)
+    ]
+    return named, palette, warnings
+
+
+def _write_named_models(task: ConversionTask, named_models, palette) -> None:
+    from core.export.gltf_exporter import export_voxels_to_gltf
+    from core.export.obj_exporter import ObjExportOptions, export_voxels_to_obj
+    from core.export.qb_exporter import export_models_to_qb
+    from core.export.vox_exporter import export_models_to_vox
+    from core.io.project_io import save_project
+    from core.project import Project
+    from core.scene import Scene
+
+    names = [name for name, _voxels in named_models]
+    models = [voxels for _name, voxels in named_models]
+    if task.target_format == "project":
+        project = Project(name=Path(task.target).stem, scene=Scene())
+        for name, voxels in named_models:
+            project.scene.add_part(name).voxels = voxels
+        if not named_models:
+            project.scene.add_part("Part 1")
+        save_project(project, task.target)
+    elif task.target_format == "vox":
+        export_models_to_vox(models, palette, task.target, names=names)
+    elif task.target_format == "qb":
+        export_models_to_qb(models, palette, task.target, names=names)
+    elif task.target_format == "obj":
+        export_voxels_to_obj(
+            _merge_models(models),
+            palette,
+            task.target,
+            options=ObjExportOptions(use_greedy_mesh=task.greedy, scale_factor=task.scale_factor),
+        )
+    elif task.target_format == "gltf":
+        export_voxels_to_gltf(
+            _merge_models(models),
+            task.target,
+            scale_factor=task.scale_factor,
+            palette=palette,
+        )
+    else:
+        raise ValueError(f"Unsupported output format '{task.target_format}'.")
+
+
+def _merge_models(models):
+    from core.voxels.voxel_grid import VoxelGrid
+
+    if len(models) == 1:
+        return models[0]
+    merged = VoxelGrid()
+    for voxels in models:
+        coords, colors = voxels.to_arrays()
+        merged.set_many(coords, colors)
+    return merged
+
+
+def _import_part_name(base_name: str, index: int, total: int) -> str:
+    if total <= 1:
+        return base_name
+    width = max(2, len(str(total)))
+    return f"{base_name} Part {index + 1:0{width}d}"
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="batch_convert",
+        description="Convert project/VOX/QB files to project/VOX/QB/OBJ/glTF without the GUI.",
+    )
+    parser.add_argument("inputs", nargs="+", help="Input files or directories.")
+    parser.add_argument("-o", "--output-dir", required=True, help="Directory for converted files.")
+    parser.add_argument("-t", "--to", dest="target_format", required=True, choices=OUTPUT_FORMATS)
+    parser.add_argument("-r", "--recursive", action="store_true", help="Recurse into directories.")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count).",
+    )
+    parser.add_argument("--no-greedy", action="store_true", help="Disable greedy meshing for OBJ.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale factor for OBJ/glTF.")
+    parser.add_argument("--summary-json", help="Write a JSON summary to this path ('-' for stdout).")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress per-file progress.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    _ensure_src_on_path()
+    args = _build_arg_parser().parse_args(argv)
+    try:
+        tasks = collect_conversion_tasks(
+            args.inputs,
+            args.output_dir,
+            args.target_format,
+            recursive=args.recursive,
+            greedy=not args.no_greedy,
+            scale_factor=args.scale,
+        )
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    def report(done: int, total: int, result: ConversionResult) -> None:
+        if args.quiet:
+            return
+        status = "ok" if result.ok else f"FAILED ({result.error})"
+        print(
+            f"[{done}/{total}] {status} {result.source} -> {result.target} "
+            f"({result.elapsed_ms:.1f} ms)",
+            file=sys.stderr,
+        )
+
+    started = time.perf_counter()
+    results = run_batch(tasks, jobs=max(1, args.jobs), progress=report)
+    summary = build_summary(results, elapsed_ms=(time.perf_counter() - started) * 1000.0)
+    if args.summary_json == "-":
+        print(json.dumps(summary, indent=2))
+    elif args.summary_json:
+        Path(args.summary_json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    if not args.quiet:
+        print(
+            f"Converted {summary['succeeded']}/{summary['total']} file(s) "
+            f"in {summary['elapsed_ms']:.0f} ms",
+            file=sys.stderr,
+        )
+    return 0 if summary["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
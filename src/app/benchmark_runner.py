@@ -0,0 +1,594 @@
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import math
+import platform
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_SIZES = (32, 64)
+TIER_SIZES = (32, 64, 128, 256)
+PATTERNS = ("sparse", "dense", "noisy")
+CASE_NAMES = (
+    "brush",
+    "fill",
+    "meshing",
+    "raycast",
+    "stats",
+    "project_io",
+    "vox_load",
+    "qb_load",
+    "export_obj",
+    "export_gltf",
+    "export_vox",
+    "export_qb",
+)
+DEFAULT_HISTORY_PATH = "perf_history.json"
+# MAD * 1.4826 estimates the standard deviation of normally distributed samples.
+_MAD_SCALE = 1.4826
+
+
+@dataclass(slots=True)
+class BenchmarkCase:
+    name: str
+    pattern: str
+    size: int
+    # setup() builds fresh untimed state for each repetition; run(state) is the timed body.
+    setup: Callable[[], object]
+    run: Callable[[object], object]
+
+    @property
+    def case_id(self) -> str:
+        return f"{self.name}/{self.pattern}-{self.size}"
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    case_id: str
+    samples: list[float]
+    median: float
+    mad: float
+    peak_bytes: int
+    voxel_count: int = 0
+
+
+@dataclass(slots=True)
+class Regression:
+    case_id: str
+    median: float
+    baseline_median: float
+    slowdown: float
+    noise_sigmas: float
+
+
+@dataclass(slots=True)
+class BenchmarkRun:
+    started_utc: str
+    python: str
+    machine: str
+    repeat: int
+    results: list[BenchmarkResult] = field(default_factory=list)
+
+
+def _ensure_src_on_path() -> None:
+    src_dir = Path(__file__).resolve().parents[1]
+    src_str = str(src_dir)
+    if src_str not in sys.path:
+        sys.path.insert(0, src_str)
+
+
+def median_and_mad(samples: list[float]) -> tuple[float, float]:
+    if not samples:
+        raise ValueError("At least one sample is required.")
+    center = statistics.median(samples)
+    return center, statistics.median(abs(sample - center) for sample in samples)
+
+
+def build_tier_grid(size: int, pattern: str, *, seed: int = 0):
+    # Seeded tiers: sparse fills ~3% of the cube, dense fills all of it in colour bands, and
+    # noisy fills half of it with random colours as a worst case for greedy meshing. The
+    # synthetic scene kinds (terrain, menger, ...) are accepted as extra patterns.
+    import numpy as np
+
+    from core.synthetic import GRID_KINDS, generate_grid
+    from core.voxels.voxel_grid import VoxelGrid
+
+    if pattern not in PATTERNS + GRID_KINDS:
+        raise ValueError(f"Unsupported benchmark pattern: {pattern}")
+    if size < 1:
+        raise ValueError(f"Unsupported benchmark size: {size}")
+    if pattern in GRID_KINDS:
+        return generate_grid(pattern, size, seed=seed + size)
+    rng = np.random.default_rng(seed + size)
+    axis = np.arange(size, dtype=np.int64)
+    coords = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+    if pattern == "dense":
+        colors = 1 + (coords[:, 2] * 4 // size)
+    else:
+        keep = rng.random(coords.shape[0]) < (0.03 if pattern == "sparse" else 0.5)
+        coords = coords[keep]
+        colors = rng.integers(1, 32, size=coords.shape[0])
+    voxels = VoxelGrid()
+    voxels.set_many(coords, colors)
+    return voxels
+
+
+def tier_voxel_count(size: int, pattern: str) -> int:
+    # Expected voxel count of build_tier_grid(size, pattern), worked out without building it.
+    cube = size**3
+    if pattern == "dense":
+        return cube
+    if pattern == "sparse":
+        return round(cube * 0.03)
+    if pattern == "noisy":
+        return round(cube * 0.5)
+    if pattern == "terrain":
+        # Noise heights average half the column height of size // 2.
+        return size * size * (1 + (size // 2 - 1) // 2)
+    if pattern == "menger":
+        level = 0
+        while 3 ** (level + 1) <= size:
+            level += 1
+        return 20**level
+    if pattern == "shell":
+        outer = size / 2.0
+        inner = max(outer - max(1, size // 16), 0.0)
+        return round(4.0 / 3.0 * math.pi * (outer**3 - inner**3))
+    if pattern == "checkerboard":
+        return (cube + 1) // 2
+    if pattern == "palette_heavy":
+        return round(math.pi / 6.0 * cube)
+    raise ValueError(f"Unsupported benchmark pattern: {pattern}")
+
+
+def build_cases(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    patterns: tuple[str, ...] = PATTERNS,
+    *,
+    work_dir: Path,
+    max_voxels: int = 1_000_000,
+    seed: int = 0,
+    keyword: str | None = None,
+) -> list[BenchmarkCase]:
+    # Nothing is built here: tiers over max_voxels and case ids without `keyword` are dropped
+    # up front, and each tier's grid, mesh and fixtures are made by the first setup needing them.
+    cases: list[BenchmarkCase] = []
+    for size in sizes:
+        for pattern in patterns:
+            if tier_voxel_count(size, pattern) > max_voxels:
+                continue
+            names = [
+                name
+                for name in CASE_NAMES
+                if keyword is None or keyword in f"{name}/{pattern}-{size}"
+            ]
+            if names:
+                cases.extend(_tier_cases(size, pattern, work_dir, names, seed=seed))
+    return cases
+
+
+def run_case(case: BenchmarkCase, *, repeat: int = 5, warmup: int = 1) -> BenchmarkResult:
+    if repeat < 1:
+        raise ValueError(f"Unsupported repeat count: {repeat}")
+    for _ in range(max(0, warmup)):
+        case.run(case.setup())
+    samples: list[float] = []
+    for _ in range(repeat):
+        state = case.setup()
+        started = time.perf_counter()
+        case.run(state)
+        samples.append(time.perf_counter() - started)
+    # tracemalloc slows allocation-heavy code, so the peak comes from one extra untimed run.
+    state = case.setup()
+    tracemalloc.start()
+    try:
+        case.run(state)
+        _current, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    center, mad = median_and_mad(samples)
+    voxels = getattr(state, "voxel_count", 0)
+    return BenchmarkResult(case.case_id, samples, center, mad, int(peak_bytes), int(voxels))
+
+
+def run_benchmarks(
+    cases: list[BenchmarkCase],
+    *,
+    repeat: int = 5,
+    warmup: int = 1,
+    progress: Callable[[int, int, BenchmarkResult], None] | None = None,
+) -> BenchmarkRun:
+    run = BenchmarkRun(
+        started_utc=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=platform.python_version(),
+        machine=f"{platform.system()}-{platform.machine()}",
+        repeat=repeat,
+    )
+    for index, case in enumerate(cases, start=1):
+        result = run_case(case, repeat=repeat, warmup=warmup)
+        run.results.append(result)
+        if progress is not None:
+            progress(index, len(cases), result)
+    return run
+
+
+def load_history(path: str | Path) -> list[dict[str, object]]:
+    history_path = Path(path)
+    if not history_path.exists():
+        return []
+    payload = json.loads(history_path.read_text(encoding="utf-8"))
+    runs = payload.get("runs") if isinstance(payload, dict) else None
+    if not isinstance(runs, list):
+        raise ValueError(f"Invalid benchmark history: {history_path}")
+    return runs
+
+
+def append_history(path: str | Path, run: BenchmarkRun) -> None:
+    runs = load_history(path)
+    runs.append(asdict(run))
+    history_path = Path(path)
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    history_path.write_text(json.dumps({"version": 1, "runs": runs}, indent=2), encoding="utf-8")
+
+
+def detect_regressions(
+    run: BenchmarkRun,
+    history: list[dict[str, object]],
+    *,
+    window: int = 5,
+    min_slowdown: float = 0.10,
+    sigmas: float = 3.0,
+) -> list[Regression]:
+    # A case regresses only when its median is both meaningfully slower than the median of
+    # the last `window` recorded medians on this machine and outside the combined noise
+    # (scaled MAD) of the current samples and those past runs.
+    previous: dict[str, list[tuple[float, float]]] = {}
+    for past in history:
+        if past.get("machine") != run.machine:
+            continue
+        for result in past.get("results", []):
+            previous.setdefault(str(result["case_id"]), []).append(
+                (float(result["median"]), float(result["mad"]))
+            )
+    regressions: list[Regression] = []
+    for result in run.results:
+        recent = previous.get(result.case_id, [])[-window:]
+        if not recent:
+            continue
+        baseline_median = statistics.median(median for median, _mad in recent)
+        spread = statistics.median(
+            [abs(median - baseline_median) for median, _mad in recent]
+            + [mad for _median, mad in recent]
+        )
+        noise = _MAD_SCALE * ((spread**2 + result.mad**2) ** 0.5)
+        delta = result.median - baseline_median
+        if baseline_median <= 0.0 or delta <= baseline_median * min_slowdown:
+            continue
+        noise_sigmas = delta / noise if noise > 0.0 else float("inf")
+        if noise_sigmas < sigmas:
+            continue
+        regressions.append(
+            Regression(
+                case_id=result.case_id,
+                median=result.median,
+                baseline_median=baseline_median,
+                slowdown=result.median / baseline_median,
+                noise_sigmas=noise_sigmas,
+            )
+        )
+    return regressions
+
+
+class _CommandState:
+    __slots__ = ("context", "voxel_count")
+
+    def __init__(self, voxels) -> None:
+        from app.app_context import AppContext
+        from core.project import Project
+
+        self.context = AppContext(current_project=Project(name="Benchmark"))
+        self.context.current_project.voxels = voxels.copy()
+        self.context.fill_max_cells = max(self.context.fill_max_cells, voxels.count() + 1)
+        self.voxel_count = voxels.count()
+
+
+class _GridState:
+    __slots__ = ("voxels", "mesh", "project", "path", "voxel_count")
+
+    def __init__(self, voxels, *, mesh=None, project=None, path: Path | None = None) -> None:
+        self.voxels = voxels
+        self.mesh = mesh
+        self.project = project
+        self.path = path
+        self.voxel_count = voxels.count()
+
+
+def _tier_cases(
+    size: int, pattern: str, work_dir: Path, names: list[str], *, seed: int = 0
+) -> list[BenchmarkCase]:
+    from core.analysis.stats import compute_scene_stats
+    from core.commands.demo_commands import FillVoxelCommand, PaintVoxelCommand
+    from core.export.gltf_exporter import export_voxels_to_gltf
+    from core.export.obj_exporter import export_voxels_to_obj
+    from core.export.qb_exporter import export_voxels_to_qb
+    from core.export.vox_exporter import export_voxels_to_vox
+    from core.io.project_io import load_project, save_project
+    from core.io.qb_io import load_qb_models_with_warnings
+    from core.io.vox_io import load_vox_models_with_warnings
+    from core.meshing.solidify import build_solid_mesh
+    from core.palette import DEFAULT_PALETTE
+    from core.project import Project
+
+    palette = list(DEFAULT_PALETTE)
+
+    @functools.cache
+    def tier_grid():
+        return build_tier_grid(size, pattern, seed=seed)
+
+    @functools.cache
+    def tier_state() -> _GridState:
+        grid = tier_grid()
+        project = Project(name=f"Benchmark {pattern} {size}")
+        project.voxels = grid
+        return _GridState(grid, mesh=build_solid_mesh(grid, greedy=True), project=project)
+
+    def target(suffix: str) -> Path:
+        return work_dir / f"{pattern}-{size}-{uuid.uuid4().hex}{suffix}"
+
+    def written(suffix: str, export: Callable[[object, str], object]) -> Callable[[], _GridState]:
+        # The fixture is written by the first setup and reused by later repetitions.
+        @functools.cache
+        def fixture() -> Path:
+            path = target(suffix)
+            export(tier_grid(), str(path))
+            return path
+
+        return lambda: _GridState(tier_grid(), path=fixture())
+
+    def brush(state: _CommandState) -> None:
+        # One stroke of single-voxel dabs across the top layer, as the viewport issues them.
+        stack = state.context.command_stack
+        stack.begin_transaction("Benchmark Stroke")
+        for x in range(size):
+            for y in range(0, size, 2):
+                stack.do(PaintVoxelCommand(x, y, size, 5), state.context)
+        stack.end_transaction()
+
+    def fill(state: _CommandState) -> None:
+        command = FillVoxelCommand(0, 0, size - 1, mode="paint", color_index=7)
+        state.context.command_stack.do(command, state.context)
+
+    def raycast(state: _GridState) -> int:
+        occupancy = state.voxels.occupancy()
+        hits = 0
+        for index in range(256):
+            u = (index % 16 + 0.5) * size / 16.0
+            v = (index // 16 + 0.5) * size / 16.0
+            if occupancy.raycast((u, v, -2.0), (0.05, 0.03, 1.0), t_end=size * 2.0) is not None:
+                hits += 1
+        return hits
+
+    def raycast_setup() -> _GridState:
+        copied = tier_grid().copy()
+        copied.occupancy()
+        return _GridState(copied)
+
+    def project_io(state: _GridState) -> None:
+        path = target(".json")
+        try:
+            save_project(state.project, str(path))
+            load_project(str(path))
+        finally:
+            path.unlink(missing_ok=True)
+
+    def export_to(suffix: str, export: Callable[[_GridState, str], object]):
+        def run(state: _GridState) -> None:
+            path = target(suffix)
+            try:
+                export(state, str(path))
+            finally:
+                path.unlink(missing_ok=True)
+                path.with_suffix(".mtl").unlink(missing_ok=True)
+
+        return run
+
+    def grid_state() -> _GridState:
+        return tier_state()
+
+    specs: list[tuple[str, Callable[[], object], Callable[[object], object]]] = [
+        ("brush", lambda: _CommandState(tier_grid()), brush),
+        ("fill", lambda: _CommandState(tier_grid()), fill),
+        ("meshing", lambda: _GridState(tier_grid()), lambda state: build_solid_mesh(state.voxels)),
+        ("raycast", raycast_setup, raycast),
+        ("stats", grid_state, lambda state: compute_scene_stats(state.project)),
+        ("project_io", grid_state, project_io),
+        (
+            "vox_load",
+            written(".vox", lambda grid, path: export_voxels_to_vox(grid, palette, path)),
+            lambda state: load_vox_models_with_warnings(str(state.path)),
+        ),
+        (
+            "qb_load",
+            written(".qb", lambda grid, path: export_voxels_to_qb(grid, palette, path)),
+            lambda state: load_qb_models_with_warnings(str(state.path)),
+        ),
+        (
+            "export_obj",
+            grid_state,
+            export_to(
+                ".obj",
+                lambda state, path: export_voxels_to_obj(
+                    state.voxels, palette, path, mesh=state.mesh
+                ),
+            ),
+        ),
+        (
+            "export_gltf",
+            grid_state,
+            export_to(
+                ".gltf",
+                lambda state, path: export_voxels_to_gltf(
+                    state.voxels, path, state.mesh, palette=palette
+                ),
+            ),
+        ),
+        (
+            "export_vox",
+            grid_state,
+            export_to(
+                ".vox", lambda state, path: export_voxels_to_vox(state.voxels, palette, path)
+            ),
+        ),
+        (
+            "export_qb",
+            grid_state,
+            export_to(
+                ".qb", lambda state, path: export_voxels_to_qb(state.voxels, palette, path)
+            ),
+        ),
+    ]
+    return [
+        BenchmarkCase(name, pattern, size, setup, run)
+        for name, setup, run in specs
+        if name in names
+    ]
+
+
+def _parse_sizes(text: str) -> tuple[int, ...]:
+    sizes = tuple(int(value) for value in text.split(",") if value.strip())
+    if not sizes or any(size < 1 for size in sizes):
+        raise ValueError(f"Unsupported benchmark sizes: {text}")
+    return sizes
+
+
+def _parse_patterns(text: str) -> tuple[str, ...]:
+    from core.synthetic import GRID_KINDS
+
+    patterns = tuple(value.strip() for value in text.split(",") if value.strip())
+    for pattern in patterns:
+        if pattern not in PATTERNS + GRID_KINDS:
+            raise ValueError(f"Unsupported benchmark pattern: {pattern}")
+    return patterns
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="benchmark_runner",
+        description="Run tiered editor benchmarks and flag statistically significant slowdowns.",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help=f"Comma-separated cube sizes (tiers: {', '.join(map(str, TIER_SIZES))}).",
+    )
+    parser.add_argument(
+        "--patterns",
+        default=",".join(PATTERNS),
+        help="Comma-separated patterns; synthetic scene kinds such as terrain or menger also work.",
+    )
+    parser.add_argument("-k", "--cases", help="Only run cases whose id contains this text.")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Timed repetitions per case.")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed warmup runs per case.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated tiers.")
+    parser.add_argument(
+        "--max-voxels",
+        type=int,
+        default=1_000_000,
+        help="Skip tiers with more voxels than this.",
+    )
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH, help="JSON history file.")
+    parser.add_argument("--no-record", action="store_true", help="Do not append to the history.")
+    parser.add_argument("--window", type=int, default=5, help="Past runs used as the baseline.")
+    parser.add_argument(
+        "--min-slowdown",
+        type=float,
+        default=0.10,
+        help="Minimum relative slowdown to report (default 0.10).",
+    )
+    parser.add_argument(
+        "--sigmas",
+        type=float,
+        default=3.0,
+        help="Slowdown must exceed this many noise deviations (default 3).",
+    )
+    parser.add_argument(
+        "--summary-json", help="Write a JSON summary to this path ('-' for stdout)."
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress per-case progress.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    _ensure_src_on_path()
+    args = _build_arg_parser().parse_args(argv)
+    try:
+        sizes = _parse_sizes(args.sizes)
+        patterns = _parse_patterns(args.patterns)
+        history = load_history(args.history)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    from util.fs import get_app_temp_dir
+
+    work_dir = get_app_temp_dir("VoxelTool") / f"benchmarks-{uuid.uuid4().hex}"
+    work_dir.mkdir(parents=True)
+    try:
+        cases = build_cases(
+            sizes,
+            patterns,
+            work_dir=work_dir,
+            max_voxels=args.max_voxels,
+            seed=args.seed,
+            keyword=args.cases,
+        )
+
+        def report(done: int, total: int, result: BenchmarkResult) -> None:
+            if args.quiet:
+                return
+            print(
+                f"[{done}/{total}] {result.case_id}: median {result.median * 1000.0:.2f} ms "
+                f"(MAD {result.mad * 1000.0:.2f} ms, "
+                f"peak {result.peak_bytes / 1048576.0:.1f} MiB)",
+                file=sys.stderr,
+            )
+
+        run = run_benchmarks(cases, repeat=args.repeat, warmup=args.warmup, progress=report)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    regressions = detect_regressions(
+        run, history, window=args.window, min_slowdown=args.min_slowdown, sigmas=args.sigmas
+    )
+    if not args.no_record:
+        append_history(args.history, run)
+    summary = {
+        "run": asdict(run),
+        "regressions": [asdict(regression) for regression in regressions],
+    }
+    if args.summary_json == "-":
+        print(json.dumps(summary, indent=2))
+    elif args.summary_json:
+        Path(args.summary_json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.case_id}: {regression.median * 1000.0:.2f} ms vs "
+            f"{regression.baseline_median * 1000.0:.2f} ms ({regression.slowdown:.2f}x, "
+            f"{regression.noise_sigmas:.1f} sigma)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class JobCancelled(Exception):
+    pass
+
+
+JobFunction = Callable[[Callable[[float], None]], object]
+
+
+class _JobSignals(QObject):
+    progress = Signal(str, float)
+    finished = Signal(str, object)
+    failed = Signal(str, str)
+    cancelled = Signal(str)
+
+
+@dataclass(slots=True)
+class JobInfo:
+    job_id: str
+    label: str
+    progress: float = 0.0
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+
+class _JobRunnable(QRunnable):
+    def __init__(self, info: JobInfo, function: JobFunction, signals: _JobSignals) -> None:
+        super().__init__()
+        self.setAutoDelete(True)
+        self._info = info
+        self._function = function
+        self._signals = signals
+
+    def run(self) -> None:
+        info = self._info
+
+        def report(fraction: float) -> None:
+            if info.cancel_event.is_set():
+                raise JobCancelled(info.label)
+            self._signals.progress.emit(info.job_id, max(0.0, min(1.0, float(fraction))))
+
+        try:
+            report(0.0)
+            result = self._function(report)
+        except JobCancelled:
+            self._signals.cancelled.emit(info.job_id)
+        except Exception as exc:
+            self._signals.failed.emit(info.job_id, f"{type(exc).__name__}: {exc}")
+        else:
+            if info.cancel_event.is_set():
+                self._signals.cancelled.emit(info.job_id)
+            else:
+                self._signals.finished.emit(info.job_id, result)
+
+
+class JobScheduler(QObject):
+    job_started = Signal(str, str)
+    job_progress = Signal(str, float)
+    job_finished = Signal(str, object)
+    job_failed = Signal(str, str)
+    job_cancelled = Signal(str)
+    jobs_idle = Signal()
+
+    def __init__(self, parent: QObject | None = None, *, pool: QThreadPool | None = None) -> None:
+        super().__init__(parent)
+        self._pool = pool or QThreadPool.globalInstance()
+        self._jobs: dict[str, JobInfo] = {}
+        self._signals = _JobSignals(self)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.cancelled.connect(self._on_cancelled)
+
+    def submit(self, label: str, function: JobFunction) -> str:
+        info = JobInfo(job_id=f"job-{uuid.uuid4().hex}", label=label)
+        self._jobs[info.job_id] = info
+        self.job_started.emit(info.job_id, label)
+        self._pool.start(_JobRunnable(info, function, self._signals))
+        return info.job_id
+
+    def cancel(self, job_id: str) -> bool:
+        info = self._jobs.get(job_id)
+        if info is None:
+            return False
+        info.cancel_event.set()
+        return True
+
+    def cancel_all(self) -> int:
+        for info in self._jobs.values():
+            info.cancel_event.set()
+        return len(self._jobs)
+
+    def active_jobs(self) -> list[JobInfo]:
+        return list(self._jobs.values())
+
+    def job_label(self, job_id: str) -> str:
+        info = self._jobs.get(job_id)
+        return info.label if info is not None else ""
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        return self._pool.waitForDone(msecs)
+
+    def _on_progress(self, job_id: str, fraction: float) -> None:
+        info = self._jobs.get(job_id)
+        if info is None:
+            return
+        info.progress = fraction
+        self.job_progress.emit(job_id, fraction)
+
+    def _on_finished(self, job_id: str, result: object) -> None:
+        self.job_finished.emit(job_id, result)
+        self._forget(job_id)
+
+    def _on_failed(self, job_id: str, message: str) -> None:
+        self.job_failed.emit(job_id, message)
+        self._forget(job_id)
+
+    def _on_cancelled(self, job_id: str) -> None:
+        self.job_cancelled.emit(job_id)
+        self._forget(job_id)
+
+    def _forget(self, job_id: str) -> None:
+        self._jobs.pop(job_id, None)
+        if not self._jobs:
+            self.jobs_idle.emit()
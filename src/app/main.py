@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
-from PySide6.QtWidgets import QApplication
-
 
 def _ensure_src_on_path() -> None:
     src_dir = Path(__file__).resolve().parents[1]
@@ -16,19 +15,57 @@ def _ensure_src_on_path() -> None:
 def main() -> int:
     _ensure_src_on_path()
 
+    # VOXEL_TOOL_PROFILE_STARTUP=1 prints an import-time and startup-phase breakdown to stderr
+    # once the window has been shown; a larger number sets how many modules are listed.
+    profile_limit = os.environ.get("VOXEL_TOOL_PROFILE_STARTUP", "")
+    profiler = None
+    if profile_limit:
+        from util.startup_profile import StartupProfiler
+
+        profiler = StartupProfiler().install()
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+
     from app.app_context import AppContext
     from app.ui.main_window import MainWindow
     from core.project import Project
     from util.log import get_logger
+    from util.trace import enable_tracing, write_chrome_trace
 
     logger = get_logger("voxel_tool")
     logger.info("Starting Phase-0 shell")
+    # VOXEL_TOOL_TRACE=<path> records spans for the whole session and writes them on exit.
+    trace_path = os.environ.get("VOXEL_TOOL_TRACE")
+    if trace_path:
+        enable_tracing(True)
 
+    if profiler is not None:
+        profiler.mark("imports")
     app = QApplication(sys.argv)
+    if profiler is not None:
+        profiler.mark("QApplication")
     context = AppContext(current_project=Project(name="Untitled"))
     window = MainWindow(context=context)
+    if profiler is not None:
+        profiler.mark("MainWindow")
     window.show()
-    return app.exec()
+    if profiler is not None:
+        profiler.mark("show")
+        QTimer.singleShot(0, lambda: _report_startup_profile(profiler, profile_limit))
+    exit_code = app.exec()
+    if trace_path:
+        logger.info("Wrote %d trace spans to %s", write_chrome_trace(trace_path), trace_path)
+    return exit_code
+
+
+def _report_startup_profile(profiler, limit: str) -> None:
+    from util.startup_profile import format_startup_profile
+
+    profiler.mark("first event loop turn")
+    profiler.uninstall()
+    count = int(limit) if limit.isdigit() and int(limit) > 1 else 25
+    print(format_startup_profile(profiler.profile, limit=count), file=sys.stderr)
 
 
 if __name__ == "__main__":
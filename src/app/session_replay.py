@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+
+
+def _ensure_src_on_path() -> None:
+    src_dir = Path(__file__).resolve().parents[1]
+    src_str = str(src_dir)
+    if src_str not in sys.path:
+        sys.path.insert(0, src_str)
+
+
+def replay_timings(session, *, project_path: str | None = None, repeat: int = 1) -> list[dict]:
+    # Per-step median over `repeat` replays, each against a freshly loaded project.
+    from core.commands.session import replay_session
+    from core.io.project_io import load_project
+    from core.project import Project
+
+    runs = []
+    for _ in range(max(1, int(repeat))):
+        if project_path:
+            project = load_project(project_path)
+        else:
+            project = Project(name=session.project_name or "Replay")
+        runs.append(replay_session(session, project))
+    steps = []
+    for index, step in enumerate(runs[0].steps):
+        steps.append(
+            {
+                "index": index,
+                "op": step.op,
+                "name": step.name,
+                "cells": step.cells,
+                "median_ms": statistics.median(run.steps[index].duration_ms for run in runs),
+            }
+        )
+    return steps
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded editing session headlessly and report per-step timings."
+    )
+    parser.add_argument("session", help="Session log (.jsonl) recorded from the Debug menu.")
+    parser.add_argument(
+        "--project",
+        help=(
+            "Project JSON to replay onto (default: the start project saved with the log, or an "
+            "empty project for logs recorded without one)."
+        ),
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="Replays per step median.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest steps to print.")
+    parser.add_argument(
+        "--summary-json",
+        help="Write every step's timing as JSON to this path ('-' for stdout).",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    _ensure_src_on_path()
+    args = _build_arg_parser().parse_args(argv)
+
+    from core.commands.session import load_session
+
+    try:
+        session = load_session(args.session)
+        project_path = args.project or session.project_file
+        steps = replay_timings(session, project_path=project_path, repeat=args.repeat)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    total_ms = sum(step["median_ms"] for step in steps)
+    print(f"{len(steps)} steps replayed in {total_ms:.2f} ms (median of {args.repeat})")
+    slowest = sorted(steps, key=lambda step: step["median_ms"], reverse=True)[: max(0, args.top)]
+    for step in slowest:
+        print(
+            f"  #{step['index']} {step['op']} {step['name']}: {step['median_ms']:.2f} ms, "
+            f"{step['cells']} cells"
+        )
+    summary = {"session": args.session, "repeat": args.repeat, "total_ms": total_ms, "steps": steps}
+    if args.summary_json == "-":
+        print(json.dumps(summary, indent=2))
+    elif args.summary_json:
+        Path(args.summary_json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,7 +4,9 @@ import logging
 import os
 import random
 import time
+import tracemalloc
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
 
 from PySide6.QtCore import QTimer, Qt
 from PySide6.QtGui import QAction, QActionGroup, QCloseEvent, QKeySequence, QShortcut
@@ -20,12 +22,14 @@ from PySide6.QtWidgets import (
     QLabel,
     QMainWindow,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QToolBar,
     QVBoxLayout,
 )
 
 from app.app_context import AppContext
+from app.jobs import JobScheduler
 from app.settings import get_settings
 from app.ui.dialogs.command_palette_dialog import CommandPaletteDialog
 from core.commands.demo_commands import (
@@ -35,14 +39,24 @@ from core.commands.demo_commands import (
     PaintVoxelCommand,
     RenameProjectCommand,
 )
+from core.commands.metrics import DEFAULT_SLOW_THRESHOLD_MS
+from core.commands.session import SessionRecorder, save_session
+from core.analysis.memory import MemoryAccountant
 from core.analysis.stats import compute_scene_stats
-from core.export.obj_exporter import ObjExportOptions, export_voxels_to_obj
-from core.export.qb_exporter import export_voxels_to_qb
-from core.export.gltf_exporter import export_voxels_to_gltf
-from core.export.vox_exporter import export_voxels_to_vox
+from core.events import (
+    ACTIVE_PART_CHANGED,
+    EVENT_KINDS,
+    HISTORY_CHANGED,
+    PALETTE_CHANGED,
+    PART_TRANSFORM_CHANGED,
+    PART_VOXELS_CHANGED,
+    PARTS_CHANGED,
+    PROJECT_CHANGED,
+    SELECTION_CHANGED,
+    TOOL_CHANGED,
+    ChangeEvent,
+)
 from core.io.project_io import load_project, save_project
-from core.io.qb_io import load_qb_models_with_warnings
-from core.io.vox_io import load_vox_models_with_warnings
 from core.io.recovery_io import (
     clear_recovery_snapshot,
     has_recovery_snapshot,
@@ -50,6 +64,7 @@ from core.io.recovery_io import (
     save_recovery_snapshot,
     write_recovery_diagnostic,
 )
+from core.meshing.disk_cache import DEFAULT_MESH_CACHE_BYTES, MeshDiskCache, set_mesh_disk_cache
 from core.meshing.solidify import rebuild_part_mesh
 from core.project import Project, utc_now_iso
 from app.ui.panels.inspector_panel import InspectorPanel
@@ -57,8 +72,16 @@ from app.ui.panels.palette_panel import PalettePanel
 from app.ui.panels.stats_panel import StatsPanel
 from app.ui.panels.tools_panel import ToolsPanel
 from app.viewport.gl_widget import GLViewportWidget
+from util.fs import get_app_temp_dir
+from util.trace import clear_trace, enable_tracing, tracing_enabled, write_chrome_trace
+
+if TYPE_CHECKING:
+    from core.export.gltf_exporter import GltfExportStats
+    from core.export.qb_exporter import QbExportStats
+    from core.export.vox_exporter import VoxExportStats
 
 AUTOSAVE_DEBOUNCE_MS = 5000
+MEMORY_REFRESH_MS = 2000
 
 
 @dataclass(slots=True)
@@ -70,6 +93,13 @@ class _ExportSessionOptions:
     scale_preset: str = "Unity (1m)"
 
 
+@dataclass(slots=True)
+class _BackgroundJobHandlers:
+    on_finished: Callable[[object], None]
+    failure_message: str
+    partial_paths: tuple[str, ...] = ()
+
+
 class _ExportOptionsDialog(QDialog):
     def __init__(self, parent: QMainWindow, format_name: str, options: _ExportSessionOptions) -> None:
         super().__init__(parent)
@@ -288,6 +318,12 @@ class MainWindow(QMainWindow):
         self._last_frame_ms = 0.0
         self._last_rebuild_ms = 0.0
         self._last_scene_triangles = 0
+        self._scene_voxel_count = 0
+        self._part_stats_cache: dict = {}
+        self._memory_accountant = MemoryAccountant()
+        self._memory_timer = QTimer(self)
+        self._memory_timer.setInterval(MEMORY_REFRESH_MS)
+        self._memory_timer.timeout.connect(self._refresh_memory_report)
         self._autosave_timer = QTimer(self)
         self._autosave_timer.setInterval(60000)
         self._autosave_timer.timeout.connect(self._on_autosave_tick)
@@ -295,6 +331,18 @@ class MainWindow(QMainWindow):
         self._autosave_debounce_timer.setSingleShot(True)
         self._autosave_debounce_timer.setInterval(AUTOSAVE_DEBOUNCE_MS)
         self._autosave_debounce_timer.timeout.connect(self._save_recovery_snapshot_now)
+        self._job_handlers: dict[str, _BackgroundJobHandlers] = {}
+        self._job_scheduler = JobScheduler(self)
+        self._job_scheduler.job_progress.connect(self._on_job_progress)
+        self._job_scheduler.job_finished.connect(self._on_job_finished)
+        self._job_scheduler.job_failed.connect(self._on_job_failed)
+        self._job_scheduler.job_cancelled.connect(self._on_job_cancelled)
+        self._job_scheduler.jobs_idle.connect(self._on_jobs_idle)
+        self._job_progress_bar = QProgressBar(self)
+        self._job_progress_bar.setRange(0, 100)
+        self._job_progress_bar.setMaximumWidth(160)
+        self._job_progress_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self._job_progress_bar)
 
         self.viewport = GLViewportWidget(self)
         self.viewport.set_context(self.context)
@@ -328,7 +376,9 @@ class MainWindow(QMainWindow):
         self.palette_panel.palette_status_message.connect(self._on_palette_status_message)
         self.palette_dock = self._add_dock("Palette", self.palette_panel, Qt.RightDockWidgetArea)
         self.stats_panel = StatsPanel(self)
+        self.stats_panel.allocation_tracking_toggled.connect(self._on_allocation_tracking_toggled)
         self.stats_dock = self._add_dock("Stats", self.stats_panel, Qt.BottomDockWidgetArea)
+        self._subscribe_to_changes()
         self._build_file_menu()
         self._build_edit_menu()
         self._build_view_menu()
@@ -338,9 +388,13 @@ class MainWindow(QMainWindow):
         self._setup_shortcuts()
         self.statusBar().showMessage("Viewport: INITIALIZING | Shader: unknown | OpenGL: unknown")
         self._restore_layout_settings()
-        self._prompt_recovery_if_available()
+        self._restore_diagnostics_settings()
+        self._restore_mesh_cache_settings()
         self._refresh_ui_state()
+        # Checked once the event loop runs, so the recovery prompt does not delay the window.
+        QTimer.singleShot(0, self._prompt_recovery_if_available)
         self._autosave_timer.start()
+        self._memory_timer.start()
 
     def _add_dock(self, title: str, widget, area: Qt.DockWidgetArea) -> QDockWidget:
         dock = QDockWidget(title, self)
@@ -389,9 +443,19 @@ class MainWindow(QMainWindow):
         export_vox_action = QAction("Export VOX", self)
         export_vox_action.triggered.connect(self._on_export_vox)
         file_menu.addAction(export_vox_action)
+        export_scene_gltf_action = QAction("Export Scene glTF", self)
+        export_scene_gltf_action.triggered.connect(self._on_export_scene_gltf)
+        file_menu.addAction(export_scene_gltf_action)
+        export_scene_vox_action = QAction("Export Scene VOX", self)
+        export_scene_vox_action.triggered.connect(self._on_export_scene_vox)
+        file_menu.addAction(export_scene_vox_action)
         export_qb_action = QAction("Export QB", self)
         export_qb_action.triggered.connect(self._on_export_qb)
         file_menu.addAction(export_qb_action)
+        self._cancel_jobs_action = QAction("Cancel Background Jobs", self)
+        self._cancel_jobs_action.setEnabled(False)
+        self._cancel_jobs_action.triggered.connect(self._on_cancel_background_jobs)
+        file_menu.addAction(self._cancel_jobs_action)
 
         file_menu.addSeparator()
 
@@ -602,6 +666,69 @@ class MainWindow(QMainWindow):
         create_test_voxels_action.triggered.connect(self._on_create_test_voxels)
         debug_menu.addAction(create_test_voxels_action)
 
+        record_trace_action = QAction("Record Performance Trace", self)
+        record_trace_action.setCheckable(True)
+        record_trace_action.setChecked(tracing_enabled())
+        record_trace_action.toggled.connect(self._on_toggle_trace_recording)
+        debug_menu.addAction(record_trace_action)
+
+        record_session_action = QAction("Record Editing Session", self)
+        record_session_action.setCheckable(True)
+        record_session_action.toggled.connect(self._on_toggle_session_recording)
+        debug_menu.addAction(record_session_action)
+
+    def _on_toggle_trace_recording(self, enabled: bool) -> None:
+        if enabled:
+            clear_trace()
+            enable_tracing(True)
+            self.statusBar().showMessage("Recording performance trace...", 5000)
+            return
+        enable_tracing(False)
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Performance Trace",
+            "",
+            "Chrome Trace (*.json);;All Files (*)",
+        )
+        if not path:
+            return
+        try:
+            span_count = write_chrome_trace(path)
+        except OSError as exc:
+            QMessageBox.warning(self, "Save Trace Failed", f"Could not write {path}: {exc}")
+            return
+        self.statusBar().showMessage(f"Saved {span_count} trace spans: {path}", 5000)
+
+    def _on_toggle_session_recording(self, enabled: bool) -> None:
+        stack = self.context.command_stack
+        if enabled:
+            stack.recorder = SessionRecorder(
+                project=self.context.current_project, command_stack=stack
+            )
+            self.statusBar().showMessage("Recording editing session...", 5000)
+            return
+        recorder = stack.recorder
+        stack.recorder = None
+        if recorder is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Editing Session",
+            "",
+            "Voxel Tool Session (*.jsonl);;All Files (*)",
+        )
+        if not path:
+            return
+        try:
+            save_session(recorder.session, path, project=recorder.start_project)
+        except OSError as exc:
+            QMessageBox.warning(self, "Save Session Failed", f"Could not write {path}: {exc}")
+            return
+        message = f"Saved {len(recorder.session.steps)} session steps: {path}"
+        if recorder.unsupported:
+            message += f" ({len(recorder.unsupported)} unsupported commands skipped)"
+        self.statusBar().showMessage(message, 5000)
+
     def _setup_shortcuts(self) -> None:
         self._register_shortcut("B", "Tool: Brush", lambda: self._set_tool_shape(AppContext.TOOL_SHAPE_BRUSH))
         self._register_shortcut("X", "Tool: Box", lambda: self._set_tool_shape(AppContext.TOOL_SHAPE_BOX))
@@ -748,6 +875,9 @@ class MainWindow(QMainWindow):
         return path
 
     def _on_export_obj(self) -> None:
+        # Format modules load on first use to keep them off the startup path.
+        from core.export.obj_exporter import ObjExportOptions, export_voxels_to_obj
+
         export_options = self._prompt_export_options("OBJ")
         if export_options is None:
             return
@@ -759,41 +889,51 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
-        export_voxels_to_obj(
-            self.context.current_project.voxels,
-            self.context.palette,
-            path,
-            options=ObjExportOptions(
-                use_greedy_mesh=export_options.obj_use_greedy_mesh,
-                triangulate=export_options.obj_triangulate,
-                scale_factor=_scale_factor_from_preset(export_options.scale_preset),
-                pivot_mode=export_options.obj_pivot_mode,
-                multi_material_by_color=export_options.obj_multi_material,
-            ),
-            mesh=(
-                self.context.active_part.mesh_cache
-                if self.context.active_part.dirty_bounds is None
-                else None
-            ),
+        voxels = self.context.current_project.voxels.snapshot()
+        palette = list(self.context.palette)
+        options = ObjExportOptions(
+            use_greedy_mesh=export_options.obj_use_greedy_mesh,
+            triangulate=export_options.obj_triangulate,
+            scale_factor=_scale_factor_from_preset(export_options.scale_preset),
+            pivot_mode=export_options.obj_pivot_mode,
+            multi_material_by_color=export_options.obj_multi_material,
+        )
+        mesh = (
+            self.context.active_part.mesh_cache
+            if self.context.active_part.dirty_bounds is None
+            else None
         )
-        voxel_count = self.context.current_project.voxels.count()
-        if voxel_count == 0:
+
+        def finished(_result: object) -> None:
+            voxel_count = voxels.count()
+            if voxel_count == 0:
+                self.statusBar().showMessage(
+                    f"No voxels to export | Exported OBJ: {path} | Scale: {export_options.scale_preset}",
+                    5000,
+                )
+                return
             self.statusBar().showMessage(
-                f"No voxels to export | Exported OBJ: {path} | Scale: {export_options.scale_preset}",
+                (
+                    f"Exported OBJ: {path} | Voxels: {voxel_count} | "
+                    f"Greedy: {export_options.obj_use_greedy_mesh} | "
+                    f"Triangulate: {export_options.obj_triangulate} | "
+                    f"Pivot: {export_options.obj_pivot_mode} | Scale: {export_options.scale_preset}"
+                ),
                 5000,
             )
-            return
-        self.statusBar().showMessage(
-            (
-                f"Exported OBJ: {path} | Voxels: {voxel_count} | "
-                f"Greedy: {export_options.obj_use_greedy_mesh} | "
-                f"Triangulate: {export_options.obj_triangulate} | "
-                f"Pivot: {export_options.obj_pivot_mode} | Scale: {export_options.scale_preset}"
+
+        self._start_background_job(
+            "Export OBJ",
+            lambda progress: export_voxels_to_obj(
+                voxels, palette, path, options=options, mesh=mesh, progress=progress
             ),
-            5000,
+            finished,
+            partial_paths=(path, os.path.splitext(path)[0] + ".mtl"),
         )
 
     def _on_import_vox(self) -> None:
+        from core.io.vox_io import load_vox_models_with_warnings
+
         path, _ = QFileDialog.getOpenFileName(
             self,
             "Import VOX",
@@ -802,46 +942,23 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
-        try:
-            models, palette, warnings = load_vox_models_with_warnings(path)
-        except Exception as exc:
-            QMessageBox.warning(self, "Import VOX", f"Failed to import VOX file.\n\n{exc}")
-            return
-
-        scene = self.context.current_project.scene
-        part_name = os.path.splitext(os.path.basename(path))[0] or "Imported VOX"
-        target_group_id: str | None = None
-        if len(models) > 1:
-            group = scene.create_group(_vox_import_group_name(part_name))
-            target_group_id = group.group_id
-        imported_count = 0
-        active_part_id: str | None = None
-        for index, voxels in enumerate(models):
-            name = _vox_import_part_name(part_name, index, len(models))
-            imported_part = scene.add_part(name)
-            imported_part.voxels = voxels
-            if target_group_id is not None:
-                scene.assign_part_to_group(imported_part.part_id, target_group_id)
-            if active_part_id is None:
-                active_part_id = imported_part.part_id
-            imported_count += 1
-        if active_part_id is not None:
-            scene.set_active_part(active_part_id)
-        self.context.palette = palette
-        self.context.active_color_index = max(
-            0,
-            min(self.context.active_color_index, len(self.context.palette) - 1),
+        project = self.context.current_project
+        self._start_background_job(
+            "Import VOX",
+            lambda progress: load_vox_models_with_warnings(path, progress=progress),
+            lambda result: self._apply_imported_models(
+                project,
+                path,
+                result,
+                format_label="VOX",
+                warning_prefix="Imported with unsupported chunk(s): ",
+            ),
+            failure_message="Failed to import VOX file.",
         )
-        self._show_voxel_status(f"Imported VOX: {path} ({imported_count} part(s))")
-        if warnings:
-            QMessageBox.information(
-                self,
-                "VOX Import Warnings",
-                "Imported with unsupported chunk(s): " + ", ".join(warnings),
-            )
-        self._refresh_ui_state()
 
     def _on_import_qb(self) -> None:
+        from core.io.qb_io import load_qb_models_with_warnings
+
         path, _ = QFileDialog.getOpenFileName(
             self,
             "Import QB",
@@ -850,14 +967,37 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
-        try:
-            models, palette, warnings = load_qb_models_with_warnings(path)
-        except Exception as exc:
-            QMessageBox.warning(self, "Import QB", f"Failed to import QB file.\n\n{exc}")
-            return
+        project = self.context.current_project
+        self._start_background_job(
+            "Import QB",
+            lambda progress: load_qb_models_with_warnings(path, progress=progress),
+            lambda result: self._apply_imported_models(
+                project,
+                path,
+                result,
+                format_label="QB",
+                warning_prefix="Imported with unsupported data: ",
+            ),
+            failure_message="Failed to import QB file.",
+        )
 
-        scene = self.context.current_project.scene
-        part_name = os.path.splitext(os.path.basename(path))[0] or "Imported QB"
+    def _apply_imported_models(
+        self,
+        project: Project,
+        path: str,
+        result: object,
+        *,
+        format_label: str,
+        warning_prefix: str,
+    ) -> None:
+        if self.context.current_project is not project:
+            self._show_voxel_status(
+                f"Discarded {format_label} import: project changed while importing {path}"
+            )
+            return
+        models, palette, warnings = result  # type: ignore[misc]
+        scene = project.scene
+        part_name = os.path.splitext(os.path.basename(path))[0] or f"Imported {format_label}"
         target_group_id: str | None = None
         if len(models) > 1:
             group = scene.create_group(_vox_import_group_name(part_name))
@@ -880,16 +1020,18 @@ class MainWindow(QMainWindow):
             0,
             min(self.context.active_color_index, len(self.context.palette) - 1),
         )
-        self._show_voxel_status(f"Imported QB: {path} ({imported_count} part(s))")
+        self._show_voxel_status(f"Imported {format_label}: {path} ({imported_count} part(s))")
         if warnings:
             QMessageBox.information(
                 self,
-                "QB Import Warnings",
-                "Imported with unsupported data: " + ", ".join(warnings),
+                f"{format_label} Import Warnings",
+                warning_prefix + ", ".join(warnings),
             )
         self._refresh_ui_state()
 
     def _on_export_gltf(self) -> None:
+        from core.export.gltf_exporter import export_voxels_to_gltf
+
         export_options = self._prompt_export_options("glTF")
         if export_options is None:
             return
@@ -901,32 +1043,48 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
-        stats = export_voxels_to_gltf(
-            self.context.current_project.voxels,
-            path,
-            scale_factor=_scale_factor_from_preset(export_options.scale_preset),
-            palette=self.context.palette,
-            mesh=(
-                self.context.active_part.mesh_cache
-                if self.context.active_part.dirty_bounds is None
-                else None
-            ),
+        voxels = self.context.current_project.voxels.snapshot()
+        palette = list(self.context.palette)
+        scale_factor = _scale_factor_from_preset(export_options.scale_preset)
+        mesh = (
+            self.context.active_part.mesh_cache
+            if self.context.active_part.dirty_bounds is None
+            else None
         )
-        if stats.triangle_count == 0:
+
+        def finished(result: object) -> None:
+            stats: GltfExportStats = result  # type: ignore[assignment]
+            if stats.triangle_count == 0:
+                self.statusBar().showMessage(
+                    f"No voxels to export | Exported glTF: {path} | Scale: {export_options.scale_preset}",
+                    5000,
+                )
+                return
             self.statusBar().showMessage(
-                f"No voxels to export | Exported glTF: {path} | Scale: {export_options.scale_preset}",
+                (
+                    f"Exported glTF: {path} | Vertices: {stats.vertex_count} | "
+                    f"Triangles: {stats.triangle_count} | Scale: {export_options.scale_preset}"
+                ),
                 5000,
             )
-            return
-        self.statusBar().showMessage(
-            (
-                f"Exported glTF: {path} | Vertices: {stats.vertex_count} | "
-                f"Triangles: {stats.triangle_count} | Scale: {export_options.scale_preset}"
+
+        self._start_background_job(
+            "Export glTF",
+            lambda progress: export_voxels_to_gltf(
+                voxels,
+                path,
+                scale_factor=scale_factor,
+                palette=palette,
+                mesh=mesh,
+                progress=progress,
             ),
-            5000,
+            finished,
+            partial_paths=(path,),
         )
 
     def _on_export_vox(self) -> None:
+        from core.export.vox_exporter import export_voxels_to_vox
+
         export_options = self._prompt_export_options("VOX")
         if export_options is None:
             return
@@ -938,22 +1096,105 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
-        stats = export_voxels_to_vox(self.context.current_project.voxels, self.context.palette, path)
-        if stats.voxel_count == 0:
+        voxels = self.context.current_project.voxels.snapshot()
+        palette = list(self.context.palette)
+
+        def finished(result: object) -> None:
+            stats: VoxExportStats = result  # type: ignore[assignment]
+            if stats.voxel_count == 0:
+                self.statusBar().showMessage(
+                    f"No voxels to export | Exported VOX: {path}",
+                    5000,
+                )
+                return
+            sx, sy, sz = stats.size
             self.statusBar().showMessage(
-                f"No voxels to export | Exported VOX: {path}",
+                (
+                    f"Exported VOX: {path} | Voxels: {stats.voxel_count} | Size: {sx}x{sy}x{sz}"
+                    + (f" | Tiles: {stats.tile_count}" if stats.tile_count > 1 else "")
+                ),
                 5000,
             )
+
+        self._start_background_job(
+            "Export VOX",
+            lambda progress: export_voxels_to_vox(voxels, palette, path, progress=progress),
+            finished,
+            partial_paths=(path,),
+        )
+
+    def _on_export_scene_gltf(self) -> None:
+        from core.export.gltf_exporter import export_parts_to_gltf
+
+        export_options = self._prompt_export_options("glTF")
+        if export_options is None:
             return
-        sx, sy, sz = stats.size
-        self.statusBar().showMessage(
-            (
-                f"Exported VOX: {path} | Voxels: {stats.voxel_count} | Size: {sx}x{sy}x{sz}"
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Scene glTF",
+            "",
+            "glTF (*.gltf);;All Files (*)",
+        )
+        if not path:
+            return
+        parts = self.context.current_project.scene.snapshot().iter_visible_parts()
+        palette = list(self.context.palette)
+        scale_factor = _scale_factor_from_preset(export_options.scale_preset)
+
+        def finished(result: object) -> None:
+            stats: GltfExportStats = result  # type: ignore[assignment]
+            self.statusBar().showMessage(
+                (
+                    f"Exported scene glTF: {path} | Parts: {stats.node_count} | "
+                    f"Meshes: {stats.mesh_count} | Triangles: {stats.triangle_count}"
+                ),
+                5000,
+            )
+
+        self._start_background_job(
+            "Export Scene glTF",
+            lambda progress: export_parts_to_gltf(
+                parts,
+                path,
+                scale_factor=scale_factor,
+                palette=palette,
+                progress=progress,
             ),
-            5000,
+            finished,
+            partial_paths=(path,),
+        )
+
+    def _on_export_scene_vox(self) -> None:
+        from core.export.vox_exporter import export_parts_to_vox
+
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Scene VOX",
+            "",
+            "VOX (*.vox);;All Files (*)",
+        )
+        if not path:
+            return
+        parts = self.context.current_project.scene.snapshot().iter_visible_parts()
+        palette = list(self.context.palette)
+
+        def finished(result: object) -> None:
+            stats: VoxExportStats = result  # type: ignore[assignment]
+            self.statusBar().showMessage(
+                f"Exported scene VOX: {path} | Parts: {len(parts)} | Models: {stats.tile_count}",
+                5000,
+            )
+
+        self._start_background_job(
+            "Export Scene VOX",
+            lambda progress: export_parts_to_vox(parts, palette, path, progress=progress),
+            finished,
+            partial_paths=(path,),
         )
 
     def _on_export_qb(self) -> None:
+        from core.export.qb_exporter import export_voxels_to_qb
+
         path, _ = QFileDialog.getSaveFileName(
             self,
             "Export QB",
@@ -962,25 +1203,92 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
-        stats = export_voxels_to_qb(
-            self.context.current_project.voxels,
-            self.context.palette,
-            path,
-            matrix_name=self.context.active_part.name,
-        )
-        if stats.voxel_count == 0:
+        voxels = self.context.current_project.voxels.snapshot()
+        palette = list(self.context.palette)
+        matrix_name = self.context.active_part.name
+
+        def finished(result: object) -> None:
+            stats: QbExportStats = result  # type: ignore[assignment]
+            if stats.voxel_count == 0:
+                self.statusBar().showMessage(
+                    f"No voxels to export | Exported QB: {path}",
+                    5000,
+                )
+                return
+            sx, sy, sz = stats.size
             self.statusBar().showMessage(
-                f"No voxels to export | Exported QB: {path}",
+                (
+                    f"Exported QB: {path} | Voxels: {stats.voxel_count} | Size: {sx}x{sy}x{sz}"
+                ),
                 5000,
             )
-            return
-        sx, sy, sz = stats.size
-        self.statusBar().showMessage(
-            (
-                f"Exported QB: {path} | Voxels: {stats.voxel_count} | Size: {sx}x{sy}x{sz}"
+
+        self._start_background_job(
+            "Export QB",
+            lambda progress: export_voxels_to_qb(
+                voxels, palette, path, matrix_name=matrix_name, progress=progress
             ),
-            5000,
+            finished,
+            partial_paths=(path,),
+        )
+
+    def _start_background_job(
+        self,
+        label: str,
+        function: Callable[[Callable[[float], None]], object],
+        on_finished: Callable[[object], None],
+        *,
+        failure_message: str | None = None,
+        partial_paths: tuple[str, ...] = (),
+    ) -> str:
+        job_id = self._job_scheduler.submit(label, function)
+        self._job_handlers[job_id] = _BackgroundJobHandlers(
+            on_finished=on_finished,
+            failure_message=failure_message or f"{label} failed.",
+            partial_paths=partial_paths,
         )
+        self._job_progress_bar.setValue(0)
+        self._job_progress_bar.setVisible(True)
+        self._cancel_jobs_action.setEnabled(True)
+        return job_id
+
+    def _on_job_progress(self, job_id: str, fraction: float) -> None:
+        percent = int(round(fraction * 100.0))
+        self._job_progress_bar.setValue(percent)
+        label = self._job_scheduler.job_label(job_id)
+        self.statusBar().showMessage(f"{label}: {percent}% (File > Cancel Background Jobs to stop)")
+
+    def _on_job_finished(self, job_id: str, result: object) -> None:
+        handlers = self._job_handlers.pop(job_id, None)
+        if handlers is not None:
+            handlers.on_finished(result)
+
+    def _on_job_failed(self, job_id: str, message: str) -> None:
+        handlers = self._job_handlers.pop(job_id, None)
+        label = self._job_scheduler.job_label(job_id) or "Background Job"
+        detail = handlers.failure_message if handlers is not None else f"{label} failed."
+        logging.getLogger("voxel_tool").warning("%s: %s", label, message)
+        QMessageBox.warning(self, label, f"{detail}\n\n{message}")
+
+    def _on_job_cancelled(self, job_id: str) -> None:
+        handlers = self._job_handlers.pop(job_id, None)
+        if handlers is not None:
+            for partial_path in handlers.partial_paths:
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+        label = self._job_scheduler.job_label(job_id) or "Background job"
+        self.statusBar().showMessage(f"{label}: cancelled", 5000)
+
+    def _on_jobs_idle(self) -> None:
+        self._job_progress_bar.setVisible(False)
+        self._cancel_jobs_action.setEnabled(False)
+
+    def _on_cancel_background_jobs(self) -> None:
+        count = self._job_scheduler.cancel_all()
+        if count:
+            self.statusBar().showMessage(f"Cancelling {count} background job(s)...", 5000)
 
     def _prompt_export_options(self, format_name: str) -> _ExportSessionOptions | None:
         dialog = _ExportOptionsDialog(self, format_name, self._export_options)
@@ -1013,6 +1321,8 @@ class MainWindow(QMainWindow):
             f"Solidified part: {part.name} | Faces: {mesh.face_count} | Vertices: {len(mesh.vertices)}"
         )
         self._refresh_ui_state()
+        # The voxels are unchanged, so no event covers the new mesh and rebuild time.
+        self._on_stats_changes([])
 
     def _on_undo(self) -> None:
         self.context.command_stack.undo(self.context)
@@ -1076,6 +1386,8 @@ class MainWindow(QMainWindow):
             ("export_obj", "Export OBJ"),
             ("export_gltf", "Export glTF"),
             ("export_vox", "Export VOX"),
+            ("export_scene_gltf", "Export Scene glTF"),
+            ("export_scene_vox", "Export Scene VOX"),
             ("export_qb", "Export QB"),
             ("undo", "Undo"),
             ("redo", "Redo"),
@@ -1115,6 +1427,10 @@ class MainWindow(QMainWindow):
             self._on_export_gltf()
         elif command_id == "export_vox":
             self._on_export_vox()
+        elif command_id == "export_scene_gltf":
+            self._on_export_scene_gltf()
+        elif command_id == "export_scene_vox":
+            self._on_export_scene_vox()
         elif command_id == "export_qb":
             self._on_export_qb()
         elif command_id == "undo":
@@ -1148,29 +1464,83 @@ class MainWindow(QMainWindow):
         self._refresh_ui_state()
 
     def _refresh_ui_state(self) -> None:
+        # Panels and the viewport redo their work from change events; this only publishes
+        # whatever the preceding action changed.
         self.setWindowTitle(f"Voxel Tool - Phase 0 - {self.context.current_project.name}")
-        scene_stats = compute_scene_stats(self.context.current_project)
+        self.context.publish_changes()
+
+    def _subscribe_to_changes(self) -> None:
+        changes = self.context.changes
+        changes.subscribe(
+            (PART_VOXELS_CHANGED, PARTS_CHANGED, ACTIVE_PART_CHANGED, PROJECT_CHANGED),
+            self._on_stats_changes,
+        )
+        changes.subscribe(
+            (PALETTE_CHANGED, PROJECT_CHANGED),
+            lambda _events: self.palette_panel.refresh(),
+        )
+        changes.subscribe(
+            (PARTS_CHANGED, PART_TRANSFORM_CHANGED, ACTIVE_PART_CHANGED, PROJECT_CHANGED),
+            self._on_inspector_changes,
+        )
+        changes.subscribe(
+            (TOOL_CHANGED, SELECTION_CHANGED, ACTIVE_PART_CHANGED, PROJECT_CHANGED),
+            lambda _events: self.tools_panel.refresh(),
+        )
+        changes.subscribe((HISTORY_CHANGED, PROJECT_CHANGED), self._on_history_changes)
+        changes.subscribe(EVENT_KINDS, lambda _events: self.viewport.update())
+
+    def _on_inspector_changes(self, events: list[ChangeEvent]) -> None:
+        # Renamed parts arrive as events carrying their id, so only those labels are re-read.
+        self.inspector_panel.refresh({event.part_id for event in events if event.part_id})
+
+    def _on_stats_changes(self, events: list[ChangeEvent]) -> None:
+        del events
+        project = self.context.current_project
+        scene_stats = compute_scene_stats(project, cache=self._part_stats_cache)
+        self._scene_voxel_count = sum(part.voxels.count() for part in project.scene.parts.values())
         self.stats_panel.set_scene_stats(
             scene_stats,
             active_part_id=self.context.active_part_id,
-            active_voxel_count=self.context.current_project.voxels.count(),
+            active_voxel_count=project.voxels.count(),
         )
         self._last_scene_triangles = scene_stats.triangles
+        self._update_runtime_stats()
+
+    def _refresh_memory_report(self) -> None:
+        # Polled rather than event driven: viewport caches change on every frame.
+        if not self.stats_dock.isVisible():
+            return
+        report = self._memory_accountant.measure(
+            self.context.current_project,
+            command_stack=self.context.command_stack,
+            viewport_usage=self.viewport.memory_usage,
+        )
+        self.stats_panel.set_memory_report(report)
+
+    def _on_allocation_tracking_toggled(self, enabled: bool) -> None:
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._refresh_memory_report()
+
+    def _on_history_changes(self, events: list[ChangeEvent]) -> None:
+        del events
+        if self.undo_action is not None:
+            self.undo_action.setEnabled(self.context.command_stack.can_undo)
+        if self.redo_action is not None:
+            self.redo_action.setEnabled(self.context.command_stack.can_redo)
+        self.stats_panel.set_command_summaries(self.context.command_stack.metrics.summaries())
+
+    def _update_runtime_stats(self) -> None:
         self.stats_panel.set_runtime_stats(
             frame_ms=self._last_frame_ms,
             rebuild_ms=self._last_rebuild_ms,
             scene_triangles=self._last_scene_triangles,
-            scene_voxels=sum(part.voxels.count() for part in self.context.current_project.scene.parts.values()),
+            scene_voxels=self._scene_voxel_count,
             active_part_voxels=self.context.current_project.voxels.count(),
         )
-        self.palette_panel.refresh()
-        self.inspector_panel.refresh()
-        self.tools_panel.refresh()
-        self.viewport.update()
-        if self.undo_action is not None:
-            self.undo_action.setEnabled(self.context.command_stack.can_undo)
-        if self.redo_action is not None:
-            self.redo_action.setEnabled(self.context.command_stack.can_redo)
 
     def _show_voxel_status(self, message: str) -> None:
         count = self.context.current_project.voxels.count()
@@ -1422,13 +1792,7 @@ class MainWindow(QMainWindow):
     def _on_runtime_metrics(self, frame_ms: float, active_voxels: int) -> None:
         del active_voxels
         self._last_frame_ms = frame_ms
-        self.stats_panel.set_runtime_stats(
-            frame_ms=self._last_frame_ms,
-            rebuild_ms=self._last_rebuild_ms,
-            scene_triangles=self._last_scene_triangles,
-            scene_voxels=sum(part.voxels.count() for part in self.context.current_project.scene.parts.values()),
-            active_part_voxels=self.context.current_project.voxels.count(),
-        )
+        self._update_runtime_stats()
 
     def _on_viewport_error(self, message: str) -> None:
         QMessageBox.critical(
@@ -1584,6 +1948,29 @@ class MainWindow(QMainWindow):
         else:
             self._apply_default_layout()
 
+    def _restore_diagnostics_settings(self) -> None:
+        threshold = get_settings().value("diagnostics/slow_command_ms", DEFAULT_SLOW_THRESHOLD_MS)
+        try:
+            self.context.command_stack.metrics.slow_threshold_ms = max(0.0, float(threshold))
+        except (TypeError, ValueError):
+            self.context.command_stack.metrics.slow_threshold_ms = DEFAULT_SLOW_THRESHOLD_MS
+
+    def _restore_mesh_cache_settings(self) -> None:
+        # meshing/disk_cache_mb caps the on-disk mesh cache; 0 turns it off.
+        default_mb = DEFAULT_MESH_CACHE_BYTES // (1024 * 1024)
+        try:
+            limit_mb = int(get_settings().value("meshing/disk_cache_mb", default_mb))
+        except (TypeError, ValueError):
+            limit_mb = default_mb
+        if limit_mb <= 0:
+            set_mesh_disk_cache(None)
+            return
+        set_mesh_disk_cache(
+            MeshDiskCache(
+                get_app_temp_dir("VoxelTool") / "mesh_cache", max_bytes=limit_mb * 1024 * 1024
+            )
+        )
+
     def _apply_default_layout(self) -> None:
         self.tools_dock.show()
         self.inspector_dock.show()
@@ -1595,8 +1982,11 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.BottomDockWidgetArea, self.stats_dock)
 
     def closeEvent(self, event: QCloseEvent) -> None:
+        self._job_scheduler.cancel_all()
+        self._job_scheduler.wait_for_done(5000)
         self._autosave_timer.stop()
         self._autosave_debounce_timer.stop()
+        self._memory_timer.stop()
         clear_recovery_snapshot()
         settings = get_settings()
         settings.setValue("main_window/geometry", self.saveGeometry())
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt, Signal
+from typing import Iterable
+
+from PySide6.QtCore import QItemSelectionModel, QModelIndex, Qt, Signal
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QCheckBox,
@@ -10,8 +12,7 @@ from PySide6.QtWidgets import (
     QInputDialog,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMessageBox,
     QPushButton,
     QVBoxLayout,
@@ -19,6 +20,13 @@ from PySide6.QtWidgets import (
 )
 
 from app.app_context import AppContext
+from core.commands.demo_commands import RenamePartCommand
+from app.ui.panels.outliner_model import (
+    GroupListModel,
+    OutlinerFilterModel,
+    PartListModel,
+    matches_filter_text,
+)
 
 
 class _DragScrubLabel(QLabel):
@@ -71,12 +79,19 @@ class InspectorPanel(QWidget):
         layout.addWidget(QLabel("Parts"))
         self.part_filter_input = QLineEdit(self)
         self.part_filter_input.setPlaceholderText("Filter parts...")
-        self.part_filter_input.textChanged.connect(lambda _text: self.refresh())
         layout.addWidget(self.part_filter_input)
 
-        self.part_list = QListWidget(self)
+        self.part_model = PartListModel(self)
+        self.part_model.rename_part = self._rename_part
+        self.part_filter_model = OutlinerFilterModel(self)
+        self.part_filter_model.setSourceModel(self.part_model)
+        self.part_filter_input.textChanged.connect(self.part_filter_model.set_text_filter)
+        self.part_list = QListView(self)
+        self.part_list.setUniformItemSizes(True)
+        self.part_list.setModel(self.part_filter_model)
         self.part_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.part_list.currentItemChanged.connect(self._on_current_part_changed)
+        self.part_list.setEditTriggers(QAbstractItemView.EditKeyPressed)
+        self.part_list.selectionModel().currentChanged.connect(self._on_current_part_changed)
         layout.addWidget(self.part_list)
 
         buttons_layout = QHBoxLayout()
@@ -89,9 +104,18 @@ class InspectorPanel(QWidget):
         buttons_layout.addWidget(self.rename_part_button)
 
         self.duplicate_part_button = QPushButton("Duplicate Part", self)
-        self.duplicate_part_button.clicked.connect(self._on_duplicate_part)
+        self.duplicate_part_button.clicked.connect(lambda: self._on_duplicate_part(linked=False))
         buttons_layout.addWidget(self.duplicate_part_button)
 
+        self.duplicate_linked_button = QPushButton("Duplicate Linked", self)
+        self.duplicate_linked_button.setToolTip("Duplicate as an instance sharing voxels and mesh")
+        self.duplicate_linked_button.clicked.connect(lambda: self._on_duplicate_part(linked=True))
+        buttons_layout.addWidget(self.duplicate_linked_button)
+
+        self.make_unique_button = QPushButton("Make Unique", self)
+        self.make_unique_button.clicked.connect(self._on_make_part_unique)
+        buttons_layout.addWidget(self.make_unique_button)
+
         self.delete_part_button = QPushButton("Delete Part", self)
         self.delete_part_button.clicked.connect(self._on_delete_part)
         buttons_layout.addWidget(self.delete_part_button)
@@ -135,10 +159,16 @@ class InspectorPanel(QWidget):
         layout.addWidget(QLabel("Groups"))
         self.group_filter_input = QLineEdit(self)
         self.group_filter_input.setPlaceholderText("Filter groups...")
-        self.group_filter_input.textChanged.connect(lambda _text: self.refresh())
         layout.addWidget(self.group_filter_input)
-        self.group_list = QListWidget(self)
-        self.group_list.currentItemChanged.connect(self._on_current_group_changed)
+        self.group_model = GroupListModel(self)
+        self.group_filter_model = OutlinerFilterModel(self)
+        self.group_filter_model.setSourceModel(self.group_model)
+        self.group_filter_input.textChanged.connect(self.group_filter_model.set_text_filter)
+        self.group_list = QListView(self)
+        self.group_list.setUniformItemSizes(True)
+        self.group_list.setModel(self.group_filter_model)
+        self.group_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.group_list.selectionModel().currentChanged.connect(self._on_current_group_changed)
         layout.addWidget(self.group_list)
 
         group_buttons_layout = QHBoxLayout()
@@ -148,8 +178,8 @@ class InspectorPanel(QWidget):
         self.delete_group_button = QPushButton("Delete Group", self)
         self.delete_group_button.clicked.connect(self._on_delete_group)
         group_buttons_layout.addWidget(self.delete_group_button)
-        self.assign_group_button = QPushButton("Assign Active Part", self)
-        self.assign_group_button.clicked.connect(self._on_assign_active_part_to_group)
+        self.assign_group_button = QPushButton("Assign Selected Parts", self)
+        self.assign_group_button.clicked.connect(self._on_assign_selected_parts_to_group)
         group_buttons_layout.addWidget(self.assign_group_button)
         self.unassign_group_button = QPushButton("Unassign Active Part", self)
         self.unassign_group_button.clicked.connect(self._on_unassign_active_part_from_group)
@@ -203,34 +233,19 @@ class InspectorPanel(QWidget):
         self._context = context
         self.refresh()
 
-    def refresh(self) -> None:
+    def refresh(self, changed_part_ids: Iterable[str] | None = None) -> None:
+        # changed_part_ids narrows which outliner labels are re-read; None re-reads them all.
         if self._context is None:
             return
 
         active_part_id = self._context.active_part_id
         active_part = self._context.active_part
-        self.part_list.blockSignals(True)
-        self.part_list.clear()
-        part_filter = self.part_filter_input.text()
-        for part_id, part in self._context.current_project.scene.iter_parts_ordered():
-            if not self._matches_filter_text(part.name, part_filter):
-                continue
-            item = QListWidgetItem(part.name)
-            item.setData(Qt.UserRole, part_id)
-            self.part_list.addItem(item)
-            if part_id == active_part_id:
-                self.part_list.setCurrentItem(item)
-        self.part_list.blockSignals(False)
-        self.group_list.blockSignals(True)
-        self.group_list.clear()
-        group_filter = self.group_filter_input.text()
-        for group_id, group in self._context.current_project.scene.iter_groups_ordered():
-            if not self._matches_filter_text(group.name, group_filter):
-                continue
-            item = QListWidgetItem(group.name)
-            item.setData(Qt.UserRole, group_id)
-            self.group_list.addItem(item)
-        self.group_list.blockSignals(False)
+        scene = self._context.current_project.scene
+        self.part_model.set_scene(scene, changed_part_ids)
+        self.group_model.set_scene(scene)
+        if self._current_part_id() != active_part_id:
+            self._set_current_row(self.part_list, self.part_model, active_part_id)
+        self.make_unique_button.setEnabled(scene.is_part_linked(active_part_id))
 
         self.visible_checkbox.blockSignals(True)
         self.locked_checkbox.blockSignals(True)
@@ -278,69 +293,80 @@ class InspectorPanel(QWidget):
     def _on_rename_part(self) -> None:
         if self._context is None:
             return
-        current_item = self.part_list.currentItem()
-        if current_item is None:
-            return
-        part_id = current_item.data(Qt.UserRole)
-        if not isinstance(part_id, str):
+        part_id = self._current_part_id()
+        if part_id is None:
             return
 
-        current_name = current_item.text()
+        current_name = self._context.current_project.scene.parts[part_id].name
         name, accepted = QInputDialog.getText(self, "Rename Part", "Part name:", text=current_name)
         if not accepted:
             return
         stripped = name.strip()
         if not stripped:
             return
-        self._context.current_project.scene.rename_part(part_id, stripped)
+        self._rename_part(part_id, stripped)
         self.refresh()
 
-    def _on_current_part_changed(self, current: QListWidgetItem | None, previous: QListWidgetItem | None) -> None:
+    def _rename_part(self, part_id: str, name: str) -> None:
+        if self._context is None:
+            return
+        self._context.command_stack.do(RenamePartCommand(part_id, name), self._context)
+
+    def _on_current_part_changed(self, current: QModelIndex, previous: QModelIndex) -> None:
         del previous
-        if self._context is None or current is None:
+        if self._context is None or not current.isValid():
             return
         part_id = current.data(Qt.UserRole)
-        if not isinstance(part_id, str):
+        if not isinstance(part_id, str) or part_id == self._context.active_part_id:
             return
         self._context.set_active_part(part_id)
         self.part_selection_changed.emit(part_id)
 
-    def _on_duplicate_part(self) -> None:
+    def _on_duplicate_part(self, *, linked: bool) -> None:
         if self._context is None:
             return
-        current_item = self.part_list.currentItem()
-        if current_item is None:
-            return
-        source_part_id = current_item.data(Qt.UserRole)
-        if not isinstance(source_part_id, str):
+        source_part_id = self._current_part_id()
+        if source_part_id is None:
             return
 
-        source_name = current_item.text().strip()
+        source_name = self._context.current_project.scene.parts[source_part_id].name.strip()
         default_name = f"{source_name} Copy" if source_name else "Part Copy"
-        name, accepted = QInputDialog.getText(self, "Duplicate Part", "New part name:", text=default_name)
+        title = "Duplicate Linked" if linked else "Duplicate Part"
+        name, accepted = QInputDialog.getText(self, title, "New part name:", text=default_name)
         if not accepted:
             return
         duplicate_name = name.strip()
         if not duplicate_name:
             return
 
-        duplicated = self._context.current_project.scene.duplicate_part(source_part_id, new_name=duplicate_name)
+        duplicated = self._context.current_project.scene.duplicate_part(
+            source_part_id, new_name=duplicate_name, linked=linked
+        )
         self.refresh()
         self.part_selection_changed.emit(duplicated.part_id)
-        self.part_status_message.emit(f"Duplicated part: {duplicate_name}")
+        prefix = "Duplicated linked part" if linked else "Duplicated part"
+        self.part_status_message.emit(f"{prefix}: {duplicate_name}")
 
-    def _on_delete_part(self) -> None:
+    def _on_make_part_unique(self) -> None:
         if self._context is None:
             return
-        current_item = self.part_list.currentItem()
-        if current_item is None:
-            return
-        part_id = current_item.data(Qt.UserRole)
-        if not isinstance(part_id, str):
+        part_id = self._context.active_part_id
+        if not self._context.current_project.scene.make_part_unique(part_id):
+            self.part_status_message.emit("Part is not linked")
             return
-        part_name = current_item.text().strip() or part_id
+        self.refresh()
+        self.part_selection_changed.emit(part_id)
+        self.part_status_message.emit(f"Made part unique: {self._context.active_part.name}")
 
+    def _on_delete_part(self) -> None:
+        if self._context is None:
+            return
+        part_id = self._current_part_id()
+        if part_id is None:
+            return
         scene = self._context.current_project.scene
+        part_name = scene.parts[part_id].name.strip() or part_id
+
         if len(scene.parts) <= 1:
             QMessageBox.information(self, "Delete Part", "At least one part must remain in the scene.")
             return
@@ -379,19 +405,35 @@ class InspectorPanel(QWidget):
 
     def _selected_part_ids(self) -> list[str]:
         selected: list[str] = []
-        for item in self.part_list.selectedItems():
-            part_id = item.data(Qt.UserRole)
+        for index in sorted(self.part_list.selectionModel().selectedRows(), key=QModelIndex.row):
+            part_id = index.data(Qt.UserRole)
             if isinstance(part_id, str):
                 selected.append(part_id)
         if selected:
             return selected
-        current_item = self.part_list.currentItem()
-        if current_item is None:
-            return []
-        part_id = current_item.data(Qt.UserRole)
-        if isinstance(part_id, str):
-            return [part_id]
-        return []
+        part_id = self._current_part_id()
+        return [] if part_id is None else [part_id]
+
+    def _current_part_id(self) -> str | None:
+        part_id = self.part_list.currentIndex().data(Qt.UserRole)
+        return part_id if isinstance(part_id, str) else None
+
+    def _current_group_id(self) -> str | None:
+        group_id = self.group_list.currentIndex().data(Qt.UserRole)
+        return group_id if isinstance(group_id, str) else None
+
+    @staticmethod
+    def _set_current_row(view: QListView, model, item_id: str) -> None:
+        # Moves the current row without re-announcing it; the caller already knows the id.
+        row = model.row_for_id(item_id)
+        index = QModelIndex() if row < 0 else view.model().mapFromSource(model.index(row))
+        selection = view.selectionModel()
+        selection.blockSignals(True)
+        selection.setCurrentIndex(index, QItemSelectionModel.ClearAndSelect)
+        selection.blockSignals(False)
+        view.viewport().update()
+        if index.isValid():
+            view.scrollTo(index)
 
     def _on_set_selected_parts_visible(self, visible: bool) -> None:
         if self._context is None:
@@ -458,17 +500,14 @@ class InspectorPanel(QWidget):
     def _selected_group(self):
         if self._context is None:
             return None
-        current_item = self.group_list.currentItem()
-        if current_item is None:
-            return None
-        group_id = current_item.data(Qt.UserRole)
-        if not isinstance(group_id, str):
+        group_id = self._current_group_id()
+        if group_id is None:
             return None
         return self._context.current_project.scene.groups.get(group_id)
 
-    def _on_current_group_changed(self, current: QListWidgetItem | None, previous: QListWidgetItem | None) -> None:
+    def _on_current_group_changed(self, current: QModelIndex, previous: QModelIndex) -> None:
         del previous
-        if self._context is None or current is None:
+        if self._context is None or not current.isValid():
             return
         group = self._selected_group()
         self.group_visible_checkbox.blockSignals(True)
@@ -493,36 +532,38 @@ class InspectorPanel(QWidget):
             return
         group = self._context.current_project.scene.create_group(group_name)
         self.refresh()
-        for row in range(self.group_list.count()):
-            item = self.group_list.item(row)
-            if item.data(Qt.UserRole) == group.group_id:
-                self.group_list.setCurrentRow(row)
-                break
+        row = self.group_model.row_for_id(group.group_id)
+        index = self.group_filter_model.mapFromSource(self.group_model.index(row))
+        if index.isValid():
+            self.group_list.setCurrentIndex(index)
         self.part_status_message.emit(f"Created group: {group.name}")
 
     def _on_delete_group(self) -> None:
         if self._context is None:
             return
-        current_item = self.group_list.currentItem()
-        if current_item is None:
-            return
-        group_id = current_item.data(Qt.UserRole)
-        if not isinstance(group_id, str):
+        group = self._selected_group()
+        if group is None:
             return
-        group_name = current_item.text().strip() or group_id
+        group_id = group.group_id
+        group_name = group.name.strip() or group_id
         self._context.current_project.scene.delete_group(group_id)
         self.refresh()
         self.part_status_message.emit(f"Deleted group: {group_name}")
 
-    def _on_assign_active_part_to_group(self) -> None:
+    def _on_assign_selected_parts_to_group(self) -> None:
         if self._context is None:
             return
         group = self._selected_group()
         if group is None:
             return
-        part = self._context.active_part
-        self._context.current_project.scene.assign_part_to_group(part.part_id, group.group_id)
-        self.part_status_message.emit(f"Assigned {part.name} -> {group.name}")
+        selected_ids = self._selected_part_ids() or [self._context.active_part_id]
+        scene = self._context.current_project.scene
+        assigned = scene.assign_parts_to_group(selected_ids, group.group_id)
+        if len(selected_ids) == 1:
+            part_name = scene.parts[selected_ids[0]].name
+            self.part_status_message.emit(f"Assigned {part_name} -> {group.name}")
+        else:
+            self.part_status_message.emit(f"Assigned {len(assigned)} part(s) -> {group.name}")
         self.refresh()
 
     def _on_unassign_active_part_from_group(self) -> None:
@@ -561,31 +602,19 @@ class InspectorPanel(QWidget):
     def _on_move_part(self, direction: int) -> None:
         if self._context is None:
             return
-        current_item = self.part_list.currentItem()
-        if current_item is None:
-            return
-        part_id = current_item.data(Qt.UserRole)
-        if not isinstance(part_id, str):
+        part_id = self._current_part_id()
+        if part_id is None:
             return
         moved = self._context.current_project.scene.move_part(part_id, direction)
         if not moved:
             return
+        # The model moves the row and the view keeps it current.
         self.refresh()
-        self.part_list.setCurrentRow(
-            next(
-                i
-                for i in range(self.part_list.count())
-                if self.part_list.item(i).data(Qt.UserRole) == part_id
-            )
-        )
         self.part_status_message.emit(f"Part order updated: {self._context.active_part.name}")
 
     @staticmethod
     def _matches_filter_text(label: str, text_filter: str) -> bool:
-        needle = str(text_filter).strip().lower()
-        if not needle:
-            return True
-        return needle in str(label).strip().lower()
+        return matches_filter_text(label, text_filter)
 
     @staticmethod
     def _create_transform_spin(
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt
+
+from core.scene import Scene
+
+
+# A sync that inserts or removes more rows than this, and more than a quarter of the rows before
+# and after it combined, resets the model instead of notifying row runs.
+_RESET_MIN_ROWS = 256
+
+
+def matches_filter_text(label: str, text_filter: str) -> bool:
+    needle = str(text_filter).strip().lower()
+    if not needle:
+        return True
+    return needle in str(label).strip().lower()
+
+
+class _SceneRows(ABC):
+    # What a list model shows for one kind of scene item. Kept apart from the model because
+    # Qt's metaclass neither mixes with ABCMeta nor enforces abstract methods.
+    @abstractmethod
+    def ids(self, scene: Scene) -> list[str]:
+        pass
+
+    @abstractmethod
+    def label(self, scene: Scene, item_id: str) -> str:
+        pass
+
+    def tooltip(self, scene: Scene, item_id: str) -> str | None:
+        del scene, item_id
+        return None
+
+
+class _PartRows(_SceneRows):
+    def ids(self, scene: Scene) -> list[str]:
+        return [part_id for part_id, _ in scene.iter_parts_ordered()]
+
+    def label(self, scene: Scene, item_id: str) -> str:
+        return scene.parts[item_id].name
+
+    def tooltip(self, scene: Scene, item_id: str) -> str | None:
+        # Resolved on hover only; counting instances scans the scene.
+        linked_count = len(scene.linked_parts(item_id))
+        if linked_count > 1:
+            return f"Linked instance ({linked_count} parts share these voxels)"
+        return None
+
+
+class _GroupRows(_SceneRows):
+    def ids(self, scene: Scene) -> list[str]:
+        return [group_id for group_id, _ in scene.iter_groups_ordered()]
+
+    def label(self, scene: Scene, item_id: str) -> str:
+        return scene.groups[item_id].name
+
+
+class _SceneListModel(QAbstractListModel):
+    # Flat outliner rows backed directly by a Scene. sync() reconciles the rows with the scene
+    # through row insert/remove/move notifications, so views keep their state and only repaint
+    # what moved or changed.
+    def __init__(self, rows: _SceneRows, parent=None) -> None:
+        super().__init__(parent)
+        self._source = rows
+        self._scene: Scene | None = None
+        self._ids: list[str] = []
+        # id -> row, shifted alongside every insert, remove and move of _ids.
+        self._rows: dict[str, int] = {}
+        self._labels: dict[str, str] = {}
+
+    def set_scene(self, scene: Scene | None, changed: Iterable[str] | None = None) -> None:
+        if scene is self._scene:
+            self.sync(changed)
+            return
+        self.beginResetModel()
+        self._scene = scene
+        self._ids = [] if scene is None else self._source.ids(scene)
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._labels = {item_id: self._source.label(scene, item_id) for item_id in self._ids}
+        self.endResetModel()
+
+    def sync(self, changed: Iterable[str] | None = None) -> None:
+        # Labels are re-read only for the ids in `changed` (and new rows); None re-reads all.
+        if self._scene is None:
+            return
+        target = self._source.ids(self._scene)
+        if target != self._ids:
+            self._reconcile(target)
+        ids = self._ids if changed is None else [i for i in changed if i in self._rows]
+        for item_id in ids:
+            label = self._source.label(self._scene, item_id)
+            if self._labels.get(item_id) != label:
+                self._labels[item_id] = label
+                index = self.index(self._rows[item_id])
+                self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+
+    def row_for_id(self, item_id: str) -> int:
+        return self._rows.get(item_id, -1)
+
+    def id_at(self, row: int) -> str | None:
+        if 0 <= row < len(self._ids):
+            return self._ids[row]
+        return None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        item_id = self.id_at(index.row()) if index.isValid() else None
+        if item_id is None:
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._labels.get(item_id, "")
+        if role == Qt.UserRole:
+            return item_id
+        if role == Qt.ToolTipRole:
+            return self._source.tooltip(self._scene, item_id)
+        return None
+
+    def _reconcile(self, target: list[str]) -> None:
+        # Rows before the first difference are left alone. Removed and inserted rows go out as
+        # one notification per contiguous run, and the id -> row index is rebuilt once per
+        # phase from the first changed row, so bulk edits stay linear in the row count. When
+        # most rows come or go at once, a reset is cheaper for views than thousands of runs.
+        start = 0
+        limit = min(len(target), len(self._ids))
+        while start < limit and target[start] == self._ids[start]:
+            start += 1
+        target_set = set(target[start:])
+        removed = [row for row in range(start, len(self._ids)) if self._ids[row] not in target_set]
+        added_count = len(target) - (len(self._ids) - len(removed))
+        changed = len(removed) + added_count
+        if changed > _RESET_MIN_ROWS and changed * 4 > len(self._ids) + len(target):
+            self._reset_rows(target)
+            return
+        for first, last in reversed(_runs(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for item_id in self._ids[first : last + 1]:
+                del self._rows[item_id]
+                self._labels.pop(item_id, None)
+            del self._ids[first : last + 1]
+            self.endRemoveRows()
+        if removed:
+            self._index_rows(removed[0])
+
+        # Rows still present are put in target order first; each move only shifts the rows
+        # it passes over.
+        kept = [item_id for item_id in target[start:] if item_id in self._rows]
+        for row, item_id in enumerate(kept, start):
+            source = self._rows[item_id]
+            if source != row:
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                self._ids.insert(row, self._ids.pop(source))
+                self._shift_rows(row + 1, source + 1, 1)
+                self._rows[item_id] = row
+                self.endMoveRows()
+
+        added = [row for row in range(start, len(target)) if target[row] not in self._rows]
+        for first, last in _runs(added):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._ids[first:first] = target[first : last + 1]
+            for item_id in target[first : last + 1]:
+                self._labels[item_id] = self._source.label(self._scene, item_id)
+            self.endInsertRows()
+        if added:
+            self._index_rows(added[0])
+
+    def _reset_rows(self, target: list[str]) -> None:
+        self.beginResetModel()
+        self._ids = list(target)
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._labels = {item_id: self._source.label(self._scene, item_id) for item_id in self._ids}
+        self.endResetModel()
+
+    def _index_rows(self, first: int) -> None:
+        rows = self._rows
+        for row in range(first, len(self._ids)):
+            rows[self._ids[row]] = row
+
+    def _shift_rows(self, first: int, stop: int, offset: int) -> None:
+        rows = self._rows
+        for item_id in self._ids[first:stop]:
+            rows[item_id] += offset
+
+
+def _runs(rows: list[int]) -> list[tuple[int, int]]:
+    # Ascending rows -> (first, last) of each contiguous run.
+    runs: list[tuple[int, int]] = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+class PartListModel(_SceneListModel):
+    def __init__(self, parent=None) -> None:
+        super().__init__(_PartRows(), parent)
+        # Called with (part_id, name) for in-place edits; the owner renames through its
+        # command stack so the edit can be undone and is published like any other.
+        self.rename_part: Callable[[str, str], None] | None = None
+
+    def flags(self, index: QModelIndex):  # type: ignore[override]
+        flags = super().flags(index)
+        if index.isValid() and self.rename_part is not None:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(  # type: ignore[override]
+        self, index: QModelIndex, value, role: int = Qt.EditRole
+    ) -> bool:
+        part_id = self.id_at(index.row()) if index.isValid() else None
+        if role != Qt.EditRole or part_id is None or self.rename_part is None:
+            return False
+        name = str(value).strip()
+        if not name:
+            return False
+        self.rename_part(part_id, name)
+        self.sync([part_id])
+        return True
+
+
+class GroupListModel(_SceneListModel):
+    def __init__(self, parent=None) -> None:
+        super().__init__(_GroupRows(), parent)
+
+
+class OutlinerFilterModel(QSortFilterProxyModel):
+    # Filters the outliner rows without rebuilding them; the source's insert/remove/move
+    # notifications only refilter the affected rows.
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._text_filter = ""
+
+    def set_text_filter(self, text_filter: str) -> None:
+        if text_filter == self._text_filter:
+            return
+        if hasattr(self, "beginFilterChange"):
+            # Qt 6.9+ replacement for the deprecated invalidateFilter().
+            self.beginFilterChange()
+            self._text_filter = text_filter
+            self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+            return
+        self._text_filter = text_filter
+        self.invalidateFilter()
+
+    def filterAcceptsRow(  # type: ignore[override]
+        self, source_row: int, source_parent: QModelIndex
+    ) -> bool:
+        if not self._text_filter.strip():
+            return True
+        source = self.sourceModel()
+        label = source.data(source.index(source_row, 0, source_parent), Qt.DisplayRole)
+        return matches_filter_text(label, self._text_filter)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import QLabel, QPushButton, QVBoxLayout, QWidget
 
+from core.analysis.memory import MemoryReport
 from core.analysis.stats import SceneStats
+from core.commands.metrics import HISTOGRAM_BOUNDS_MS, CommandSummary
+
+_SPARK_BLOCKS = " ▁▂▃▄▅▆▇█"
 
 
 def format_runtime_stats_label(
@@ -33,7 +38,63 @@ def format_memory_label(memory_bytes: int) -> str:
     return f"{value:.2f} {units[unit_index]}"
 
 
+def format_memory_report(report: MemoryReport) -> str:
+    # Largest subsystem first: that is the one that runs out of memory first.
+    total = report.total_bytes
+    entries = [
+        f"{name} {format_memory_label(size)} ({size * 100.0 / total:.0f}%)"
+        if total
+        else f"{name} {format_memory_label(size)}"
+        for name, size in report.ranked()
+    ]
+    return "Memory: " + " | ".join([*entries, f"total {format_memory_label(total)}"])
+
+
+def format_allocation_report(report: MemoryReport) -> str:
+    if report.traced_current_bytes is None:
+        return ""
+    lines = [
+        f"Traced allocations: current {format_memory_label(report.traced_current_bytes)} | "
+        f"peak {format_memory_label(report.traced_peak_bytes or 0)}"
+    ]
+    for site in report.top_allocations:
+        lines.append(
+            f"  {site.location}: {format_memory_label(site.size_bytes)} in {site.count} blocks"
+        )
+    return "\n".join(lines)
+
+
+def format_histogram(counts: list[int]) -> str:
+    # One block per bucket, scaled to the fullest bucket; empty buckets stay blank.
+    peak = max(counts, default=0)
+    if peak <= 0:
+        return " " * len(counts)
+    top = len(_SPARK_BLOCKS) - 1
+    return "".join(
+        _SPARK_BLOCKS[max(1, round(count * top / peak))] if count else " " for count in counts
+    )
+
+
+def format_command_summaries(summaries: list[CommandSummary], *, limit: int = 8) -> str:
+    if not summaries:
+        return "Commands: -"
+    bounds = f"{HISTOGRAM_BOUNDS_MS[0]:g}..{HISTOGRAM_BOUNDS_MS[-1]:g}+ ms"
+    lines = [f"Commands (by total time, histogram {bounds}):"]
+    for summary in summaries[: max(0, int(limit))]:
+        undo = format_memory_label(int(summary.mean_undo_bytes))
+        lines.append(
+            f"  {summary.command} [{summary.phase}] x{summary.count}: "
+            f"total {summary.total_ms:.1f} ms | p50 {summary.p50_ms:.2f} | "
+            f"p95 {summary.p95_ms:.2f} | max {summary.max_ms:.2f} | "
+            f"cells {summary.mean_cells:.0f} | undo {undo} "
+            f"|{format_histogram(summary.histogram)}|"
+        )
+    return "\n".join(lines)
+
+
 class StatsPanel(QWidget):
+    allocation_tracking_toggled = Signal(bool)
+
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         layout = QVBoxLayout(self)
@@ -46,7 +107,21 @@ class StatsPanel(QWidget):
         layout.addWidget(self.scene_label)
         layout.addWidget(self.object_label)
         layout.addWidget(self.voxel_count_label)
+        self.memory_label = QLabel("Memory: -")
+        self.memory_label.setWordWrap(True)
+        self.allocation_button = QPushButton("Track Allocations")
+        self.allocation_button.setCheckable(True)
+        self.allocation_button.setToolTip(
+            "Trace Python allocations with tracemalloc and list the largest allocation sites."
+        )
+        self.allocation_button.toggled.connect(self.allocation_tracking_toggled)
+        self.allocation_label = QLabel("")
+        self.command_label = QLabel("Commands: -")
         layout.addWidget(self.runtime_label)
+        layout.addWidget(self.memory_label)
+        layout.addWidget(self.allocation_button)
+        layout.addWidget(self.allocation_label)
+        layout.addWidget(self.command_label)
         layout.addStretch(1)
 
     def set_scene_stats(self, scene_stats: SceneStats, active_part_id: str, active_voxel_count: int) -> None:
@@ -94,3 +169,10 @@ class StatsPanel(QWidget):
                 active_part_voxels=active_part_voxels,
             )
         )
+
+    def set_memory_report(self, report: MemoryReport) -> None:
+        self.memory_label.setText(format_memory_report(report))
+        self.allocation_label.setText(format_allocation_report(report))
+
+    def set_command_summaries(self, summaries: list[CommandSummary]) -> None:
+        self.command_label.setText(format_command_summaries(summaries))
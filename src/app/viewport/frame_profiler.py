@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from util.trace import span
+
+# Stages are timed inclusively; "signature" runs inside "render_data".
+FRAME_STAGES = ("cull", "signature", "render_data", "mesh_build", "upload", "draw")
+_STAGE_LABELS = {
+    "cull": "cull",
+    "signature": "signature",
+    "render_data": "render data",
+    "mesh_build": "mesh build",
+    "upload": "upload",
+    "draw": "draw",
+}
+DEFAULT_FRAME_WINDOW = 120
+
+
+@dataclass(slots=True)
+class FrameSample:
+    total_ms: float = 0.0
+    stage_ms: dict[str, float] = field(default_factory=dict)
+    upload_bytes: int = 0
+    draw_calls: int = 0
+
+
+class FrameProfiler:
+    # Rolling per-stage frame timings for the viewport HUD. Stages also open trace spans, so a
+    # recorded trace and the HUD always agree on stage boundaries.
+    def __init__(self, window: int = DEFAULT_FRAME_WINDOW) -> None:
+        if window < 1:
+            raise ValueError(f"Unsupported frame window: {window}")
+        self.window = window
+        self._frames: deque[FrameSample] = deque(maxlen=window)
+        self._cache_lookups: dict[str, deque[bool]] = {}
+        self._current: FrameSample | None = None
+        self._frame_start = 0.0
+
+    def begin_frame(self) -> None:
+        self._current = FrameSample()
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self) -> FrameSample | None:
+        sample = self._current
+        if sample is None:
+            return None
+        sample.total_ms = (time.perf_counter() - self._frame_start) * 1000.0
+        self._frames.append(sample)
+        self._current = None
+        return sample
+
+    @contextmanager
+    def stage(self, name: str, **args: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with span(f"viewport.{name}", category="render", **args):
+                yield
+        finally:
+            if self._current is not None:
+                elapsed = (time.perf_counter() - start) * 1000.0
+                stage_ms = self._current.stage_ms
+                stage_ms[name] = stage_ms.get(name, 0.0) + elapsed
+
+    def add_upload(self, byte_count: int) -> None:
+        if self._current is not None:
+            self._current.upload_bytes += int(byte_count)
+
+    def add_draw_calls(self, count: int) -> None:
+        if self._current is not None:
+            self._current.draw_calls += int(count)
+
+    def record_cache(self, name: str, hit: bool) -> None:
+        lookups = self._cache_lookups.get(name)
+        if lookups is None:
+            # Per-cache lookups over roughly the same span of frames as the timings.
+            lookups = deque(maxlen=self.window * 16)
+            self._cache_lookups[name] = lookups
+        lookups.append(bool(hit))
+
+    def frames(self) -> list[FrameSample]:
+        return list(self._frames)
+
+    def percentiles(self, *quantiles: float) -> tuple[float, ...]:
+        totals = sorted(sample.total_ms for sample in self._frames)
+        if not totals:
+            return tuple(0.0 for _ in quantiles)
+        # Nearest-rank percentiles: each result is a frame time that actually happened.
+        return tuple(
+            totals[min(len(totals) - 1, max(0, math.ceil(quantile * len(totals)) - 1))]
+            for quantile in quantiles
+        )
+
+    def stage_means(self) -> dict[str, float]:
+        if not self._frames:
+            return {}
+        count = len(self._frames)
+        return {
+            stage: sum(sample.stage_ms.get(stage, 0.0) for sample in self._frames) / count
+            for stage in FRAME_STAGES
+        }
+
+    def cache_hit_rates(self) -> dict[str, float]:
+        return {
+            name: sum(lookups) / len(lookups)
+            for name, lookups in sorted(self._cache_lookups.items())
+            if lookups
+        }
+
+    def hud_lines(self) -> list[str]:
+        if not self._frames:
+            return []
+        count = len(self._frames)
+        p50, p95, p99 = self.percentiles(0.50, 0.95, 0.99)
+        means = self.stage_means()
+        upload_bytes = sum(sample.upload_bytes for sample in self._frames) / count
+        draw_calls = sum(sample.draw_calls for sample in self._frames) / count
+        lines = [
+            f"Frame {self._frames[-1].total_ms:.2f} ms | p50 {p50:.2f}  p95 {p95:.2f}  "
+            f"p99 {p99:.2f} ({count} frames)",
+            "  ".join(
+                f"{_STAGE_LABELS[stage]} {means[stage]:.2f}"
+                for stage in ("cull", "signature", "render_data", "mesh_build")
+            )
+            + " ms",
+            f"upload {means['upload']:.2f} ms ({_format_bytes(upload_bytes)})  "
+            f"draw {means['draw']:.2f} ms ({draw_calls:.0f} calls)  "
+            f"GL submit {means['upload'] + means['draw']:.2f} ms",
+        ]
+        rates = self.cache_hit_rates()
+        if rates:
+            lines.append(
+                "Cache hits: "
+                + "  ".join(
+                    f"{name.replace('_', ' ')} {rate * 100.0:.0f}%" for name, rate in rates.items()
+                )
+            )
+        return lines
+
+
+def _format_bytes(byte_count: float) -> str:
+    if byte_count >= 1024 * 1024:
+        return f"{byte_count / (1024 * 1024):.1f} MB"
+    if byte_count >= 1024:
+        return f"{byte_count / 1024:.1f} KB"
+    return f"{byte_count:.0f} B"
@@ -3,25 +3,39 @@ from __future__ import annotations
 import logging
 import time
 from array import array
-from ctypes import c_void_p
+from ctypes import addressof, c_ubyte, c_void_p
 from math import cos, radians, sin
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import QPointF, Qt, Signal
-from PySide6.QtGui import QColor, QMatrix4x4, QPainter, QVector3D
+from PySide6.QtGui import QColor, QMatrix4x4, QPainter, QVector3D, QVector4D
 from PySide6.QtOpenGL import (
     QOpenGLBuffer,
+    QOpenGLFramebufferObject,
     QOpenGLShader,
     QOpenGLShaderProgram,
     QOpenGLVertexArrayObject,
 )
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
+from app.viewport.frame_profiler import FrameProfiler
+from app.viewport.picking import (
+    PickHit,
+    PickTable,
+    build_pick_faces,
+    decode_pick_pixel,
+    pick_vertices,
+)
+from core.analysis.memory import object_bytes
 from core.commands.demo_commands import build_brush_cells, build_shape_plane_cells, compute_fill_preview_cells
+from core.scene import group_parts_by_asset
+from core.spatial import SceneBoundsIndex, frustum_planes, raycast_scene
+from core.voxels.lod import VoxelLodPyramid, select_lod_factor
 from core.voxels.raycast import (
     intersect_axis_plane,
-    resolve_brush_target_cell,
-    resolve_shape_target_cell,
+    resolve_brush_target_from_hit,
+    resolve_shape_target_from_hit,
 )
+from util.trace import span
 
 if TYPE_CHECKING:
     from app.app_context import AppContext
@@ -46,6 +60,9 @@ class GLViewportWidget(QOpenGLWidget):
     _GL_RENDERER = 0x1F01
     _GL_VERSION = 0x1F02
     _GL_NO_ERROR = 0
+    _GL_RGBA = 0x1908
+    _GL_UNSIGNED_BYTE = 0x1401
+    _CLEAR_COLOR = (0.18, 0.22, 0.27, 1.0)
     _DEFAULT_YAW_DEG = 45.0
     _DEFAULT_PITCH_DEG = -30.0
     _DEFAULT_DISTANCE = 25.0
@@ -78,6 +95,8 @@ class GLViewportWidget(QOpenGLWidget):
         self._init_error_text: str | None = None
         self._logged_pipeline_missing = False
         self.debug_overlay_enabled = True
+        self.frame_profiler = FrameProfiler()
+        self.lod_enabled = True
         self.yaw_deg = self._DEFAULT_YAW_DEG
         self.pitch_deg = self._DEFAULT_PITCH_DEG
         self.distance = self._DEFAULT_DISTANCE
@@ -97,6 +116,36 @@ class GLViewportWidget(QOpenGLWidget):
         self._cached_point_vertices: array | None = None
         self._cached_line_vertices: array | None = None
         self._cached_voxel_count: int = 0
+        self._mesh_vertex_cache: dict[
+            tuple[str, int], tuple[object, tuple[object, ...], array]
+        ] = {}
+        self._lod_pyramids: dict[str, VoxelLodPyramid] = {}
+        self._pick_fbo: QOpenGLFramebufferObject | None = None
+        self._pick_table: PickTable | None = None
+        self._pick_signature: tuple[object, ...] | None = None
+        self._pick_vertex_cache: dict[str, tuple[object, int, object, int | None, array]] = {}
+        self._scene_bounds = SceneBoundsIndex()
+        self._gpu_buffer_bytes = 0
+
+    def memory_usage(self, seen: set[int] | None = None) -> tuple[int, int]:
+        # CPU side: render-data, mesh-vertex, pick and LOD caches plus the bounds index. GPU
+        # side: the shared vertex buffer (reallocated per draw, so it holds the last upload)
+        # and the pick framebuffer's RGBA8 colour and depth-stencil attachments.
+        cpu_bytes = object_bytes(
+            (
+                self._cached_point_vertices,
+                self._cached_line_vertices,
+                self._mesh_vertex_cache,
+                self._pick_vertex_cache,
+                self._lod_pyramids,
+                self._scene_bounds,
+            ),
+            seen,
+        )
+        gpu_bytes = self._gpu_buffer_bytes
+        if self._pick_fbo is not None:
+            gpu_bytes += self._pick_fbo.width() * self._pick_fbo.height() * 8
+        return cpu_bytes, gpu_bytes
 
     def set_context(self, ctx: "AppContext") -> None:
         self._app_context = ctx
@@ -163,7 +212,7 @@ class GLViewportWidget(QOpenGLWidget):
         try:
             self._logger.info("initializeGL called.")
             funcs = self.context().functions()
-            funcs.glClearColor(0.18, 0.22, 0.27, 1.0)
+            funcs.glClearColor(*self._CLEAR_COLOR)
             funcs.glEnable(self._GL_DEPTH_TEST)
 
             vendor = self._gl_string(funcs, self._GL_VENDOR)
@@ -196,12 +245,27 @@ class GLViewportWidget(QOpenGLWidget):
             self._logger.exception("OpenGL initialization failed")
 
     def paintGL(self) -> None:
+        with span("paintGL", category="render"):
+            self.frame_profiler.begin_frame()
+            try:
+                self._paint_frame()
+            finally:
+                self.frame_profiler.end_frame()
+
+    def _paint_frame(self) -> None:
         frame_start = time.perf_counter()
         funcs = self.context().functions()
         funcs.glClear(self._GL_COLOR_BUFFER_BIT | self._GL_DEPTH_BUFFER_BIT)
         if self._app_context is None:
             return
-        point_vertices, line_vertices, voxel_count = self._build_visible_render_data()
+        mvp = self._build_view_projection_matrix()
+        with self.frame_profiler.stage("cull"):
+            visible_parts = self._frustum_visible_parts(mvp)
+            lod_factors = self._part_lod_factors(visible_parts, mvp)
+        with self.frame_profiler.stage("render_data"):
+            point_vertices, line_vertices, voxel_count = self._build_visible_render_data(
+                visible_parts, lod_factors
+            )
         if self._program is None or self._buffer is None or self._vao is None:
             if not self._logged_pipeline_missing:
                 self._logger.error(
@@ -217,12 +281,18 @@ class GLViewportWidget(QOpenGLWidget):
             )
             return
 
-        mvp = self._build_view_projection_matrix()
         self._draw_world_grid(funcs, mvp)
         self._draw_mirror_guides(funcs, mvp)
-        mesh_vertices = self._build_visible_mesh_vertices()
-        if mesh_vertices:
-            self._draw_colored_vertices(funcs, mesh_vertices, self._GL_TRIANGLES, mvp)
+        with self.frame_profiler.stage("mesh_build"):
+            mesh_batches = self._build_visible_mesh_batches(visible_parts, lod_factors)
+        for mesh_vertices, instance_transforms in mesh_batches:
+            self._draw_colored_vertices(
+                funcs,
+                mesh_vertices,
+                self._GL_TRIANGLES,
+                mvp,
+                instance_transforms=instance_transforms,
+            )
         if hasattr(funcs, "glPointSize"):
             funcs.glPointSize(8.0)
         if point_vertices:
@@ -246,7 +316,15 @@ class GLViewportWidget(QOpenGLWidget):
         frame_ms = (time.perf_counter() - frame_start) * 1000.0
         self.runtime_metrics.emit(frame_ms, voxel_count)
 
-    def _draw_colored_vertices(self, funcs, vertex_data: array, mode: int, mvp: QMatrix4x4) -> int:
+    def _draw_colored_vertices(
+        self,
+        funcs,
+        vertex_data: array,
+        mode: int,
+        mvp: QMatrix4x4,
+        *,
+        instance_transforms: list[QMatrix4x4] | None = None,
+    ) -> int:
         if self._program is None or self._buffer is None or len(vertex_data) == 0:
             return 0
 
@@ -254,11 +332,14 @@ class GLViewportWidget(QOpenGLWidget):
             self._vao.bind()
 
         self._buffer.bind()
-        self._buffer.allocate(vertex_data.tobytes(), len(vertex_data) * 4)
+        upload_bytes = len(vertex_data) * 4
+        with self.frame_profiler.stage("upload", bytes=upload_bytes):
+            self._buffer.allocate(vertex_data.tobytes(), upload_bytes)
+        self.frame_profiler.add_upload(upload_bytes)
+        self._gpu_buffer_bytes = upload_bytes
         funcs.glBindBuffer(self._GL_ARRAY_BUFFER, self._buffer.bufferId())
 
         self._program.bind()
-        self._program.setUniformValue("u_mvp", mvp)
 
         stride = 6 * 4
         position_location = self._program.attributeLocation("position")
@@ -280,7 +361,15 @@ class GLViewportWidget(QOpenGLWidget):
         self._program.setAttributeBuffer(position_location, self._GL_FLOAT, 0, 3, stride)
         self._program.setAttributeBuffer(color_location, self._GL_FLOAT, 3 * 4, 3, stride)
         count = len(vertex_data) // 6
-        funcs.glDrawArrays(mode, 0, count)
+        # Instances share the uploaded buffer and differ only in their model matrix.
+        draw_transforms = instance_transforms or (None,)
+        with self.frame_profiler.stage("draw", vertices=count):
+            for transform in draw_transforms:
+                self._program.setUniformValue(
+                    "u_mvp", mvp if transform is None else mvp * transform
+                )
+                funcs.glDrawArrays(mode, 0, count)
+        self.frame_profiler.add_draw_calls(len(draw_transforms))
         self._program.disableAttributeArray(position_location)
         self._program.disableAttributeArray(color_location)
         self._program.release()
@@ -364,6 +453,10 @@ class GLViewportWidget(QOpenGLWidget):
         if error_text:
             painter.setPen(QColor(255, 180, 90))
             painter.drawText(12, 110, error_text)
+        # Rolling stage breakdown of the previous frames; this frame is still being drawn.
+        painter.setPen(QColor(190, 230, 190))
+        for row, line in enumerate(self.frame_profiler.hud_lines()):
+            painter.drawText(12, 128 + row * 18, line)
         painter.end()
 
     def _viewport_status_message(self, readiness: str) -> str:
@@ -1006,15 +1099,11 @@ class GLViewportWidget(QOpenGLWidget):
         allow_plane_fallback = (
             not should_erase and self._app_context.pick_mode == self._app_context.PICK_MODE_PLANE_LOCK
         )
-        ray = self._screen_to_world_ray(pos.x(), pos.y())
-        if ray is None:
+        if self._screen_to_world_ray(pos.x(), pos.y()) is None:
             return None
-        origin, direction = ray
         plane_cell = self._screen_to_plane_cell(pos) if allow_plane_fallback else None
-        target = resolve_brush_target_cell(
-            self._app_context.current_project.voxels,
-            (origin.x(), origin.y(), origin.z()),
-            (direction.x(), direction.y(), direction.z()),
+        target = resolve_brush_target_from_hit(
+            self._active_part_surface_hit(pos),
             erase_mode=should_erase,
             plane_fallback_cell=plane_cell,
         )
@@ -1035,14 +1124,10 @@ class GLViewportWidget(QOpenGLWidget):
         allow_plane_fallback = (
             not should_erase and self._app_context.pick_mode == self._app_context.PICK_MODE_PLANE_LOCK
         )
-        ray = self._screen_to_world_ray(pos.x(), pos.y())
-        if ray is None:
+        if self._screen_to_world_ray(pos.x(), pos.y()) is None:
             return None
-        origin, direction = ray
-        target = resolve_shape_target_cell(
-            self._app_context.current_project.voxels,
-            (origin.x(), origin.y(), origin.z()),
-            (direction.x(), direction.y(), direction.z()),
+        target = resolve_shape_target_from_hit(
+            self._active_part_surface_hit(pos),
             erase_mode=should_erase,
             plane_fallback_cell=self._screen_to_plane_cell(pos) if allow_plane_fallback else None,
         )
@@ -1183,10 +1268,8 @@ class GLViewportWidget(QOpenGLWidget):
             self._shape_preview_cells = set()
             self.update()
 
-        ray = self._screen_to_world_ray(pos.x(), pos.y())
-        if ray is None:
+        if self._screen_to_world_ray(pos.x(), pos.y()) is None:
             return
-        origin, direction = ray
         temporary_erase = bool(modifiers & Qt.ShiftModifier)
         mode = self._app_context.voxel_tool_mode
         should_erase = temporary_erase or mode == self._app_context.TOOL_MODE_ERASE
@@ -1194,10 +1277,8 @@ class GLViewportWidget(QOpenGLWidget):
             not should_erase and self._app_context.pick_mode == self._app_context.PICK_MODE_PLANE_LOCK
         )
         plane_cell = self._screen_to_plane_cell(pos) if allow_plane_fallback else None
-        target = resolve_brush_target_cell(
-            self._app_context.current_project.voxels,
-            (origin.x(), origin.y(), origin.z()),
-            (direction.x(), direction.y(), direction.z()),
+        target = resolve_brush_target_from_hit(
+            self._active_part_surface_hit(pos),
             erase_mode=should_erase,
             plane_fallback_cell=plane_cell,
         )
@@ -1292,7 +1373,12 @@ class GLViewportWidget(QOpenGLWidget):
             return
         sx, sy, sz = start_cell
         ex, ey, _ = end_cell
-        cells = build_shape_plane_cells("box", sx, sy, ex, ey, sz)
+        # Only filled cells can be moved or duplicated, so the box keeps just those.
+        cells = set(
+            self._app_context.current_project.voxels.occupancy().cells_in_box(
+                (min(sx, ex), min(sy, ey), sz), (max(sx, ex), max(sy, ey), sz)
+            )
+        )
         self._app_context.set_selected_voxels(cells)
         self.voxel_edit_applied.emit(f"Selected voxels: {len(cells)}")
         self.update()
@@ -1427,6 +1513,136 @@ class GLViewportWidget(QOpenGLWidget):
         ).normalized()
         return eye, direction
 
+    def pick_at(self, x: float, y: float) -> PickHit | None:
+        # Reads the part, cell and face under the cursor from an offscreen ID buffer that is only
+        # re-rendered when the camera or the visible scene changed. Without a GL pipeline the
+        # visible parts are raycast on the CPU instead.
+        if self._app_context is None:
+            return None
+        if self._program is None or self._buffer is None or not self.isValid():
+            return self._cpu_pick(x, y)
+        self.makeCurrent()
+        try:
+            if not self._render_pick_buffer():
+                return self._cpu_pick(x, y)
+            return self._read_pick_pixel(x, y)
+        finally:
+            self.doneCurrent()
+
+    def _active_part_surface_hit(
+        self, pos: QPointF
+    ) -> tuple[tuple[int, int, int], tuple[int, int, int] | None] | None:
+        hit = self.pick_at(pos.x(), pos.y())
+        if hit is None or self._app_context is None:
+            return None
+        # Edits only land on the active part; another part in front of it hides the surface.
+        if hit.part_id != self._app_context.active_part_id:
+            return None
+        return hit.cell, hit.adjacent_cell
+
+    def _cpu_pick(self, x: float, y: float) -> PickHit | None:
+        ray = self._screen_to_world_ray(x, y)
+        if ray is None or self._app_context is None:
+            return None
+        origin, direction = ray
+        hit = raycast_scene(
+            self._app_context.current_project.scene.iter_visible_parts(),
+            (origin.x(), origin.y(), origin.z()),
+            (direction.x(), direction.y(), direction.z()),
+            bounds_index=self._scene_bounds,
+        )
+        if hit is None:
+            return None
+        return PickHit(hit.part_id, hit.cell, hit.adjacent_cell)
+
+    def _render_pick_buffer(self) -> bool:
+        ratio = self.devicePixelRatioF()
+        width = max(1, int(self.width() * ratio))
+        height = max(1, int(self.height() * ratio))
+        mvp = self._build_view_projection_matrix()
+        parts = self._frustum_visible_parts(mvp)
+        signature = (
+            tuple(mvp.copyDataTo()),
+            width,
+            height,
+            self._compute_visible_render_signature(self._app_context, parts),
+        )
+        pick_hit = self._pick_fbo is not None and self._pick_signature == signature
+        self.frame_profiler.record_cache("pick_buffer", pick_hit)
+        if pick_hit:
+            return True
+
+        if self._pick_fbo is None or (self._pick_fbo.width(), self._pick_fbo.height()) != (
+            width,
+            height,
+        ):
+            self._pick_fbo = QOpenGLFramebufferObject(
+                width, height, QOpenGLFramebufferObject.Attachment.Depth
+            )
+        if not self._pick_fbo.isValid():
+            self._logger.warning("Pick framebuffer unavailable; using CPU raycast picking.")
+            return False
+
+        scene_part_ids = set(self._app_context.current_project.scene.parts)
+        for part_id in set(self._pick_vertex_cache) - scene_part_ids:
+            del self._pick_vertex_cache[part_id]
+        funcs = self.context().functions()
+        table = PickTable()
+        self._pick_fbo.bind()
+        try:
+            funcs.glViewport(0, 0, width, height)
+            funcs.glClearColor(0.0, 0.0, 0.0, 0.0)
+            funcs.glClear(self._GL_COLOR_BUFFER_BIT | self._GL_DEPTH_BUFFER_BIT)
+            funcs.glEnable(self._GL_DEPTH_TEST)
+            for part in parts:
+                vertices = self._part_pick_vertices(part, table)
+                if vertices is None:
+                    continue
+                self._draw_colored_vertices(
+                    funcs,
+                    vertices,
+                    self._GL_TRIANGLES,
+                    mvp,
+                    instance_transforms=[self._part_transform_matrix(part)],
+                )
+        finally:
+            funcs.glClearColor(*self._CLEAR_COLOR)
+            self._pick_fbo.release()
+        self._pick_table = table
+        self._pick_signature = signature
+        return True
+
+    def _part_pick_vertices(self, part, table: PickTable) -> array | None:
+        voxels = part.voxels
+        cached = self._pick_vertex_cache.get(part.part_id)
+        if cached is None or cached[0] is not voxels or cached[1] != voxels.revision:
+            cached = (voxels, voxels.revision, build_pick_faces(voxels), None, array("f"))
+        faces = cached[2]
+        first_id = table.add(part.part_id, faces)
+        if first_id is None:
+            return None
+        if cached[3] != first_id:
+            cached = (cached[0], cached[1], faces, first_id, pick_vertices(faces, first_id))
+        self._pick_vertex_cache[part.part_id] = cached
+        return cached[4]
+
+    def _read_pick_pixel(self, x: float, y: float) -> PickHit | None:
+        if self._pick_fbo is None or self._pick_table is None:
+            return None
+        ratio = self.devicePixelRatioF()
+        pixel_x = int(x * ratio)
+        pixel_y = self._pick_fbo.height() - 1 - int(y * ratio)
+        if not (0 <= pixel_x < self._pick_fbo.width() and 0 <= pixel_y < self._pick_fbo.height()):
+            return None
+        pixel = (c_ubyte * 4)()
+        funcs = self.context().functions()
+        self._pick_fbo.bind()
+        funcs.glReadPixels(
+            pixel_x, pixel_y, 1, 1, self._GL_RGBA, self._GL_UNSIGNED_BYTE, addressof(pixel)
+        )
+        self._pick_fbo.release()
+        return self._pick_table.resolve(decode_pick_pixel(pixel[0], pixel[1], pixel[2]))
+
     @staticmethod
     def _gl_string(funcs, token: int) -> str:
         value = funcs.glGetString(token)
@@ -1468,23 +1684,101 @@ class GLViewportWidget(QOpenGLWidget):
             line_vertices.extend(self._build_voxel_line_vertices(part_rows, transform))
         return point_vertices, line_vertices
 
-    def _build_visible_render_data(self) -> tuple[array, array, int]:
+    def _frustum_visible_parts(self, mvp: QMatrix4x4) -> list:
+        if self._app_context is None:
+            return []
+        parts = self._app_context.current_project.scene.iter_visible_parts()
+        bvh = self._scene_bounds.update(parts)
+        visible_ids = set(bvh.query_frustum(frustum_planes(mvp.copyDataTo())))
+        return [part for part in parts if part.part_id in visible_ids]
+
+    def _part_lod_factors(self, parts: list, mvp: QMatrix4x4) -> dict[str, int]:
+        # Parts whose nearest voxels shrink below a pixel are drawn from a coarser LOD level.
+        if not self.lod_enabled or self._app_context is None:
+            return {}
+        scene_parts = self._app_context.current_project.scene.parts.values()
+        live_assets = {part.asset.asset_id for part in scene_parts}
+        for asset_id in set(self._lod_pyramids) - live_assets:
+            del self._lod_pyramids[asset_id]
+        eye, _, _, up = self._camera_vectors()
+        factors: dict[str, int] = {}
+        for part in parts:
+            factor = select_lod_factor(self._part_pixels_per_voxel(part, mvp, eye, up))
+            if factor > 1:
+                factors[part.part_id] = factor
+        return factors
+
+    def _part_pixels_per_voxel(
+        self, part, mvp: QMatrix4x4, eye: QVector3D, up: QVector3D
+    ) -> float:
+        bounds = self._scene_bounds.part_bounds(part.part_id)
+        if bounds is None:
+            return float("inf")
+        # Measure one voxel at the point of the part's bounds closest to the camera.
+        eye_xyz = (eye.x(), eye.y(), eye.z())
+        nearest = QVector3D(
+            *(
+                min(max(eye_xyz[axis], bounds.minimum[axis]), bounds.maximum[axis])
+                for axis in range(3)
+            )
+        )
+        voxel_size = max(abs(float(value)) for value in part.scale)
+        near_clip = mvp.map(QVector4D(nearest, 1.0))
+        far_clip = mvp.map(QVector4D(nearest + up * voxel_size, 1.0))
+        if near_clip.w() <= 1e-6 or far_clip.w() <= 1e-6:
+            return float("inf")
+        dx = (far_clip.x() / far_clip.w() - near_clip.x() / near_clip.w()) * self.width() * 0.5
+        dy = (far_clip.y() / far_clip.w() - near_clip.y() / near_clip.w()) * self.height() * 0.5
+        return (dx * dx + dy * dy) ** 0.5
+
+    def _lod_pyramid(self, asset) -> VoxelLodPyramid:
+        pyramid = self._lod_pyramids.get(asset.asset_id)
+        if pyramid is None or pyramid.voxels is not asset.voxels:
+            pyramid = VoxelLodPyramid(asset.voxels)
+            self._lod_pyramids[asset.asset_id] = pyramid
+        return pyramid
+
+    @staticmethod
+    def _lod_cell_transform(transform: QMatrix4x4, factor: int) -> QMatrix4x4:
+        # Coarse cell c is drawn at the centre of the source block it covers.
+        offset = (factor - 1) * 0.5
+        lod_transform = QMatrix4x4(transform)
+        lod_transform.translate(offset, offset, offset)
+        lod_transform.scale(float(factor))
+        return lod_transform
+
+    def _build_visible_render_data(
+        self, parts: list | None = None, lod_factors: dict[str, int] | None = None
+    ) -> tuple[array, array, int]:
         point_vertices = array("f")
         line_vertices = array("f")
         voxel_count = 0
         if self._app_context is None:
             return point_vertices, line_vertices, voxel_count
-        signature = self._visible_render_signature()
-        if (
+        if parts is None:
+            parts = self._app_context.current_project.scene.iter_visible_parts()
+        lod_factors = lod_factors or {}
+        with self.frame_profiler.stage("signature"):
+            signature = self._compute_visible_render_signature(
+                self._app_context, parts, lod_factors
+            )
+        cache_hit = (
             self._cached_render_signature == signature
             and self._cached_point_vertices is not None
             and self._cached_line_vertices is not None
-        ):
+        )
+        self.frame_profiler.record_cache("render_data", cache_hit)
+        if cache_hit:
             return self._cached_point_vertices, self._cached_line_vertices, self._cached_voxel_count
-        for part in self._app_context.current_project.scene.iter_visible_parts():
+        for part in parts:
             transform = self._part_transform_matrix(part)
-            part_rows = part.voxels.to_list()
-            voxel_count += len(part_rows)
+            factor = lod_factors.get(part.part_id, 1)
+            if factor > 1:
+                transform = self._lod_cell_transform(transform, factor)
+                part_rows = self._lod_pyramid(part.asset).level(factor).to_list()
+            else:
+                part_rows = part.voxels.to_list()
+            voxel_count += part.voxels.count()
             for x, y, z, color_index in part_rows:
                 color = self._palette_color_rgb(self._app_context, color_index)
                 mapped = transform.map(QVector3D(float(x), float(y), float(z)))
@@ -1500,11 +1794,18 @@ class GLViewportWidget(QOpenGLWidget):
         return self._compute_visible_render_signature(self._app_context)
 
     @staticmethod
-    def _compute_visible_render_signature(app_context: "AppContext | None") -> tuple[tuple[object, ...], ...]:
+    def _compute_visible_render_signature(
+        app_context: "AppContext | None",
+        parts: list | None = None,
+        lod_factors: dict[str, int] | None = None,
+    ) -> tuple[tuple[object, ...], ...]:
         if app_context is None:
             return tuple()
+        if parts is None:
+            parts = app_context.current_project.scene.iter_visible_parts()
+        lod_factors = lod_factors or {}
         signature: list[tuple[object, ...]] = []
-        for part in app_context.current_project.scene.iter_visible_parts():
+        for part in parts:
             signature.append(
                 (
                     part.part_id,
@@ -1513,26 +1814,49 @@ class GLViewportWidget(QOpenGLWidget):
                     part.rotation,
                     part.scale,
                     part.voxels.revision,
+                    lod_factors.get(part.part_id, 1),
                 )
             )
         return tuple(signature)
 
-    def _build_visible_mesh_vertices(self) -> array:
-        vertices = array("f")
+    def _build_visible_mesh_batches(
+        self, parts: list | None = None, lod_factors: dict[str, int] | None = None
+    ) -> list[tuple[array, list[QMatrix4x4]]]:
         if self._app_context is None:
-            return vertices
-        for part in self._app_context.current_project.scene.iter_visible_parts():
-            if part.mesh_cache is None or not part.mesh_cache.quads:
+            return []
+        if parts is None:
+            parts = self._app_context.current_project.scene.iter_visible_parts()
+        lod_factors = lod_factors or {}
+        palette_key = tuple(self._app_context.palette)
+        batches: list[tuple[array, list[QMatrix4x4]]] = []
+        live_keys: set[tuple[str, int]] = set()
+        for asset, instances in group_parts_by_asset(parts):
+            if asset.mesh_cache is None or not asset.mesh_cache.quads:
                 continue
-            transform = self._part_transform_matrix(part)
-            vertices.extend(
-                self._mesh_triangles_from_surface(
-                    part.mesh_cache,
-                    transform,
-                    self._app_context,
-                )
-            )
-        return vertices
+            # Instances of one asset can sit at different distances, so batch per LOD level.
+            by_factor: dict[int, list] = {}
+            for part in instances:
+                by_factor.setdefault(lod_factors.get(part.part_id, 1), []).append(part)
+            for factor, factor_instances in sorted(by_factor.items()):
+                mesh = asset.mesh_cache
+                if factor > 1:
+                    mesh = self._lod_pyramid(asset).mesh(factor)
+                cache_key = (asset.asset_id, factor)
+                live_keys.add(cache_key)
+                cached = self._mesh_vertex_cache.get(cache_key)
+                cache_hit = cached is not None and cached[0] is mesh and cached[1] == palette_key
+                self.frame_profiler.record_cache("mesh_vertices", cache_hit)
+                if not cache_hit:
+                    vertices = self._mesh_triangles_from_surface(
+                        mesh, QMatrix4x4(), self._app_context
+                    )
+                    cached = (mesh, palette_key, vertices)
+                    self._mesh_vertex_cache[cache_key] = cached
+                transforms = [self._part_transform_matrix(part) for part in factor_instances]
+                batches.append((cached[2], transforms))
+        for cache_key in set(self._mesh_vertex_cache) - live_keys:
+            del self._mesh_vertex_cache[cache_key]
+        return batches
 
     @classmethod
     def _palette_color_rgb(cls, app_context: "AppContext | None", color_index: int) -> tuple[float, float, float]:
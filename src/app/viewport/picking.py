@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.voxels.voxel_grid import VoxelGrid
+
+# Pick ids are packed into the RGB channels of an RGBA8 target; 0 is the cleared background.
+MAX_PICK_ID = (1 << 24) - 1
+
+_FACE_NORMALS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+_KEY_BIAS = 1 << 20
+_KEY_BITS = 21
+
+
+@dataclass(slots=True, frozen=True)
+class PickHit:
+    part_id: str
+    cell: tuple[int, int, int]
+    adjacent_cell: tuple[int, int, int] | None
+
+
+@dataclass(slots=True)
+class PickFaces:
+    # Exposed voxel faces of one grid in part-local space; voxels are centred on integer
+    # coordinates to match the CPU raycaster. positions holds six vertices per face.
+    positions: np.ndarray
+    cells: np.ndarray
+    normals: np.ndarray
+
+    @property
+    def face_count(self) -> int:
+        return int(self.cells.shape[0])
+
+
+def build_pick_faces(voxels: VoxelGrid) -> PickFaces:
+    coords, _ = voxels.to_arrays()
+    if coords.shape[0] == 0:
+        empty = np.zeros((0, 3), dtype=np.int64)
+        return PickFaces(np.zeros((0, 3), dtype=np.float32), empty, empty)
+    keys = np.sort(_pack_keys(coords))
+    cells: list[np.ndarray] = []
+    normals: list[np.ndarray] = []
+    for normal in _FACE_NORMALS:
+        neighbour_keys = _pack_keys(coords + np.asarray(normal, dtype=np.int64))
+        slots = np.minimum(np.searchsorted(keys, neighbour_keys), keys.shape[0] - 1)
+        exposed = keys[slots] != neighbour_keys
+        cells.append(coords[exposed])
+        normals.append(np.broadcast_to(np.asarray(normal, dtype=np.int64), (int(exposed.sum()), 3)))
+    face_cells = np.concatenate(cells)
+    face_normals = np.concatenate(normals)
+    corners = _face_corners(face_normals)
+    positions = (face_cells[:, None, :] + corners).reshape(-1, 3).astype(np.float32)
+    return PickFaces(positions, face_cells, face_normals)
+
+
+def decode_pick_pixel(red: int, green: int, blue: int) -> int:
+    return (int(red) << 16) | (int(green) << 8) | int(blue)
+
+
+def pick_vertices(faces: PickFaces, first_id: int) -> array:
+    # Interleaves position and id colour the same way as the viewport's colour vertices.
+    ids = np.arange(first_id, first_id + faces.face_count, dtype=np.int64)
+    colors = np.column_stack(((ids >> 16) & 0xFF, (ids >> 8) & 0xFF, ids & 0xFF)) / 255.0
+    interleaved = np.hstack((faces.positions, np.repeat(colors, 6, axis=0).astype(np.float32)))
+    vertices = array("f")
+    vertices.frombytes(interleaved.astype(np.float32).tobytes())
+    return vertices
+
+
+class PickTable:
+    # Maps pick ids back to the part, cell and face they were rendered for. Ids are handed out
+    # in consecutive ranges, one per part.
+    def __init__(self) -> None:
+        self._first_ids: list[int] = []
+        self._entries: list[tuple[str, PickFaces]] = []
+        self.next_id = 1
+
+    def add(self, part_id: str, faces: PickFaces) -> int | None:
+        if faces.face_count == 0 or self.next_id + faces.face_count - 1 > MAX_PICK_ID:
+            return None
+        first_id = self.next_id
+        self._first_ids.append(first_id)
+        self._entries.append((part_id, faces))
+        self.next_id += faces.face_count
+        return first_id
+
+    def resolve(self, pick_id: int) -> PickHit | None:
+        if pick_id <= 0 or pick_id >= self.next_id:
+            return None
+        slot = bisect_right(self._first_ids, pick_id) - 1
+        part_id, faces = self._entries[slot]
+        face_index = pick_id - self._first_ids[slot]
+        x, y, z = (int(value) for value in faces.cells[face_index])
+        nx, ny, nz = (int(value) for value in faces.normals[face_index])
+        return PickHit(part_id, (x, y, z), (x + nx, y + ny, z + nz))
+
+
+def _pack_keys(coords: np.ndarray) -> np.ndarray:
+    biased = coords + _KEY_BIAS
+    return (biased[:, 0] << (2 * _KEY_BITS)) | (biased[:, 1] << _KEY_BITS) | biased[:, 2]
+
+
+def _face_corners(normals: np.ndarray) -> np.ndarray:
+    # Two triangles per face on the cube side facing along the normal.
+    axis = np.argmax(np.abs(normals), axis=1)
+    u_axis = (axis + 1) % 3
+    v_axis = (axis + 2) % 3
+    count = normals.shape[0]
+    rows = np.arange(count)
+    quad = np.zeros((count, 4, 3), dtype=np.float64)
+    quad[rows, :, axis] = (normals[rows, axis] * 0.5)[:, None]
+    for corner, (u, v) in enumerate(((-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5))):
+        quad[rows, corner, u_axis] = u
+        quad[rows, corner, v_axis] = v
+    return quad[:, (0, 1, 2, 0, 2, 3), :]
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import random
+import shutil
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Iterable
+
+from core.commands.demo_commands import FillVoxelCommand, compute_fill_preview_cells
+from core.commands.session import ReplayContext
+from core.export.qb_exporter import export_voxels_to_qb
+from core.export.vox_exporter import export_voxels_to_vox
+from core.io.project_io import load_project, save_project
+from core.io.qb_io import load_qb_models
+from core.io.vox_io import load_vox
+from core.meshing.greedy_mesher import extract_greedy_surface_mesh
+from core.meshing.mesh import SurfaceMesh
+from core.meshing.solidify import rebuild_part_mesh
+from core.meshing.surface_extractor import extract_surface_mesh
+from core.palette import DEFAULT_PALETTE
+from core.part import Part
+from core.project import Project
+from core.synthetic import GRID_KINDS, generate_grid, random_fill
+from core.voxels.raycast import VoxelRayHit, traverse_voxel_ray
+from core.voxels.voxel_grid import VoxelGrid
+from util.fs import get_app_temp_dir
+
+Cell = tuple[int, int, int]
+# (owner x, owner y, owner z, axis, sign, color): one unit face of one voxel.
+UnitFace = tuple[int, int, int, int, int, int]
+Ray = tuple[tuple[float, float, float], tuple[float, float, float]]
+MeshEngine = Callable[[VoxelGrid], SurfaceMesh]
+FillEngine = Callable[[VoxelGrid, Cell, str], set[Cell]]
+RayEngine = Callable[[VoxelGrid, tuple[float, float, float], tuple[float, float, float]], object]
+Check = Callable[[VoxelGrid], "str | None"]
+
+
+@dataclass(slots=True)
+class Mismatch:
+    check: str
+    scene: str
+    detail: str
+    # Smallest voxel set ([x, y, z, color] rows) found that still fails the check.
+    voxels: list[list[int]]
+
+
+def _incremental_mesh(voxels: VoxelGrid, *, greedy: bool) -> SurfaceMesh:
+    # Meshes the grid with a small box carved out, puts the box back and rebuilds incrementally.
+    rows = sorted(voxels.to_list())
+    part = Part(part_id="differential", name="Differential", voxels=voxels.copy())
+    if not rows:
+        return rebuild_part_mesh(part, greedy=greedy)
+    cx, cy, cz, _ = rows[len(rows) // 2]
+    carved = {
+        (x, y, z): color
+        for x, y, z, color in rows
+        if abs(x - cx) <= 1 and abs(y - cy) <= 1 and abs(z - cz) <= 1
+    }
+    for x, y, z in carved:
+        part.voxels.remove(x, y, z)
+    rebuild_part_mesh(part, greedy=greedy)
+    for (x, y, z), color in carved.items():
+        part.voxels.set(x, y, z, color)
+    part.mark_dirty_cells(set(carved))
+    return rebuild_part_mesh(part, greedy=greedy)
+
+
+def _fill_command_cells(voxels: VoxelGrid, seed: Cell, mode: str) -> set[Cell]:
+    # The cells a flood erase actually removes when run as an editor command.
+    project = Project(name="Differential")
+    project.voxels = voxels.copy()
+    ctx = ReplayContext(current_project=project, fill_connectivity=mode, fill_max_cells=1 << 20)
+    FillVoxelCommand(*seed, mode="erase").do(ctx)
+    before = {(x, y, z) for x, y, z, _color in voxels.to_list()}
+    return before - {(x, y, z) for x, y, z, _color in project.voxels.to_list()}
+
+
+def _reference_fill(voxels: VoxelGrid, seed: Cell, mode: str) -> set[Cell]:
+    return compute_fill_preview_cells(voxels, *seed, mode=mode, max_cells=1 << 20)
+
+
+def _reference_ray(
+    voxels: VoxelGrid,
+    origin: tuple[float, float, float],
+    direction: tuple[float, float, float],
+) -> VoxelRayHit | None:
+    return traverse_voxel_ray(voxels, origin, direction, t_end=1000.0)
+
+
+def _occupancy_ray(
+    voxels: VoxelGrid,
+    origin: tuple[float, float, float],
+    direction: tuple[float, float, float],
+) -> VoxelRayHit | None:
+    return voxels.occupancy().raycast(origin, direction, t_end=1000.0)
+
+
+# Reference implementations, and the fast paths that must agree with them. New engines
+# register here to be covered by tests/test_differential.py.
+REFERENCE_MESH: MeshEngine = extract_surface_mesh
+MESH_ENGINES: dict[str, MeshEngine] = {
+    "greedy": extract_greedy_surface_mesh,
+    "incremental": partial(_incremental_mesh, greedy=False),
+    "incremental_greedy": partial(_incremental_mesh, greedy=True),
+}
+REFERENCE_FILL: FillEngine = _reference_fill
+FILL_ENGINES: dict[str, FillEngine] = {"fill_command": _fill_command_cells}
+REFERENCE_RAY: RayEngine = _reference_ray
+RAY_ENGINES: dict[str, RayEngine] = {"occupancy": _occupancy_ray}
+CODECS = ("vox", "qb", "project")
+
+
+def face_coverage(mesh: SurfaceMesh) -> Counter[UnitFace]:
+    # Splits every quad into the unit voxel faces it covers, so meshes that merge faces
+    # differently still compare equal. A face's owner is the voxel it bounds.
+    coverage: Counter[UnitFace] = Counter()
+    for index, quad in enumerate(mesh.quads):
+        verts = [mesh.vertices[i] for i in quad]
+        normal = mesh.quad_normal(index)
+        axis = max(range(3), key=lambda component: abs(normal[component]))
+        sign = 1 if normal[axis] > 0 else -1
+        low = [int(round(min(vertex[i] for vertex in verts))) for i in range(3)]
+        high = [int(round(max(vertex[i] for vertex in verts))) for i in range(3)]
+        low[axis] -= 1 if sign > 0 else 0
+        high[axis] = low[axis] + 1
+        color = mesh.face_colors[index] if index < len(mesh.face_colors) else 0
+        for x in range(low[0], high[0]):
+            for y in range(low[1], high[1]):
+                for z in range(low[2], high[2]):
+                    coverage[(x, y, z, axis, sign, color)] += 1
+    return coverage
+
+
+def is_watertight(coverage: Counter[UnitFace]) -> bool:
+    # A closed voxel surface uses every unit edge an even number of times.
+    edges: Counter[tuple[Cell, Cell]] = Counter()
+    for (x, y, z, axis, sign, _color), count in coverage.items():
+        origin = [x, y, z]
+        origin[axis] += 1 if sign > 0 else 0
+        u_axis, v_axis = [index for index in range(3) if index != axis]
+        corners = []
+        for du, dv in ((0, 0), (1, 0), (1, 1), (0, 1)):
+            corner = list(origin)
+            corner[u_axis] += du
+            corner[v_axis] += dv
+            corners.append((corner[0], corner[1], corner[2]))
+        for start, end in zip(corners, corners[1:] + corners[:1]):
+            edges[(min(start, end), max(start, end))] += count
+    return all(count % 2 == 0 for count in edges.values())
+
+
+def mesh_check(engine: MeshEngine) -> Check:
+    def check(voxels: VoxelGrid) -> str | None:
+        expected = face_coverage(REFERENCE_MESH(voxels))
+        actual = face_coverage(engine(voxels))
+        if any(count > 1 for count in actual.values()):
+            return "faces covered more than once"
+        if actual != expected:
+            missing = len(expected - actual)
+            extra = len(actual - expected)
+            return f"face coverage differs: {missing} missing, {extra} extra"
+        if not is_watertight(actual):
+            return "surface is not watertight"
+        return None
+
+    return check
+
+
+def fill_check(engine: FillEngine, *, seeds: int = 4) -> Check:
+    def check(voxels: VoxelGrid) -> str | None:
+        rows = sorted(voxels.to_list())
+        for x, y, z, _color in rows[:: max(1, len(rows) // seeds)][:seeds]:
+            for mode in ("plane", "volume"):
+                expected = REFERENCE_FILL(voxels, (x, y, z), mode)
+                actual = engine(voxels, (x, y, z), mode)
+                if actual != expected:
+                    return (
+                        f"{mode} fill from {(x, y, z)}: {len(expected - actual)} missing, "
+                        f"{len(actual - expected)} extra"
+                    )
+        return None
+
+    return check
+
+
+def ray_check(engine: RayEngine, *, rays: int = 16, seed: int = 0) -> Check:
+    def check(voxels: VoxelGrid) -> str | None:
+        for origin, direction in _probe_rays(voxels, rays, seed):
+            expected = _ray_key(REFERENCE_RAY(voxels, origin, direction))
+            actual = _ray_key(engine(voxels, origin, direction))
+            if actual != expected:
+                return f"ray {origin} -> {direction}: expected {expected}, got {actual}"
+        return None
+
+    return check
+
+
+def codec_check(codec: str) -> Check:
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported differential codec: {codec}")
+
+    def check(voxels: VoxelGrid) -> str | None:
+        work_dir = get_app_temp_dir("VoxelTool") / f"differential-{uuid.uuid4().hex}"
+        work_dir.mkdir(parents=True)
+        try:
+            first = work_dir / f"first.{codec}"
+            second = work_dir / f"second.{codec}"
+            palette = _palette_for(voxels)
+            loaded, loaded_palette = _save_and_load(codec, voxels, palette, str(first))
+            expected = {tuple(row[:3]): palette[row[3] % len(palette)] for row in voxels.to_list()}
+            actual = {
+                tuple(row[:3]): loaded_palette[row[3] % len(loaded_palette)]
+                for row in loaded.to_list()
+            }
+            if set(actual) != set(expected):
+                differing = len(set(expected) ^ set(actual))
+                return f"cell sets differ after round trip: {differing} cells"
+            if actual != expected:
+                return "colours differ after round trip"
+            if codec == "project":
+                save_project(load_project(str(first)), str(second))
+            else:
+                _save_and_load(codec, loaded, loaded_palette, str(second))
+            if first.read_bytes() != second.read_bytes():
+                return "re-saving the loaded file changes its bytes"
+            return None
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return check
+
+
+def default_checks() -> dict[str, Check]:
+    checks: dict[str, Check] = {}
+    for name, mesh_engine in MESH_ENGINES.items():
+        checks[f"mesh:{name}"] = mesh_check(mesh_engine)
+    for name, fill_engine in FILL_ENGINES.items():
+        checks[f"fill:{name}"] = fill_check(fill_engine)
+    for name, ray_engine in RAY_ENGINES.items():
+        checks[f"ray:{name}"] = ray_check(ray_engine)
+    for codec in CODECS:
+        checks[f"codec:{codec}"] = codec_check(codec)
+    return checks
+
+
+def differential_scenes(*, seed: int = 0, size: int = 10) -> list[tuple[str, VoxelGrid]]:
+    scenes = [
+        (f"random-{density}", random_fill(size, density=density, seed=seed, colors=3))
+        for density in (0.1, 0.4, 0.8)
+    ]
+    scenes.extend((kind, generate_grid(kind, size, seed=seed)) for kind in GRID_KINDS)
+    return scenes
+
+
+def run_differential(
+    scenes: Iterable[tuple[str, VoxelGrid]],
+    checks: dict[str, Check] | None = None,
+    *,
+    minimize: bool = True,
+) -> list[Mismatch]:
+    checks = default_checks() if checks is None else checks
+    mismatches: list[Mismatch] = []
+    for scene_name, voxels in scenes:
+        for check_name, check in checks.items():
+            detail = check(voxels)
+            if detail is None:
+                continue
+            rows = voxels.to_list()
+            if minimize:
+                rows = minimize_voxels(rows, lambda subset: check(VoxelGrid.from_list(subset)))
+                detail = check(VoxelGrid.from_list(rows)) or detail
+            mismatches.append(Mismatch(check_name, scene_name, detail, rows))
+    return mismatches
+
+
+def minimize_voxels(
+    rows: list[list[int]],
+    fails: Callable[[list[list[int]]], object],
+    *,
+    max_checks: int = 2000,
+) -> list[list[int]]:
+    # Delta debugging (ddmin): drop ever smaller slices of voxels while the check still fails.
+    current = list(rows)
+    granularity = 2
+    checks = 0
+    while len(current) >= 2 and checks < max_checks:
+        chunk = -(-len(current) // granularity)
+        reduced = False
+        for start in range(0, len(current), chunk):
+            candidate = current[:start] + current[start + chunk:]
+            checks += 1
+            if candidate and fails(candidate):
+                current = candidate
+                granularity = max(granularity - 1, 2)
+                reduced = True
+                break
+            if checks >= max_checks:
+                break
+        if not reduced:
+            if granularity >= len(current):
+                break
+            granularity = min(len(current), granularity * 2)
+    return current
+
+
+def _save_and_load(
+    codec: str,
+    voxels: VoxelGrid,
+    palette: list[tuple[int, int, int]],
+    path: str,
+) -> tuple[VoxelGrid, list[tuple[int, int, int]]]:
+    if codec == "vox":
+        export_voxels_to_vox(voxels, palette, path)
+        return load_vox(path)
+    if codec == "qb":
+        export_voxels_to_qb(voxels, palette, path)
+        models, loaded_palette = load_qb_models(path)
+        return (models[0] if models else VoxelGrid()), loaded_palette
+    project = Project(name="Differential")
+    project.voxels = voxels.copy()
+    save_project(project, path)
+    return load_project(path).voxels, palette
+
+
+def _palette_for(voxels: VoxelGrid) -> list[tuple[int, int, int]]:
+    # Distinct colours for every index in use; QB stores colours, not indices.
+    count = 1 + max((row[3] for row in voxels.to_list()), default=0)
+    if count <= len(DEFAULT_PALETTE):
+        return list(DEFAULT_PALETTE)
+    return [(index, 255 - index, (index * 97) % 256) for index in range(count)]
+
+
+def _probe_rays(voxels: VoxelGrid, count: int, seed: int) -> list[Ray]:
+    # Rays from a sphere around the grid towards random points inside its bounds.
+    box = voxels.occupancy().bounds()
+    if box is None:
+        return []
+    (min_x, min_y, min_z), (max_x, max_y, max_z) = box
+    rng = random.Random(seed)
+    radius = 2.0 + max(max_x - min_x, max_y - min_y, max_z - min_z)
+    rays: list[Ray] = []
+    for _ in range(count):
+        target = (
+            rng.uniform(min_x - 0.5, max_x + 0.5),
+            rng.uniform(min_y - 0.5, max_y + 0.5),
+            rng.uniform(min_z - 0.5, max_z + 0.5),
+        )
+        offset = [rng.gauss(0.0, 1.0) for _ in range(3)]
+        length = max(1e-6, sum(component * component for component in offset) ** 0.5)
+        origin = tuple(target[i] + offset[i] * radius / length for i in range(3))
+        direction = tuple(target[i] - origin[i] for i in range(3))
+        rays.append((origin, direction))  # type: ignore[arg-type]
+    return rays
+
+
+def _ray_key(hit: object) -> tuple | None:
+    if not isinstance(hit, VoxelRayHit):
+        return None
+    return hit.cell, hit.normal, round(hit.distance, 6)
+
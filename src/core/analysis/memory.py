@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+import types
+import weakref
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable
+
+import numpy as np
+
+from core.meshing.mesh import SurfaceMesh
+from core.project import Project
+from core.scene import group_parts_by_asset
+from core.voxels.voxel_grid import VoxelGrid
+
+VOXEL_STORAGE = "voxel storage"
+MESH_CACHES = "mesh caches"
+UNDO_HISTORY = "undo history"
+VIEWPORT_CPU = "viewport CPU"
+VIEWPORT_GPU = "viewport GPU"
+MEMORY_SUBSYSTEMS = (VOXEL_STORAGE, MESH_CACHES, UNDO_HISTORY, VIEWPORT_CPU, VIEWPORT_GPU)
+
+# Shared, immortal or code objects that a deep walk must not attribute to a subsystem.
+_SKIPPED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+)
+
+
+@dataclass(slots=True)
+class AllocationSite:
+    location: str
+    size_bytes: int
+    count: int
+
+
+@dataclass(slots=True)
+class MemoryReport:
+    subsystems: dict[str, int] = field(default_factory=dict)
+    traced_current_bytes: int | None = None
+    traced_peak_bytes: int | None = None
+    top_allocations: list[AllocationSite] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.subsystems.values())
+
+    def ranked(self) -> list[tuple[str, int]]:
+        return sorted(self.subsystems.items(), key=lambda item: item[1], reverse=True)
+
+
+class MemoryAccountant:
+    # Measures real footprints per subsystem. Objects reachable from several subsystems (chunks
+    # shared by copy-on-write snapshots, linked assets) are counted once, by the first subsystem
+    # measured. Undo commands are immutable once recorded, so their sizes are cached.
+    def __init__(self) -> None:
+        # command -> (bytes, ids of the objects those bytes were charged for).
+        self._command_bytes: weakref.WeakKeyDictionary[object, tuple[int, frozenset[int]]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def measure(
+        self,
+        project: Project,
+        *,
+        command_stack=None,
+        viewport_usage: Callable[[set[int]], tuple[int, int]] | None = None,
+        allocation_limit: int = 5,
+    ) -> MemoryReport:
+        # viewport_usage(seen) returns the viewport's (CPU, GPU) bytes, skipping ids in seen.
+        seen: set[int] = set()
+        report = MemoryReport()
+        storage = 0
+        meshes = 0
+        for asset, _ in group_parts_by_asset(list(project.scene.parts.values())):
+            storage += asset.voxels.storage_bytes(seen)
+            meshes += mesh_bytes(asset.mesh_cache, seen)
+        report.subsystems[VOXEL_STORAGE] = storage
+        report.subsystems[MESH_CACHES] = meshes
+        if command_stack is not None:
+            report.subsystems[UNDO_HISTORY] = sum(
+                self._history_command_bytes(command, seen)
+                for command in (*command_stack.undo_stack, *command_stack.redo_stack)
+            )
+        if viewport_usage is not None:
+            cpu_bytes, gpu_bytes = viewport_usage(seen)
+            report.subsystems[VIEWPORT_CPU] = int(cpu_bytes)
+            report.subsystems[VIEWPORT_GPU] = int(gpu_bytes)
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report.traced_current_bytes = current
+            report.traced_peak_bytes = peak
+            report.top_allocations = top_allocation_sites(allocation_limit)
+        return report
+
+    def _history_command_bytes(self, command: object, seen: set[int]) -> int:
+        cached = self._command_bytes.get(command)
+        if cached is not None and seen.isdisjoint(cached[1]):
+            # A hit still claims the command's objects, so later commands and the viewport do
+            # not count what they share with it.
+            seen.update(cached[1])
+            return cached[0]
+        # Measured against the live scene, so snapshot chunks the scene still shares are
+        # not charged to the history.
+        known = set(seen)
+        size = object_bytes(command, seen)
+        self._command_bytes[command] = (size, frozenset(seen - known))
+        return size
+
+
+def mesh_bytes(mesh: SurfaceMesh | None, seen: set[int] | None = None) -> int:
+    if mesh is None:
+        return 0
+    seen = set() if seen is None else seen
+    if id(mesh) in seen:
+        return 0
+    seen.add(id(mesh))
+    return (
+        sys.getsizeof(mesh)
+        + _sampled_list_bytes(mesh.vertices)
+        + _sampled_list_bytes(mesh.quads)
+        + _sampled_list_bytes(mesh.face_colors)
+    )
+
+
+def object_bytes(value: object, seen: set[int] | None = None) -> int:
+    # Deep size of an object graph, following gc referents; voxel grids, meshes and numeric
+    # buffers are sized through their dedicated paths.
+    seen = set() if seen is None else seen
+    total = 0
+    pending = [value]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _SKIPPED_TYPES) or _is_cached_int(item):
+            continue
+        if isinstance(item, VoxelGrid):
+            total += item.storage_bytes(seen)
+            continue
+        if isinstance(item, SurfaceMesh):
+            total += mesh_bytes(item, seen)
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, bytearray, int, float, array, np.ndarray)):
+            continue
+        pending.extend(gc.get_referents(item))
+    return total
+
+
+def estimate_object_bytes(value: object, *, sample: int = 32) -> int:
+    # Like object_bytes, but containers longer than `sample` are sized from their first `sample`
+    # items and scaled up, so the cost stays bounded on large, uniform undo payloads.
+    return _estimate_bytes(value, set(), max(1, int(sample)))
+
+
+def top_allocation_sites(limit: int = 5) -> list[AllocationSite]:
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+    sites: list[AllocationSite] = []
+    for stat in snapshot.statistics("lineno")[: max(0, int(limit))]:
+        frame = stat.traceback[0]
+        sites.append(AllocationSite(f"{frame.filename}:{frame.lineno}", stat.size, stat.count))
+    return sites
+
+
+def _estimate_bytes(value: object, seen: set[int], sample: int) -> int:
+    if id(value) in seen or isinstance(value, _SKIPPED_TYPES) or _is_cached_int(value):
+        return 0
+    if isinstance(value, VoxelGrid):
+        return value.storage_bytes(seen)
+    if isinstance(value, SurfaceMesh):
+        return mesh_bytes(value, seen)
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, array, np.ndarray)):
+        return size
+    if isinstance(value, dict):
+        children = [item for pair in islice(value.items(), sample) for item in pair]
+        scale = len(value) / max(1, min(len(value), sample))
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        children = list(islice(value, sample))
+        scale = len(value) / max(1, len(children))
+    else:
+        children = gc.get_referents(value)
+        scale = 1.0
+    return size + int(sum(_estimate_bytes(child, seen, sample) for child in children) * scale)
+
+
+def _sampled_list_bytes(values: list) -> int:
+    # Mesh lists hold uniformly shaped tuples, so one element sizes them all; the last element
+    # has the largest indices and so the most boxed ints.
+    if not values:
+        return sys.getsizeof(values)
+    sample = values[-1]
+    per_item = sys.getsizeof(sample)
+    if isinstance(sample, tuple):
+        per_item += sum(
+            sys.getsizeof(component)
+            for component in sample
+            if not _is_cached_int(component)
+        )
+    elif _is_cached_int(sample):
+        per_item = 0
+    return sys.getsizeof(values) + len(values) * per_item
+
+
+def _is_cached_int(value: object) -> bool:
+    # CPython shares one object for each int in -5..256.
+    return type(value) is int and -5 <= value <= 256
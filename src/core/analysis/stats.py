@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+from core.analysis.memory import mesh_bytes
 from core.meshing.solidify import build_solid_mesh
 from core.part import Part
 from core.project import Project
+from util.trace import traced
 
 
 VOXEL_SIZE_METERS = 1.0
@@ -43,17 +45,43 @@ class SceneStats:
     total_memory_bytes: int = 0
 
 
-def compute_scene_stats(project: Project) -> SceneStats:
+@traced(category="stats")
+def compute_scene_stats(
+    project: Project,
+    *,
+    cache: dict[str, tuple[tuple, PartStats, set[int]]] | None = None,
+) -> SceneStats:
+    # With a cache, parts whose voxels, mesh and name are unchanged since the last call reuse
+    # their stats instead of being re-meshed; entries for removed parts are dropped.
     scene_stats = SceneStats()
     scene_materials: set[int] = set()
+    if cache is not None:
+        for stale_id in cache.keys() - project.scene.parts.keys():
+            del cache[stale_id]
     for part in project.scene.parts.values():
-        part_stats = _compute_part_stats(part)
+        key = (
+            id(part.voxels),
+            part.voxels.revision,
+            id(part.mesh_cache),
+            part.dirty_bounds,
+            part.name,
+            part.incremental_rebuild_attempts,
+            part.incremental_rebuild_fallbacks,
+        )
+        cached = None if cache is None else cache.get(part.part_id)
+        if cached is not None and cached[0] == key:
+            _, part_stats, materials = cached
+        else:
+            part_stats = _compute_part_stats(part)
+            materials = _part_materials(part)
+            if cache is not None:
+                cache[part.part_id] = (key, part_stats, materials)
         scene_stats.parts.append(part_stats)
         scene_stats.triangles += part_stats.triangles
         scene_stats.faces += part_stats.faces
         scene_stats.edges += part_stats.edges
         scene_stats.vertices += part_stats.vertices
-        scene_materials.update(_part_materials(part))
+        scene_materials.update(materials)
         scene_stats.voxel_memory_bytes += part_stats.voxel_memory_bytes
         scene_stats.mesh_memory_bytes += part_stats.mesh_memory_bytes
     scene_stats.materials_used = len(scene_materials)
@@ -80,8 +108,8 @@ def _compute_part_stats(part: Part) -> PartStats:
             unique_edges.add(key)
             edge_use_count[key] = edge_use_count.get(key, 0) + 1
     non_manifold_edge_hints = sum(1 for count in edge_use_count.values() if count > 2)
-    voxel_memory_bytes = part.voxels.count() * 16
-    mesh_memory_bytes = (len(mesh.vertices) * 12) + (len(mesh.quads) * 16) + (len(mesh.face_colors) * 4)
+    voxel_memory_bytes = part.voxels.storage_bytes()
+    mesh_memory_bytes = mesh_bytes(mesh)
     return PartStats(
         part_id=part.part_id,
         part_name=part.name,
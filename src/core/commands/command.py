@@ -8,6 +8,11 @@ class Command(ABC):
     def name(self) -> str:
         return self.__class__.__name__
 
+    @property
+    def cells_touched(self) -> int:
+        # Voxel cells this command changed when it last ran; 0 for non-voxel commands.
+        return 0
+
     @abstractmethod
     def do(self, ctx) -> None:
         pass
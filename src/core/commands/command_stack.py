@@ -1,6 +1,14 @@
 from __future__ import annotations
 
+import time
+from typing import TYPE_CHECKING, Callable
+
 from core.commands.command import Command
+from core.commands.metrics import CommandMetrics
+from util.trace import span
+
+if TYPE_CHECKING:
+    from core.commands.session import SessionRecorder
 
 
 class _CompoundCommand(Command):
@@ -16,6 +24,10 @@ class _CompoundCommand(Command):
         for command in self._commands:
             command.do(ctx)
 
+    @property
+    def cells_touched(self) -> int:
+        return sum(command.cells_touched for command in self._commands)
+
     def undo(self, ctx) -> None:
         for command in reversed(self._commands):
             command.undo(ctx)
@@ -28,6 +40,11 @@ class CommandStack:
         self._transaction_commands: list[Command] | None = None
         self._transaction_label: str | None = None
         self.max_undo_steps = max(1, int(max_undo_steps))
+        # Called after commands run outside a transaction and whenever the stacks change.
+        self.on_change: Callable[[], None] | None = None
+        self.metrics = CommandMetrics()
+        # Set while an editing session is being recorded for headless replay.
+        self.recorder: SessionRecorder | None = None
 
     @property
     def can_undo(self) -> bool:
@@ -42,31 +59,52 @@ class CommandStack:
         return self._transaction_commands is not None
 
     def do(self, command: Command, ctx) -> None:
-        command.do(ctx)
-        if self._transaction_commands is not None:
-            self._transaction_commands.append(command)
-        else:
+        with span("CommandStack.do", category="command", command=command.name):
+            started = time.perf_counter()
+            command.do(ctx)
+            self.metrics.record(command, "do", (time.perf_counter() - started) * 1000.0)
+            if self.recorder is not None:
+                self.recorder.record_command(command, ctx)
+            if self._transaction_commands is not None:
+                # Listeners hear about the whole transaction once it ends.
+                self._transaction_commands.append(command)
+                self.redo_stack.clear()
+                return
             self.undo_stack.append(command)
             self._trim_undo_stack()
-        self.redo_stack.clear()
+            self.redo_stack.clear()
+            self._notify_change()
 
     def undo(self, ctx) -> None:
         if not self.undo_stack:
             return
         command = self.undo_stack.pop()
-        command.undo(ctx)
-        self.redo_stack.append(command)
+        with span("CommandStack.undo", category="command", command=command.name):
+            started = time.perf_counter()
+            command.undo(ctx)
+            self.metrics.record(command, "undo", (time.perf_counter() - started) * 1000.0)
+            if self.recorder is not None:
+                self.recorder.record_step("undo")
+            self.redo_stack.append(command)
+            self._notify_change()
 
     def redo(self, ctx) -> None:
         if not self.redo_stack:
             return
         command = self.redo_stack.pop()
-        command.do(ctx)
-        self.undo_stack.append(command)
+        with span("CommandStack.redo", category="command", command=command.name):
+            started = time.perf_counter()
+            command.do(ctx)
+            self.metrics.record(command, "redo", (time.perf_counter() - started) * 1000.0)
+            if self.recorder is not None:
+                self.recorder.record_step("redo")
+            self.undo_stack.append(command)
+            self._notify_change()
 
     def clear(self) -> None:
         self.undo_stack.clear()
         self.redo_stack.clear()
+        self._notify_change()
 
     def set_max_undo_steps(self, max_steps: int) -> None:
         self.max_undo_steps = max(1, int(max_steps))
@@ -77,6 +115,8 @@ class CommandStack:
             raise RuntimeError("A transaction is already active.")
         self._transaction_commands = []
         self._transaction_label = label
+        if self.recorder is not None:
+            self.recorder.record_step("begin", label=label)
 
     def end_transaction(self) -> None:
         if self._transaction_commands is None:
@@ -85,15 +125,17 @@ class CommandStack:
         label = self._transaction_label
         self._transaction_commands = None
         self._transaction_label = None
+        if self.recorder is not None:
+            self.recorder.record_step("end")
 
         if not commands:
             return
         if len(commands) == 1:
             self.undo_stack.append(commands[0])
-            self._trim_undo_stack()
-            return
-        self.undo_stack.append(_CompoundCommand(commands, label=label))
+        else:
+            self.undo_stack.append(_CompoundCommand(commands, label=label))
         self._trim_undo_stack()
+        self._notify_change()
 
     def cancel_transaction(self, ctx=None, *, rollback: bool = True) -> None:
         if self._transaction_commands is None:
@@ -101,6 +143,8 @@ class CommandStack:
         commands = self._transaction_commands
         self._transaction_commands = None
         self._transaction_label = None
+        if self.recorder is not None:
+            self.recorder.record_step("cancel", args={"rollback": rollback})
         if not commands or not rollback:
             return
         if ctx is None:
@@ -108,6 +152,11 @@ class CommandStack:
         for command in reversed(commands):
             command.undo(ctx)
         self.redo_stack.clear()
+        self._notify_change()
+
+    def _notify_change(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
 
     def _trim_undo_stack(self) -> None:
         overflow = len(self.undo_stack) - self.max_undo_steps
@@ -27,6 +27,31 @@ class RenameProjectCommand(Command):
         ctx.current_project.name = self._old_name
 
 
+class RenamePartCommand(Command):
+    def __init__(self, part_id: str, new_name: str) -> None:
+        self.part_id = part_id
+        self.new_name = new_name
+        self._old_name: str | None = None
+
+    @property
+    def name(self) -> str:
+        return "Rename Part"
+
+    def do(self, ctx) -> None:
+        scene = ctx.current_project.scene
+        if self._old_name is None:
+            part = scene.parts.get(self.part_id)
+            if part is None:
+                raise ValueError(f"Part '{self.part_id}' does not exist.")
+            self._old_name = part.name
+        scene.rename_part(self.part_id, self.new_name)
+
+    def undo(self, ctx) -> None:
+        if self._old_name is None:
+            return
+        ctx.current_project.scene.rename_part(self.part_id, self._old_name)
+
+
 class PaintVoxelCommand(Command):
     def __init__(self, x: int, y: int, z: int, color_index: int) -> None:
         self.x = x
@@ -39,6 +64,10 @@ class PaintVoxelCommand(Command):
     def name(self) -> str:
         return "Paint Voxel"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._deltas)
+
     def do(self, ctx) -> None:
         voxels = ctx.current_project.voxels
         brush_size = int(getattr(ctx, "brush_size", 1))
@@ -68,6 +97,10 @@ class RemoveVoxelCommand(Command):
     def name(self) -> str:
         return "Erase Voxel"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._deltas)
+
     def do(self, ctx) -> None:
         voxels = ctx.current_project.voxels
         brush_size = int(getattr(ctx, "brush_size", 1))
@@ -94,6 +127,10 @@ class ClearVoxelsCommand(Command):
     def name(self) -> str:
         return "Clear Voxels"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._snapshot)
+
     def do(self, ctx) -> None:
         _invalidate_active_mesh_cache(ctx)
         self._snapshot = ctx.current_project.voxels.to_list()
@@ -113,6 +150,10 @@ class CreateTestVoxelsCommand(Command):
     def name(self) -> str:
         return "Create Test Voxels"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._snapshot)
+
     def do(self, ctx) -> None:
         _invalidate_active_mesh_cache(ctx)
         self._snapshot = ctx.current_project.voxels.to_list()
@@ -166,6 +207,10 @@ class BoxVoxelCommand(Command):
     def name(self) -> str:
         return "Box Fill" if self.mode == "paint" else "Box Erase"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._deltas)
+
     def do(self, ctx) -> None:
         voxels = ctx.current_project.voxels
         base_cells = build_box_plane_cells(self.start_x, self.start_y, self.end_x, self.end_y, self.z)
@@ -207,6 +252,10 @@ class LineVoxelCommand(Command):
     def name(self) -> str:
         return "Line Paint" if self.mode == "paint" else "Line Erase"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._deltas)
+
     def do(self, ctx) -> None:
         voxels = ctx.current_project.voxels
         base_cells = build_line_plane_cells(self.start_x, self.start_y, self.end_x, self.end_y, self.z)
@@ -238,6 +287,10 @@ class FillVoxelCommand(Command):
     def name(self) -> str:
         return "Flood Fill" if self.mode == "paint" else "Flood Erase"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._deltas)
+
     def do(self, ctx) -> None:
         voxels = ctx.current_project.voxels
         self.aborted_by_threshold = False
@@ -317,6 +370,10 @@ class MoveSelectedVoxelsCommand(Command):
     def name(self) -> str:
         return "Move Selected Voxels"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._source_colors) + len(self._target_colors)
+
     def do(self, ctx) -> None:
         voxels = ctx.current_project.voxels
         self._source_colors = {}
@@ -336,14 +393,15 @@ class MoveSelectedVoxelsCommand(Command):
             target = (x + self.dx, y + self.dy, z + self.dz)
             self._target_colors[target] = color
 
-        for target in self._target_colors:
-            if target in source_cells:
-                continue
-            if voxels.get(*target) is not None:
-                self.collision_blocked = True
-                self._source_colors = {}
-                self._target_colors = {}
-                return
+        if not _cells_region_empty(voxels, self._target_colors):
+            for target in self._target_colors:
+                if target in source_cells:
+                    continue
+                if voxels.get(*target) is not None:
+                    self.collision_blocked = True
+                    self._source_colors = {}
+                    self._target_colors = {}
+                    return
 
         _invalidate_active_mesh_cache(ctx, source_cells | set(self._target_colors.keys()))
         for source in source_cells:
@@ -382,6 +440,10 @@ class DuplicateSelectedVoxelsCommand(Command):
     def name(self) -> str:
         return "Duplicate Selected Voxels"
 
+    @property
+    def cells_touched(self) -> int:
+        return len(self._target_colors)
+
     def do(self, ctx) -> None:
         voxels = ctx.current_project.voxels
         self._target_colors = {}
@@ -400,13 +462,16 @@ class DuplicateSelectedVoxelsCommand(Command):
             self.capped_by_limit = True
             return
 
-        for (x, y, z), color in source_colors.items():
-            target = (x + self.dx, y + self.dy, z + self.dz)
-            if voxels.get(*target) is not None:
-                self.collision_blocked = True
-                self._target_colors = {}
-                return
-            self._target_colors[target] = color
+        targets = {
+            (x + self.dx, y + self.dy, z + self.dz): color
+            for (x, y, z), color in source_colors.items()
+        }
+        if not _cells_region_empty(voxels, targets):
+            for target in targets:
+                if voxels.get(*target) is not None:
+                    self.collision_blocked = True
+                    return
+        self._target_colors = targets
 
         _invalidate_active_mesh_cache(ctx, set(self._target_colors.keys()))
         for target, color in self._target_colors.items():
@@ -578,12 +643,39 @@ def _rasterize_line(start_x: int, start_y: int, end_x: int, end_y: int) -> list[
 
 
 def _plane_fill_bounds(voxels: VoxelGrid, z: int, seed_x: int, seed_y: int) -> tuple[int, int, int, int]:
-    plane_cells = [(x, y) for x, y, cell_z, _ in voxels.to_list() if cell_z == z]
-    if not plane_cells:
+    bounds = voxels.occupancy().bounds((None, None, z), (None, None, z))
+    if bounds is None:
         return seed_x, seed_x, seed_y, seed_y
-    xs = [cell[0] for cell in plane_cells] + [seed_x]
-    ys = [cell[1] for cell in plane_cells] + [seed_y]
-    return min(xs), max(xs), min(ys), max(ys)
+    (min_x, min_y, _), (max_x, max_y, _) = bounds
+    return min(min_x, seed_x), max(max_x, seed_x), min(min_y, seed_y), max(max_y, seed_y)
+
+
+def _cells_region_empty(voxels: VoxelGrid, cells) -> bool:
+    # One hierarchical emptiness check over the cells' bounding box before any per-cell lookups.
+    if not cells:
+        return True
+    xs, ys, zs = zip(*cells)
+    return voxels.occupancy().is_region_empty(
+        (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
+    )
+
+
+def mirror_cells(
+    cells: set[tuple[int, int, int]],
+    *,
+    enabled: tuple[bool, bool, bool],
+    offsets: tuple[int, int, int],
+) -> set[tuple[int, int, int]]:
+    expanded: set[tuple[int, int, int]] = set()
+    for x, y, z in cells:
+        xs = (x, (2 * offsets[0]) - x) if enabled[0] else (x,)
+        ys = (y, (2 * offsets[1]) - y) if enabled[1] else (y,)
+        zs = (z, (2 * offsets[2]) - z) if enabled[2] else (z,)
+        for mirrored_x in xs:
+            for mirrored_y in ys:
+                for mirrored_z in zs:
+                    expanded.add((mirrored_x, mirrored_y, mirrored_z))
+    return expanded
 
 
 def _expand_mirror_cells(ctx, base_cells: set[tuple[int, int, int]]) -> set[tuple[int, int, int]]:
@@ -664,13 +756,18 @@ def _volume_fill_bounds(
     seed_y: int,
     seed_z: int,
 ) -> tuple[int, int, int, int, int, int]:
-    rows = voxels.to_list()
-    if not rows:
+    bounds = voxels.occupancy().bounds()
+    if bounds is None:
         return seed_x, seed_x, seed_y, seed_y, seed_z, seed_z
-    xs = [row[0] for row in rows] + [seed_x]
-    ys = [row[1] for row in rows] + [seed_y]
-    zs = [row[2] for row in rows] + [seed_z]
-    return min(xs), max(xs), min(ys), max(ys), min(zs), max(zs)
+    (min_x, min_y, min_z), (max_x, max_y, max_z) = bounds
+    return (
+        min(min_x, seed_x),
+        max(max_x, seed_x),
+        min(min_y, seed_y),
+        max(max_y, seed_y),
+        min(min_z, seed_z),
+        max(max_z, seed_z),
+    )
 
 
 def _flood_volume_region(
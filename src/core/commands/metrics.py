@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from core.analysis.memory import estimate_object_bytes
+from core.commands.command import Command
+
+# Upper bounds (ms) of the histogram buckets; the last bucket holds everything slower.
+HISTOGRAM_BOUNDS_MS = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0, 1000.0)
+DEFAULT_SLOW_THRESHOLD_MS = 100.0
+DEFAULT_METRICS_WINDOW = 256
+# Estimated undo cost of a sample that is not slow: the command object plus one stored entry
+# (a delta, snapshot row or colour-map item) per touched cell.
+UNDO_COMMAND_BYTES = 160
+UNDO_ENTRY_BYTES = 80
+
+
+@dataclass(slots=True)
+class CommandSample:
+    command: str
+    phase: str
+    duration_ms: float
+    cells: int
+    # Estimated from the cells touched; slow samples are measured, which costs more than most
+    # commands.
+    undo_bytes: int
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass(slots=True)
+class CommandSummary:
+    command: str
+    phase: str
+    count: int
+    total_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    mean_cells: float
+    mean_undo_bytes: float
+    histogram: list[int]
+
+
+class CommandMetrics:
+    # Rolling per-command timings: the last `window` samples of each (command, phase) pair.
+    # Samples at or over slow_threshold_ms are also passed to on_slow.
+    def __init__(
+        self,
+        *,
+        window: int = DEFAULT_METRICS_WINDOW,
+        slow_threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS,
+    ) -> None:
+        if window < 1:
+            raise ValueError(f"Unsupported metrics window: {window}")
+        self.window = window
+        self.slow_threshold_ms = float(slow_threshold_ms)
+        self.on_slow: Callable[[CommandSample], None] | None = None
+        self._samples: dict[tuple[str, str], deque[CommandSample]] = {}
+
+    def record(self, command: Command, phase: str, duration_ms: float) -> CommandSample:
+        slow = float(duration_ms) >= self.slow_threshold_ms
+        cells = int(command.cells_touched)
+        sample = CommandSample(
+            command=command.name,
+            phase=phase,
+            duration_ms=float(duration_ms),
+            cells=cells,
+            undo_bytes=(
+                estimate_object_bytes(command)
+                if slow
+                else UNDO_COMMAND_BYTES + cells * UNDO_ENTRY_BYTES
+            ),
+        )
+        key = (sample.command, phase)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = deque(maxlen=self.window)
+            self._samples[key] = samples
+        samples.append(sample)
+        if slow and self.on_slow is not None:
+            self.on_slow(sample)
+        return sample
+
+    def samples(self, command: str, phase: str = "do") -> list[CommandSample]:
+        return list(self._samples.get((command, phase), ()))
+
+    def summaries(self) -> list[CommandSummary]:
+        # Most total time first: the top rows are what dominates editing latency.
+        summaries = [
+            _summarize(command, phase, list(samples))
+            for (command, phase), samples in self._samples.items()
+            if samples
+        ]
+        summaries.sort(key=lambda summary: summary.total_ms, reverse=True)
+        return summaries
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+
+def _summarize(command: str, phase: str, samples: list[CommandSample]) -> CommandSummary:
+    durations = sorted(sample.duration_ms for sample in samples)
+    histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for duration in durations:
+        histogram[bisect_left(HISTOGRAM_BOUNDS_MS, duration)] += 1
+    count = len(samples)
+    return CommandSummary(
+        command=command,
+        phase=phase,
+        count=count,
+        total_ms=sum(durations),
+        p50_ms=_nearest_rank(durations, 0.50),
+        p95_ms=_nearest_rank(durations, 0.95),
+        max_ms=durations[-1],
+        mean_cells=sum(sample.cells for sample in samples) / count,
+        mean_undo_bytes=sum(sample.undo_bytes for sample in samples) / count,
+        histogram=histogram,
+    )
+
+
+def _nearest_rank(sorted_values: list[float], quantile: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(quantile * len(sorted_values)) - 1))
+    return sorted_values[index]
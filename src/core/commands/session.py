@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import inspect
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from core.commands import demo_commands
+from core.commands.command import Command
+from core.commands.command_stack import CommandStack
+from core.io.project_io import save_project
+from core.part import Part
+from core.project import Project
+
+SESSION_FORMAT = "voxel-tool-session"
+# Version 2 adds the undo/redo depth at the start of recording and the start project file.
+SESSION_VERSION = 2
+# Written next to a log as "<log stem><suffix>": the project as it was when recording started.
+SESSION_PROJECT_SUFFIX = ".start.json"
+SESSION_OPS = ("do", "undo", "redo", "begin", "end", "cancel")
+# Editor settings that change what a command does; recorded whenever they change.
+SESSION_STATE_FIELDS = (
+    "active_part_id",
+    "brush_size",
+    "brush_shape",
+    "fill_connectivity",
+    "fill_max_cells",
+    "mirror_x_enabled",
+    "mirror_y_enabled",
+    "mirror_z_enabled",
+    "mirror_x_offset",
+    "mirror_y_offset",
+    "mirror_z_offset",
+)
+_COMMAND_TYPES: dict[str, type[Command]] = {
+    command_type.__name__: command_type
+    for command_type in (
+        demo_commands.RenameProjectCommand,
+        demo_commands.RenamePartCommand,
+        demo_commands.PaintVoxelCommand,
+        demo_commands.AddVoxelCommand,
+        demo_commands.RemoveVoxelCommand,
+        demo_commands.ClearVoxelsCommand,
+        demo_commands.CreateTestVoxelsCommand,
+        demo_commands.BoxVoxelCommand,
+        demo_commands.LineVoxelCommand,
+        demo_commands.FillVoxelCommand,
+        demo_commands.MoveSelectedVoxelsCommand,
+        demo_commands.DuplicateSelectedVoxelsCommand,
+    )
+}
+
+
+@dataclass(slots=True)
+class SessionStep:
+    op: str
+    # Seconds since recording started.
+    at: float = 0.0
+    command: str | None = None
+    args: dict[str, object] = field(default_factory=dict)
+    label: str | None = None
+    # Only the editor settings that changed since the previous step.
+    state: dict[str, object] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Session:
+    project_name: str = ""
+    steps: list[SessionStep] = field(default_factory=list)
+    # History that already existed when recording started; the log cannot undo or redo into it.
+    undo_depth: int = 0
+    redo_depth: int = 0
+    # Project the steps were recorded against, resolved next to the log on load.
+    project_file: str | None = None
+
+
+@dataclass(slots=True)
+class ReplayStepResult:
+    index: int
+    op: str
+    name: str
+    duration_ms: float
+    cells: int
+
+
+@dataclass(slots=True)
+class ReplayReport:
+    steps: list[ReplayStepResult] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(step.duration_ms for step in self.steps)
+
+    def slowest(self, limit: int = 10) -> list[ReplayStepResult]:
+        return sorted(self.steps, key=lambda step: step.duration_ms, reverse=True)[:limit]
+
+
+@dataclass(slots=True)
+class ReplayContext:
+    # Headless stand-in for the editor's AppContext: just what the commands read.
+    current_project: Project
+    brush_size: int = 1
+    brush_shape: str = "cube"
+    fill_connectivity: str = "plane"
+    fill_max_cells: int = 5000
+    mirror_x_enabled: bool = False
+    mirror_y_enabled: bool = False
+    mirror_z_enabled: bool = False
+    mirror_x_offset: int = 0
+    mirror_y_offset: int = 0
+    mirror_z_offset: int = 0
+    selected_voxels: set[tuple[int, int, int]] = field(default_factory=set)
+
+    @property
+    def active_part(self) -> Part:
+        return self.current_project.scene.get_active_part()
+
+    @property
+    def active_part_id(self) -> str:
+        return self.active_part.part_id
+
+    def apply_state(self, state: dict[str, object]) -> None:
+        for name, value in state.items():
+            if name == "active_part_id":
+                # Parts created outside the command stack are not in the log; keep the
+                # current part when the recorded one does not exist in this project.
+                if value in self.current_project.scene.parts:
+                    self.current_project.scene.set_active_part(str(value))
+            elif name in SESSION_STATE_FIELDS:
+                setattr(self, name, value)
+
+    def set_selected_voxels(self, cells: set[tuple[int, int, int]]) -> None:
+        self.selected_voxels = {tuple(cell) for cell in cells}
+
+    def expand_mirrored_cells(self, cells: set[tuple[int, int, int]]) -> set[tuple[int, int, int]]:
+        return demo_commands.mirror_cells(
+            cells,
+            enabled=(self.mirror_x_enabled, self.mirror_y_enabled, self.mirror_z_enabled),
+            offsets=(self.mirror_x_offset, self.mirror_y_offset, self.mirror_z_offset),
+        )
+
+
+class SessionRecorder:
+    # Attached as CommandStack.recorder; appends one step per stack operation. Given the project
+    # and stack, it keeps a copy-on-write snapshot of the project and the history depth at the
+    # start, so a replay can begin from what the artist had.
+    def __init__(
+        self,
+        project_name: str = "",
+        *,
+        project: Project | None = None,
+        command_stack: CommandStack | None = None,
+    ) -> None:
+        if project is not None and not project_name:
+            project_name = project.name
+        self.session = Session(project_name=project_name)
+        if command_stack is not None:
+            self.session.undo_depth = len(command_stack.undo_stack)
+            self.session.redo_depth = len(command_stack.redo_stack)
+        self.start_project: Project | None = None
+        if project is not None:
+            self.start_project = Project(
+                name=project.name,
+                created_utc=project.created_utc,
+                modified_utc=project.modified_utc,
+                scene=project.scene.snapshot(),
+                editor_state=dict(project.editor_state),
+            )
+        self._started = time.perf_counter()
+        self._state: dict[str, object] = {}
+        # Names of commands that ran but cannot be serialized; replays of this log will diverge.
+        self.unsupported: list[str] = []
+
+    def record_command(self, command: Command, ctx) -> None:
+        if type(command).__name__ not in _COMMAND_TYPES:
+            self.unsupported.append(command.name)
+            return
+        self.session.steps.append(
+            SessionStep(
+                op="do",
+                at=self._elapsed(),
+                command=type(command).__name__,
+                args=command_args(command),
+                state=self._changed_state(ctx),
+            )
+        )
+
+    def record_step(
+        self, op: str, label: str | None = None, args: dict[str, object] | None = None
+    ) -> None:
+        if op not in SESSION_OPS:
+            raise ValueError(f"Unsupported session op: {op}")
+        self.session.steps.append(
+            SessionStep(op=op, at=self._elapsed(), label=label, args=dict(args or {}))
+        )
+
+    def _elapsed(self) -> float:
+        return round(time.perf_counter() - self._started, 4)
+
+    def _changed_state(self, ctx) -> dict[str, object]:
+        changed: dict[str, object] = {}
+        for name in SESSION_STATE_FIELDS:
+            if not hasattr(ctx, name):
+                continue
+            value = getattr(ctx, name)
+            if self._state.get(name) != value or name not in self._state:
+                changed[name] = value
+                self._state[name] = value
+        return changed
+
+
+def command_args(command: Command) -> dict[str, object]:
+    command_type = type(command)
+    if command_type.__name__ not in _COMMAND_TYPES:
+        raise ValueError(f"Unsupported session command: {command_type.__name__}")
+    # Every recordable command keeps its constructor arguments as same-named attributes.
+    args: dict[str, object] = {}
+    for name in inspect.signature(command_type.__init__).parameters:
+        if name == "self":
+            continue
+        value = getattr(command, name)
+        if isinstance(value, (set, frozenset)):
+            value = [list(cell) for cell in sorted(value)]
+        args[name] = value
+    return args
+
+
+def command_from_step(step: SessionStep) -> Command:
+    command_type = _COMMAND_TYPES.get(step.command or "")
+    if command_type is None:
+        raise ValueError(f"Unsupported session command: {step.command}")
+    args = dict(step.args)
+    if "selected_cells" in args:
+        args["selected_cells"] = {tuple(cell) for cell in args["selected_cells"]}
+    return command_type(**args)
+
+
+def save_session(session: Session, path: str | Path, *, project: Project | None = None) -> None:
+    # JSON lines: a header, then one compact step per line. A start project is saved beside
+    # the log and named in the header.
+    path = Path(path)
+    header: dict[str, object] = {
+        "format": SESSION_FORMAT,
+        "version": SESSION_VERSION,
+        "project": session.project_name,
+        "undo_depth": session.undo_depth,
+        "redo_depth": session.redo_depth,
+    }
+    if project is not None:
+        project_path = path.with_name(f"{path.stem}{SESSION_PROJECT_SUFFIX}")
+        save_project(project, str(project_path))
+        header["project_file"] = project_path.name
+    elif session.project_file is not None:
+        header["project_file"] = Path(session.project_file).name
+    lines = [json.dumps(header, separators=(",", ":"))]
+    for step in session.steps:
+        payload: dict[str, object] = {"op": step.op, "at": step.at}
+        if step.command is not None:
+            payload["command"] = step.command
+        if step.args:
+            payload["args"] = step.args
+        if step.label is not None:
+            payload["label"] = step.label
+        if step.state:
+            payload["state"] = step.state
+        lines.append(json.dumps(payload, separators=(",", ":")))
+    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def load_session(path: str | Path) -> Session:
+    lines = [line for line in Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty session log: {path}")
+    header = json.loads(lines[0])
+    if header.get("format") != SESSION_FORMAT:
+        raise ValueError(f"Unsupported session format: {header.get('format')}")
+    if int(header.get("version", 0)) > SESSION_VERSION:
+        raise ValueError(f"Unsupported session version: {header.get('version')}")
+    project_file = header.get("project_file")
+    session = Session(
+        project_name=str(header.get("project", "")),
+        undo_depth=int(header.get("undo_depth", 0)),
+        redo_depth=int(header.get("redo_depth", 0)),
+        project_file=str(Path(path).with_name(str(project_file))) if project_file else None,
+    )
+    for line in lines[1:]:
+        payload = json.loads(line)
+        op = str(payload.get("op", ""))
+        if op not in SESSION_OPS:
+            raise ValueError(f"Unsupported session op: {op}")
+        session.steps.append(
+            SessionStep(
+                op=op,
+                at=float(payload.get("at", 0.0)),
+                command=payload.get("command"),
+                args=dict(payload.get("args", {})),
+                label=payload.get("label"),
+                state=dict(payload.get("state", {})),
+            )
+        )
+    return session
+
+
+def replay_session(
+    session: Session,
+    project: Project | None = None,
+    *,
+    command_stack: CommandStack | None = None,
+) -> ReplayReport:
+    # Applies every step through a CommandStack and times each one. Transactions end at the
+    # step that closes them, so the "end" step carries no command time of its own. The stack
+    # only records undo/redo when it has something to pop, so one that finds the replay stack
+    # empty reached history from before recording started, which the log cannot reproduce.
+    project = project if project is not None else Project(name=session.project_name or "Replay")
+    stack = command_stack if command_stack is not None else CommandStack()
+    ctx = ReplayContext(current_project=project)
+    report = ReplayReport()
+    for index, step in enumerate(session.steps):
+        ctx.apply_state(step.state)
+        command = command_from_step(step) if step.op == "do" else None
+        started = time.perf_counter()
+        if command is not None:
+            stack.do(command, ctx)
+        elif step.op in ("undo", "redo"):
+            pending = stack.undo_stack if step.op == "undo" else stack.redo_stack
+            if not pending:
+                raise ValueError(
+                    f"Session step {index} ({step.op}) reaches history from before recording "
+                    f"started (undo depth {session.undo_depth}, redo depth "
+                    f"{session.redo_depth}); the replay would diverge."
+                )
+            command = pending[-1]
+            if step.op == "undo":
+                stack.undo(ctx)
+            else:
+                stack.redo(ctx)
+        elif step.op == "begin":
+            stack.begin_transaction(step.label or "Transaction")
+        elif step.op == "end":
+            stack.end_transaction()
+        else:
+            stack.cancel_transaction(ctx, rollback=bool(step.args.get("rollback", True)))
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        report.steps.append(
+            ReplayStepResult(
+                index=index,
+                op=step.op,
+                name=command.name if command is not None else (step.label or step.op),
+                duration_ms=duration_ms,
+                cells=command.cells_touched if command is not None else 0,
+            )
+        )
+    return report
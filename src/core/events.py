@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+PART_VOXELS_CHANGED = "part_voxels_changed"
+PART_TRANSFORM_CHANGED = "part_transform_changed"
+# Parts added, removed, renamed, reordered, shown/hidden or locked/unlocked.
+PARTS_CHANGED = "parts_changed"
+ACTIVE_PART_CHANGED = "active_part_changed"
+PALETTE_CHANGED = "palette_changed"
+SELECTION_CHANGED = "selection_changed"
+TOOL_CHANGED = "tool_changed"
+PROJECT_CHANGED = "project_changed"
+HISTORY_CHANGED = "history_changed"
+
+EVENT_KINDS = (
+    PART_VOXELS_CHANGED,
+    PART_TRANSFORM_CHANGED,
+    PARTS_CHANGED,
+    ACTIVE_PART_CHANGED,
+    PALETTE_CHANGED,
+    SELECTION_CHANGED,
+    TOOL_CHANGED,
+    PROJECT_CHANGED,
+    HISTORY_CHANGED,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class ChangeEvent:
+    kind: str
+    part_id: str | None = None
+
+
+ChangeListener = Callable[[list[ChangeEvent]], None]
+
+
+class ChangeBus:
+    # Listeners receive every event of their kinds emitted since the last delivery, in order and
+    # without duplicates. Inside batch() delivery waits until the outermost batch closes.
+    def __init__(self) -> None:
+        self._listeners: list[tuple[frozenset[str], ChangeListener]] = []
+        self._pending: dict[ChangeEvent, None] = {}
+        self._batch_depth = 0
+
+    def subscribe(self, kinds: Iterable[str], listener: ChangeListener) -> Callable[[], None]:
+        kind_set = frozenset(kinds)
+        unknown = kind_set.difference(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Unsupported change event kind: {sorted(unknown)[0]}")
+        entry = (kind_set, listener)
+        self._listeners.append(entry)
+
+        def unsubscribe() -> None:
+            if entry in self._listeners:
+                self._listeners.remove(entry)
+
+        return unsubscribe
+
+    def emit(self, kind: str, part_id: str | None = None) -> None:
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unsupported change event kind: {kind}")
+        self._pending[ChangeEvent(kind, part_id)] = None
+        if self._batch_depth == 0:
+            self.flush()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        while self._pending:
+            events = list(self._pending)
+            self._pending = {}
+            for kinds, listener in list(self._listeners):
+                matching = [event for event in events if event.kind in kinds]
+                if matching:
+                    listener(matching)
+
+
+class SceneChangeTracker:
+    # Scenes record their own edits once watched (Scene.watch_changes), so collect() drains that
+    # record instead of comparing every part; publishing costs the size of the edit.
+    def __init__(self) -> None:
+        self._project_id: int | None = None
+        self._scene = None
+        self._active_part_id: str | None = None
+
+    def collect(self, project) -> list[ChangeEvent]:
+        scene = project.scene
+        if id(project) != self._project_id or scene is not self._scene:
+            # Subscribers reload everything for a new project, so its earlier edits are moot.
+            self._project_id = id(project)
+            self._scene = scene
+            self._active_part_id = scene.active_part_id
+            scene.watch_changes()
+            scene.drain_changes()
+            return [
+                ChangeEvent(PROJECT_CHANGED),
+                ChangeEvent(PARTS_CHANGED),
+                ChangeEvent(ACTIVE_PART_CHANGED, scene.active_part_id),
+            ]
+        events = scene.drain_changes()
+        if scene.active_part_id != self._active_part_id:
+            events.append(ChangeEvent(ACTIVE_PART_CHANGED, scene.active_part_id))
+            self._active_part_id = scene.active_part_id
+        return events
@@ -1,17 +1,31 @@
 """Core export helpers."""
 
-from core.export.gltf_exporter import GltfExportStats, export_voxels_to_gltf
-from core.export.obj_exporter import ObjExportOptions, export_voxels_to_obj
-from core.export.qb_exporter import QbExportStats, export_voxels_to_qb
-from core.export.vox_exporter import VoxExportStats, export_voxels_to_vox
+from importlib import import_module
 
-__all__ = [
-    "ObjExportOptions",
-    "export_voxels_to_obj",
-    "GltfExportStats",
-    "export_voxels_to_gltf",
-    "QbExportStats",
-    "export_voxels_to_qb",
-    "VoxExportStats",
-    "export_voxels_to_vox",
-]
+# Exporters are imported on first use, so importing one of them (or this package) at startup
+# does not load every format.
+_EXPORTS = {
+    "ObjExportOptions": "core.export.obj_exporter",
+    "export_voxels_to_obj": "core.export.obj_exporter",
+    "GltfExportStats": "core.export.gltf_exporter",
+    "export_voxels_to_gltf": "core.export.gltf_exporter",
+    "export_parts_to_gltf": "core.export.gltf_exporter",
+    "QbExportStats": "core.export.qb_exporter",
+    "export_voxels_to_qb": "core.export.qb_exporter",
+    "export_models_to_qb": "core.export.qb_exporter",
+    "VoxExportStats": "core.export.vox_exporter",
+    "export_voxels_to_vox": "core.export.vox_exporter",
+    "export_models_to_vox": "core.export.vox_exporter",
+    "export_parts_to_vox": "core.export.vox_exporter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
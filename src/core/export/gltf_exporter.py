@@ -4,20 +4,26 @@ import base64
 import json
 import struct
 from dataclasses import dataclass
-from math import sqrt
+from math import cos, radians, sin, sqrt
+from typing import Callable
 
 from core.meshing.mesh import SurfaceMesh
-from core.meshing.solidify import build_solid_mesh
+from core.meshing.solidify import load_or_build_mesh
 from core.palette import DEFAULT_PALETTE
+from core.part import Part
 from core.voxels.voxel_grid import VoxelGrid
+from util.trace import traced
 
 
 @dataclass(slots=True)
 class GltfExportStats:
     vertex_count: int
     triangle_count: int
+    mesh_count: int = 1
+    node_count: int = 1
 
 
+@traced(category="export")
 def export_voxels_to_gltf(
     voxels: VoxelGrid,
     path: str,
@@ -25,135 +31,222 @@ def export_voxels_to_gltf(
     *,
     scale_factor: float = 1.0,
     palette: list[tuple[int, int, int]] | None = None,
+    progress: Callable[[float], None] | None = None,
 ) -> GltfExportStats:
-    export_mesh = mesh or build_solid_mesh(voxels, greedy=True)
+    export_mesh = mesh or load_or_build_mesh(voxels, greedy=True)
+    if progress is not None:
+        progress(0.4)
     if export_mesh.face_count == 0:
-        payload = {
+        _write_gltf(_empty_payload(), path)
+        return GltfExportStats(vertex_count=0, triangle_count=0)
+
+    builder = _GltfBuilder(palette or list(DEFAULT_PALETTE), float(scale_factor))
+    builder.add_mesh(export_mesh)
+    if progress is not None:
+        progress(0.8)
+    payload = builder.payload([{"mesh": 0}])
+    _write_gltf(payload, path)
+    if progress is not None:
+        progress(1.0)
+    return GltfExportStats(vertex_count=builder.vertex_count, triangle_count=builder.triangle_count)
+
+
+@traced(category="export")
+def export_parts_to_gltf(
+    parts: list[Part],
+    path: str,
+    *,
+    scale_factor: float = 1.0,
+    palette: list[tuple[int, int, int]] | None = None,
+    progress: Callable[[float], None] | None = None,
+) -> GltfExportStats:
+    # Parts sharing a voxel asset reference one glTF mesh from separate nodes.
+    scale = float(scale_factor)
+    builder = _GltfBuilder(palette or list(DEFAULT_PALETTE), scale)
+    asset_meshes: dict[int, int | None] = {}
+    nodes: list[dict[str, object]] = []
+    for part_index, part in enumerate(parts):
+        asset_key = id(part.asset)
+        if asset_key not in asset_meshes:
+            export_mesh = part.mesh_cache
+            if export_mesh is None or part.dirty_bounds is not None:
+                export_mesh = load_or_build_mesh(part.voxels, lineage=part.part_id)
+            asset_meshes[asset_key] = (
+                builder.add_mesh(export_mesh, name=part.name) if export_mesh.face_count else None
+            )
+        mesh_index = asset_meshes[asset_key]
+        if progress is not None:
+            progress(0.8 * (part_index + 1) / len(parts))
+        if mesh_index is None:
+            continue
+        nodes.append(_part_node(part, mesh_index, scale))
+
+    if not nodes:
+        _write_gltf(_empty_payload(), path)
+        return GltfExportStats(vertex_count=0, triangle_count=0, mesh_count=0, node_count=0)
+    _write_gltf(builder.payload(nodes), path)
+    if progress is not None:
+        progress(1.0)
+    return GltfExportStats(
+        vertex_count=builder.vertex_count,
+        triangle_count=builder.triangle_count,
+        mesh_count=len(builder.meshes),
+        node_count=len(nodes),
+    )
+
+
+class _GltfBuilder:
+    def __init__(self, palette: list[tuple[int, int, int]], scale: float) -> None:
+        self.palette = palette
+        self.scale = scale
+        self.buffer_parts: list[bytes] = []
+        self.byte_length = 0
+        self.buffer_views: list[dict[str, object]] = []
+        self.accessors: list[dict[str, object]] = []
+        self.meshes: list[dict[str, object]] = []
+        self.materials: list[dict[str, object]] = []
+        self.vertex_count = 0
+        self.triangle_count = 0
+
+    def add_mesh(self, mesh: SurfaceMesh, *, name: str | None = None) -> int:
+        scale = self.scale
+        positions = [(x * scale, y * scale, z * scale) for x, y, z in mesh.vertices]
+        indices: list[int] = []
+        for a, b, c, d in mesh.quads:
+            indices.extend((a, b, c, a, c, d))
+        normals = _build_vertex_normals(mesh, len(positions))
+        uvs = _build_vertex_uvs(positions)
+        vertex_colors = _build_vertex_colors(mesh, self.palette, len(positions))
+
+        vertex_bytes = b"".join(struct.pack("<3f", x, y, z) for x, y, z in positions)
+        normal_bytes = b"".join(struct.pack("<3f", nx, ny, nz) for nx, ny, nz in normals)
+        uv_bytes = b"".join(struct.pack("<2f", u, v) for u, v in uvs)
+        color_bytes = b"".join(struct.pack("<3f", r, g, b) for r, g, b in vertex_colors)
+        index_bytes = b"".join(struct.pack("<I", idx) for idx in indices)
+        min_bounds = [min(v[i] for v in positions) for i in range(3)]
+        max_bounds = [max(v[i] for v in positions) for i in range(3)]
+        position_accessor = self._add_accessor(vertex_bytes, 34962, 5126, len(positions), "VEC3")
+        self.accessors[position_accessor]["min"] = min_bounds
+        self.accessors[position_accessor]["max"] = max_bounds
+        normal_accessor = self._add_accessor(normal_bytes, 34962, 5126, len(normals), "VEC3")
+        uv_accessor = self._add_accessor(uv_bytes, 34962, 5126, len(uvs), "VEC2")
+        color_accessor = self._add_accessor(color_bytes, 34962, 5126, len(vertex_colors), "VEC3")
+        index_accessor = self._add_accessor(index_bytes, 34963, 5125, len(indices), "SCALAR")
+
+        self.materials.append(_build_material_baseline(mesh, self.palette))
+        mesh_payload: dict[str, object] = {
+            "primitives": [
+                {
+                    "attributes": {
+                        "POSITION": position_accessor,
+                        "NORMAL": normal_accessor,
+                        "TEXCOORD_0": uv_accessor,
+                        "COLOR_0": color_accessor,
+                    },
+                    "indices": index_accessor,
+                    "material": len(self.materials) - 1,
+                    "mode": 4,
+                }
+            ]
+        }
+        if name:
+            mesh_payload["name"] = name
+        self.meshes.append(mesh_payload)
+        self.vertex_count += len(positions)
+        self.triangle_count += len(indices) // 3
+        return len(self.meshes) - 1
+
+    def payload(self, nodes: list[dict[str, object]]) -> dict[str, object]:
+        combined = b"".join(self.buffer_parts)
+        encoded = base64.b64encode(combined).decode("ascii")
+        data_uri = "data:application/octet-stream;base64," + encoded
+        return {
             "asset": {"version": "2.0", "generator": "VoxelTool"},
-            "scenes": [{"nodes": []}],
+            "buffers": [{"byteLength": len(combined), "uri": data_uri}],
+            "bufferViews": self.buffer_views,
+            "accessors": self.accessors,
+            "meshes": self.meshes,
+            "materials": self.materials,
+            "nodes": nodes,
+            "scenes": [{"nodes": list(range(len(nodes)))}],
             "scene": 0,
-            "nodes": [],
-            "meshes": [],
         }
-        with open(path, "w", encoding="utf-8") as file_obj:
-            json.dump(payload, file_obj, indent=2)
-        return GltfExportStats(vertex_count=0, triangle_count=0)
 
-    scale = float(scale_factor)
-    positions = [(x * scale, y * scale, z * scale) for x, y, z in export_mesh.vertices]
-    indices: list[int] = []
-    for a, b, c, d in export_mesh.quads:
-        indices.extend((a, b, c, a, c, d))
-    normals = _build_vertex_normals(export_mesh, len(positions))
-    uvs = _build_vertex_uvs(positions)
-    vertex_colors = _build_vertex_colors(export_mesh, palette or list(DEFAULT_PALETTE), len(positions))
-    material_palette = palette or list(DEFAULT_PALETTE)
-    material = _build_material_baseline(export_mesh, material_palette)
-
-    vertex_bytes = b"".join(struct.pack("<3f", x, y, z) for x, y, z in positions)
-    normal_bytes = b"".join(struct.pack("<3f", nx, ny, nz) for nx, ny, nz in normals)
-    uv_bytes = b"".join(struct.pack("<2f", u, v) for u, v in uvs)
-    color_bytes = b"".join(struct.pack("<3f", r, g, b) for r, g, b in vertex_colors)
-    index_bytes = b"".join(struct.pack("<I", idx) for idx in indices)
-    if len(vertex_bytes) % 4 != 0:
-        vertex_bytes += b"\x00" * (4 - (len(vertex_bytes) % 4))
-    if len(normal_bytes) % 4 != 0:
-        normal_bytes += b"\x00" * (4 - (len(normal_bytes) % 4))
-    if len(uv_bytes) % 4 != 0:
-        uv_bytes += b"\x00" * (4 - (len(uv_bytes) % 4))
-    if len(color_bytes) % 4 != 0:
-        color_bytes += b"\x00" * (4 - (len(color_bytes) % 4))
-    if len(index_bytes) % 4 != 0:
-        index_bytes += b"\x00" * (4 - (len(index_bytes) % 4))
-    combined = vertex_bytes + normal_bytes + uv_bytes + color_bytes + index_bytes
-    data_uri = "data:application/octet-stream;base64," + base64.b64encode(combined).decode("ascii")
-
-    min_bounds = [min(v[i] for v in positions) for i in range(3)]
-    max_bounds = [max(v[i] for v in positions) for i in range(3)]
-    payload = {
-        "asset": {"version": "2.0", "generator": "VoxelTool"},
-        "buffers": [{"byteLength": len(combined), "uri": data_uri}],
-        "bufferViews": [
-            {"buffer": 0, "byteOffset": 0, "byteLength": len(vertex_bytes), "target": 34962},
-            {"buffer": 0, "byteOffset": len(vertex_bytes), "byteLength": len(normal_bytes), "target": 34962},
-            {
-                "buffer": 0,
-                "byteOffset": len(vertex_bytes) + len(normal_bytes),
-                "byteLength": len(uv_bytes),
-                "target": 34962,
-            },
+    def _add_accessor(
+        self,
+        data: bytes,
+        target: int,
+        component_type: int,
+        count: int,
+        accessor_type: str,
+    ) -> int:
+        if len(data) % 4 != 0:
+            data += b"\x00" * (4 - (len(data) % 4))
+        self.buffer_views.append(
+            {"buffer": 0, "byteOffset": self.byte_length, "byteLength": len(data), "target": target}
+        )
+        self.buffer_parts.append(data)
+        self.byte_length += len(data)
+        self.accessors.append(
             {
-                "buffer": 0,
-                "byteOffset": len(vertex_bytes) + len(normal_bytes) + len(uv_bytes),
-                "byteLength": len(color_bytes),
-                "target": 34962,
-            },
-            {
-                "buffer": 0,
-                "byteOffset": len(vertex_bytes) + len(normal_bytes) + len(uv_bytes) + len(color_bytes),
-                "byteLength": len(index_bytes),
-                "target": 34963,
-            },
-        ],
-        "accessors": [
-            {
-                "bufferView": 0,
-                "byteOffset": 0,
-                "componentType": 5126,
-                "count": len(positions),
-                "type": "VEC3",
-                "min": min_bounds,
-                "max": max_bounds,
-            },
-            {
-                "bufferView": 1,
-                "byteOffset": 0,
-                "componentType": 5126,
-                "count": len(normals),
-                "type": "VEC3",
-            },
-            {
-                "bufferView": 2,
+                "bufferView": len(self.buffer_views) - 1,
                 "byteOffset": 0,
-                "componentType": 5126,
-                "count": len(uvs),
-                "type": "VEC2",
-            },
-            {
-                "bufferView": 3,
-                "byteOffset": 0,
-                "componentType": 5126,
-                "count": len(vertex_colors),
-                "type": "VEC3",
-            },
-            {
-                "bufferView": 4,
-                "byteOffset": 0,
-                "componentType": 5125,
-                "count": len(indices),
-                "type": "SCALAR",
-            },
-        ],
-        "meshes": [
-            {
-                "primitives": [
-                    {
-                        "attributes": {"POSITION": 0, "NORMAL": 1, "TEXCOORD_0": 2, "COLOR_0": 3},
-                        "indices": 4,
-                        "material": 0,
-                        "mode": 4,
-                    }
-                ]
+                "componentType": component_type,
+                "count": count,
+                "type": accessor_type,
             }
-        ],
-        "materials": [material],
-        "nodes": [{"mesh": 0}],
-        "scenes": [{"nodes": [0]}],
+        )
+        return len(self.accessors) - 1
+
+
+def _part_node(part: Part, mesh_index: int, scale: float) -> dict[str, object]:
+    node: dict[str, object] = {"name": part.name, "mesh": mesh_index}
+    if any(part.position):
+        node["translation"] = [float(value) * scale for value in part.position]
+    if any(part.rotation):
+        node["rotation"] = _euler_xyz_to_quaternion(part.rotation)
+    if part.scale != (1.0, 1.0, 1.0):
+        node["scale"] = [float(value) for value in part.scale]
+    return node
+
+
+def _euler_xyz_to_quaternion(rotation: tuple[float, float, float]) -> list[float]:
+    # Matches the viewport order: rotate X, then Y, then Z in the parent frame (q = qx * qy * qz).
+    rx, ry, rz = (radians(float(value)) * 0.5 for value in rotation)
+    qx = (sin(rx), 0.0, 0.0, cos(rx))
+    qy = (0.0, sin(ry), 0.0, cos(ry))
+    qz = (0.0, 0.0, sin(rz), cos(rz))
+    x, y, z, w = _quaternion_multiply(_quaternion_multiply(qx, qy), qz)
+    return [x, y, z, w]
+
+
+def _quaternion_multiply(
+    a: tuple[float, float, float, float],
+    b: tuple[float, float, float, float],
+) -> tuple[float, float, float, float]:
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    )
+
+
+def _empty_payload() -> dict[str, object]:
+    return {
+        "asset": {"version": "2.0", "generator": "VoxelTool"},
+        "scenes": [{"nodes": []}],
         "scene": 0,
+        "nodes": [],
+        "meshes": [],
     }
+
+
+def _write_gltf(payload: dict[str, object], path: str) -> None:
     with open(path, "w", encoding="utf-8") as file_obj:
         json.dump(payload, file_obj, indent=2)
-    return GltfExportStats(vertex_count=len(positions), triangle_count=len(indices) // 3)
 
 
 def _build_vertex_normals(mesh: SurfaceMesh, vertex_count: int) -> list[tuple[float, float, float]]:
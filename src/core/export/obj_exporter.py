@@ -2,10 +2,15 @@ from __future__ import annotations
 
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Callable
 
 from core.meshing.mesh import SurfaceMesh
-from core.meshing.solidify import build_solid_mesh
+from core.meshing.solidify import load_or_build_mesh
 from core.voxels.voxel_grid import VoxelGrid
+from util.trace import traced
+
+
+_PROGRESS_FACE_STRIDE = 4096
 
 
 @dataclass(slots=True)
@@ -21,15 +26,20 @@ class ObjExportOptions:
     multi_material_by_color: bool = False
 
 
+@traced(category="export")
 def export_voxels_to_obj(
     voxels: VoxelGrid,
     palette: list[tuple[int, int, int]],
     path: str,
     options: ObjExportOptions | None = None,
     mesh: SurfaceMesh | None = None,
+    *,
+    progress: Callable[[float], None] | None = None,
 ) -> None:
     export_options = options or ObjExportOptions()
-    export_mesh = mesh or build_solid_mesh(voxels, greedy=export_options.use_greedy_mesh)
+    export_mesh = mesh or load_or_build_mesh(voxels, greedy=export_options.use_greedy_mesh)
+    if progress is not None:
+        progress(0.3)
     transformed_vertices = _transform_vertices(
         export_mesh.vertices,
         pivot_mode=export_options.pivot_mode,
@@ -78,7 +88,10 @@ def export_voxels_to_obj(
                 quad_uv_indices.append((base + 1, base + 2, base + 3, base + 4))
 
         current_material: str | None = None
+        face_total = max(1, len(export_mesh.quads))
         for face_index, (a, b, c, d) in enumerate(export_mesh.quads):
+            if progress is not None and face_index % _PROGRESS_FACE_STRIDE == 0:
+                progress(0.3 + (0.7 * face_index / face_total))
             if mtl_name and export_options.multi_material_by_color:
                 color_index = 0
                 if face_index < len(export_mesh.face_colors):
@@ -100,6 +113,8 @@ def export_voxels_to_obj(
                     file_obj.write(f"f {a + 1}/{uv[0]} {b + 1}/{uv[1]} {c + 1}/{uv[2]} {d + 1}/{uv[3]}\n")
                 else:
                     file_obj.write(f"f {a + 1} {b + 1} {c + 1} {d + 1}\n")
+    if progress is not None:
+        progress(1.0)
 
 
 def _transform_vertices(
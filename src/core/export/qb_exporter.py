@@ -2,8 +2,15 @@ from __future__ import annotations
 
 import struct
 from dataclasses import dataclass
+from typing import Callable
 
+import numpy as np
+
+from core.io.qb_io import QB_CODEFLAG, QB_NEXTSLICEFLAG
 from core.voxels.voxel_grid import VoxelGrid
+from util.trace import traced
+
+_MIN_RLE_RUN = 3
 
 
 @dataclass(slots=True)
@@ -18,74 +25,130 @@ def export_voxels_to_qb(
     path: str,
     *,
     matrix_name: str = "VoxelTool",
+    compressed: bool = False,
+    progress: Callable[[float], None] | None = None,
 ) -> QbExportStats:
-    rows = voxels.to_list()
-    if not rows:
-        payload = _build_qb_payload([], matrix_name=matrix_name)
-        with open(path, "wb") as file_obj:
-            file_obj.write(payload)
-        return QbExportStats(voxel_count=0, size=(0, 0, 0))
+    return export_models_to_qb(
+        [voxels], palette, path, names=[matrix_name], compressed=compressed, progress=progress
+    )
+
 
-    xs = [x for x, _y, _z, _c in rows]
-    ys = [y for _x, y, _z, _c in rows]
-    zs = [z for _x, _y, z, _c in rows]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    min_z, max_z = min(zs), max(zs)
-    size_x = max_x - min_x + 1
-    size_y = max_y - min_y + 1
-    size_z = max_z - min_z + 1
-    voxel_map: dict[tuple[int, int, int], int] = {}
-    for x, y, z, color in rows:
-        voxel_map[(x - min_x, y - min_y, z - min_z)] = int(color)
-
-    payload = _build_qb_payload(
-        [
+@traced(category="export")
+def export_models_to_qb(
+    models: list[VoxelGrid],
+    palette: list[tuple[int, int, int]],
+    path: str,
+    *,
+    names: list[str] | None = None,
+    compressed: bool = False,
+    progress: Callable[[float], None] | None = None,
+) -> QbExportStats:
+    matrix_names = names or []
+    palette_words = _palette_words(palette)
+    matrices: list[dict[str, object]] = []
+    voxel_count = 0
+    mins: list[np.ndarray] = []
+    maxs: list[np.ndarray] = []
+    for model_index, model in enumerate(models):
+        coords, colors = model.to_arrays()
+        if coords.shape[0] == 0:
+            continue
+        low = coords.min(axis=0)
+        high = coords.max(axis=0)
+        size_x, size_y, size_z = (int(value) for value in high - low + 1)
+        local = coords - low
+        words = np.zeros((size_z, size_y, size_x), dtype="<u4")
+        words[local[:, 2], local[:, 1], local[:, 0]] = palette_words[_palette_slots(colors, palette)]
+        name = matrix_names[model_index] if model_index < len(matrix_names) else "VoxelTool"
+        matrices.append(
             {
-                "name": matrix_name,
+                "name": name,
                 "size": (size_x, size_y, size_z),
-                "pos": (min_x, min_y, min_z),
-                "voxels": voxel_map,
+                "pos": tuple(int(value) for value in low),
+                "words": words,
             }
-        ],
-        palette=palette,
-        matrix_name=matrix_name,
-    )
+        )
+        voxel_count += int(coords.shape[0])
+        mins.append(low)
+        maxs.append(high)
+        if progress is not None:
+            progress(0.5 * (model_index + 1) / len(models))
+
+    payload = _build_qb_payload(matrices, compressed=compressed, progress=progress)
     with open(path, "wb") as file_obj:
         file_obj.write(payload)
-    return QbExportStats(voxel_count=len(rows), size=(size_x, size_y, size_z))
+    if progress is not None:
+        progress(1.0)
+    if not matrices:
+        return QbExportStats(voxel_count=0, size=(0, 0, 0))
+    size = tuple(int(value) for value in np.max(maxs, axis=0) - np.min(mins, axis=0) + 1)
+    return QbExportStats(voxel_count=voxel_count, size=size)
+
+
+def _palette_words(palette: list[tuple[int, int, int]]) -> np.ndarray:
+    rgb = np.zeros((len(palette) + 1, 3), dtype=np.uint32)
+    if palette:
+        rgb[:-1] = np.asarray(palette, dtype=np.int64).reshape(-1, 3) & 0xFF
+    return (rgb[:, 0] | (rgb[:, 1] << 8) | (rgb[:, 2] << 16) | np.uint32(255 << 24)).astype("<u4")
+
+
+def _palette_slots(colors: np.ndarray, palette: list[tuple[int, int, int]]) -> np.ndarray:
+    # Out-of-range indices map to the trailing black entry of _palette_words.
+    in_range = (colors >= 0) & (colors < len(palette))
+    return np.where(in_range, colors, len(palette))
 
 
 def _build_qb_payload(
     matrices: list[dict[str, object]],
     *,
-    palette: list[tuple[int, int, int]] | None = None,
     matrix_name: str = "VoxelTool",
+    compressed: bool = False,
+    progress: Callable[[float], None] | None = None,
 ) -> bytes:
-    header = struct.pack("<IIIIII", 257, 0, 0, 0, 0, len(matrices))
-    body = b""
-    for matrix in matrices:
+    parts = [struct.pack("<IIIIII", 257, 0, 0, 1 if compressed else 0, 0, len(matrices))]
+    for matrix_index, matrix in enumerate(matrices):
         name_text = str(matrix.get("name", matrix_name))
         name = name_text.encode("utf-8")
         if len(name) > 255:
             name = name[:255]
         sx, sy, sz = matrix["size"]
         px, py, pz = matrix["pos"]
-        voxel_map: dict[tuple[int, int, int], int] = matrix["voxels"]  # type: ignore[assignment]
-        body += struct.pack("<B", len(name)) + name
-        body += struct.pack("<IIIiii", int(sx), int(sy), int(sz), int(px), int(py), int(pz))
-        for z in range(int(sz)):
-            for y in range(int(sy)):
-                for x in range(int(sx)):
-                    color_index = voxel_map.get((x, y, z))
-                    if color_index is None:
-                        body += struct.pack("<I", 0)
-                        continue
-                    rgb = (0, 0, 0)
-                    if palette and 0 <= int(color_index) < len(palette):
-                        rgb = palette[int(color_index)]
-                    r, g, b = rgb
-                    value = (int(r) & 0xFF) | ((int(g) & 0xFF) << 8) | ((int(b) & 0xFF) << 16) | (255 << 24)
-                    body += struct.pack("<I", value)
-    return header + body
+        words: np.ndarray = matrix["words"]  # type: ignore[assignment]
+        parts.append(struct.pack("<B", len(name)) + name)
+        parts.append(struct.pack("<IIIiii", int(sx), int(sy), int(sz), int(px), int(py), int(pz)))
+        if compressed:
+            for slice_index, slice_words in enumerate(words):
+                parts.append(_encode_rle_slice(slice_words.reshape(-1)))
+                if progress is not None:
+                    progress(0.5 + 0.5 * (matrix_index + slice_index / len(words)) / len(matrices))
+        else:
+            parts.append(np.ascontiguousarray(words, dtype="<u4").tobytes())
+        if progress is not None:
+            progress(0.5 + 0.5 * (matrix_index + 1) / len(matrices))
+    return b"".join(parts)
+
+
+def _encode_rle_slice(words: np.ndarray) -> bytes:
+    if words.size == 0:
+        return struct.pack("<I", QB_NEXTSLICEFLAG)
+    starts = np.flatnonzero(np.concatenate(([True], words[1:] != words[:-1])))
+    lengths = np.diff(np.append(starts, words.size))
+    values = words[starts].astype(np.uint32)
+    is_run = lengths >= _MIN_RLE_RUN
+    token_counts = np.where(is_run, 3, lengths)
+    token_offsets = np.concatenate(([0], np.cumsum(token_counts)[:-1]))
+    out = np.empty(int(token_counts.sum()) + 1, dtype="<u4")
 
+    run_offsets = token_offsets[is_run]
+    out[run_offsets] = QB_CODEFLAG
+    out[run_offsets + 1] = lengths[is_run]
+    out[run_offsets + 2] = values[is_run]
+
+    literal_lengths = lengths[~is_run]
+    literal_offsets = np.repeat(token_offsets[~is_run], literal_lengths)
+    literal_steps = np.arange(literal_offsets.size) - np.repeat(
+        np.cumsum(literal_lengths) - literal_lengths, literal_lengths
+    )
+    out[literal_offsets + literal_steps] = np.repeat(values[~is_run], literal_lengths)
+    out[-1] = QB_NEXTSLICEFLAG
+    return out.tobytes()
@@ -1,90 +1,336 @@
 from __future__ import annotations
 
+import os
 import struct
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Callable
 
+import numpy as np
+
+from core.part import Part
 from core.voxels.voxel_grid import VoxelGrid
+from util.trace import traced
+
+VOX_TILE_SIZE = 256
 
 
 @dataclass(slots=True)
 class VoxExportStats:
     voxel_count: int
     size: tuple[int, int, int]
+    tile_count: int = 1
+
+
+@dataclass(slots=True)
+class _VoxTile:
+    model_index: int
+    origin: tuple[int, int, int]
+    coords: np.ndarray
+    colors: np.ndarray
+
+
+@dataclass(slots=True)
+class _VoxInstance:
+    model_index: int
+    name: str | None = None
+    translation: tuple[int, int, int] | None = None
+    rotation: int | None = None
 
 
 def export_voxels_to_vox(
     voxels: VoxelGrid,
     palette: list[tuple[int, int, int]],
     path: str,
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> VoxExportStats:
+    return export_models_to_vox([voxels], palette, path, progress=progress)
+
+
+@traced(category="export")
+def export_models_to_vox(
+    models: list[VoxelGrid],
+    palette: list[tuple[int, int, int]],
+    path: str,
+    *,
+    names: list[str] | None = None,
+    progress: Callable[[float], None] | None = None,
 ) -> VoxExportStats:
-    rows = voxels.to_list()
-    if not rows:
+    model_names = names or []
+    instances = [
+        _VoxInstance(index, model_names[index] if index < len(model_names) else None)
+        for index in range(len(models))
+    ]
+    return _export_instances(models, instances, palette, path, progress)
+
+
+@traced(category="export")
+def export_parts_to_vox(
+    parts: list[Part],
+    palette: list[tuple[int, int, int]],
+    path: str,
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> VoxExportStats:
+    # Linked parts share one set of models; each part gets its own transform whose shape
+    # nodes reference the same model ids. VOX transforms only hold integer translations and
+    # 90-degree rotations, so other rotations are dropped and scale is ignored.
+    models: list[VoxelGrid] = []
+    model_for_asset: dict[int, int] = {}
+    instances: list[_VoxInstance] = []
+    for part in parts:
+        model_index = model_for_asset.setdefault(id(part.asset), len(models))
+        if model_index == len(models):
+            models.append(part.voxels)
+        translation = tuple(int(round(float(value))) for value in part.position)
+        instances.append(
+            _VoxInstance(
+                model_index,
+                part.name,
+                translation if any(translation) else None,
+                _encode_vox_rotation(part.rotation),
+            )
+        )
+    return _export_instances(models, instances, palette, path, progress)
+
+
+def _export_instances(
+    models: list[VoxelGrid],
+    instances: list[_VoxInstance],
+    palette: list[tuple[int, int, int]],
+    path: str,
+    progress: Callable[[float], None] | None,
+) -> VoxExportStats:
+    tiles: list[_VoxTile] = []
+    voxel_count = 0
+    mins: list[np.ndarray] = []
+    maxs: list[np.ndarray] = []
+    for model_index, model in enumerate(models):
+        coords, colors = model.to_arrays()
+        if coords.shape[0] == 0:
+            continue
+        voxel_count += int(coords.shape[0])
+        mins.append(coords.min(axis=0))
+        maxs.append(coords.max(axis=0))
+        tiles.extend(_split_into_tiles(model_index, coords, colors))
+
+    if not tiles:
         size = (1, 1, 1)
-        payload = _build_vox_payload([], size, palette)
-        with open(path, "wb") as file_obj:
-            file_obj.write(payload)
-        return VoxExportStats(voxel_count=0, size=size)
-
-    xs = [row[0] for row in rows]
-    ys = [row[1] for row in rows]
-    zs = [row[2] for row in rows]
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    min_z, max_z = min(zs), max(zs)
-    size = (max_x - min_x + 1, max_y - min_y + 1, max_z - min_z + 1)
-    if any(component > 255 for component in size):
-        raise ValueError("VOX export supports maximum model size of 255 on each axis.")
-    if len(rows) > 255 * 255 * 255:
-        raise ValueError("VOX export voxel count exceeds single-model limits.")
-
-    vox_entries: list[tuple[int, int, int, int]] = []
-    for x, y, z, color_index in rows:
-        vx = x - min_x
-        vy = y - min_y
-        vz = z - min_z
-        vox_color = _to_vox_palette_index(color_index)
-        vox_entries.append((vx, vy, vz, vox_color))
-
-    payload = _build_vox_payload(vox_entries, size, palette)
+        empty_coords = np.zeros((0, 3), dtype=np.int64)
+        tiles = [_VoxTile(0, (0, 0, 0), empty_coords, np.zeros(0, dtype=np.int64))]
+    else:
+        low = np.min(mins, axis=0)
+        high = np.max(maxs, axis=0)
+        size = tuple(int(value) for value in high - low + 1)
+
+    payload = _build_vox_payload(tiles, palette, instances, progress)
     with open(path, "wb") as file_obj:
         file_obj.write(payload)
-    return VoxExportStats(voxel_count=len(vox_entries), size=size)
+    if progress is not None:
+        progress(1.0)
+    return VoxExportStats(voxel_count=voxel_count, size=size, tile_count=len(tiles))
+
+
+def _split_into_tiles(model_index: int, coords: np.ndarray, colors: np.ndarray) -> list[_VoxTile]:
+    mins = coords.min(axis=0)
+    tile_keys = (coords - mins) // VOX_TILE_SIZE
+    unique_keys, inverse = np.unique(tile_keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(unique_keys.shape[0] + 1))
+    tiles: list[_VoxTile] = []
+    for tile_index, key in enumerate(unique_keys):
+        members = order[bounds[tile_index] : bounds[tile_index + 1]]
+        origin = mins + key * VOX_TILE_SIZE
+        tiles.append(
+            _VoxTile(
+                model_index=model_index,
+                origin=tuple(int(value) for value in origin),
+                coords=coords[members] - origin,
+                colors=colors[members],
+            )
+        )
+    return tiles
+
+
+def _encode_tile(tile: _VoxTile) -> tuple[bytes, tuple[int, int, int]]:
+    if tile.coords.shape[0] == 0:
+        size = (1, 1, 1)
+        entries = np.zeros((0, 4), dtype=np.uint8)
+    else:
+        size = tuple(int(value) for value in tile.coords.max(axis=0) + 1)
+        order = np.lexsort((tile.coords[:, 2], tile.coords[:, 1], tile.coords[:, 0]))
+        entries = np.empty((order.size, 4), dtype=np.uint8)
+        entries[:, :3] = tile.coords[order]
+        entries[:, 3] = _to_vox_palette_index(tile.colors[order])
+    size_chunk = _chunk(b"SIZE", struct.pack("<III", *size), b"")
+    xyzi_chunk = _chunk(b"XYZI", struct.pack("<I", entries.shape[0]) + entries.tobytes(), b"")
+    return size_chunk + xyzi_chunk, size
 
 
 def _build_vox_payload(
-    entries: list[tuple[int, int, int, int]],
-    size: tuple[int, int, int],
+    tiles: list[_VoxTile],
     palette: list[tuple[int, int, int]],
+    instances: list[_VoxInstance],
+    progress: Callable[[float], None] | None = None,
 ) -> bytes:
-    size_chunk_content = struct.pack("<III", size[0], size[1], size[2])
-    size_chunk = _chunk(b"SIZE", size_chunk_content, b"")
-
-    xyzi_payload = struct.pack("<I", len(entries))
-    for x, y, z, color in entries:
-        xyzi_payload += struct.pack("<BBBB", x, y, z, color)
-    xyzi_chunk = _chunk(b"XYZI", xyzi_payload, b"")
-
-    rgba_bytes = b""
-    for i in range(256):
-        if i == 255:
-            rgba_bytes += struct.pack("<BBBB", 0, 0, 0, 0)
-            continue
-        if i < len(palette):
-            r, g, b = palette[i]
-        else:
-            r, g, b = 0, 0, 0
-        rgba_bytes += struct.pack("<BBBB", int(r), int(g), int(b), 255)
-    rgba_chunk = _chunk(b"RGBA", rgba_bytes, b"")
-
-    children = size_chunk + xyzi_chunk + rgba_chunk
+    encoded: list[tuple[bytes, tuple[int, int, int]]] = []
+    with ThreadPoolExecutor(max_workers=min(len(tiles), os.cpu_count() or 1)) as executor:
+        for tile_result in executor.map(_encode_tile, tiles):
+            encoded.append(tile_result)
+            if progress is not None:
+                progress(0.9 * len(encoded) / len(tiles))
+
+    model_chunks = [chunk for chunk, _size in encoded]
+    graph_chunks = _build_scene_graph(tiles, [size for _chunk_bytes, size in encoded], instances)
+    rgba_chunk = _chunk(b"RGBA", _rgba_content(palette), b"")
+    children = b"".join(model_chunks) + b"".join(graph_chunks) + rgba_chunk
     main_chunk = _chunk(b"MAIN", b"", children)
     return b"VOX " + struct.pack("<I", 150) + main_chunk
 
 
+def _build_scene_graph(
+    tiles: list[_VoxTile],
+    sizes: list[tuple[int, int, int]],
+    instances: list[_VoxInstance],
+) -> list[bytes]:
+    # Root transform 0 -> root group 1 -> one transform/group pair per instance -> one
+    # transform/shape pair per tile. Tile translations point at the model pivot (size // 2);
+    # instances of the same model reference the same model ids from their shape nodes.
+    model_tiles: dict[int, list[int]] = {}
+    for model_id, tile in enumerate(tiles):
+        model_tiles.setdefault(tile.model_index, []).append(model_id)
+    placed = [instance for instance in instances if instance.model_index in model_tiles]
+    if not placed:
+        placed = [_VoxInstance(tiles[0].model_index)]
+    next_node_id = 2
+    instance_nodes: list[tuple[int, int]] = []
+    for _instance in placed:
+        instance_nodes.append((next_node_id, next_node_id + 1))
+        next_node_id += 2
+
+    chunks = [
+        _transform_chunk(0, 1, layer_id=-1),
+        _group_chunk(1, [transform_id for transform_id, _group_id in instance_nodes]),
+    ]
+    tile_chunks: list[bytes] = []
+    for instance, (transform_id, group_id) in zip(placed, instance_nodes):
+        tile_transform_ids: list[int] = []
+        for model_id in model_tiles[instance.model_index]:
+            tile_transform_id = next_node_id
+            next_node_id += 2
+            tile_transform_ids.append(tile_transform_id)
+            tile, size = tiles[model_id], sizes[model_id]
+            translation = [origin + (extent // 2) for origin, extent in zip(tile.origin, size)]
+            tile_chunks.append(
+                _transform_chunk(tile_transform_id, tile_transform_id + 1, translation=translation)
+            )
+            tile_chunks.append(_shape_chunk(tile_transform_id + 1, model_id))
+        chunks.append(
+            _transform_chunk(
+                transform_id,
+                group_id,
+                name=instance.name,
+                translation=list(instance.translation) if instance.translation else None,
+                rotation=instance.rotation,
+            )
+        )
+        chunks.append(_group_chunk(group_id, tile_transform_ids))
+    return chunks + tile_chunks
+
+
+def _transform_chunk(
+    node_id: int,
+    child_id: int,
+    *,
+    layer_id: int = 0,
+    translation: list[int] | None = None,
+    name: str | None = None,
+    rotation: int | None = None,
+) -> bytes:
+    attributes = {"_name": name} if name else {}
+    frame = {"_t": " ".join(str(int(value)) for value in translation)} if translation else {}
+    if rotation is not None:
+        frame["_r"] = str(rotation)
+    content = (
+        struct.pack("<i", node_id)
+        + _vox_dict(attributes)
+        + struct.pack("<iiii", child_id, -1, layer_id, 1)
+        + _vox_dict(frame)
+    )
+    return _chunk(b"nTRN", content, b"")
+
+
+def _group_chunk(node_id: int, child_ids: list[int]) -> bytes:
+    child_block = struct.pack(f"<i{len(child_ids)}i", len(child_ids), *child_ids)
+    content = struct.pack("<i", node_id) + _vox_dict({}) + child_block
+    return _chunk(b"nGRP", content, b"")
+
+
+def _shape_chunk(node_id: int, model_id: int) -> bytes:
+    model_block = struct.pack("<ii", 1, model_id) + _vox_dict({})
+    content = struct.pack("<i", node_id) + _vox_dict({}) + model_block
+    return _chunk(b"nSHP", content, b"")
+
+
+def _vox_dict(entries: dict[str, str]) -> bytes:
+    parts = [struct.pack("<i", len(entries))]
+    for key, value in entries.items():
+        key_bytes = key.encode("utf-8")
+        value_bytes = value.encode("utf-8")
+        parts.append(struct.pack("<i", len(key_bytes)) + key_bytes)
+        parts.append(struct.pack("<i", len(value_bytes)) + value_bytes)
+    return b"".join(parts)
+
+
+def _rgba_content(palette: list[tuple[int, int, int]]) -> bytes:
+    rgba = np.zeros((256, 4), dtype=np.uint8)
+    rgba[:255, 3] = 255
+    colors = palette[:255]
+    if colors:
+        rgba[: len(colors), :3] = np.asarray(colors, dtype=np.int64).reshape(-1, 3) & 0xFF
+    return rgba.tobytes()
+
+
 def _chunk(chunk_id: bytes, content: bytes, children: bytes) -> bytes:
     return chunk_id + struct.pack("<II", len(content), len(children)) + content + children
 
 
-def _to_vox_palette_index(color_index: int) -> int:
+def _encode_vox_rotation(rotation: tuple[float, float, float]) -> int | None:
+    # Inverse of the importer's packed _r decoding; None for identity or non-90-degree angles.
+    quarter_turns = []
+    for angle in rotation:
+        turns = float(angle) / 90.0
+        if abs(turns - round(turns)) > 1e-6:
+            return None
+        quarter_turns.append(int(round(turns)) % 4)
+    if not any(quarter_turns):
+        return None
+    matrix = np.eye(3, dtype=np.int64)
+    for axis, turns in enumerate(quarter_turns):
+        matrix = matrix @ _axis_quarter_turns(axis, turns)
+    columns = [int(np.flatnonzero(row)[0]) for row in matrix]
+    value = columns[0] | (columns[1] << 2)
+    for row_index, column in enumerate(columns):
+        if matrix[row_index, column] < 0:
+            value |= 1 << (4 + row_index)
+    return value
+
+
+def _axis_quarter_turns(axis: int, turns: int) -> np.ndarray:
+    cos_value, sin_value = ((1, 0), (0, 1), (-1, 0), (0, -1))[turns]
+    first, second = [index for index in range(3) if index != axis]
+    if axis == 1:
+        first, second = second, first
+    matrix = np.eye(3, dtype=np.int64)
+    matrix[first, first] = cos_value
+    matrix[first, second] = -sin_value
+    matrix[second, first] = sin_value
+    matrix[second, second] = cos_value
+    return matrix
+
+
+def _to_vox_palette_index(color_index: np.ndarray | int) -> np.ndarray | int:
     # VOX uses palette indices in 1..255 where 0 means empty.
-    return (int(color_index) % 255) + 1
+    return (color_index % 255) + 1
@@ -1,27 +1,31 @@
 """Project IO package."""
 
-from core.io.palette_io import load_palette_preset, load_palette_preset_with_metadata, save_palette_preset
-from core.io.project_io import load_project, save_project
-from core.io.qb_io import load_qb_models, load_qb_models_with_warnings
-from core.io.recovery_io import (
-    clear_recovery_snapshot,
-    get_recovery_path,
-    has_recovery_snapshot,
-    load_recovery_snapshot,
-    save_recovery_snapshot,
-)
+from importlib import import_module
 
-__all__ = [
-    "load_project",
-    "save_project",
-    "load_palette_preset",
-    "load_palette_preset_with_metadata",
-    "save_palette_preset",
-    "load_qb_models",
-    "load_qb_models_with_warnings",
-    "get_recovery_path",
-    "has_recovery_snapshot",
-    "save_recovery_snapshot",
-    "load_recovery_snapshot",
-    "clear_recovery_snapshot",
-]
+# Loaders are imported on first use, so importing one of them (or this package) at startup
+# does not load every format.
+_EXPORTS = {
+    "load_project": "core.io.project_io",
+    "save_project": "core.io.project_io",
+    "load_palette_preset": "core.io.palette_io",
+    "load_palette_preset_with_metadata": "core.io.palette_io",
+    "save_palette_preset": "core.io.palette_io",
+    "load_qb_models": "core.io.qb_io",
+    "load_qb_models_with_warnings": "core.io.qb_io",
+    "get_recovery_path": "core.io.recovery_io",
+    "has_recovery_snapshot": "core.io.recovery_io",
+    "save_recovery_snapshot": "core.io.recovery_io",
+    "load_recovery_snapshot": "core.io.recovery_io",
+    "clear_recovery_snapshot": "core.io.recovery_io",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -2,27 +2,38 @@ from __future__ import annotations
 
 import json
 
-from core.part import Part
+from core.part import Part, PartAsset
 from core.project import Project
 from core.scene import PartGroup, Scene
 from core.voxels.voxel_grid import VoxelGrid
+from util.trace import traced
 
 _REQUIRED_BASE_KEYS = {"name", "created_utc", "modified_utc", "version"}
 _SCENE_KEY = "scene"
 _LEGACY_VOXELS_KEY = "voxels"
 _EDITOR_STATE_KEY = "editor_state"
-CURRENT_PROJECT_SCHEMA_VERSION = 1
+# Version 2 lets a linked part store `linked_to` instead of its own voxels.
+CURRENT_PROJECT_SCHEMA_VERSION = 2
 MIN_SUPPORTED_PROJECT_SCHEMA_VERSION = 1
 
 
+@traced(category="io")
 def save_project(project: Project, path: str) -> None:
     parts_payload = []
+    asset_owners: dict[int, str] = {}
     for _, part in project.scene.iter_parts_ordered():
-        parts_payload.append(
+        part_payload: dict[str, object] = {
+            "part_id": part.part_id,
+            "name": part.name,
+        }
+        # Linked parts store their voxels once, on the first part that uses the asset.
+        owner_id = asset_owners.setdefault(id(part.asset), part.part_id)
+        if owner_id == part.part_id:
+            part_payload["voxels"] = part.voxels.to_list()
+        else:
+            part_payload["linked_to"] = owner_id
+        part_payload.update(
             {
-                "part_id": part.part_id,
-                "name": part.name,
-                "voxels": part.voxels.to_list(),
                 "position": [part.position[0], part.position[1], part.position[2]],
                 "rotation": [part.rotation[0], part.rotation[1], part.rotation[2]],
                 "scale": [part.scale[0], part.scale[1], part.scale[2]],
@@ -30,12 +41,14 @@ def save_project(project: Project, path: str) -> None:
                 "locked": part.locked,
             }
         )
+        parts_payload.append(part_payload)
 
     payload = {
         "name": project.name,
         "created_utc": project.created_utc,
         "modified_utc": project.modified_utc,
-        "version": project.version,
+        # Files are always written in the current schema, whatever version they were read from.
+        "version": CURRENT_PROJECT_SCHEMA_VERSION,
         "editor_state": project.editor_state,
         "scene": {
             "active_part_id": project.scene.active_part_id,
@@ -56,6 +69,7 @@ def save_project(project: Project, path: str) -> None:
         json.dump(payload, file_obj, indent=2)
 
 
+@traced(category="io")
 def load_project(path: str) -> Project:
     with open(path, "r", encoding="utf-8") as file_obj:
         payload = json.load(file_obj)
@@ -111,7 +125,16 @@ def load_project(path: str) -> Project:
             name = str(raw_part.get("name", "")).strip()
             if not part_id or not name:
                 raise ValueError("Invalid project schema (part_id and name are required for each part).")
-            voxels = VoxelGrid.from_list(raw_part.get("voxels", []))
+            linked_to = raw_part.get("linked_to")
+            if linked_to is not None:
+                owner = scene.parts.get(str(linked_to))
+                if owner is None:
+                    raise ValueError(
+                        "Invalid project schema (linked_to must reference an earlier part)."
+                    )
+                asset = owner.asset
+            else:
+                asset = PartAsset(voxels=VoxelGrid.from_list(raw_part.get("voxels", [])))
             position = _parse_vec3(raw_part.get("position"), default=(0.0, 0.0, 0.0))
             rotation = _parse_vec3(raw_part.get("rotation"), default=(0.0, 0.0, 0.0))
             scale = _parse_vec3(raw_part.get("scale"), default=(1.0, 1.0, 1.0))
@@ -120,14 +143,14 @@ def load_project(path: str) -> Project:
             scene.parts[part_id] = Part(
                 part_id=part_id,
                 name=name,
-                voxels=voxels,
+                asset=asset,
                 position=position,
                 rotation=rotation,
                 scale=scale,
                 visible=visible,
                 locked=locked,
             )
-            scene.part_order.append(part_id)
+            scene.part_order[part_id] = None
 
         if not scene.parts:
             raise ValueError("Invalid project schema (scene must contain at least one part).")
@@ -136,7 +159,7 @@ def load_project(path: str) -> Project:
         if requested_active_part_id in scene.parts:
             scene.active_part_id = requested_active_part_id
         else:
-            scene.active_part_id = scene.part_order[0]
+            scene.active_part_id = next(iter(scene.part_order))
 
         groups_payload = scene_payload.get("groups", [])
         if isinstance(groups_payload, list):
@@ -147,11 +170,11 @@ def load_project(path: str) -> Project:
                 name = str(raw_group.get("name", "")).strip()
                 if not group_id or not name:
                     continue
-                part_ids = [
+                part_ids = dict.fromkeys(
                     part_id
                     for part_id in raw_group.get("part_ids", [])
                     if isinstance(part_id, str) and part_id in scene.parts
-                ]
+                )
                 scene.groups[group_id] = PartGroup(
                     group_id=group_id,
                     name=name,
@@ -159,7 +182,7 @@ def load_project(path: str) -> Project:
                     visible=bool(raw_group.get("visible", True)),
                     locked=bool(raw_group.get("locked", False)),
                 )
-                scene.group_order.append(group_id)
+                scene.group_order[group_id] = None
 
         project.scene = scene
     else:
@@ -185,6 +208,17 @@ def _migrate_payload(
     if from_version == target_version:
         return payload
     migrated = dict(payload)
-    # Migration scaffolding placeholder for future schema upgrades.
+    for version in range(from_version, target_version):
+        migrated = _MIGRATIONS[version](migrated)
     migrated["version"] = target_version
     return migrated
+
+
+def _migrate_v1_to_v2(payload: dict[str, object]) -> dict[str, object]:
+    # v1 parts each carry their own voxels, which v2 still reads as-is; only v2 writers emit
+    # linked_to, so the step changes nothing but the version.
+    return payload
+
+
+# Upgrade steps keyed by the version they upgrade from.
+_MIGRATIONS = {1: _migrate_v1_to_v2}
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 import struct
+from typing import Callable
+
+import numpy as np
 
 from core.voxels.voxel_grid import VoxelGrid
+from util.trace import traced
+
+QB_CODEFLAG = 2
+QB_NEXTSLICEFLAG = 6
 
 
 def load_qb_models(path: str) -> tuple[list[VoxelGrid], list[tuple[int, int, int]]]:
@@ -10,8 +17,14 @@ def load_qb_models(path: str) -> tuple[list[VoxelGrid], list[tuple[int, int, int
     return models, palette
 
 
-def load_qb_models_with_warnings(path: str) -> tuple[list[VoxelGrid], list[tuple[int, int, int]], list[str]]:
-    payload = open(path, "rb").read()
+@traced(category="io")
+def load_qb_models_with_warnings(
+    path: str,
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> tuple[list[VoxelGrid], list[tuple[int, int, int]], list[str]]:
+    with open(path, "rb") as file_obj:
+        payload = file_obj.read()
     if len(payload) < 24:
         raise ValueError("Invalid QB payload.")
     offset = 0
@@ -23,14 +36,11 @@ def load_qb_models_with_warnings(path: str) -> tuple[list[VoxelGrid], list[tuple
         raise ValueError("Unsupported QB version.")
 
     warnings: list[str] = []
-    if compressed:
-        raise ValueError("Compressed QB is not supported in this feasibility slice.")
-
     models: list[VoxelGrid] = []
     palette: list[tuple[int, int, int]] = []
-    color_to_index: dict[tuple[int, int, int], int] = {}
+    color_to_index: dict[int, int] = {}
 
-    for _ in range(matrix_count):
+    for matrix_index in range(matrix_count):
         if offset >= len(payload):
             break
         name_len = payload[offset]
@@ -42,30 +52,21 @@ def load_qb_models_with_warnings(path: str) -> tuple[list[VoxelGrid], list[tuple
             raise ValueError("Invalid QB matrix header size.")
         size_x, size_y, size_z, pos_x, pos_y, pos_z = struct.unpack("<IIIiii", payload[offset : offset + 24])
         offset += 24
-        voxel_words = size_x * size_y * size_z
-        byte_count = voxel_words * 4
-        if offset + byte_count > len(payload):
-            raise ValueError("Invalid QB voxel payload size.")
-        voxels = VoxelGrid()
-        for z in range(size_z):
-            for y in range(size_y):
-                for x in range(size_x):
-                    raw = struct.unpack("<I", payload[offset : offset + 4])[0]
-                    offset += 4
-                    a = (raw >> 24) & 0xFF
-                    b = (raw >> 16) & 0xFF
-                    g = (raw >> 8) & 0xFF
-                    r = raw & 0xFF
-                    if a == 0:
-                        continue
-                    rgb = (r, g, b) if color_format == 0 else (b, g, r)
-                    color_index = color_to_index.get(rgb)
-                    if color_index is None:
-                        color_index = len(palette)
-                        palette.append(rgb)
-                        color_to_index[rgb] = color_index
-                    voxels.set(int(x) + int(pos_x), int(y) + int(pos_y), int(z) + int(pos_z), color_index)
-        models.append(voxels)
+        if compressed:
+            words, offset = _decode_rle_matrix(payload, offset, (size_x, size_y, size_z))
+        else:
+            voxel_words = size_x * size_y * size_z
+            if offset + voxel_words * 4 > len(payload):
+                raise ValueError("Invalid QB voxel payload size.")
+            words = np.frombuffer(payload, dtype="<u4", count=voxel_words, offset=offset).reshape(
+                size_z, size_y, size_x
+            )
+            offset += voxel_words * 4
+        models.append(
+            _matrix_to_grid(words, (pos_x, pos_y, pos_z), color_format, palette, color_to_index)
+        )
+        if progress is not None:
+            progress((matrix_index + 1) / matrix_count)
 
     if not models:
         raise ValueError("QB file missing model data.")
@@ -73,3 +74,67 @@ def load_qb_models_with_warnings(path: str) -> tuple[list[VoxelGrid], list[tuple
         palette = [(0, 0, 0)]
     return models, palette, warnings
 
+
+def _decode_rle_matrix(
+    payload: bytes, offset: int, size: tuple[int, int, int]
+) -> tuple[np.ndarray, int]:
+    size_x, size_y, size_z = size
+    slice_words = size_x * size_y
+    words = np.zeros((size_z, slice_words), dtype=np.uint32)
+    end = len(payload)
+    for z in range(size_z):
+        row = words[z]
+        index = 0
+        while True:
+            if offset + 4 > end:
+                raise ValueError("Invalid QB voxel payload size.")
+            data = struct.unpack_from("<I", payload, offset)[0]
+            offset += 4
+            if data == QB_NEXTSLICEFLAG:
+                break
+            count = 1
+            if data == QB_CODEFLAG:
+                if offset + 8 > end:
+                    raise ValueError("Invalid QB voxel payload size.")
+                count, data = struct.unpack_from("<II", payload, offset)
+                offset += 8
+            if index + count > slice_words:
+                raise ValueError("Invalid QB compressed run length.")
+            row[index : index + count] = data
+            index += count
+    return words.reshape(size_z, size_y, size_x), offset
+
+
+def _matrix_to_grid(
+    words: np.ndarray,
+    position: tuple[int, int, int],
+    color_format: int,
+    palette: list[tuple[int, int, int]],
+    color_to_index: dict[int, int],
+) -> VoxelGrid:
+    voxels = VoxelGrid()
+    filled = (words >> 24) != 0
+    zs, ys, xs = np.nonzero(filled)
+    if zs.size == 0:
+        return voxels
+    raw = words[filled]
+    channel_0 = raw & 0xFF
+    channel_2 = (raw >> 16) & 0xFF
+    if color_format == 0:
+        keys = (channel_0 << 16) | (raw & 0xFF00) | channel_2
+    else:
+        keys = (channel_2 << 16) | (raw & 0xFF00) | channel_0
+    unique_keys, first_seen, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    lut = np.empty(unique_keys.size, dtype=np.int64)
+    for unique_slot in np.argsort(first_seen, kind="stable").tolist():
+        key = int(unique_keys[unique_slot])
+        color_index = color_to_index.get(key)
+        if color_index is None:
+            color_index = len(palette)
+            palette.append(((key >> 16) & 0xFF, (key >> 8) & 0xFF, key & 0xFF))
+            color_to_index[key] = color_index
+        lut[unique_slot] = color_index
+    pos_x, pos_y, pos_z = position
+    coords = np.stack((xs + int(pos_x), ys + int(pos_y), zs + int(pos_z)), axis=1)
+    voxels.set_many(coords, lut[inverse.reshape(-1)])
+    return voxels
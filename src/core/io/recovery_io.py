@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from copy import deepcopy
+from dataclasses import replace
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -29,8 +29,12 @@ def get_recovery_diagnostic_path() -> Path:
 
 def save_recovery_snapshot(project: Project) -> Path:
     path = get_recovery_path()
-    snapshot = deepcopy(project)
-    snapshot.editor_state = dict(project.editor_state)
+    # The scene snapshot shares voxel chunks with the live project instead of deep-copying.
+    snapshot = replace(
+        project,
+        scene=project.scene.snapshot(),
+        editor_state=dict(project.editor_state),
+    )
     snapshot.editor_state[_RECOVERY_EDITOR_STATE_KEY] = _RECOVERY_VERSION
     save_project(snapshot, str(path))
     return path
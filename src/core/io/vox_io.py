@@ -1,8 +1,53 @@
 from __future__ import annotations
 
+import mmap
+import os
 import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
 
 from core.voxels.voxel_grid import VoxelGrid
+from util.trace import traced
+
+_IDENTITY_ROTATION = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+_KNOWN_CHUNKS = {b"MAIN", b"SIZE", b"XYZI", b"RGBA", b"nTRN", b"nGRP", b"nSHP", b"LAYR"}
+_MAX_GRAPH_DEPTH = 256
+
+
+@dataclass(slots=True)
+class _VoxModelChunk:
+    size: tuple[int, int, int]
+    voxel_offset: int
+    voxel_count: int
+    legacy_translation: tuple[int, int, int] = (0, 0, 0)
+
+
+@dataclass(slots=True)
+class _VoxTransformNode:
+    child_id: int
+    rotation: tuple[tuple[int, int, int], ...] = _IDENTITY_ROTATION
+    translation: tuple[int, int, int] = (0, 0, 0)
+
+
+@dataclass(slots=True)
+class _VoxGroupNode:
+    child_ids: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _VoxShapeNode:
+    model_ids: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _VoxPlacement:
+    model_index: int
+    rotation: tuple[tuple[int, int, int], ...]
+    translation: tuple[int, int, int]
+    centered: bool
 
 
 def load_vox(path: str) -> tuple[VoxelGrid, list[tuple[int, int, int]]]:
@@ -17,72 +62,188 @@ def load_vox_models(path: str) -> tuple[list[VoxelGrid], list[tuple[int, int, in
     return models, palette
 
 
-def load_vox_models_with_warnings(path: str) -> tuple[list[VoxelGrid], list[tuple[int, int, int]], list[str]]:
-    payload = open(path, "rb").read()
-    if payload[:4] != b"VOX ":
-        raise ValueError("Invalid VOX header.")
-    if len(payload) < 20:
-        raise ValueError("Invalid VOX payload.")
+@traced(category="io")
+def load_vox_models_with_warnings(
+    path: str,
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> tuple[list[VoxelGrid], list[tuple[int, int, int]], list[str]]:
+    with open(path, "rb") as file_obj:
+        if file_obj.read(4) != b"VOX ":
+            raise ValueError("Invalid VOX header.")
+        if os.fstat(file_obj.fileno()).st_size < 20:
+            raise ValueError("Invalid VOX payload.")
+        with mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as payload:
+            model_chunks, nodes, palette, unsupported_chunks = _walk_vox_chunks(payload)
+            if not model_chunks:
+                raise ValueError("VOX file missing model data (SIZE/XYZI).")
+            placements = _resolve_scene_graph(nodes, len(model_chunks))
+            if placements is None:
+                placements = [
+                    _VoxPlacement(index, _IDENTITY_ROTATION, model.legacy_translation, False)
+                    for index, model in enumerate(model_chunks)
+                ]
+            models = _decode_models(payload, model_chunks, placements, progress)
 
-    models: list[VoxelGrid] = []
+    if not palette:
+        palette = [(0, 0, 0)] * 255
+    return models, palette, sorted(unsupported_chunks)
+
+
+def _walk_vox_chunks(
+    payload: mmap.mmap,
+) -> tuple[
+    list[_VoxModelChunk],
+    dict[int, _VoxTransformNode | _VoxGroupNode | _VoxShapeNode],
+    list[tuple[int, int, int]],
+    set[str],
+]:
+    model_chunks: list[_VoxModelChunk] = []
+    nodes: dict[int, _VoxTransformNode | _VoxGroupNode | _VoxShapeNode] = {}
     palette: list[tuple[int, int, int]] = []
     unsupported_chunks: set[str] = set()
     pending_size: tuple[int, int, int] | None = None
     pending_translation = (0, 0, 0)
 
+    payload_size = len(payload)
     offset = 8
-    while offset + 12 <= len(payload):
+    while offset + 12 <= payload_size:
         chunk_id = payload[offset : offset + 4]
-        content_size = struct.unpack("<I", payload[offset + 4 : offset + 8])[0]
-        _children_size = struct.unpack("<I", payload[offset + 8 : offset + 12])[0]
+        content_size, _children_size = struct.unpack_from("<II", payload, offset + 4)
         content_start = offset + 12
         content_end = content_start + content_size
-        if content_end > len(payload):
+        if content_end > payload_size:
             break
-        content = payload[content_start:content_end]
-
-        if chunk_id == b"SIZE" and len(content) >= 12:
-            sx, sy, sz = struct.unpack("<III", content[:12])
-            pending_size = (sx, sy, sz)
-        elif chunk_id == b"XYZI" and len(content) >= 4:
-            voxel_count = struct.unpack("<I", content[:4])[0]
-            expected = 4 + (voxel_count * 4)
-            if len(content) < expected:
+
+        if chunk_id == b"SIZE" and content_size >= 12:
+            pending_size = struct.unpack_from("<III", payload, content_start)
+        elif chunk_id == b"XYZI" and content_size >= 4:
+            voxel_count = struct.unpack_from("<I", payload, content_start)[0]
+            if content_size < 4 + (voxel_count * 4):
                 raise ValueError("Invalid VOX XYZI chunk size.")
             if pending_size is None:
                 raise ValueError("VOX file has XYZI chunk without preceding SIZE chunk.")
-            model = VoxelGrid()
-            tx, ty, tz = pending_translation
-            for i in range(voxel_count):
-                start = 4 + (i * 4)
-                x, y, z, color = struct.unpack("<BBBB", content[start : start + 4])
-                if color == 0:
-                    continue
-                model.set(int(x) + tx, int(y) + ty, int(z) + tz, int(color - 1))
-            models.append(model)
+            model_chunks.append(
+                _VoxModelChunk(pending_size, content_start + 4, voxel_count, pending_translation)
+            )
             pending_size = None
             pending_translation = (0, 0, 0)
         elif chunk_id == b"nTRN":
-            parsed_translation = _parse_ntrn_translation(content)
-            if parsed_translation is None:
+            parsed = _parse_ntrn(payload[content_start:content_end])
+            if parsed is None:
                 unsupported_chunks.add("nTRN")
             else:
-                pending_translation = parsed_translation
-        elif chunk_id == b"RGBA" and len(content) >= 1024:
-            palette = []
-            for i in range(255):
-                rgba = struct.unpack("<BBBB", content[i * 4 : (i * 4) + 4])
-                palette.append((int(rgba[0]), int(rgba[1]), int(rgba[2])))
-        elif chunk_id not in {b"MAIN"}:
+                node_id, node = parsed
+                nodes[node_id] = node
+                pending_translation = node.translation
+        elif chunk_id == b"nGRP":
+            parsed_group = _parse_ngrp(payload[content_start:content_end])
+            if parsed_group is None:
+                unsupported_chunks.add("nGRP")
+            else:
+                nodes[parsed_group[0]] = parsed_group[1]
+        elif chunk_id == b"nSHP":
+            parsed_shape = _parse_nshp(payload[content_start:content_end])
+            if parsed_shape is None:
+                unsupported_chunks.add("nSHP")
+            else:
+                nodes[parsed_shape[0]] = parsed_shape[1]
+        elif chunk_id == b"RGBA" and content_size >= 1024:
+            rgba = np.frombuffer(payload, dtype=np.uint8, count=1024, offset=content_start)
+            palette = [tuple(color) for color in rgba.reshape(256, 4)[:255, :3].tolist()]
+            del rgba
+        elif chunk_id not in _KNOWN_CHUNKS:
             unsupported_chunks.add(chunk_id.decode("ascii", errors="replace"))
 
         offset = content_end
+    return model_chunks, nodes, palette, unsupported_chunks
 
-    if not models:
-        raise ValueError("VOX file missing model data (SIZE/XYZI).")
-    if not palette:
-        palette = [(0, 0, 0)] * 255
-    return models, palette, sorted(unsupported_chunks)
+
+def _resolve_scene_graph(
+    nodes: dict[int, _VoxTransformNode | _VoxGroupNode | _VoxShapeNode],
+    model_count: int,
+) -> list[_VoxPlacement] | None:
+    # Files without a complete graph rooted at transform node 0 fall back to the legacy
+    # "translation applies to the next model" placement.
+    if not isinstance(nodes.get(0), _VoxTransformNode):
+        return None
+    placements: list[_VoxPlacement] = []
+    referenced: set[int] = set()
+    visiting: set[int] = set()
+
+    def visit(node_id: int, rotation: np.ndarray, translation: np.ndarray) -> bool:
+        node = nodes.get(node_id)
+        if node is None or node_id in visiting or len(visiting) > _MAX_GRAPH_DEPTH:
+            return False
+        visiting.add(node_id)
+        try:
+            if isinstance(node, _VoxTransformNode):
+                local_rotation = np.asarray(node.rotation, dtype=np.int64)
+                return visit(
+                    node.child_id,
+                    rotation @ local_rotation,
+                    rotation @ np.asarray(node.translation, dtype=np.int64) + translation,
+                )
+            if isinstance(node, _VoxGroupNode):
+                return all(visit(child_id, rotation, translation) for child_id in node.child_ids)
+            for model_id in node.model_ids[:1]:
+                if not 0 <= model_id < model_count:
+                    return False
+                referenced.add(model_id)
+                placements.append(
+                    _VoxPlacement(
+                        model_id,
+                        tuple(tuple(int(value) for value in row) for row in rotation.tolist()),
+                        tuple(int(value) for value in translation.tolist()),
+                        True,
+                    )
+                )
+            return True
+        finally:
+            visiting.discard(node_id)
+
+    if not visit(0, np.eye(3, dtype=np.int64), np.zeros(3, dtype=np.int64)):
+        return None
+    for model_id in range(model_count):
+        if model_id not in referenced:
+            placements.append(_VoxPlacement(model_id, _IDENTITY_ROTATION, (0, 0, 0), False))
+    return placements
+
+
+def _decode_models(
+    payload: mmap.mmap,
+    model_chunks: list[_VoxModelChunk],
+    placements: list[_VoxPlacement],
+    progress: Callable[[float], None] | None = None,
+) -> list[VoxelGrid]:
+    def decode(placement: _VoxPlacement) -> VoxelGrid:
+        return _decode_model(payload, model_chunks[placement.model_index], placement)
+
+    models: list[VoxelGrid] = []
+    with ThreadPoolExecutor(max_workers=min(len(placements), os.cpu_count() or 1)) as executor:
+        for model in executor.map(decode, placements):
+            models.append(model)
+            if progress is not None:
+                progress(len(models) / len(placements))
+    return models
+
+
+def _decode_model(payload: mmap.mmap, model: _VoxModelChunk, placement: _VoxPlacement) -> VoxelGrid:
+    entries = np.frombuffer(
+        payload, dtype=np.uint8, count=model.voxel_count * 4, offset=model.voxel_offset
+    ).reshape(-1, 4)
+    filled = entries[:, 3] != 0
+    coords = entries[filled, :3].astype(np.int64)
+    colors = entries[filled, 3].astype(np.int64) - 1
+    del entries
+    if placement.centered:
+        coords -= np.asarray(model.size, dtype=np.int64) // 2
+    if placement.rotation != _IDENTITY_ROTATION:
+        coords = coords @ np.asarray(placement.rotation, dtype=np.int64).T
+    coords += np.asarray(placement.translation, dtype=np.int64)
+    grid = VoxelGrid()
+    grid.set_many(coords, colors)
+    return grid
 
 
 def _read_vox_dict(content: bytes, offset: int) -> tuple[dict[str, str], int] | None:
@@ -114,35 +275,108 @@ def _read_vox_dict(content: bytes, offset: int) -> tuple[dict[str, str], int] |
     return result, offset
 
 
-def _parse_ntrn_translation(content: bytes) -> tuple[int, int, int] | None:
+def _read_node_header(content: bytes) -> tuple[int, int] | None:
+    if len(content) < 8:
+        return None
+    node_id = struct.unpack("<i", content[:4])[0]
+    node_dict_result = _read_vox_dict(content, 4)
+    if node_dict_result is None:
+        return None
+    return node_id, node_dict_result[1]
+
+
+def _parse_ntrn(content: bytes) -> tuple[int, _VoxTransformNode] | None:
     # nTRN (VOX 150): node_id | node_dict | child_id | reserved | layer_id | num_frames | frame_dict...
     if len(content) < 24:
         return None
-    offset = 0
-    offset += 4  # node_id
-    node_dict_result = _read_vox_dict(content, offset)
-    if node_dict_result is None:
+    header = _read_node_header(content)
+    if header is None:
         return None
-    _node_dict, offset = node_dict_result
+    node_id, offset = header
     if offset + 16 > len(content):
         return None
+    child_id = struct.unpack("<i", content[offset : offset + 4])[0]
     offset += 12  # child_id, reserved_id, layer_id
     num_frames = struct.unpack("<i", content[offset : offset + 4])[0]
     offset += 4
+    node = _VoxTransformNode(child_id=child_id)
     if num_frames <= 0:
-        return (0, 0, 0)
+        return node_id, node
     frame_dict_result = _read_vox_dict(content, offset)
     if frame_dict_result is None:
         return None
     frame_dict, _ = frame_dict_result
     raw_t = frame_dict.get("_t")
-    if raw_t is None:
-        return (0, 0, 0)
-    parts = raw_t.strip().split()
-    if len(parts) != 3:
+    if raw_t is not None:
+        parts = raw_t.strip().split()
+        if len(parts) != 3:
+            return None
+        try:
+            node.translation = (int(parts[0]), int(parts[1]), int(parts[2]))
+        except ValueError:
+            return None
+    raw_r = frame_dict.get("_r")
+    if raw_r is not None:
+        try:
+            rotation = _decode_vox_rotation(int(raw_r.strip()))
+        except ValueError:
+            return None
+        if rotation is None:
+            return None
+        node.rotation = rotation
+    return node_id, node
+
+
+def _parse_ngrp(content: bytes) -> tuple[int, _VoxGroupNode] | None:
+    header = _read_node_header(content)
+    if header is None:
+        return None
+    node_id, offset = header
+    if offset + 4 > len(content):
+        return None
+    child_count = struct.unpack("<i", content[offset : offset + 4])[0]
+    offset += 4
+    if child_count < 0 or offset + (child_count * 4) > len(content):
+        return None
+    child_ids = list(struct.unpack(f"<{child_count}i", content[offset : offset + (child_count * 4)]))
+    return node_id, _VoxGroupNode(child_ids=child_ids)
+
+
+def _parse_nshp(content: bytes) -> tuple[int, _VoxShapeNode] | None:
+    header = _read_node_header(content)
+    if header is None:
         return None
-    try:
-        return int(parts[0]), int(parts[1]), int(parts[2])
-    except ValueError:
+    node_id, offset = header
+    if offset + 4 > len(content):
+        return None
+    model_count = struct.unpack("<i", content[offset : offset + 4])[0]
+    offset += 4
+    if model_count < 1:
         return None
+    model_ids: list[int] = []
+    for _ in range(model_count):
+        if offset + 4 > len(content):
+            return None
+        model_ids.append(struct.unpack("<i", content[offset : offset + 4])[0])
+        model_dict_result = _read_vox_dict(content, offset + 4)
+        if model_dict_result is None:
+            return None
+        offset = model_dict_result[1]
+    return node_id, _VoxShapeNode(model_ids=model_ids)
 
+
+def _decode_vox_rotation(value: int) -> tuple[tuple[int, int, int], ...] | None:
+    # Packed rotation: bits 0-1 / 2-3 hold the non-zero column of rows 0 and 1, bits 4-6 the
+    # sign of each row; row 2 takes the remaining column.
+    column_0 = value & 0x3
+    column_1 = (value >> 2) & 0x3
+    if column_0 > 2 or column_1 > 2 or column_0 == column_1:
+        return None
+    columns = (column_0, column_1, 3 - column_0 - column_1)
+    rows: list[tuple[int, int, int]] = []
+    for row_index, column in enumerate(columns):
+        sign = -1 if (value >> (4 + row_index)) & 0x1 else 1
+        row = [0, 0, 0]
+        row[column] = sign
+        rows.append((row[0], row[1], row[2]))
+    return tuple(rows)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import uuid
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+
+from core.meshing.mesh import SurfaceMesh
+from core.voxels.voxel_grid import CHUNK_SIZE, ChunkKey, VoxelGrid
+
+MeshOptions = tuple[int, ...]
+
+# Bumped whenever mesher output changes, so entries written by older builds are never matched.
+MESH_CACHE_VERSION = 1
+DEFAULT_MESH_CACHE_BYTES = 256 * 1024 * 1024
+_ENTRY_SUFFIX = ".npz"
+_LINEAGE_SUFFIX = ".ref"
+_CHUNK_MASK = CHUNK_SIZE - 1
+# Multipliers that turn a voxel's chunk-local (x, y, z) into its index in a dense chunk array.
+_CHUNK_STRIDES = np.array([CHUNK_SIZE * CHUNK_SIZE, CHUNK_SIZE, 1], dtype=np.int64)
+_DIGEST_BYTES = 16
+_LOAD_ERRORS = (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile)
+
+_default_cache: MeshDiskCache | None = None
+
+
+@dataclass(slots=True)
+class CachedMesh:
+    mesh: SurfaceMesh
+    # Per-chunk content digests of the voxels the mesh was built from.
+    chunk_digests: dict[ChunkKey, bytes] = field(default_factory=dict)
+    # mesh_options() of the build; a mesh is only ever patched into one built the same way.
+    options: MeshOptions = ()
+
+
+@dataclass(slots=True)
+class MeshCacheStats:
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+class MeshDiskCache:
+    # Meshes stored as .npz files named by the content key of the voxels and mesher options,
+    # plus small .ref files naming each lineage's latest entry. Both count against max_bytes.
+    # The directory is scanned once; after that a running LRU index tracks file sizes, and
+    # stores evict the least recently used files past max_bytes.
+    def __init__(self, root: str | Path, *, max_bytes: int = DEFAULT_MESH_CACHE_BYTES) -> None:
+        if int(max_bytes) <= 0:
+            raise ValueError(f"Unsupported mesh cache size: {max_bytes}")
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.stats = MeshCacheStats()
+        # Exporters run on worker threads, so index updates are serialized.
+        self._lock = threading.Lock()
+        self._index: OrderedDict[Path, int] | None = None
+        self._total_bytes = 0
+
+    def load(self, key: str) -> CachedMesh | None:
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                # Zipping the transposed columns is the fastest way back to lists of tuples.
+                cached = CachedMesh(
+                    mesh=SurfaceMesh(
+                        vertices=list(zip(*data["vertices"].T.tolist())),
+                        quads=list(zip(*data["quads"].T.tolist())),
+                        face_colors=data["face_colors"].tolist(),
+                    ),
+                    chunk_digests={
+                        tuple(chunk_key): bytes(digest)
+                        for chunk_key, digest in zip(
+                            data["chunk_keys"].tolist(), data["chunk_digests"]
+                        )
+                    },
+                    options=tuple(data["options"].tolist()),
+                )
+            os.utime(path)
+        except FileNotFoundError:
+            self._forget(path)
+            return None
+        except _LOAD_ERRORS:
+            # A truncated or foreign file is dropped and rebuilt rather than trusted.
+            path.unlink(missing_ok=True)
+            self._forget(path)
+            return None
+        self._touch(path)
+        return cached
+
+    def store(self, key: str, cached: CachedMesh) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        digests = sorted(cached.chunk_digests.items())
+        mesh = cached.mesh
+        path = self._entry_path(key)
+        # Written beside the entry and renamed, so readers never see a partial file.
+        pending = self.root / f"{key}-{uuid.uuid4().hex}.tmp"
+        try:
+            with pending.open("wb") as handle:
+                np.savez(
+                    handle,
+                    vertices=np.asarray(mesh.vertices, dtype=np.float64).reshape(-1, 3),
+                    quads=np.asarray(mesh.quads, dtype=np.int64).reshape(-1, 4),
+                    face_colors=np.asarray(mesh.face_colors, dtype=np.int64),
+                    chunk_keys=np.asarray(
+                        [chunk_key for chunk_key, _ in digests], dtype=np.int64
+                    ).reshape(-1, 3),
+                    chunk_digests=np.frombuffer(
+                        b"".join(digest for _, digest in digests), dtype=np.uint8
+                    ).reshape(-1, _DIGEST_BYTES),
+                    options=np.asarray(cached.options, dtype=np.int64),
+                )
+            size = pending.stat().st_size
+            os.replace(pending, path)
+        finally:
+            pending.unlink(missing_ok=True)
+        self.stats.stores += 1
+        self._touch(path, size)
+        self.evict()
+
+    def latest(self, lineage: str) -> str | None:
+        # Key of the last entry used for this lineage (a part built with one set of options).
+        path = self._lineage_path(lineage)
+        try:
+            key = path.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+        self._touch(path)
+        return key
+
+    def set_latest(self, lineage: str, key: str) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._lineage_path(lineage)
+        path.write_text(key, encoding="utf-8")
+        self._touch(path, len(key))
+        self.evict()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._ensure_index()
+            return self._total_bytes
+
+    def evict(self) -> int:
+        removed = 0
+        with self._lock:
+            index = self._ensure_index()
+            while index and self._total_bytes > self.max_bytes:
+                path, size = index.popitem(last=False)
+                path.unlink(missing_ok=True)
+                self._total_bytes -= size
+                removed += 1
+        self.stats.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.root.is_dir():
+                for path in self.root.iterdir():
+                    if path.suffix in (_ENTRY_SUFFIX, _LINEAGE_SUFFIX):
+                        path.unlink(missing_ok=True)
+            self._index = OrderedDict()
+            self._total_bytes = 0
+
+    def _ensure_index(self) -> OrderedDict[Path, int]:
+        # Caller holds the lock. Files are ordered oldest first by mtime on the first scan.
+        if self._index is None:
+            files: list[tuple[float, Path, int]] = []
+            if self.root.is_dir():
+                for path in self.root.iterdir():
+                    if path.suffix not in (_ENTRY_SUFFIX, _LINEAGE_SUFFIX):
+                        continue
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, path, stat.st_size))
+            files.sort(key=lambda item: item[0])
+            self._index = OrderedDict((path, size) for _, path, size in files)
+            self._total_bytes = sum(size for _, _, size in files)
+        return self._index
+
+    def _touch(self, path: Path, size: int | None = None) -> None:
+        # Marks the file most recently used; size is given when the file was just written.
+        with self._lock:
+            index = self._ensure_index()
+            previous = index.pop(path, None)
+            if size is None:
+                if previous is None:
+                    return
+                size = previous
+            index[path] = size
+            self._total_bytes += size - (previous or 0)
+
+    def _forget(self, path: Path) -> None:
+        with self._lock:
+            size = self._ensure_index().pop(path, None)
+            if size is not None:
+                self._total_bytes -= size
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}{_ENTRY_SUFFIX}"
+
+    def _lineage_path(self, lineage: str) -> Path:
+        name = hashlib.blake2b(lineage.encode("utf-8"), digest_size=16).hexdigest()
+        return self.root / f"{name}{_LINEAGE_SUFFIX}"
+
+
+def set_mesh_disk_cache(cache: MeshDiskCache | None) -> None:
+    global _default_cache
+    _default_cache = cache
+
+
+def get_mesh_disk_cache() -> MeshDiskCache | None:
+    return _default_cache
+
+
+def mesh_options(*, greedy: bool) -> MeshOptions:
+    return (MESH_CACHE_VERSION, int(bool(greedy)))
+
+
+def lineage_key(lineage: str, options: MeshOptions) -> str:
+    # Lineages are per mesher options, so a build never patches a mesh built another way.
+    return f"{lineage}|{','.join(str(option) for option in options)}"
+
+
+def chunk_digests(voxels: VoxelGrid) -> dict[ChunkKey, bytes]:
+    # Each chunk hashes as a dense 16^3 color array (-1 for empty), so equal contents give
+    # equal digests whatever order the voxels were written in. Keys and colors are read into
+    # arrays by numpy and scattered in one step, without a per-voxel Python loop.
+    digests: dict[ChunkKey, bytes] = {}
+    cells = np.empty(CHUNK_SIZE**3, dtype=np.int64)
+    for chunk_key, chunk in voxels.iter_chunks():
+        cells.fill(-1)
+        coords = np.fromiter(
+            chain.from_iterable(chunk), dtype=np.int64, count=3 * len(chunk)
+        ).reshape(-1, 3)
+        cells[(coords & _CHUNK_MASK) @ _CHUNK_STRIDES] = np.fromiter(
+            chunk.values(), dtype=np.int64, count=len(chunk)
+        )
+        digests[chunk_key] = hashlib.blake2b(cells.tobytes(), digest_size=_DIGEST_BYTES).digest()
+    return digests
+
+
+def mesh_content_key(digests: dict[ChunkKey, bytes], options: MeshOptions) -> str:
+    content = hashlib.blake2b(digest_size=20)
+    content.update(np.asarray(options, dtype=np.int64).tobytes())
+    for chunk_key, digest in sorted(digests.items()):
+        content.update(np.asarray(chunk_key, dtype=np.int64).tobytes())
+        content.update(digest)
+    return content.hexdigest()
+
+
+def changed_chunks(
+    previous: dict[ChunkKey, bytes], current: dict[ChunkKey, bytes]
+) -> set[ChunkKey]:
+    return {
+        chunk_key
+        for chunk_key in previous.keys() | current.keys()
+        if previous.get(chunk_key) != current.get(chunk_key)
+    }
@@ -30,8 +30,8 @@ def extract_greedy_surface_mesh(voxels: VoxelGrid) -> SurfaceMesh:
             groups[("z", -1, z, color)].add((x, y))
 
     for (axis, sign, plane, color), cells in groups.items():
-        for u0, v0, u1, v1 in _greedy_rectangles(cells):
-            quad = _quad_from_rect(axis, sign, plane, u0, v0, u1, v1)
+        for u0, v0, u1, v1 in greedy_rectangles(cells):
+            quad = quad_from_rect(axis, sign, plane, u0, v0, u1, v1)
             base = len(mesh.vertices)
             mesh.vertices.extend(quad)
             mesh.quads.append((base, base + 1, base + 2, base + 3))
@@ -40,7 +40,7 @@ def extract_greedy_surface_mesh(voxels: VoxelGrid) -> SurfaceMesh:
     return mesh
 
 
-def _greedy_rectangles(cells: set[tuple[int, int]]) -> list[tuple[int, int, int, int]]:
+def greedy_rectangles(cells: set[tuple[int, int]]) -> list[tuple[int, int, int, int]]:
     pending = set(cells)
     rectangles: list[tuple[int, int, int, int]] = []
     while pending:
@@ -64,7 +64,7 @@ def _greedy_rectangles(cells: set[tuple[int, int]]) -> list[tuple[int, int, int,
     return rectangles
 
 
-def _quad_from_rect(
+def quad_from_rect(
     axis: str,
     sign: int,
     plane: int,
@@ -1,76 +1,207 @@
 from __future__ import annotations
 
+from collections import defaultdict
+
 from core.part import Part
-from core.meshing.greedy_mesher import extract_greedy_surface_mesh
+from core.meshing.disk_cache import (
+    CachedMesh,
+    MeshDiskCache,
+    changed_chunks,
+    chunk_digests,
+    get_mesh_disk_cache,
+    lineage_key,
+    mesh_content_key,
+    mesh_options,
+)
+from core.meshing.greedy_mesher import (
+    extract_greedy_surface_mesh,
+    greedy_rectangles,
+    quad_from_rect,
+)
 from core.meshing.mesh import SurfaceMesh
 from core.meshing.surface_extractor import extract_surface_mesh
-from core.voxels.voxel_grid import VoxelGrid
+from core.voxels.voxel_grid import CHUNK_SIZE, VoxelGrid
+from util.trace import traced
+
+_AXES = ("x", "y", "z")
+# The (u, v) axes of each face plane, matching the greedy mesher's cell keys.
+_PLANE_AXES = ((1, 2), (0, 2), (0, 1))
+# A cached mesh is patched only while at most this many chunks, and at most half of the part's
+# chunks, changed since it was stored. Patching walks every cached face, so noisy surfaces with
+# more than one face per _PATCH_VOXELS_PER_FACE voxels are rebuilt in full instead.
+_MAX_PATCHED_CHUNKS = 32
+_PATCH_VOXELS_PER_FACE = 3
 
 
+@traced(category="mesh")
 def build_solid_mesh(voxels: VoxelGrid, *, greedy: bool = True) -> SurfaceMesh:
     if greedy:
         return extract_greedy_surface_mesh(voxels)
     return extract_surface_mesh(voxels)
 
 
-def rebuild_part_mesh(part: Part, *, greedy: bool = True) -> SurfaceMesh:
+@traced(category="mesh")
+def load_or_build_mesh(
+    voxels: VoxelGrid,
+    *,
+    greedy: bool = True,
+    lineage: str | None = None,
+    cache: MeshDiskCache | None = None,
+) -> SurfaceMesh:
+    # Looks the voxels up in the disk cache (the default one unless given) by content. On a
+    # miss, the last mesh stored for `lineage` is reused when few of its chunks changed: only
+    # faces owned by those chunks are rebuilt, so the result matches a full build.
+    cache = cache if cache is not None else get_mesh_disk_cache()
+    if cache is None:
+        return build_solid_mesh(voxels, greedy=greedy)
+    options = mesh_options(greedy=greedy)
+    lineage = lineage_key(lineage, options) if lineage is not None else None
+    digests = chunk_digests(voxels)
+    key = mesh_content_key(digests, options)
+    cached = cache.load(key)
+    if cached is not None:
+        cache.stats.hits += 1
+        if lineage is not None and cache.latest(lineage) != key:
+            cache.set_latest(lineage, key)
+        return cached.mesh
+    mesh = None
+    previous_key = cache.latest(lineage) if lineage is not None else None
+    previous = cache.load(previous_key) if previous_key is not None else None
+    if previous is not None and previous.options == options:
+        changed = changed_chunks(previous.chunk_digests, digests)
+        if (
+            len(changed) <= min(_MAX_PATCHED_CHUNKS, len(digests) // 2)
+            and previous.mesh.face_count * _PATCH_VOXELS_PER_FACE <= voxels.count()
+        ):
+            cache.stats.partial_hits += 1
+            part = Part(part_id="", name="", voxels=voxels, mesh_cache=previous.mesh)
+            boxes = [_chunk_bounds(chunk_key) for chunk_key in sorted(changed)]
+            mesh = _incremental_rebuild(part, boxes, greedy=greedy)
+    if mesh is None:
+        cache.stats.misses += 1
+        mesh = build_solid_mesh(voxels, greedy=greedy)
+    cache.store(key, CachedMesh(mesh=mesh, chunk_digests=digests, options=options))
+    if lineage is not None:
+        cache.set_latest(lineage, key)
+    return mesh
+
+
+@traced(category="mesh")
+def rebuild_part_mesh(part: Part, *, greedy: bool = True, verify: bool = False) -> SurfaceMesh:
+    # verify re-runs the full build after an incremental one and keeps the full mesh on any
+    # mismatch. tests/test_differential.py covers the equivalence, so it is a debugging aid.
     if part.mesh_cache is not None and part.dirty_bounds is not None:
         dirty_bounds = _expand_bounds(part.dirty_bounds, pad=1)
         if _bounds_volume(dirty_bounds) <= 4096:
             part.incremental_rebuild_attempts += 1
-            incremental = _incremental_rebuild(part, dirty_bounds, greedy=greedy)
-            full = build_solid_mesh(part.voxels, greedy=greedy)
-            mesh = (
-                incremental
-                if _mesh_signature(incremental) == _mesh_signature(full)
-                else full
-            )
-            if mesh is full:
-                part.incremental_rebuild_fallbacks += 1
+            mesh = _incremental_rebuild(part, [dirty_bounds], greedy=greedy)
+            if verify:
+                full = build_solid_mesh(part.voxels, greedy=greedy)
+                if _mesh_signature(mesh) != _mesh_signature(full):
+                    part.incremental_rebuild_fallbacks += 1
+                    mesh = full
             part.mesh_cache = mesh
             part.dirty_bounds = None
             return mesh
         part.incremental_rebuild_fallbacks += 1
-    mesh = build_solid_mesh(part.voxels, greedy=greedy)
+    mesh = load_or_build_mesh(part.voxels, greedy=greedy, lineage=part.part_id)
     part.mesh_cache = mesh
     part.dirty_bounds = None
     return mesh
 
 
-def _incremental_rebuild(part: Part, dirty_bounds: tuple[int, int, int, int, int, int], *, greedy: bool) -> SurfaceMesh:
-    preserved = _mesh_without_bounds(part.mesh_cache or SurfaceMesh(), dirty_bounds)
-    local_voxels = _extract_voxels_in_bounds(part.voxels, dirty_bounds)
-    patch = build_solid_mesh(local_voxels, greedy=greedy)
+def _incremental_rebuild(
+    part: Part, boxes: list[tuple[int, int, int, int, int, int]], *, greedy: bool
+) -> SurfaceMesh:
+    # Faces belong to the voxel they bound. Every face plane that can hold a face of a cell in
+    # one of the boxes is rebuilt whole: its faces owned outside the boxes are kept, the ones
+    # inside are recomputed against the full grid, and the plane is meshed again. Greedy
+    # rectangles depend only on a plane's face set, so the result matches a full rebuild.
+    mesh = part.mesh_cache or SurfaceMesh()
+    dirty: set[tuple[int, int, int]] = set()
+    touched: tuple[set[int], set[int], set[int]] = (set(), set(), set())
+    for min_x, max_x, min_y, max_y, min_z, max_z in boxes:
+        xs, ys, zs = range(min_x, max_x + 1), range(min_y, max_y + 1), range(min_z, max_z + 1)
+        touched[0].update(xs)
+        touched[1].update(ys)
+        touched[2].update(zs)
+        dirty.update((x, y, z) for x in xs for y in ys for z in zs)
+    preserved = SurfaceMesh()
+    planes: dict[tuple[str, int, int, int], set[tuple[int, int]]] = defaultdict(set)
+    for face_index, quad in enumerate(mesh.quads):
+        verts = [mesh.vertices[i] for i in quad]
+        color = mesh.face_colors[face_index] if face_index < len(mesh.face_colors) else 0
+        axis_index, sign, plane, (u0, v0, u1, v1) = _quad_plane_rect(
+            verts, mesh.quad_normal(face_index)
+        )
+        owner = plane - 1 if sign > 0 else plane
+        if owner not in touched[axis_index]:
+            base = len(preserved.vertices)
+            preserved.vertices.extend(verts)
+            preserved.quads.append((base, base + 1, base + 2, base + 3))
+            preserved.face_colors.append(color)
+            continue
+        cells = planes[(_AXES[axis_index], sign, plane, color)]
+        for u in range(u0, u1):
+            for v in range(v0, v1):
+                if _plane_cell(axis_index, owner, u, v) not in dirty:
+                    cells.add((u, v))
+
+    voxels = part.voxels
+    for x, y, z in dirty:
+        color = voxels.get(x, y, z)
+        if color is None:
+            continue
+        if voxels.get(x + 1, y, z) is None:
+            planes[("x", 1, x + 1, color)].add((y, z))
+        if voxels.get(x - 1, y, z) is None:
+            planes[("x", -1, x, color)].add((y, z))
+        if voxels.get(x, y + 1, z) is None:
+            planes[("y", 1, y + 1, color)].add((x, z))
+        if voxels.get(x, y - 1, z) is None:
+            planes[("y", -1, y, color)].add((x, z))
+        if voxels.get(x, y, z + 1) is None:
+            planes[("z", 1, z + 1, color)].add((x, y))
+        if voxels.get(x, y, z - 1) is None:
+            planes[("z", -1, z, color)].add((x, y))
+
+    patch = SurfaceMesh()
+    for (axis, sign, plane, color), cells in planes.items():
+        if greedy:
+            rects = greedy_rectangles(cells)
+        else:
+            rects = [(u, v, u + 1, v + 1) for u, v in sorted(cells)]
+        for u0, v0, u1, v1 in rects:
+            base = len(patch.vertices)
+            patch.vertices.extend(quad_from_rect(axis, sign, plane, u0, v0, u1, v1))
+            patch.quads.append((base, base + 1, base + 2, base + 3))
+            patch.face_colors.append(color)
     return _merge_meshes(preserved, patch)
 
 
-def _extract_voxels_in_bounds(
-    voxels: VoxelGrid,
-    bounds: tuple[int, int, int, int, int, int],
-) -> VoxelGrid:
-    min_x, max_x, min_y, max_y, min_z, max_z = bounds
-    local = VoxelGrid()
-    for x, y, z, color in voxels.to_list():
-        if min_x <= x <= max_x and min_y <= y <= max_y and min_z <= z <= max_z:
-            local.set(x, y, z, color)
-    return local
+def _plane_cell(axis_index: int, owner: int, u: int, v: int) -> tuple[int, int, int]:
+    if axis_index == 0:
+        return (owner, u, v)
+    if axis_index == 1:
+        return (u, owner, v)
+    return (u, v, owner)
 
 
-def _mesh_without_bounds(mesh: SurfaceMesh, bounds: tuple[int, int, int, int, int, int]) -> SurfaceMesh:
-    min_x, max_x, min_y, max_y, min_z, max_z = bounds
-    filtered = SurfaceMesh()
-    for face_index, quad in enumerate(mesh.quads):
-        verts = [mesh.vertices[i] for i in quad]
-        if _quad_intersects_bounds(verts, min_x, max_x, min_y, max_y, min_z, max_z):
-            continue
-        base = len(filtered.vertices)
-        filtered.vertices.extend(verts)
-        filtered.quads.append((base, base + 1, base + 2, base + 3))
-        if face_index < len(mesh.face_colors):
-            filtered.face_colors.append(mesh.face_colors[face_index])
-        else:
-            filtered.face_colors.append(0)
-    return filtered
+def _quad_plane_rect(
+    vertices: list[tuple[float, float, float]],
+    normal: tuple[float, float, float],
+) -> tuple[int, int, int, tuple[int, int, int, int]]:
+    # (axis index, sign, plane, (u0, v0, u1, v1)) in the greedy mesher's plane coordinates.
+    axis_index = max(range(3), key=lambda index: abs(normal[index]))
+    u_index, v_index = _PLANE_AXES[axis_index]
+    us = [vertex[u_index] for vertex in vertices]
+    vs = [vertex[v_index] for vertex in vertices]
+    return (
+        axis_index,
+        1 if normal[axis_index] > 0 else -1,
+        int(round(vertices[0][axis_index])),
+        (int(round(min(us))), int(round(min(vs))), int(round(max(us))), int(round(max(vs)))),
+    )
 
 
 def _merge_meshes(first: SurfaceMesh, second: SurfaceMesh) -> SurfaceMesh:
@@ -87,28 +218,6 @@ def _merge_meshes(first: SurfaceMesh, second: SurfaceMesh) -> SurfaceMesh:
     return merged
 
 
-def _quad_intersects_bounds(
-    vertices: list[tuple[float, float, float]],
-    min_x: int,
-    max_x: int,
-    min_y: int,
-    max_y: int,
-    min_z: int,
-    max_z: int,
-) -> bool:
-    xs = [v[0] for v in vertices]
-    ys = [v[1] for v in vertices]
-    zs = [v[2] for v in vertices]
-    return not (
-        max(xs) < min_x
-        or min(xs) > max_x + 1
-        or max(ys) < min_y
-        or min(ys) > max_y + 1
-        or max(zs) < min_z
-        or min(zs) > max_z + 1
-    )
-
-
 def _expand_bounds(bounds: tuple[int, int, int, int, int, int], *, pad: int) -> tuple[int, int, int, int, int, int]:
     min_x, max_x, min_y, max_y, min_z, max_z = bounds
     return (
@@ -121,6 +230,15 @@ def _expand_bounds(bounds: tuple[int, int, int, int, int, int], *, pad: int) ->
     )
 
 
+def _chunk_bounds(chunk_key: tuple[int, int, int]) -> tuple[int, int, int, int, int, int]:
+    # Cells of the chunk plus a one-cell border, whose faces toward the chunk may change too.
+    bounds: list[int] = []
+    for axis in chunk_key:
+        low = axis * CHUNK_SIZE
+        bounds.extend((low - 1, low + CHUNK_SIZE))
+    return tuple(bounds)
+
+
 def _bounds_volume(bounds: tuple[int, int, int, int, int, int]) -> int:
     min_x, max_x, min_y, max_y, min_z, max_z = bounds
     return max(1, (max_x - min_x + 1)) * max(1, (max_y - min_y + 1)) * max(1, (max_z - min_z + 1))
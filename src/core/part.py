@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
+from uuid import uuid4
 
 from core.voxels.voxel_grid import VoxelGrid
 
@@ -9,20 +10,19 @@ if TYPE_CHECKING:
     from core.meshing.mesh import SurfaceMesh
 
 
+def _next_asset_id() -> str:
+    return f"asset-{uuid4().hex}"
+
+
 @dataclass(slots=True)
-class Part:
-    part_id: str
-    name: str
+class PartAsset:
+    # Voxels and mesh cache shared by every part instancing this asset.
     voxels: VoxelGrid = field(default_factory=VoxelGrid)
-    position: tuple[float, float, float] = (0.0, 0.0, 0.0)
-    rotation: tuple[float, float, float] = (0.0, 0.0, 0.0)
-    scale: tuple[float, float, float] = (1.0, 1.0, 1.0)
-    visible: bool = True
-    locked: bool = False
     mesh_cache: "SurfaceMesh | None" = None
     dirty_bounds: tuple[int, int, int, int, int, int] | None = None
     incremental_rebuild_attempts: int = 0
     incremental_rebuild_fallbacks: int = 0
+    asset_id: str = field(default_factory=_next_asset_id)
 
     def mark_dirty_cells(self, cells: set[tuple[int, int, int]]) -> None:
         if not cells:
@@ -43,3 +43,108 @@ class Part:
             min(min_z, next_bounds[4]),
             max(max_z, next_bounds[5]),
         )
+
+
+# Part fields a watching Scene is told about; storage is compared by identity, the rest by value.
+_WATCHED_VALUES = frozenset({"name", "position", "rotation", "scale", "visible", "locked"})
+_WATCHED_STORAGE = frozenset({"asset", "voxels"})
+
+
+@dataclass(slots=True, init=False)
+class Part:
+    part_id: str
+    name: str
+    asset: PartAsset
+    position: tuple[float, float, float]
+    rotation: tuple[float, float, float]
+    scale: tuple[float, float, float]
+    visible: bool
+    locked: bool
+    # Set by the Scene watching this part; called with (part, field) after a watched field changes.
+    _on_change: "Callable[[Part, str], None] | None" = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __init__(
+        self,
+        part_id: str,
+        name: str,
+        voxels: VoxelGrid | None = None,
+        position: tuple[float, float, float] = (0.0, 0.0, 0.0),
+        rotation: tuple[float, float, float] = (0.0, 0.0, 0.0),
+        scale: tuple[float, float, float] = (1.0, 1.0, 1.0),
+        visible: bool = True,
+        locked: bool = False,
+        mesh_cache: "SurfaceMesh | None" = None,
+        *,
+        asset: PartAsset | None = None,
+    ) -> None:
+        if asset is None:
+            asset = PartAsset(
+                voxels=voxels if voxels is not None else VoxelGrid(),
+                mesh_cache=mesh_cache,
+            )
+        elif voxels is not None or mesh_cache is not None:
+            raise ValueError("Part takes either an asset or voxels/mesh_cache, not both.")
+        object.__setattr__(self, "_on_change", None)
+        self.part_id = part_id
+        self.name = name
+        self.asset = asset
+        self.position = position
+        self.rotation = rotation
+        self.scale = scale
+        self.visible = visible
+        self.locked = locked
+
+    def __setattr__(self, name: str, value) -> None:
+        on_change = self._on_change
+        if on_change is None or (name not in _WATCHED_VALUES and name not in _WATCHED_STORAGE):
+            object.__setattr__(self, name, value)
+            return
+        previous = getattr(self, name)
+        object.__setattr__(self, name, value)
+        if previous is not value and (name in _WATCHED_STORAGE or previous != value):
+            on_change(self, name)
+
+    @property
+    def voxels(self) -> VoxelGrid:
+        return self.asset.voxels
+
+    @voxels.setter
+    def voxels(self, value: VoxelGrid) -> None:
+        self.asset.voxels = value
+
+    @property
+    def mesh_cache(self) -> "SurfaceMesh | None":
+        return self.asset.mesh_cache
+
+    @mesh_cache.setter
+    def mesh_cache(self, value: "SurfaceMesh | None") -> None:
+        self.asset.mesh_cache = value
+
+    @property
+    def dirty_bounds(self) -> tuple[int, int, int, int, int, int] | None:
+        return self.asset.dirty_bounds
+
+    @dirty_bounds.setter
+    def dirty_bounds(self, value: tuple[int, int, int, int, int, int] | None) -> None:
+        self.asset.dirty_bounds = value
+
+    @property
+    def incremental_rebuild_attempts(self) -> int:
+        return self.asset.incremental_rebuild_attempts
+
+    @incremental_rebuild_attempts.setter
+    def incremental_rebuild_attempts(self, value: int) -> None:
+        self.asset.incremental_rebuild_attempts = value
+
+    @property
+    def incremental_rebuild_fallbacks(self) -> int:
+        return self.asset.incremental_rebuild_fallbacks
+
+    @incremental_rebuild_fallbacks.setter
+    def incremental_rebuild_fallbacks(self, value: int) -> None:
+        self.asset.incremental_rebuild_fallbacks = value
+
+    def mark_dirty_cells(self, cells: set[tuple[int, int, int]]) -> None:
+        self.asset.mark_dirty_cells(cells)
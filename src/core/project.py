@@ -16,7 +16,7 @@ class Project:
     name: str
     created_utc: str = field(default_factory=utc_now_iso)
     modified_utc: str = field(default_factory=utc_now_iso)
-    version: int = 1
+    version: int = 2
     scene: Scene = field(default_factory=Scene.with_default_part)
     editor_state: dict[str, object] = field(default_factory=dict)
 
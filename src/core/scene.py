@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from uuid import uuid4
 
-from core.part import Part
+from core.events import PART_TRANSFORM_CHANGED, PART_VOXELS_CHANGED, PARTS_CHANGED, ChangeEvent
+from core.part import Part, PartAsset
 from core.voxels.voxel_grid import VoxelGrid
 
+_TRANSFORM_FIELDS = frozenset({"position", "rotation", "scale"})
+
+
 def _next_part_id() -> str:
     return f"part-{uuid4().hex}"
 
@@ -14,11 +18,19 @@ def _next_group_id() -> str:
     return f"group-{uuid4().hex}"
 
 
+def group_parts_by_asset(parts: list[Part]) -> list[tuple[PartAsset, list[Part]]]:
+    instances: dict[int, tuple[PartAsset, list[Part]]] = {}
+    for part in parts:
+        instances.setdefault(id(part.asset), (part.asset, []))[1].append(part)
+    return list(instances.values())
+
+
 @dataclass(slots=True)
 class PartGroup:
     group_id: str
     name: str
-    part_ids: list[str] = field(default_factory=list)
+    # Ordered set of member ids (values are always None), so removing a member is O(1).
+    part_ids: dict[str, None] = field(default_factory=dict)
     visible: bool = True
     locked: bool = False
 
@@ -27,9 +39,27 @@ class PartGroup:
 class Scene:
     parts: dict[str, Part] = field(default_factory=dict)
     active_part_id: str | None = None
-    part_order: list[str] = field(default_factory=list)
+    # Ordered sets of ids (values are always None); iter_*_ordered() return them as lists.
+    part_order: dict[str, None] = field(default_factory=dict)
     groups: dict[str, PartGroup] = field(default_factory=dict)
-    group_order: list[str] = field(default_factory=list)
+    group_order: dict[str, None] = field(default_factory=dict)
+    # Positions within the orders above, built on first use and dropped when an id is removed;
+    # edit the scene through the methods below rather than mutating the orders directly.
+    _part_index: dict[str, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _group_index: dict[str, int] | None = field(default=None, init=False, repr=False, compare=False)
+    _part_groups: dict[str, dict[str, None]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Edits recorded since the last drain_changes(); None until watch_changes() is called.
+    _changes: dict[ChangeEvent, None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Grids whose write hook fired since the last drain, to be armed again by the drain.
+    _written: list[VoxelGrid] = field(default_factory=list, init=False, repr=False, compare=False)
+    # id(grid) -> ids of the parts using it.
+    _voxel_owners: dict[int, list[str]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def with_default_part(cls) -> "Scene":
@@ -40,7 +70,8 @@ class Scene:
     def add_part(self, name: str) -> Part:
         part = Part(part_id=_next_part_id(), name=name)
         self.parts[part.part_id] = part
-        self.part_order.append(part.part_id)
+        self._append_to_order(part.part_id)
+        self._attach(part)
         if self.active_part_id is None:
             self.active_part_id = part.part_id
         return part
@@ -66,7 +97,13 @@ class Scene:
             raise ValueError("Part name cannot be empty.")
         self.parts[part_id].name = name
 
-    def duplicate_part(self, part_id: str, *, new_name: str | None = None) -> Part:
+    def duplicate_part(
+        self,
+        part_id: str,
+        *,
+        new_name: str | None = None,
+        linked: bool = False,
+    ) -> Part:
         source = self.parts.get(part_id)
         if source is None:
             raise ValueError(f"Part '{part_id}' does not exist.")
@@ -74,11 +111,14 @@ class Scene:
         if not duplicate_name:
             raise ValueError("Part name cannot be empty.")
 
-        duplicated_voxels = VoxelGrid.from_list(source.voxels.to_list())
+        if linked:
+            asset = source.asset
+        else:
+            asset = PartAsset(voxels=source.voxels.copy(), mesh_cache=source.mesh_cache)
         duplicate = Part(
             part_id=_next_part_id(),
             name=duplicate_name,
-            voxels=duplicated_voxels,
+            asset=asset,
             position=source.position,
             rotation=source.rotation,
             scale=source.scale,
@@ -86,23 +126,67 @@ class Scene:
             locked=source.locked,
         )
         self.parts[duplicate.part_id] = duplicate
-        self.part_order.append(duplicate.part_id)
+        self._append_to_order(duplicate.part_id)
+        self._attach(duplicate)
         self.active_part_id = duplicate.part_id
         return duplicate
 
+    def linked_parts(self, part_id: str) -> list[Part]:
+        part = self.parts.get(part_id)
+        if part is None:
+            raise ValueError(f"Part '{part_id}' does not exist.")
+        return [other for _, other in self.iter_parts_ordered() if other.asset is part.asset]
+
+    def is_part_linked(self, part_id: str) -> bool:
+        return len(self.linked_parts(part_id)) > 1
+
+    def make_part_unique(self, part_id: str) -> bool:
+        if not self.is_part_linked(part_id):
+            return False
+        part = self.parts[part_id]
+        shared = part.asset
+        part.asset = PartAsset(
+            voxels=shared.voxels.copy(),
+            mesh_cache=shared.mesh_cache,
+            dirty_bounds=shared.dirty_bounds,
+        )
+        return True
+
+    def iter_asset_instances(
+        self, *, visible_only: bool = False
+    ) -> list[tuple[PartAsset, list[Part]]]:
+        parts = [part for _, part in self.iter_parts_ordered()]
+        if visible_only:
+            parts = [part for part in parts if part.visible]
+        return group_parts_by_asset(parts)
+
+    def snapshot(self) -> "Scene":
+        # Read-only voxel snapshots for background readers; linked parts stay linked.
+        assets: dict[int, PartAsset] = {}
+        parts: dict[str, Part] = {}
+        for part_id, part in self.parts.items():
+            asset = assets.get(id(part.asset))
+            if asset is None:
+                asset = replace(part.asset, voxels=part.voxels.snapshot())
+                assets[id(part.asset)] = asset
+            parts[part_id] = replace(part, asset=asset)
+        return Scene(
+            parts=parts,
+            active_part_id=self.active_part_id,
+            part_order=dict(self.part_order),
+            groups={
+                group_id: replace(group, part_ids=dict(group.part_ids))
+                for group_id, group in self.groups.items()
+            },
+            group_order=dict(self.group_order),
+        )
+
     def delete_part(self, part_id: str) -> str:
         if part_id not in self.parts:
             raise ValueError(f"Part '{part_id}' does not exist.")
         if len(self.parts) <= 1:
             raise ValueError("Cannot delete the last remaining part.")
-
-        was_active = self.active_part_id == part_id
-        del self.parts[part_id]
-        self.part_order = [pid for pid in self.part_order if pid != part_id]
-        for group in self.groups.values():
-            group.part_ids = [pid for pid in group.part_ids if pid != part_id]
-        if was_active:
-            self.active_part_id = self.part_order[0]
+        self._remove_parts([part_id])
         return self.active_part_id or ""
 
     def set_parts_visible(self, part_ids: list[str], visible: bool) -> list[str]:
@@ -131,8 +215,7 @@ class Scene:
             raise ValueError("No valid parts selected for deletion.")
         if len(self.parts) - len(unique_ids) < 1:
             raise ValueError("Cannot delete all parts; at least one part must remain.")
-        for part_id in unique_ids:
-            self.delete_part(part_id)
+        self._remove_parts(unique_ids)
         return self.active_part_id or ""
 
     def iter_visible_parts(self) -> list[Part]:
@@ -140,50 +223,105 @@ class Scene:
 
     def iter_parts_ordered(self) -> list[tuple[str, Part]]:
         if not self.part_order:
-            self.part_order = list(self.parts.keys())
+            self.part_order = dict.fromkeys(self.parts)
+            self._part_index = None
         return [(part_id, self.parts[part_id]) for part_id in self.part_order if part_id in self.parts]
 
     def move_part(self, part_id: str, direction: int) -> bool:
         if part_id not in self.parts or direction not in (-1, 1):
             return False
-        if part_id not in self.part_order:
-            self.part_order = list(self.parts.keys())
-        index = self.part_order.index(part_id)
+        part_index = self._order_index()
+        if part_id not in part_index:
+            self.part_order = dict.fromkeys(self.parts)
+            self._part_index = None
+            part_index = self._order_index()
+        index = part_index[part_id]
         target = index + direction
         if target < 0 or target >= len(self.part_order):
             return False
-        self.part_order[index], self.part_order[target] = self.part_order[target], self.part_order[index]
+        # A swap rebuilds the ordered set; moves are single steps, removals stay O(1).
+        order = list(self.part_order)
+        other_id = order[target]
+        order[index], order[target] = other_id, part_id
+        self.part_order = dict.fromkeys(order)
+        part_index[part_id] = target
+        part_index[other_id] = index
+        self._record(PARTS_CHANGED)
         return True
 
+    def watch_changes(self) -> None:
+        # From here on part and scene edits are recorded for drain_changes(), including voxel
+        # writes: each grid reports its first write after a drain through a one-shot hook.
+        if self._changes is not None:
+            return
+        self._changes = {}
+        for part in self.parts.values():
+            part._on_change = self._part_changed
+            part.voxels.notify_next_write(self._voxels_written)
+        self._voxel_owners = None
+
+    def drain_changes(self) -> list[ChangeEvent]:
+        if not self._changes:
+            return []
+        events = list(self._changes)
+        self._changes = {}
+        for grid in self._written:
+            grid.notify_next_write(self._voxels_written)
+        self._written = []
+        return events
+
     def create_group(self, name: str) -> PartGroup:
         group_name = name.strip()
         if not group_name:
             raise ValueError("Group name cannot be empty.")
         group = PartGroup(group_id=_next_group_id(), name=group_name)
         self.groups[group.group_id] = group
-        self.group_order.append(group.group_id)
+        self.group_order[group.group_id] = None
+        if self._group_index is not None:
+            self._group_index[group.group_id] = len(self.group_order) - 1
         return group
 
     def delete_group(self, group_id: str) -> None:
-        if group_id not in self.groups:
+        group = self.groups.get(group_id)
+        if group is None:
             raise ValueError(f"Group '{group_id}' does not exist.")
+        part_groups = self._memberships()
+        for part_id in group.part_ids:
+            part_groups.get(part_id, {}).pop(group_id, None)
         del self.groups[group_id]
-        self.group_order = [gid for gid in self.group_order if gid != group_id]
+        self.group_order.pop(group_id, None)
+        self._group_index = None
 
     def assign_part_to_group(self, part_id: str, group_id: str) -> None:
-        if part_id not in self.parts:
-            raise ValueError(f"Part '{part_id}' does not exist.")
+        self.assign_parts_to_group([part_id], group_id)
+
+    def assign_parts_to_group(self, part_ids: list[str], group_id: str) -> list[str]:
         group = self.groups.get(group_id)
         if group is None:
             raise ValueError(f"Group '{group_id}' does not exist.")
-        if part_id not in group.part_ids:
-            group.part_ids.append(part_id)
+        for part_id in part_ids:
+            if part_id not in self.parts:
+                raise ValueError(f"Part '{part_id}' does not exist.")
+        part_groups = self._memberships()
+        assigned: list[str] = []
+        for part_id in part_ids:
+            memberships = part_groups.setdefault(part_id, {})
+            if group_id in memberships:
+                continue
+            memberships[group_id] = None
+            group.part_ids[part_id] = None
+            assigned.append(part_id)
+        return assigned
 
     def unassign_part_from_group(self, part_id: str, group_id: str) -> None:
         group = self.groups.get(group_id)
         if group is None:
             raise ValueError(f"Group '{group_id}' does not exist.")
-        group.part_ids = [pid for pid in group.part_ids if pid != part_id]
+        memberships = self._memberships().get(part_id)
+        if memberships is None or group_id not in memberships:
+            return
+        del memberships[group_id]
+        group.part_ids.pop(part_id, None)
 
     def set_group_visible(self, group_id: str, visible: bool) -> None:
         group = self.groups.get(group_id)
@@ -208,13 +346,98 @@ class Scene:
     def group_names_for_part(self, part_id: str) -> list[str]:
         if part_id not in self.parts:
             raise ValueError(f"Part '{part_id}' does not exist.")
-        names: list[str] = []
-        for group_id, group in self.iter_groups_ordered():
-            if part_id in group.part_ids:
-                names.append(group.name or group_id)
-        return names
+        memberships = self._memberships().get(part_id)
+        if not memberships:
+            return []
+        group_index = self._group_order_index()
+        ordered = sorted(
+            (group_id for group_id in memberships if group_id in group_index),
+            key=group_index.__getitem__,
+        )
+        return [self.groups[group_id].name or group_id for group_id in ordered]
 
     def iter_groups_ordered(self) -> list[tuple[str, PartGroup]]:
         if not self.group_order:
-            self.group_order = list(self.groups.keys())
+            self.group_order = dict.fromkeys(self.groups)
+            self._group_index = None
         return [(group_id, self.groups[group_id]) for group_id in self.group_order if group_id in self.groups]
+
+    def _order_index(self) -> dict[str, int]:
+        if self._part_index is None:
+            self._part_index = {part_id: index for index, part_id in enumerate(self.part_order)}
+        return self._part_index
+
+    def _group_order_index(self) -> dict[str, int]:
+        if self._group_index is None:
+            self._group_index = {group_id: index for index, group_id in enumerate(self.group_order)}
+        return self._group_index
+
+    def _memberships(self) -> dict[str, dict[str, None]]:
+        # part_id -> ids of the groups listing it, as an ordered set.
+        if self._part_groups is None:
+            part_groups: dict[str, dict[str, None]] = {}
+            for group_id, group in self.groups.items():
+                for part_id in group.part_ids:
+                    part_groups.setdefault(part_id, {})[group_id] = None
+            self._part_groups = part_groups
+        return self._part_groups
+
+    def _record(self, kind: str, part_id: str | None = None) -> None:
+        if self._changes is not None:
+            self._changes[ChangeEvent(kind, part_id)] = None
+
+    def _attach(self, part: Part) -> None:
+        if self._changes is None:
+            return
+        part._on_change = self._part_changed
+        part.voxels.notify_next_write(self._voxels_written)
+        self._voxel_owners = None
+        self._record(PARTS_CHANGED)
+        self._record(PART_VOXELS_CHANGED, part.part_id)
+        self._record(PART_TRANSFORM_CHANGED, part.part_id)
+        self._record(PARTS_CHANGED, part.part_id)
+
+    def _part_changed(self, part: Part, name: str) -> None:
+        if name in _TRANSFORM_FIELDS:
+            self._record(PART_TRANSFORM_CHANGED, part.part_id)
+        elif name in ("asset", "voxels"):
+            self._voxel_owners = None
+            self._voxels_written(part.voxels)
+        else:
+            self._record(PARTS_CHANGED, part.part_id)
+
+    def _voxels_written(self, grid: VoxelGrid) -> None:
+        # Linked parts share the grid, so every one of them is reported.
+        if self._voxel_owners is None:
+            owners: dict[int, list[str]] = {}
+            for part_id, part in self.parts.items():
+                owners.setdefault(id(part.voxels), []).append(part_id)
+            self._voxel_owners = owners
+        part_ids = self._voxel_owners.get(id(grid))
+        if not part_ids:
+            return
+        for part_id in part_ids:
+            self._record(PART_VOXELS_CHANGED, part_id)
+        self._written.append(grid)
+
+    def _append_to_order(self, part_id: str) -> None:
+        self.part_order[part_id] = None
+        if self._part_index is not None:
+            self._part_index[part_id] = len(self.part_order) - 1
+
+    def _remove_parts(self, part_ids: list[str]) -> None:
+        removed = set(part_ids)
+        part_groups = self._memberships()
+        for part_id in part_ids:
+            self.parts.pop(part_id)._on_change = None
+            self.part_order.pop(part_id, None)
+            for group_id in part_groups.pop(part_id, {}):
+                group = self.groups.get(group_id)
+                if group is not None:
+                    group.part_ids.pop(part_id, None)
+            self._record(PARTS_CHANGED, part_id)
+        self._record(PARTS_CHANGED)
+        self._voxel_owners = None
+        self._part_index = None
+        if self.active_part_id in removed:
+            self.active_part_id = next(pid for pid in self.part_order if pid in self.parts)
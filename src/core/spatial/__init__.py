@@ -0,0 +1,17 @@
+from core.spatial.bounds import Aabb, part_transform_matrix, voxel_grid_bounds
+from core.spatial.bvh import Bvh, SceneBoundsIndex, part_world_bounds
+from core.spatial.frustum import aabb_in_frustum, frustum_planes
+from core.spatial.raycast import SceneRayHit, raycast_scene
+
+__all__ = [
+    "Aabb",
+    "Bvh",
+    "SceneBoundsIndex",
+    "SceneRayHit",
+    "aabb_in_frustum",
+    "frustum_planes",
+    "part_transform_matrix",
+    "part_world_bounds",
+    "raycast_scene",
+    "voxel_grid_bounds",
+]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import cos, radians, sin
+
+import numpy as np
+
+from core.voxels.voxel_grid import CHUNK_SIZE, VoxelGrid
+
+# A voxel at integer (x, y, z) is picked around its centre (x +/- 0.5) and meshed over
+# [x, x + 1], so local bounds cover both.
+_VOXEL_LOW_PAD = 0.5
+_VOXEL_HIGH_PAD = 1.0
+
+
+@dataclass(slots=True, frozen=True)
+class Aabb:
+    minimum: tuple[float, float, float]
+    maximum: tuple[float, float, float]
+
+    @property
+    def center(self) -> tuple[float, float, float]:
+        return (
+            (self.minimum[0] + self.maximum[0]) * 0.5,
+            (self.minimum[1] + self.maximum[1]) * 0.5,
+            (self.minimum[2] + self.maximum[2]) * 0.5,
+        )
+
+    def union(self, other: "Aabb") -> "Aabb":
+        return Aabb(
+            (
+                min(self.minimum[0], other.minimum[0]),
+                min(self.minimum[1], other.minimum[1]),
+                min(self.minimum[2], other.minimum[2]),
+            ),
+            (
+                max(self.maximum[0], other.maximum[0]),
+                max(self.maximum[1], other.maximum[1]),
+                max(self.maximum[2], other.maximum[2]),
+            ),
+        )
+
+    def corners(self) -> np.ndarray:
+        low, high = self.minimum, self.maximum
+        return np.array(
+            [
+                (x, y, z)
+                for x in (low[0], high[0])
+                for y in (low[1], high[1])
+                for z in (low[2], high[2])
+            ],
+            dtype=np.float64,
+        )
+
+    def transformed(self, matrix: np.ndarray) -> "Aabb":
+        corners = self.corners() @ matrix[:3, :3].T + matrix[:3, 3]
+        low = corners.min(axis=0)
+        high = corners.max(axis=0)
+        return Aabb(
+            (float(low[0]), float(low[1]), float(low[2])),
+            (float(high[0]), float(high[1]), float(high[2])),
+        )
+
+    def intersect_ray(
+        self,
+        origin: tuple[float, float, float],
+        direction: tuple[float, float, float],
+    ) -> tuple[float, float] | None:
+        t_near = float("-inf")
+        t_far = float("inf")
+        for axis in range(3):
+            o = origin[axis]
+            d = direction[axis]
+            low = self.minimum[axis]
+            high = self.maximum[axis]
+            if abs(d) < 1e-12:
+                if o < low or o > high:
+                    return None
+                continue
+            t0 = (low - o) / d
+            t1 = (high - o) / d
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_near = max(t_near, t0)
+            t_far = min(t_far, t1)
+            if t_near > t_far:
+                return None
+        if t_far < 0.0:
+            return None
+        return max(t_near, 0.0), t_far
+
+
+def voxel_grid_bounds(voxels: VoxelGrid) -> Aabb | None:
+    # Chunk granularity keeps this O(chunks); the box is conservative by up to one chunk.
+    keys = voxels.chunk_keys()
+    if not keys:
+        return None
+    chunk_rows = np.asarray(keys, dtype=np.int64)
+    low = chunk_rows.min(axis=0) * CHUNK_SIZE - _VOXEL_LOW_PAD
+    high = (chunk_rows.max(axis=0) + 1) * CHUNK_SIZE - 1 + _VOXEL_HIGH_PAD
+    return Aabb(
+        (float(low[0]), float(low[1]), float(low[2])),
+        (float(high[0]), float(high[1]), float(high[2])),
+    )
+
+
+def part_transform_matrix(
+    position: tuple[float, float, float],
+    rotation: tuple[float, float, float],
+    scale: tuple[float, float, float],
+) -> np.ndarray:
+    # Same order as the viewport: translate, rotate X, Y, Z (degrees), then scale.
+    matrix = np.eye(4, dtype=np.float64)
+    matrix[:3, :3] = (
+        _axis_rotation(0, rotation[0])
+        @ _axis_rotation(1, rotation[1])
+        @ _axis_rotation(2, rotation[2])
+        @ np.diag([float(scale[0]), float(scale[1]), float(scale[2])])
+    )
+    matrix[:3, 3] = [float(position[0]), float(position[1]), float(position[2])]
+    return matrix
+
+
+def _axis_rotation(axis: int, degrees: float) -> np.ndarray:
+    angle = radians(float(degrees))
+    c = cos(angle)
+    s = sin(angle)
+    if axis == 0:
+        return np.array([[1.0, 0.0, 0.0], [0.0, c, -s], [0.0, s, c]])
+    if axis == 1:
+        return np.array([[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]])
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Generic, TypeVar
+
+import numpy as np
+
+from core.part import Part
+from core.spatial.bounds import Aabb, part_transform_matrix, voxel_grid_bounds
+from core.spatial.frustum import aabb_in_frustum
+
+T = TypeVar("T")
+
+_LEAF_SIZE = 4
+
+
+@dataclass(slots=True)
+class _BvhNode:
+    bounds: Aabb
+    left: int = -1
+    right: int = -1
+    start: int = 0
+    count: int = 0
+
+
+class Bvh(Generic[T]):
+    # Median split on the longest centroid axis; leaves hold up to _LEAF_SIZE items.
+
+    def __init__(self, entries: list[tuple[T, Aabb]]) -> None:
+        self._items: list[T] = []
+        self._boxes: list[Aabb] = []
+        self._nodes: list[_BvhNode] = []
+        if entries:
+            order = list(range(len(entries)))
+            centers = np.array([box.center for _item, box in entries], dtype=np.float64)
+            self._build(entries, centers, order)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def query(self, accept: Callable[[Aabb], bool]) -> list[T]:
+        if not self._nodes:
+            return []
+        hits: list[T] = []
+        stack = [0]
+        while stack:
+            node = self._nodes[stack.pop()]
+            if not accept(node.bounds):
+                continue
+            if node.count:
+                for index in range(node.start, node.start + node.count):
+                    if accept(self._boxes[index]):
+                        hits.append(self._items[index])
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+        return hits
+
+    def query_frustum(self, planes: np.ndarray) -> list[T]:
+        return self.query(lambda box: aabb_in_frustum(planes, box))
+
+    def query_ray(
+        self,
+        origin: tuple[float, float, float],
+        direction: tuple[float, float, float],
+        *,
+        max_distance: float = float("inf"),
+    ) -> list[tuple[float, T]]:
+        # Items whose boxes the ray enters, nearest entry distance first.
+        if not self._nodes:
+            return []
+        hits: list[tuple[float, T]] = []
+        stack = [0]
+        while stack:
+            node = self._nodes[stack.pop()]
+            span = node.bounds.intersect_ray(origin, direction)
+            if span is None or span[0] > max_distance:
+                continue
+            if node.count:
+                for index in range(node.start, node.start + node.count):
+                    item_span = self._boxes[index].intersect_ray(origin, direction)
+                    if item_span is not None and item_span[0] <= max_distance:
+                        hits.append((item_span[0], self._items[index]))
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+        hits.sort(key=lambda hit: hit[0])
+        return hits
+
+    def _build(
+        self,
+        entries: list[tuple[T, Aabb]],
+        centers: np.ndarray,
+        order: list[int],
+    ) -> int:
+        bounds = entries[order[0]][1]
+        for index in order[1:]:
+            bounds = bounds.union(entries[index][1])
+        node_index = len(self._nodes)
+        node = _BvhNode(bounds=bounds)
+        self._nodes.append(node)
+        if len(order) <= _LEAF_SIZE:
+            node.start = len(self._items)
+            node.count = len(order)
+            for index in order:
+                item, box = entries[index]
+                self._items.append(item)
+                self._boxes.append(box)
+            return node_index
+        member_centers = centers[order]
+        axis = int(np.argmax(member_centers.max(axis=0) - member_centers.min(axis=0)))
+        sorted_order = [order[i] for i in np.argsort(member_centers[:, axis], kind="stable")]
+        middle = len(sorted_order) // 2
+        node.left = self._build(entries, centers, sorted_order[:middle])
+        node.right = self._build(entries, centers, sorted_order[middle:])
+        return node_index
+
+
+@dataclass(slots=True)
+class _PartBoundsEntry:
+    voxels: object
+    revision: int
+    position: tuple[float, float, float]
+    rotation: tuple[float, float, float]
+    scale: tuple[float, float, float]
+    world_bounds: Aabb | None
+
+
+class SceneBoundsIndex:
+    # World-space part AABBs, recomputed only when a part's voxels or transform change.
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _PartBoundsEntry] = {}
+        self._bvh: Bvh[str] | None = None
+        self._bvh_key: tuple[str, ...] | None = None
+
+    def update(self, parts: list[Part]) -> Bvh[str]:
+        changed = False
+        seen: set[str] = set()
+        for part in parts:
+            seen.add(part.part_id)
+            entry = self._entries.get(part.part_id)
+            if (
+                entry is not None
+                and entry.voxels is part.voxels
+                and entry.revision == part.voxels.revision
+                and entry.position == part.position
+                and entry.rotation == part.rotation
+                and entry.scale == part.scale
+            ):
+                continue
+            self._entries[part.part_id] = _PartBoundsEntry(
+                voxels=part.voxels,
+                revision=part.voxels.revision,
+                position=part.position,
+                rotation=part.rotation,
+                scale=part.scale,
+                world_bounds=part_world_bounds(part),
+            )
+            changed = True
+        for stale_id in set(self._entries) - seen:
+            del self._entries[stale_id]
+        key = tuple(part.part_id for part in parts)
+        if changed or self._bvh is None or key != self._bvh_key:
+            self._bvh = Bvh(
+                [
+                    (part.part_id, bounds)
+                    for part in parts
+                    if (bounds := self._entries[part.part_id].world_bounds) is not None
+                ]
+            )
+            self._bvh_key = key
+        return self._bvh
+
+    def part_bounds(self, part_id: str) -> Aabb | None:
+        entry = self._entries.get(part_id)
+        return entry.world_bounds if entry is not None else None
+
+
+def part_world_bounds(part: Part) -> Aabb | None:
+    local = voxel_grid_bounds(part.voxels)
+    if local is None:
+        return None
+    return local.transformed(part_transform_matrix(part.position, part.rotation, part.scale))
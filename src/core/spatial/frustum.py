@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import numpy as np
+
+from core.spatial.bounds import Aabb
+
+
+def frustum_planes(view_projection) -> np.ndarray:
+    # Gribb/Hartmann extraction from a row-major clip matrix; each row is (a, b, c, d) with
+    # the plane normal pointing into the frustum.
+    rows = np.asarray(view_projection, dtype=np.float64).reshape(4, 4)
+    planes = np.array(
+        [
+            rows[3] + rows[0],
+            rows[3] - rows[0],
+            rows[3] + rows[1],
+            rows[3] - rows[1],
+            rows[3] + rows[2],
+            rows[3] - rows[2],
+        ]
+    )
+    lengths = np.linalg.norm(planes[:, :3], axis=1)
+    lengths[lengths < 1e-12] = 1.0
+    return planes / lengths[:, None]
+
+
+def aabb_in_frustum(planes: np.ndarray, box: Aabb) -> bool:
+    low = box.minimum
+    high = box.maximum
+    for a, b, c, d in planes.tolist():
+        # Test the corner furthest along the plane normal.
+        px = high[0] if a >= 0.0 else low[0]
+        py = high[1] if b >= 0.0 else low[1]
+        pz = high[2] if c >= 0.0 else low[2]
+        if a * px + b * py + c * pz + d < 0.0:
+            return False
+    return True
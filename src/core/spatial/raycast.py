@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import sqrt
+
+import numpy as np
+
+from core.part import Part
+from core.spatial.bounds import part_transform_matrix, voxel_grid_bounds
+from core.spatial.bvh import SceneBoundsIndex
+
+
+@dataclass(slots=True, frozen=True)
+class SceneRayHit:
+    part_id: str
+    cell: tuple[int, int, int]
+    normal: tuple[int, int, int] | None
+    distance: float
+
+    @property
+    def adjacent_cell(self) -> tuple[int, int, int] | None:
+        if self.normal is None:
+            return None
+        return (
+            self.cell[0] + self.normal[0],
+            self.cell[1] + self.normal[1],
+            self.cell[2] + self.normal[2],
+        )
+
+
+def raycast_scene(
+    parts: list[Part],
+    origin: tuple[float, float, float],
+    direction: tuple[float, float, float],
+    *,
+    bounds_index: SceneBoundsIndex | None = None,
+    max_distance: float = 200.0,
+) -> SceneRayHit | None:
+    # Nearest voxel hit across posed parts. Candidates come from the bounds BVH in entry order;
+    # each is walked in its own local space, and the search stops once the next candidate's
+    # bounds start beyond the best hit so far.
+    dx, dy, dz = direction
+    length = sqrt(dx * dx + dy * dy + dz * dz)
+    if length <= 1e-9:
+        return None
+    world_direction = np.array([dx / length, dy / length, dz / length], dtype=np.float64)
+    world_origin = np.array(origin, dtype=np.float64)
+    index = bounds_index if bounds_index is not None else SceneBoundsIndex()
+    candidates = index.update(parts).query_ray(
+        tuple(world_origin.tolist()), tuple(world_direction.tolist()), max_distance=max_distance
+    )
+    parts_by_id = {part.part_id: part for part in parts}
+    best: SceneRayHit | None = None
+    for entry_distance, part_id in candidates:
+        if best is not None and entry_distance > best.distance:
+            break
+        part = parts_by_id[part_id]
+        limit = max_distance if best is None else best.distance
+        hit = _raycast_part(part, world_origin, world_direction, limit)
+        if hit is not None and (best is None or hit.distance < best.distance):
+            best = hit
+    return best
+
+
+def _raycast_part(
+    part: Part,
+    world_origin: np.ndarray,
+    world_direction: np.ndarray,
+    max_distance: float,
+) -> SceneRayHit | None:
+    matrix = part_transform_matrix(part.position, part.rotation, part.scale)
+    try:
+        inverse = np.linalg.inv(matrix)
+    except np.linalg.LinAlgError:
+        return None
+    # The local direction is not renormalised, so distances along it stay in world units.
+    local_origin = inverse[:3, :3] @ world_origin + inverse[:3, 3]
+    local_direction = inverse[:3, :3] @ world_direction
+    origin = (float(local_origin[0]), float(local_origin[1]), float(local_origin[2]))
+    direction = (float(local_direction[0]), float(local_direction[1]), float(local_direction[2]))
+    bounds = voxel_grid_bounds(part.voxels)
+    if bounds is None:
+        return None
+    span = bounds.intersect_ray(origin, direction)
+    if span is None or span[0] > max_distance:
+        return None
+    # Start one cell before the bounds so the first hit still reports the face it entered by.
+    back_off = 1.0 / max(float(np.linalg.norm(local_direction)), 1e-12)
+    hit = part.voxels.occupancy().raycast(
+        origin,
+        direction,
+        t_start=max(0.0, span[0] - back_off),
+        t_end=min(span[1], max_distance),
+    )
+    if hit is None:
+        return None
+    return SceneRayHit(part.part_id, hit.cell, hit.normal, hit.distance)
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from core.palette import DEFAULT_PALETTE
+from core.project import Project
+from core.scene import Scene
+from core.voxels.voxel_grid import CHUNK_SIZE, VoxelGrid
+
+GRID_KINDS = ("terrain", "menger", "shell", "checkerboard", "palette_heavy")
+SCENE_KINDS = GRID_KINDS + ("city",)
+FIXTURE_FORMATS = {".vox": "vox", ".qb": "qb", ".json": "project"}
+
+_Predicate = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+_Colorize = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass(slots=True)
+class SyntheticScene:
+    kind: str
+    size: int
+    seed: int
+    project: Project
+    palette: list[tuple[int, int, int]]
+
+    def voxel_count(self) -> int:
+        return sum(part.voxels.count() for _, part in self.project.scene.iter_parts_ordered())
+
+
+def noise_terrain(
+    size: int, *, seed: int = 0, height: int | None = None, octaves: int = 4
+) -> VoxelGrid:
+    # Value-noise heightmap over an XZ footprint of size x size; columns grow along +Y and are
+    # coloured by elevation band.
+    _check_size(size)
+    column_height = size // 2 if height is None else int(height)
+    if column_height < 1:
+        raise ValueError(f"Unsupported terrain height: {height}")
+    rng = np.random.default_rng(seed)
+    heights = 1 + (_value_noise(size, rng, octaves) * (column_height - 1)).astype(np.int64)
+    bands = np.array([4, 3, 1, 7], dtype=np.int64)
+
+    def colorize(coords: np.ndarray) -> np.ndarray:
+        band = coords[:, 1] * len(bands) // column_height
+        return bands[np.minimum(band, len(bands) - 1)]
+
+    return _fill(
+        (size, column_height, size),
+        lambda x, y, z: y < heights[x, z],
+        colorize,
+    )
+
+
+def menger_sponge(level: int) -> VoxelGrid:
+    if level < 0:
+        raise ValueError(f"Unsupported Menger level: {level}")
+    size = 3**level
+
+    def predicate(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        keep = np.ones(np.broadcast_shapes(x.shape, y.shape, z.shape), dtype=bool)
+        scale = 1
+        for _ in range(level):
+            centred = (
+                ((x // scale) % 3 == 1).astype(np.int8)
+                + ((y // scale) % 3 == 1)
+                + ((z // scale) % 3 == 1)
+            )
+            keep &= centred < 2
+            scale *= 3
+        return keep
+
+    return _fill(
+        (size, size, size),
+        predicate,
+        lambda coords: coords.sum(axis=1) * len(DEFAULT_PALETTE) // (3 * size),
+    )
+
+
+def hollow_shell(size: int, *, thickness: int = 1, shape: str = "sphere") -> VoxelGrid:
+    _check_size(size)
+    if thickness < 1:
+        raise ValueError(f"Unsupported shell thickness: {thickness}")
+    if shape == "sphere":
+        centre = (size - 1) / 2.0
+        outer = size / 2.0
+        inner = max(outer - thickness, 0.0)
+
+        def predicate(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+            distance = (x - centre) ** 2 + (y - centre) ** 2 + (z - centre) ** 2
+            return (distance < outer * outer) & (distance >= inner * inner)
+
+    elif shape == "box":
+
+        def predicate(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+            edge = np.minimum(np.minimum(x, size - 1 - x), np.minimum(y, size - 1 - y))
+            return np.minimum(edge, np.minimum(z, size - 1 - z)) < thickness
+
+    else:
+        raise ValueError(f"Unsupported shell shape: {shape}")
+    return _fill(
+        (size, size, size),
+        predicate,
+        lambda coords: coords[:, 1] * len(DEFAULT_PALETTE) // size,
+    )
+
+
+def checkerboard(size: int, *, filled: bool = False) -> VoxelGrid:
+    # Worst cases for greedy meshing: alternate cells leave every voxel isolated with six
+    # exposed faces; the filled variant is solid but alternates colours so no faces merge.
+    _check_size(size)
+    if filled:
+        return _fill(
+            (size, size, size),
+            lambda x, y, z: np.ones(np.broadcast_shapes(x.shape, y.shape, z.shape), dtype=bool),
+            lambda coords: coords.sum(axis=1) % 2,
+        )
+    return _fill(
+        (size, size, size),
+        lambda x, y, z: (x + y + z) % 2 == 0,
+        lambda coords: (coords[:, 0] // 2) % 2,
+    )
+
+
+def palette_heavy(size: int, *, seed: int = 0, colors: int = 255) -> VoxelGrid:
+    _check_size(size)
+    if not 1 <= colors <= 255:
+        raise ValueError(f"Unsupported palette size: {colors}")
+    rng = np.random.default_rng(seed)
+    centre = (size - 1) / 2.0
+    radius = size / 2.0
+
+    def predicate(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        return (x - centre) ** 2 + (y - centre) ** 2 + (z - centre) ** 2 < radius * radius
+
+    return _fill(
+        (size, size, size),
+        predicate,
+        lambda coords: rng.integers(0, colors, size=coords.shape[0]),
+    )
+
+
+def random_fill(size: int, *, density: float, seed: int = 0, colors: int = 32) -> VoxelGrid:
+    _check_size(size)
+    if not 0.0 < density <= 1.0:
+        raise ValueError(f"Unsupported fill density: {density}")
+    rng = np.random.default_rng(seed)
+    return _fill(
+        (size, size, size),
+        lambda x, y, z: rng.random(np.broadcast_shapes(x.shape, y.shape, z.shape)) < density,
+        lambda coords: rng.integers(0, colors, size=coords.shape[0]),
+    )
+
+
+def city_project(size: int, *, seed: int = 0, block: int = 12, reuse: float = 0.35) -> Project:
+    # A ground plate with a grid of buildings, one part per building; roughly `reuse` of the
+    # buildings are linked instances of earlier ones, as in kitbashed scenes.
+    _check_size(size)
+    if block < 6:
+        raise ValueError(f"Unsupported city block size: {block}")
+    rng = np.random.default_rng(seed)
+    scene = Scene()
+    ground = scene.add_part("Ground")
+    ground.voxels = _fill(
+        (size, 1, size),
+        lambda x, y, z: np.ones(np.broadcast_shapes(x.shape, y.shape, z.shape), dtype=bool),
+        lambda coords: np.full(coords.shape[0], 3, dtype=np.int64),
+    )
+    ground.position = (0.0, -1.0, 0.0)
+    buildings: list[str] = []
+    per_side = max(1, size // block)
+    for index in range(per_side * per_side):
+        row, column = divmod(index, per_side)
+        position = (float(column * block + 1), 0.0, float(row * block + 1))
+        name = f"Building {index + 1}"
+        if buildings and rng.random() < reuse:
+            source = buildings[int(rng.integers(0, len(buildings)))]
+            part = scene.duplicate_part(source, new_name=name, linked=True)
+        else:
+            part = scene.add_part(name)
+            part.voxels = _building(
+                int(rng.integers(4, block - 1)),
+                int(rng.integers(max(4, block // 2), max(block // 2, size // 2, 4) + 1)),
+                int(rng.integers(4, block - 1)),
+            )
+            buildings.append(part.part_id)
+        part.position = position
+    scene.active_part_id = ground.part_id
+    return Project(name=f"Synthetic city {size}", scene=scene)
+
+
+def generate_scene(kind: str, size: int, *, seed: int = 0) -> SyntheticScene:
+    if kind not in SCENE_KINDS:
+        raise ValueError(f"Unsupported synthetic scene: {kind}")
+    palette = list(DEFAULT_PALETTE)
+    if kind == "city":
+        project = city_project(size, seed=seed)
+    else:
+        if kind == "palette_heavy":
+            palette = _random_palette(255, seed)
+        scene = Scene()
+        scene.add_part(kind.replace("_", " ").title()).voxels = generate_grid(kind, size, seed=seed)
+        project = Project(name=f"Synthetic {kind} {size}", scene=scene)
+    return SyntheticScene(kind=kind, size=size, seed=seed, project=project, palette=palette)
+
+
+def generate_grid(kind: str, size: int, *, seed: int = 0) -> VoxelGrid:
+    if kind == "terrain":
+        return noise_terrain(size, seed=seed)
+    if kind == "menger":
+        # Largest sponge that fits in the requested size.
+        level = 0
+        while 3 ** (level + 1) <= size:
+            level += 1
+        return menger_sponge(level)
+    if kind == "shell":
+        return hollow_shell(size, thickness=max(1, size // 16))
+    if kind == "checkerboard":
+        return checkerboard(size)
+    if kind == "palette_heavy":
+        return palette_heavy(size, seed=seed)
+    raise ValueError(f"Unsupported synthetic grid: {kind}")
+
+
+def save_fixture(scene: SyntheticScene, path: str | Path) -> str:
+    from core.export.qb_exporter import export_models_to_qb
+    from core.export.vox_exporter import export_parts_to_vox
+    from core.io.project_io import save_project
+
+    target = Path(path)
+    fixture_format = FIXTURE_FORMATS.get(target.suffix.lower())
+    if fixture_format is None:
+        raise ValueError(f"Unsupported fixture format: {target.suffix or target.name}")
+    parts = [part for _, part in scene.project.scene.iter_parts_ordered()]
+    if fixture_format == "vox":
+        export_parts_to_vox(parts, scene.palette, str(target))
+    elif fixture_format == "qb":
+        # QB matrices carry no transforms, so part positions are baked into the voxels.
+        export_models_to_qb(
+            [_baked_voxels(part) for part in parts],
+            scene.palette,
+            str(target),
+            names=[part.name for part in parts],
+        )
+    else:
+        save_project(scene.project, str(target))
+    return fixture_format
+
+
+def _fill(dims: tuple[int, int, int], predicate: _Predicate, colorize: _Colorize) -> VoxelGrid:
+    # Evaluates the predicate one chunk-aligned X slab at a time so memory stays bounded on
+    # large sizes, writing each slab through the bulk set_many path.
+    size_x, size_y, size_z = dims
+    ys = np.arange(size_y, dtype=np.int64)[None, :, None]
+    zs = np.arange(size_z, dtype=np.int64)[None, None, :]
+    voxels = VoxelGrid()
+    for start in range(0, size_x, CHUNK_SIZE):
+        xs = np.arange(start, min(start + CHUNK_SIZE, size_x), dtype=np.int64)[:, None, None]
+        keep = np.broadcast_to(predicate(xs, ys, zs), (xs.shape[0], size_y, size_z))
+        coords = np.stack(np.nonzero(keep), axis=1).astype(np.int64)
+        if coords.shape[0] == 0:
+            continue
+        coords[:, 0] += start
+        voxels.set_many(coords, colorize(coords))
+    return voxels
+
+
+def _building(width: int, height: int, depth: int) -> VoxelGrid:
+    def predicate(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        wall = (x == 0) | (x == width - 1) | (z == 0) | (z == depth - 1)
+        return wall | (y == 0) | (y == height - 1)
+
+    def colorize(coords: np.ndarray) -> np.ndarray:
+        x, y, z = coords[:, 0], coords[:, 1], coords[:, 2]
+        window = (y % 3 == 1) & ((x + z) % 3 == 1) & (y < height - 1)
+        return np.where(y == height - 1, 5, np.where(window, 4, 7))
+
+    return _fill((width, height, depth), predicate, colorize)
+
+
+def _value_noise(size: int, rng: np.random.Generator, octaves: int) -> np.ndarray:
+    if octaves < 1:
+        raise ValueError(f"Unsupported noise octaves: {octaves}")
+    total = np.zeros((size, size), dtype=np.float64)
+    amplitude = 1.0
+    weight = 0.0
+    for octave in range(octaves):
+        cells = 2 ** (octave + 1)
+        lattice = rng.random((cells + 1, cells + 1))
+        samples = np.linspace(0.0, cells, size, endpoint=False)
+        cell = samples.astype(np.int64)
+        fraction = samples - cell
+        fraction = fraction * fraction * (3.0 - 2.0 * fraction)
+        fx = fraction[:, None]
+        fz = fraction[None, :]
+        low, high = cell, cell + 1
+        near = lattice[np.ix_(low, low)] * (1.0 - fx) + lattice[np.ix_(high, low)] * fx
+        far = lattice[np.ix_(low, high)] * (1.0 - fx) + lattice[np.ix_(high, high)] * fx
+        total += amplitude * (near * (1.0 - fz) + far * fz)
+        weight += amplitude
+        amplitude *= 0.5
+    return total / weight
+
+
+def _random_palette(count: int, seed: int) -> list[tuple[int, int, int]]:
+    rng = np.random.default_rng(seed)
+    return [tuple(int(channel) for channel in rgb) for rgb in rng.integers(0, 256, (count, 3))]
+
+
+def _baked_voxels(part) -> VoxelGrid:
+    offset = np.array([int(round(float(value))) for value in part.position], dtype=np.int64)
+    if not offset.any():
+        return part.voxels
+    coords, colors = part.voxels.to_arrays()
+    baked = VoxelGrid()
+    baked.set_many(coords + offset, colors)
+    return baked
+
+
+def _check_size(size: int) -> None:
+    if size < 1:
+        raise ValueError(f"Unsupported synthetic size: {size}")
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from core.meshing.mesh import SurfaceMesh
+from core.meshing.solidify import build_solid_mesh
+from core.voxels.voxel_grid import ChunkKey, VoxelGrid, VoxelKey
+
+# Every factor divides the 16^3 chunk size, so a coarse cell never straddles two chunks and
+# each chunk can be downsampled on its own.
+LOD_FACTORS = (2, 4, 8)
+
+
+def downsample_voxels(
+    coords: np.ndarray, colors: np.ndarray, factor: int
+) -> tuple[np.ndarray, np.ndarray]:
+    # Each factor^3 block becomes one cell when any voxel in it is filled, coloured by the most
+    # common colour in the block (ties go to the lower palette index).
+    coord_rows = np.asarray(coords, dtype=np.int64).reshape(-1, 3)
+    color_values = np.asarray(colors, dtype=np.int64).reshape(-1)
+    if coord_rows.shape[0] == 0:
+        return np.zeros((0, 3), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    rows = np.column_stack((coord_rows // factor, color_values))
+    unique_rows, counts = np.unique(rows, axis=0, return_counts=True)
+    order = np.lexsort(
+        (unique_rows[:, 3], -counts, unique_rows[:, 2], unique_rows[:, 1], unique_rows[:, 0])
+    )
+    ranked = unique_rows[order]
+    first = np.ones(ranked.shape[0], dtype=bool)
+    first[1:] = np.any(ranked[1:, :3] != ranked[:-1, :3], axis=1)
+    winners = ranked[first]
+    return winners[:, :3], winners[:, 3]
+
+
+def downsample_grid(voxels: VoxelGrid, factor: int) -> VoxelGrid:
+    _validate_factor(factor)
+    coarse = VoxelGrid()
+    coords, colors = voxels.to_arrays()
+    coarse.set_many(*downsample_voxels(coords, colors, factor))
+    return coarse
+
+
+def select_lod_factor(pixels_per_voxel: float, *, max_cell_pixels: float = 2.0) -> int:
+    # Coarsest level whose cells still project smaller than max_cell_pixels, so a part only
+    # drops detail once its voxels are below a pixel apart.
+    factor = 1
+    for candidate in LOD_FACTORS:
+        if pixels_per_voxel * candidate >= max_cell_pixels:
+            break
+        factor = candidate
+    return factor
+
+
+@dataclass(slots=True)
+class _LodLevel:
+    grid: VoxelGrid = field(default_factory=VoxelGrid)
+    revision: int = -1
+    chunk_revisions: dict[ChunkKey, int] = field(default_factory=dict)
+    chunk_cells: dict[ChunkKey, list[VoxelKey]] = field(default_factory=dict)
+    mesh: SurfaceMesh | None = None
+    mesh_revision: int = -1
+
+
+class VoxelLodPyramid:
+    # Coarse copies of a grid, built on first use and refreshed per chunk when the source
+    # grid's chunk revisions move on. Level cells live in coarse coordinates: cell c covers
+    # source voxels [c * factor, (c + 1) * factor).
+    def __init__(self, voxels: VoxelGrid) -> None:
+        self.voxels = voxels
+        self._levels: dict[int, _LodLevel] = {}
+
+    def level(self, factor: int) -> VoxelGrid:
+        _validate_factor(factor)
+        level = self._levels.setdefault(factor, _LodLevel())
+        voxels = self.voxels
+        if level.revision == voxels.revision:
+            return level.grid
+
+        for chunk_key in list(level.chunk_revisions):
+            if voxels.chunk_revision(chunk_key) != level.chunk_revisions[chunk_key]:
+                self._drop_chunk(level, chunk_key)
+        coords: list[VoxelKey] = []
+        colors: list[int] = []
+        for chunk_key, chunk in voxels.iter_chunks():
+            if chunk_key in level.chunk_revisions:
+                continue
+            chunk_coords, chunk_colors = downsample_voxels(
+                np.array(list(chunk), dtype=np.int64),
+                np.fromiter(chunk.values(), dtype=np.int64, count=len(chunk)),
+                factor,
+            )
+            cells = [tuple(cell) for cell in chunk_coords.tolist()]
+            level.chunk_revisions[chunk_key] = voxels.chunk_revision(chunk_key)
+            level.chunk_cells[chunk_key] = cells
+            coords.extend(cells)
+            colors.extend(chunk_colors.tolist())
+        if coords:
+            level.grid.set_many(coords, colors)
+        level.revision = voxels.revision
+        return level.grid
+
+    def mesh(self, factor: int) -> SurfaceMesh:
+        # Greedy-meshes the coarse grid and scales it back to source units.
+        grid = self.level(factor)
+        level = self._levels[factor]
+        if level.mesh is None or level.mesh_revision != grid.revision:
+            coarse = build_solid_mesh(grid, greedy=True)
+            level.mesh = SurfaceMesh(
+                vertices=[(x * factor, y * factor, z * factor) for x, y, z in coarse.vertices],
+                quads=coarse.quads,
+                face_colors=coarse.face_colors,
+            )
+            level.mesh_revision = grid.revision
+        return level.mesh
+
+    @staticmethod
+    def _drop_chunk(level: _LodLevel, chunk_key: ChunkKey) -> None:
+        for x, y, z in level.chunk_cells.pop(chunk_key, []):
+            level.grid.remove(x, y, z)
+        del level.chunk_revisions[chunk_key]
+
+
+def _validate_factor(factor: int) -> None:
+    if factor not in LOD_FACTORS:
+        raise ValueError(f"LOD factor must be one of {', '.join(map(str, LOD_FACTORS))}.")
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import heapq
+import sys
+from math import floor, inf
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+from core.voxels.raycast import VoxelRayHit
+
+# Each node covers 4x4x4 children, so its occupancy fits in one 64-bit mask. Level 1 nodes hold
+# voxel bits, level 2 nodes line up with the 16^3 storage chunks, and the top level is a hash
+# of roots spanning 4^LEVEL_COUNT cells per axis.
+LEVEL_COUNT = 8
+
+Cell = tuple[int, int, int]
+BoxBound = tuple[int | None, int | None, int | None]
+
+
+class OccupancyTree:
+    # Hashed 64-tree over voxel occupancy (colours are not stored). _levels[i] maps the
+    # coordinates of a level i + 1 node (cell >> 2 * (i + 1)) to the mask of its occupied
+    # children.
+    def __init__(self) -> None:
+        self._levels: list[dict[Cell, int]] = [{} for _ in range(LEVEL_COUNT)]
+
+    @classmethod
+    def from_coords(cls, coords) -> "OccupancyTree":
+        tree = cls()
+        keys = np.asarray(coords, dtype=np.int64).reshape(-1, 3)
+        for level in tree._levels:
+            if keys.shape[0] == 0:
+                break
+            parents = keys >> 2
+            bits = np.left_shift(np.int64(1), _child_bits(keys)).astype(np.uint64)
+            parent_keys, inverse = np.unique(parents, axis=0, return_inverse=True)
+            masks = np.zeros(parent_keys.shape[0], dtype=np.uint64)
+            np.bitwise_or.at(masks, inverse.reshape(-1), bits)
+            level.update(zip(map(tuple, parent_keys.tolist()), masks.tolist()))
+            keys = parent_keys
+        return tree
+
+    def add(self, x: int, y: int, z: int) -> None:
+        key = (x, y, z)
+        for level in self._levels:
+            parent = (key[0] >> 2, key[1] >> 2, key[2] >> 2)
+            bit = 1 << _child_bit(key)
+            mask = level.get(parent, 0)
+            if mask & bit:
+                return
+            level[parent] = mask | bit
+            if mask:
+                return
+            key = parent
+
+    def add_many(self, cells: Iterable[Cell]) -> None:
+        for x, y, z in cells:
+            self.add(x, y, z)
+
+    def remove(self, x: int, y: int, z: int) -> None:
+        key = (x, y, z)
+        for level in self._levels:
+            parent = (key[0] >> 2, key[1] >> 2, key[2] >> 2)
+            bit = 1 << _child_bit(key)
+            mask = level.get(parent, 0)
+            if not mask & bit:
+                return
+            mask &= ~bit
+            if mask:
+                level[parent] = mask
+                return
+            del level[parent]
+            key = parent
+
+    def contains(self, x: int, y: int, z: int) -> bool:
+        mask = self._levels[0].get((x >> 2, y >> 2, z >> 2), 0)
+        return bool(mask & (1 << _child_bit((x, y, z))))
+
+    def is_empty(self) -> bool:
+        return not self._levels[0]
+
+    def storage_bytes(self) -> int:
+        # Measured from the level dicts; node keys are tuples and masks boxed 64-bit ints.
+        total = sys.getsizeof(self._levels)
+        for level in self._levels:
+            total += sys.getsizeof(level)
+            if level:
+                key, mask = next(iter(level.items()))
+                total += len(level) * (sys.getsizeof(key) + sys.getsizeof(mask))
+        return total
+
+    def is_region_empty(self, minimum: BoxBound, maximum: BoxBound) -> bool:
+        # Inclusive box; None leaves an axis unbounded.
+        return next(self._walk(_box_test(minimum, maximum)), None) is None
+
+    def cells_in_box(self, minimum: BoxBound, maximum: BoxBound) -> list[Cell]:
+        return list(self._walk(_box_test(minimum, maximum)))
+
+    def cells_in_sphere(self, center: tuple[float, float, float], radius: float) -> list[Cell]:
+        radius_sq = float(radius) * float(radius)
+
+        def overlaps(low: Cell, high: Cell) -> bool:
+            distance_sq = 0.0
+            for axis in range(3):
+                value = center[axis]
+                nearest = min(max(value, low[axis]), high[axis])
+                distance_sq += (value - nearest) ** 2
+            return distance_sq <= radius_sq
+
+        return list(self._walk(overlaps))
+
+    def bounds(
+        self,
+        minimum: BoxBound = (None, None, None),
+        maximum: BoxBound = (None, None, None),
+    ) -> tuple[Cell, Cell] | None:
+        # Tight bounds of the occupied cells inside the box, found best-first per axis so only
+        # nodes that can still improve an extreme are opened.
+        overlaps = _box_test(minimum, maximum)
+        low: list[int] = []
+        high: list[int] = []
+        for axis in range(3):
+            smallest = self._extreme(axis, overlaps, largest=False)
+            if smallest is None:
+                return None
+            low.append(smallest)
+            high.append(self._extreme(axis, overlaps, largest=True))
+        return (low[0], low[1], low[2]), (high[0], high[1], high[2])
+
+    def raycast(
+        self,
+        origin: tuple[float, float, float],
+        direction: tuple[float, float, float],
+        *,
+        t_start: float = 0.0,
+        t_end: float = 200.0,
+    ) -> VoxelRayHit | None:
+        # Same contract as traverse_voxel_ray, but jumps across the largest empty node around
+        # the current cell instead of stepping one cell at a time.
+        if self.is_empty() or t_end < t_start:
+            return None
+        step = [1 if d > 1e-12 else -1 if d < -1e-12 else 0 for d in direction]
+        cell = [int(floor(origin[axis] + direction[axis] * t_start + 0.5)) for axis in range(3)]
+        normal: Cell | None = None
+        t = t_start
+        bricks = self._levels[0]
+        while t <= t_end:
+            brick = bricks.get((cell[0] >> 2, cell[1] >> 2, cell[2] >> 2))
+            if brick is not None and brick & (1 << _child_bit(cell)):
+                return VoxelRayHit((cell[0], cell[1], cell[2]), normal, t)
+            level = 0
+            if brick is None:
+                level = 1
+                while level < LEVEL_COUNT:
+                    shift = 2 * (level + 1)
+                    parent = (cell[0] >> shift, cell[1] >> shift, cell[2] >> shift)
+                    if parent in self._levels[level]:
+                        break
+                    level += 1
+            shift = 2 * level
+            node_low = [(value >> shift) << shift for value in cell]
+            node_high = [value + (1 << shift) - 1 for value in node_low]
+            exit_axis = -1
+            t_exit = inf
+            for axis in range(3):
+                if step[axis] > 0:
+                    t_axis = (node_high[axis] + 0.5 - origin[axis]) / direction[axis]
+                elif step[axis] < 0:
+                    t_axis = (node_low[axis] - 0.5 - origin[axis]) / direction[axis]
+                else:
+                    continue
+                if t_axis < t_exit:
+                    t_exit = t_axis
+                    exit_axis = axis
+            if exit_axis < 0:
+                return None
+            t = max(t, t_exit)
+            for axis in range(3):
+                if axis == exit_axis:
+                    cell[axis] = node_high[axis] + 1 if step[axis] > 0 else node_low[axis] - 1
+                else:
+                    value = int(floor(origin[axis] + direction[axis] * t + 0.5))
+                    cell[axis] = min(max(value, node_low[axis]), node_high[axis])
+            normal_axes = [0, 0, 0]
+            normal_axes[exit_axis] = -step[exit_axis]
+            normal = (normal_axes[0], normal_axes[1], normal_axes[2])
+        return None
+
+    def _walk(self, overlaps: Callable[[Cell, Cell], bool]) -> Iterator[Cell]:
+        stack = [
+            (LEVEL_COUNT, node)
+            for node in self._levels[LEVEL_COUNT - 1]
+            if overlaps(*_node_box(LEVEL_COUNT, node))
+        ]
+        while stack:
+            level, node = stack.pop()
+            for child in _children(node, self._levels[level - 1][node]):
+                if level == 1:
+                    if overlaps(child, child):
+                        yield child
+                elif overlaps(*_node_box(level - 1, child)):
+                    stack.append((level - 1, child))
+
+    def _extreme(
+        self,
+        axis: int,
+        overlaps: Callable[[Cell, Cell], bool],
+        *,
+        largest: bool,
+    ) -> int | None:
+        def priority(level: int, node: Cell) -> int:
+            low, high = _node_box(level, node)
+            return -high[axis] if largest else low[axis]
+
+        heap = [
+            (priority(LEVEL_COUNT, node), LEVEL_COUNT, node)
+            for node in self._levels[LEVEL_COUNT - 1]
+            if overlaps(*_node_box(LEVEL_COUNT, node))
+        ]
+        heapq.heapify(heap)
+        while heap:
+            _, level, node = heapq.heappop(heap)
+            if level == 0:
+                return node[axis]
+            for child in _children(node, self._levels[level - 1][node]):
+                if overlaps(*_node_box(level - 1, child)):
+                    heapq.heappush(heap, (priority(level - 1, child), level - 1, child))
+        return None
+
+
+def _child_bit(cell) -> int:
+    return (cell[0] & 3) | ((cell[1] & 3) << 2) | ((cell[2] & 3) << 4)
+
+
+def _child_bits(cells: np.ndarray) -> np.ndarray:
+    local = cells & 3
+    return local[:, 0] | (local[:, 1] << 2) | (local[:, 2] << 4)
+
+
+def _children(node: Cell, mask: int) -> Iterator[Cell]:
+    base_x, base_y, base_z = node[0] << 2, node[1] << 2, node[2] << 2
+    while mask:
+        low_bit = mask & -mask
+        bit = low_bit.bit_length() - 1
+        mask ^= low_bit
+        yield (base_x + (bit & 3), base_y + ((bit >> 2) & 3), base_z + (bit >> 4))
+
+
+def _node_box(level: int, node: Cell) -> tuple[Cell, Cell]:
+    # Inclusive cell range covered by a node; level 0 is a single voxel.
+    shift = 2 * level
+    low = (node[0] << shift, node[1] << shift, node[2] << shift)
+    size = (1 << shift) - 1
+    return low, (low[0] + size, low[1] + size, low[2] + size)
+
+
+def _box_test(minimum: BoxBound, maximum: BoxBound) -> Callable[[Cell, Cell], bool]:
+    low = tuple(-inf if value is None else value for value in minimum)
+    high = tuple(inf if value is None else value for value in maximum)
+
+    def overlaps(node_low: Cell, node_high: Cell) -> bool:
+        return (
+            node_low[0] <= high[0]
+            and node_high[0] >= low[0]
+            and node_low[1] <= high[1]
+            and node_high[1] >= low[1]
+            and node_low[2] <= high[2]
+            and node_high[2] >= low[2]
+        )
+
+    return overlaps
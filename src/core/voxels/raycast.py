@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-from math import floor, sqrt
+from dataclasses import dataclass
+from math import floor, inf, sqrt
 
 from core.voxels.voxel_grid import VoxelGrid
 
 
+@dataclass(slots=True, frozen=True)
+class VoxelRayHit:
+    cell: tuple[int, int, int]
+    # Outward normal of the face the ray entered through; None when the ray starts inside.
+    normal: tuple[int, int, int] | None
+    distance: float
+
+    @property
+    def adjacent_cell(self) -> tuple[int, int, int] | None:
+        if self.normal is None:
+            return None
+        return (
+            self.cell[0] + self.normal[0],
+            self.cell[1] + self.normal[1],
+            self.cell[2] + self.normal[2],
+        )
+
+
 def intersect_axis_plane(
     origin: tuple[float, float, float],
     direction: tuple[float, float, float],
@@ -65,6 +84,52 @@ def raycast_voxel_surface(
     return None
 
 
+def traverse_voxel_ray(
+    voxels: VoxelGrid,
+    origin: tuple[float, float, float],
+    direction: tuple[float, float, float],
+    *,
+    t_start: float = 0.0,
+    t_end: float = 200.0,
+) -> VoxelRayHit | None:
+    # Amanatides-Woo grid walk over [t_start, t_end], in units of direction. Voxels are centred
+    # on integer coordinates, so cell boundaries sit on half-integers.
+    if t_end < t_start:
+        return None
+    cell = [0, 0, 0]
+    step = [0, 0, 0]
+    t_max = [inf, inf, inf]
+    t_delta = [inf, inf, inf]
+    for axis in range(3):
+        position = origin[axis] + direction[axis] * t_start + 0.5
+        cell[axis] = int(floor(position))
+        d = direction[axis]
+        if d > 1e-12:
+            step[axis] = 1
+            t_max[axis] = t_start + (cell[axis] + 1 - position) / d
+            t_delta[axis] = 1.0 / d
+        elif d < -1e-12:
+            step[axis] = -1
+            t_max[axis] = t_start + (cell[axis] - position) / d
+            t_delta[axis] = -1.0 / d
+
+    normal: tuple[int, int, int] | None = None
+    t = t_start
+    while t <= t_end:
+        if voxels.get(cell[0], cell[1], cell[2]) is not None:
+            return VoxelRayHit((cell[0], cell[1], cell[2]), normal, t)
+        axis = min(range(3), key=t_max.__getitem__)
+        t = t_max[axis]
+        if t == inf:
+            return None
+        cell[axis] += step[axis]
+        t_max[axis] += t_delta[axis]
+        normal_axes = [0, 0, 0]
+        normal_axes[axis] = -step[axis]
+        normal = (normal_axes[0], normal_axes[1], normal_axes[2])
+    return None
+
+
 def resolve_brush_target_cell(
     voxels: VoxelGrid,
     origin: tuple[float, float, float],
@@ -73,7 +138,19 @@ def resolve_brush_target_cell(
     erase_mode: bool,
     plane_fallback_cell: tuple[int, int, int] | None = None,
 ) -> tuple[tuple[int, int, int], str] | None:
-    hit_result = raycast_voxel_surface(voxels, origin, direction)
+    return resolve_brush_target_from_hit(
+        raycast_voxel_surface(voxels, origin, direction),
+        erase_mode=erase_mode,
+        plane_fallback_cell=plane_fallback_cell,
+    )
+
+
+def resolve_brush_target_from_hit(
+    hit_result: tuple[tuple[int, int, int], tuple[int, int, int] | None] | None,
+    *,
+    erase_mode: bool,
+    plane_fallback_cell: tuple[int, int, int] | None = None,
+) -> tuple[tuple[int, int, int], str] | None:
     if erase_mode:
         if hit_result is None:
             return None
@@ -98,7 +175,19 @@ def resolve_shape_target_cell(
     erase_mode: bool,
     plane_fallback_cell: tuple[int, int, int] | None = None,
 ) -> tuple[tuple[int, int, int], str] | None:
-    hit_result = raycast_voxel_surface(voxels, origin, direction)
+    return resolve_shape_target_from_hit(
+        raycast_voxel_surface(voxels, origin, direction),
+        erase_mode=erase_mode,
+        plane_fallback_cell=plane_fallback_cell,
+    )
+
+
+def resolve_shape_target_from_hit(
+    hit_result: tuple[tuple[int, int, int], tuple[int, int, int] | None] | None,
+    *,
+    erase_mode: bool,
+    plane_fallback_cell: tuple[int, int, int] | None = None,
+) -> tuple[tuple[int, int, int], str] | None:
     if hit_result is None:
         if plane_fallback_cell is None:
             return None
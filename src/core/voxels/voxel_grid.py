@@ -1,45 +1,246 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterator
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from core.voxels.occupancy import OccupancyTree
+
+CHUNK_SHIFT = 4
+CHUNK_SIZE = 1 << CHUNK_SHIFT
+# CPython caches ints in this range; coordinates outside it are boxed per key.
+_SMALL_INT_RANGE = range(-5, 257)
+_KEY_TUPLE_BYTES = sys.getsizeof((0, 0, 0))
+_BOXED_INT_BYTES = sys.getsizeof(1 << 20)
+
+ChunkKey = tuple[int, int, int]
+VoxelKey = tuple[int, int, int]
 
 
 @dataclass(slots=True)
 class VoxelGrid:
-    _data: dict[tuple[int, int, int], int] = field(default_factory=dict)
+    # Voxels are stored per 16^3 chunk, keyed by world coordinates inside each chunk.
+    # Snapshots share the chunk dicts; a live grid copies a chunk before its first write
+    # after a snapshot was taken.
+    _chunks: dict[ChunkKey, dict[VoxelKey, int]] = field(default_factory=dict)
     revision: int = 0
+    _count: int = field(default=0, compare=False)
+    _frozen: bool = field(default=False, compare=False, repr=False)
+    _shared_chunks: set[ChunkKey] = field(default_factory=set, compare=False, repr=False)
+    _read_only: bool = field(default=False, compare=False, repr=False)
+    _chunk_revisions: dict[ChunkKey, int] = field(default_factory=dict, compare=False, repr=False)
+    _occupancy: "OccupancyTree | None" = field(default=None, compare=False, repr=False)
+    _write_hook: "Callable[[VoxelGrid], None] | None" = field(
+        default=None, compare=False, repr=False
+    )
 
     def set(self, x: int, y: int, z: int, color_index: int) -> None:
         key = (x, y, z)
         color_value = int(color_index)
-        if self._data.get(key) == color_value:
+        chunk = self._chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT, z >> CHUNK_SHIFT))
+        if chunk is not None and chunk.get(key) == color_value:
             return
-        self._data[key] = color_value
+        chunk = self._writable_chunk((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT, z >> CHUNK_SHIFT))
+        if key not in chunk:
+            self._count += 1
+            if self._occupancy is not None:
+                self._occupancy.add(x, y, z)
+        chunk[key] = color_value
         self.revision += 1
 
     def remove(self, x: int, y: int, z: int) -> None:
         key = (x, y, z)
-        if key in self._data:
-            del self._data[key]
-            self.revision += 1
+        chunk_key = (x >> CHUNK_SHIFT, y >> CHUNK_SHIFT, z >> CHUNK_SHIFT)
+        chunk = self._chunks.get(chunk_key)
+        if chunk is None or key not in chunk:
+            return
+        chunk = self._writable_chunk(chunk_key)
+        del chunk[key]
+        if not chunk:
+            del self._chunks[chunk_key]
+            del self._chunk_revisions[chunk_key]
+        if self._occupancy is not None:
+            self._occupancy.remove(x, y, z)
+        self._count -= 1
+        self.revision += 1
 
     def clear(self) -> None:
-        if not self._data:
+        self._ensure_writable()
+        if not self._count:
             return
-        self._data.clear()
+        # Replacing the dict leaves any snapshot's chunk storage untouched.
+        if self._write_hook is not None:
+            self._notify_write()
+        self._chunks = {}
+        self._chunk_revisions = {}
+        self._occupancy = None
+        self._shared_chunks = set()
+        self._frozen = False
+        self._count = 0
         self.revision += 1
 
     def get(self, x: int, y: int, z: int) -> int | None:
-        return self._data.get((x, y, z))
+        chunk = self._chunks.get((x >> CHUNK_SHIFT, y >> CHUNK_SHIFT, z >> CHUNK_SHIFT))
+        if chunk is None:
+            return None
+        return chunk.get((x, y, z))
 
     def count(self) -> int:
-        return len(self._data)
+        return self._count
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    def snapshot(self) -> "VoxelGrid":
+        if self._read_only:
+            return self
+        self._frozen = True
+        return VoxelGrid(
+            _chunks=self._chunks,
+            revision=self.revision,
+            _count=self._count,
+            _frozen=True,
+            _read_only=True,
+            _chunk_revisions=self._chunk_revisions,
+        )
+
+    def copy(self) -> "VoxelGrid":
+        # Writable copy sharing chunk storage with this grid until either side writes.
+        self._frozen = True
+        return VoxelGrid(
+            _chunks=self._chunks,
+            revision=self.revision,
+            _count=self._count,
+            _frozen=True,
+            _chunk_revisions=self._chunk_revisions,
+        )
+
+    def occupancy(self) -> "OccupancyTree":
+        # Built on first use, then kept in step with every later edit of this grid.
+        if self._occupancy is None:
+            from core.voxels.occupancy import OccupancyTree
+
+            self._occupancy = OccupancyTree.from_coords(self.to_arrays()[0])
+        return self._occupancy
+
+    def notify_next_write(self, hook: "Callable[[VoxelGrid], None] | None") -> None:
+        # One-shot: hook(grid) runs before the next write only, so later writes stay as cheap
+        # as before until the owner arms it again.
+        self._write_hook = hook
+
+    def chunk_keys(self) -> list[ChunkKey]:
+        return list(self._chunks)
+
+    def chunk_revision(self, chunk_key: ChunkKey) -> int:
+        # Grid revision of the last write to this chunk; 0 when the chunk is empty.
+        return self._chunk_revisions.get(chunk_key, 0)
+
+    def iter_chunks(self) -> Iterator[tuple[ChunkKey, dict[VoxelKey, int]]]:
+        return iter(self._chunks.items())
+
+    def items(self) -> Iterator[tuple[VoxelKey, int]]:
+        for chunk in self._chunks.values():
+            yield from chunk.items()
+
+    def storage_bytes(self, seen: set[int] | None = None) -> int:
+        # Measured footprint of the chunk dicts, their coordinate keys and the occupancy index.
+        # Chunks whose ids are already in `seen` (shared with a snapshot or copy counted
+        # earlier) are skipped, and the ids counted here are added to it.
+        seen = set() if seen is None else seen
+        total = 0.0
+        if id(self._chunks) not in seen:
+            seen.add(id(self._chunks))
+            total += sys.getsizeof(self._chunks) + sys.getsizeof(self._chunk_revisions)
+        for chunk_key, chunk in self._chunks.items():
+            if id(chunk) in seen:
+                continue
+            seen.add(id(chunk))
+            total += sys.getsizeof(chunk) + len(chunk) * _key_bytes(chunk_key)
+        if self._occupancy is not None and id(self._occupancy) not in seen:
+            seen.add(id(self._occupancy))
+            total += self._occupancy.storage_bytes()
+        return int(total)
+
+    def set_many(self, coords, colors) -> None:
+        coord_rows = np.asarray(coords, dtype=np.int64).reshape(-1, 3)
+        color_values = np.asarray(colors, dtype=np.int64).reshape(-1)
+        if coord_rows.shape[0] != color_values.shape[0]:
+            raise ValueError("coords and colors must have the same length.")
+        self._ensure_writable()
+        if coord_rows.shape[0] == 0:
+            return
+        chunk_rows = coord_rows >> CHUNK_SHIFT
+        chunk_keys, inverse = np.unique(chunk_rows, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(chunk_keys.shape[0] + 1)).tolist()
+        xs, ys, zs = coord_rows[order].T.tolist()
+        ordered_colors = color_values[order].tolist()
+        for index, chunk_key in enumerate(map(tuple, chunk_keys.tolist())):
+            start, end = bounds[index], bounds[index + 1]
+            keys = zip(xs[start:end], ys[start:end], zs[start:end])
+            chunk = self._writable_chunk(chunk_key)
+            before = len(chunk)
+            chunk.update(zip(keys, ordered_colors[start:end]))
+            self._count += len(chunk) - before
+        if self._occupancy is not None:
+            self._occupancy.add_many(map(tuple, coord_rows.tolist()))
+        self.revision += 1
+
+    def to_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        if not self._count:
+            return np.zeros((0, 3), dtype=np.int64), np.zeros(0, dtype=np.int64)
+        coords = np.fromiter(
+            (axis for chunk in self._chunks.values() for key in chunk for axis in key),
+            dtype=np.int64,
+            count=self._count * 3,
+        ).reshape(-1, 3)
+        colors = np.fromiter(
+            (color for chunk in self._chunks.values() for color in chunk.values()),
+            dtype=np.int64,
+            count=self._count,
+        )
+        return coords, colors
 
     def to_list(self) -> list[list[int]]:
         rows: list[list[int]] = []
-        for (x, y, z), color_index in sorted(self._data.items(), key=lambda item: item[0]):
+        for (x, y, z), color_index in sorted(self.items(), key=lambda item: item[0]):
             rows.append([x, y, z, color_index])
         return rows
 
+    def _ensure_writable(self) -> None:
+        if self._read_only:
+            raise ValueError("VoxelGrid snapshot is read-only.")
+
+    def _writable_chunk(self, chunk_key: ChunkKey) -> dict[VoxelKey, int]:
+        self._ensure_writable()
+        if self._write_hook is not None:
+            self._notify_write()
+        if self._frozen:
+            self._chunks = dict(self._chunks)
+            self._chunk_revisions = dict(self._chunk_revisions)
+            self._shared_chunks = set(self._chunks)
+            self._frozen = False
+        self._chunk_revisions[chunk_key] = self.revision + 1
+        chunk = self._chunks.get(chunk_key)
+        if chunk is None:
+            chunk = {}
+            self._chunks[chunk_key] = chunk
+        elif chunk_key in self._shared_chunks:
+            chunk = dict(chunk)
+            self._chunks[chunk_key] = chunk
+            self._shared_chunks.discard(chunk_key)
+        return chunk
+
+    def _notify_write(self) -> None:
+        hook = self._write_hook
+        self._write_hook = None
+        hook(self)
+
     @classmethod
     def from_list(cls, data) -> "VoxelGrid":
         if not isinstance(data, list):
@@ -54,3 +255,15 @@ class VoxelGrid:
                 raise ValueError("voxel row values must be integers.")
             grid.set(x, y, z, color_index)
         return grid
+
+
+def _key_bytes(chunk_key: ChunkKey) -> float:
+    # Average bytes per voxel key in a chunk: the 3-tuple plus its boxed coordinates. Colour
+    # values are palette indices, which always come from the small-int cache.
+    boxed = 0.0
+    for axis in chunk_key:
+        low = axis << CHUNK_SHIFT
+        high = min(low + CHUNK_SIZE - 1, _SMALL_INT_RANGE.stop - 1)
+        cached = max(0, high - max(low, _SMALL_INT_RANGE.start) + 1)
+        boxed += (CHUNK_SIZE - cached) / CHUNK_SIZE
+    return _KEY_TUPLE_BYTES + boxed * _BOXED_INT_BYTES
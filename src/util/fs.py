@@ -4,6 +4,10 @@ import os
 import tempfile
 from pathlib import Path
 
+# Resolved temp dirs by candidate list, so the write probe runs once per process instead of on
+# every call; a changed environment yields new candidates and is probed again.
+_TEMP_DIR_CACHE: dict[tuple[Path, ...], Path] = {}
+
 
 def _is_within(child: Path, parent: Path) -> bool:
     try:
@@ -40,10 +44,16 @@ def get_app_temp_dir(app_name: str) -> Path:
     candidates.append(Path.home() / "AppData" / "Local" / safe_name / "Temp")
     candidates.append(Path.home() / f".{safe_name}" / "Temp")
 
+    key = tuple(candidates)
+    cached = _TEMP_DIR_CACHE.get(key)
+    if cached is not None and cached.is_dir():
+        return cached
+
     for candidate in candidates:
         if _is_within(candidate, repo_root):
             continue
         if _is_writable_dir(candidate):
+            _TEMP_DIR_CACHE[key] = candidate
             return candidate
 
     raise RuntimeError("Could not create a writable temp directory outside the repository.")
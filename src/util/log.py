@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import json
 import logging
 from logging.handlers import RotatingFileHandler
 
 from util.fs import get_app_temp_dir
 
 _LOG_NAME = "voxel_tool.log"
+_SLOW_OPS_NAME = "slow_ops.jsonl"
 
 
 def get_logger(name: str = "voxel_tool") -> logging.Logger:
@@ -40,3 +42,28 @@ def get_logger(name: str = "voxel_tool") -> logging.Logger:
     logger.addHandler(stream_handler)
     return logger
 
+
+def get_slow_ops_logger() -> logging.Logger:
+    # One JSON object per line, rotated next to voxel_tool.log.
+    logger = logging.getLogger("voxel_tool.slow_ops")
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    log_dir = get_app_temp_dir("VoxelTool")
+    log_dir.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        log_dir / _SLOW_OPS_NAME,
+        maxBytes=512_000,
+        backupCount=2,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(file_handler)
+    return logger
+
+
+def log_slow_operation(record: dict) -> None:
+    get_slow_ops_logger().info(json.dumps(record, sort_keys=True))
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import dataclass, field
+from importlib.abc import MetaPathFinder
+
+
+@dataclass(slots=True)
+class ModuleImport:
+    name: str
+    # Inclusive time covers the modules this one imported while executing; self time does not.
+    inclusive_ms: float = 0.0
+    self_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class StartupProfile:
+    modules: list[ModuleImport] = field(default_factory=list)
+    phases: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def import_ms(self) -> float:
+        return sum(module.self_ms for module in self.modules)
+
+    def slowest(self, limit: int = 25) -> list[ModuleImport]:
+        return sorted(self.modules, key=lambda module: module.self_ms, reverse=True)[:limit]
+
+    def packages(self, depth: int = 1) -> list[tuple[str, float]]:
+        # Self time summed per top-level package (or per `depth` leading name parts).
+        totals: dict[str, float] = {}
+        for module in self.modules:
+            key = ".".join(module.name.split(".")[: max(1, depth)])
+            totals[key] = totals.get(key, 0.0) + module.self_ms
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+class _TimedLoader:
+    # Wraps a module's real loader; anything but module creation and execution is delegated.
+    def __init__(self, profiler: StartupProfiler, name: str, loader) -> None:
+        self._profiler = profiler
+        self._name = name
+        self._loader = loader
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Extension modules do their work here rather than in exec_module.
+        create = getattr(self._loader, "create_module", None)
+        if create is None:
+            return None
+        return self._profiler._timed(self._name, create, spec)
+
+    def exec_module(self, module) -> None:
+        self._profiler._timed(self._name, self._loader.exec_module, module)
+
+
+class StartupProfiler(MetaPathFinder):
+    # Times every module imported while installed. It sits first on sys.meta_path, asks the
+    # remaining finders for the spec and wraps the loader, so finder cost is not counted.
+    def __init__(self) -> None:
+        self.profile = StartupProfile()
+        self._entries: dict[str, ModuleImport] = {}
+        self._stack: list[ModuleImport] = []
+        self._started = time.perf_counter()
+        self._last_mark = self._started
+        self._finding: set[str] = set()
+
+    def install(self) -> StartupProfiler:
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def mark(self, phase: str) -> None:
+        # Records the wall time since the previous mark (or since the profiler was created).
+        now = time.perf_counter()
+        self.profile.phases.append((phase, (now - self._last_mark) * 1000.0))
+        self._last_mark = now
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self, fullname, spec.loader)
+        return spec
+
+    def _timed(self, name: str, call, argument):
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = ModuleImport(name)
+            self._entries[name] = entry
+            self.profile.modules.append(entry)
+        self._stack.append(entry)
+        started = time.perf_counter()
+        try:
+            return call(argument)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000.0
+            self._stack.pop()
+            entry.inclusive_ms += elapsed
+            entry.self_ms += elapsed
+            if self._stack:
+                self._stack[-1].self_ms -= elapsed
+
+
+def format_startup_profile(profile: StartupProfile, *, limit: int = 25) -> str:
+    lines = ["Startup phases:"]
+    for phase, duration_ms in profile.phases:
+        lines.append(f"  {phase:<28} {duration_ms:9.1f} ms")
+    lines.append(
+        f"Imports: {len(profile.modules)} modules, {profile.import_ms:.1f} ms self time"
+    )
+    lines.append("  By package (self ms):")
+    for package, self_ms in profile.packages()[:limit]:
+        lines.append(f"    {package:<40} {self_ms:9.1f}")
+    lines.append("  Slowest modules (self ms / inclusive ms):")
+    for module in profile.slowest(limit):
+        lines.append(f"    {module.name:<40} {module.self_ms:9.1f} {module.inclusive_ms:9.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, TypeVar
+
+_F = TypeVar("_F", bound=Callable)
+
+# Oldest spans are dropped past this many, so a forgotten capture cannot grow without bound.
+MAX_TRACE_EVENTS = 500_000
+
+_enabled = False
+_events: deque[tuple[str, str, int, int, int, dict[str, object] | None]] = deque(
+    maxlen=MAX_TRACE_EVENTS
+)
+_thread_names: dict[int, str] = {}
+_origin_ns = time.perf_counter_ns()
+
+
+class _Span:
+    __slots__ = ("_name", "_category", "_args", "_start_ns")
+
+    def __init__(self, name: str, category: str, args: dict[str, object] | None) -> None:
+        self._name = name
+        self._category = category
+        self._args = args
+        self._start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self._start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end_ns = time.perf_counter_ns()
+        thread = threading.current_thread()
+        _thread_names.setdefault(thread.ident or 0, thread.name)
+        _events.append(
+            (
+                self._name,
+                self._category,
+                self._start_ns - _origin_ns,
+                end_ns - self._start_ns,
+                thread.ident or 0,
+                self._args,
+            )
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable_tracing(enabled: bool = True) -> None:
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def clear_trace() -> None:
+    _events.clear()
+
+
+def span(name: str, *, category: str = "app", **args: object) -> _Span | _NullSpan:
+    # While tracing is off this returns a shared no-op context manager.
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args or None)
+
+
+def traced(name: str | None = None, *, category: str = "app") -> Callable[[_F], _F]:
+    def decorate(func: _F) -> _F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, category, None):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def trace_events() -> list[dict[str, object]]:
+    # Chrome trace_event "complete" events; timestamps and durations are in microseconds.
+    pid = os.getpid()
+    events: list[dict[str, object]] = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+        for tid, thread_name in sorted(_thread_names.items())
+    ]
+    for name, category, start_ns, duration_ns, tid, args in list(_events):
+        event: dict[str, object] = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_ns / 1000.0,
+            "dur": duration_ns / 1000.0,
+            "pid": pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = {key: _json_value(value) for key, value in args.items()}
+        events.append(event)
+    return events
+
+
+def write_chrome_trace(path: str | Path) -> int:
+    # Loadable in Perfetto (ui.perfetto.dev) or chrome://tracing.
+    events = trace_events()
+    payload = {"traceEvents": events, "displayTimeUnit": "ms"}
+    Path(path).write_text(json.dumps(payload), encoding="utf-8")
+    return sum(1 for event in events if event["ph"] == "X")
+
+
+def _json_value(value: object) -> object:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
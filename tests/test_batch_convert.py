@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+from app.batch_convert import collect_conversion_tasks, main, run_batch
+from core.export.qb_exporter import export_voxels_to_qb
+from core.export.vox_exporter import export_voxels_to_vox
+from core.io.project_io import load_project
+from core.io.qb_io import load_qb_models
+from core.palette import DEFAULT_PALETTE
+from core.voxels.voxel_grid import VoxelGrid
+from util.fs import get_app_temp_dir
+
+
+def _make_input_dir() -> Path:
+    root = get_app_temp_dir("VoxelTool") / f"batch-convert-{uuid.uuid4().hex}"
+    (root / "in" / "nested").mkdir(parents=True)
+    voxels = VoxelGrid()
+    voxels.set(0, 0, 0, 1)
+    voxels.set(2, 1, 0, 3)
+    export_voxels_to_vox(voxels, list(DEFAULT_PALETTE), str(root / "in" / "crate.vox"))
+    export_voxels_to_qb(voxels, list(DEFAULT_PALETTE), str(root / "in" / "nested" / "barrel.qb"))
+    (root / "in" / "notes.txt").write_text("ignored", encoding="utf-8")
+    (root / "in" / "broken.vox").write_bytes(b"NOPE")
+    return root
+
+
+def test_batch_convert_cli_writes_outputs_and_json_summary() -> None:
+    root = _make_input_dir()
+    try:
+        summary_path = root / "summary.json"
+        exit_code = main(
+            [
+                str(root / "in"),
+                "-o",
+                str(root / "out"),
+                "-t",
+                "project",
+                "-r",
+                "-j",
+                "1",
+                "-q",
+                "--summary-json",
+                str(summary_path),
+            ]
+        )
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        assert exit_code == 1
+        assert summary["total"] == 3
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 1
+        failed = [result for result in summary["results"] if not result["ok"]]
+        assert failed[0]["source"].endswith("broken.vox")
+        project = load_project(str(root / "out" / "crate.json"))
+        assert project.voxels.get(2, 1, 0) == 3
+        assert project.scene.get_active_part().name == "crate"
+        nested = load_project(str(root / "out" / "nested" / "barrel.json"))
+        assert nested.voxels.count() == 2
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_batch_convert_process_pool_preserves_task_order() -> None:
+    root = _make_input_dir()
+    try:
+        (root / "in" / "broken.vox").unlink()
+        tasks = collect_conversion_tasks([str(root / "in")], str(root / "out"), "qb", recursive=True)
+        progress: list[tuple[int, int]] = []
+        results = run_batch(
+            tasks, jobs=2, progress=lambda done, total, _result: progress.append((done, total))
+        )
+        assert [result.source for result in results] == [task.source for task in tasks]
+        assert all(result.ok for result in results)
+        assert progress == [(1, 2), (2, 2)]
+        models, _palette = load_qb_models(str(root / "out" / "crate.qb"))
+        assert models[0].count() == 2
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_batch_convert_does_not_import_qt() -> None:
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "import app.batch_convert, core.export, core.io, core.io.vox_io;"
+        "print('PySide6' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code, str(src_dir)], capture_output=True, text=True, check=True
+    )
+    assert output.stdout.strip() == "False"
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import shutil
+import uuid
+
+import pytest
+
+from app.benchmark_runner import (
+    BenchmarkResult,
+    BenchmarkRun,
+    build_cases,
+    build_tier_grid,
+    detect_regressions,
+    main,
+    median_and_mad,
+    tier_voxel_count,
+)
+from util.fs import get_app_temp_dir
+
+
+def _run(machine: str, medians: dict[str, float], mad: float = 0.002) -> BenchmarkRun:
+    run = BenchmarkRun(
+        started_utc="2026-01-01T00:00:00+00:00", python="3", machine=machine, repeat=5
+    )
+    for case_id, median in medians.items():
+        run.results.append(BenchmarkResult(case_id, [median], median, mad, peak_bytes=0))
+    return run
+
+
+def _history(*runs: BenchmarkRun) -> list[dict[str, object]]:
+    return [
+        {
+            "machine": run.machine,
+            "results": [
+                {"case_id": result.case_id, "median": result.median, "mad": result.mad}
+                for result in run.results
+            ],
+        }
+        for run in runs
+    ]
+
+
+def test_median_and_mad_and_tier_grids() -> None:
+    assert median_and_mad([1.0, 2.0, 9.0]) == (2.0, 1.0)
+    with pytest.raises(ValueError):
+        median_and_mad([])
+
+    assert build_tier_grid(8, "dense").count() == 512
+    sparse = build_tier_grid(16, "sparse", seed=3)
+    assert 0 < sparse.count() < 16**3 // 10
+    assert sparse.to_list() == build_tier_grid(16, "sparse", seed=3).to_list()
+    with pytest.raises(ValueError):
+        build_tier_grid(8, "solid")
+
+
+def test_build_cases_filters_before_building_anything() -> None:
+    root = get_app_temp_dir("VoxelTool") / f"benchmark-cases-{uuid.uuid4().hex}"
+    root.mkdir(parents=True)
+    try:
+        assert tier_voxel_count(8, "dense") == 512
+        assert tier_voxel_count(9, "menger") == build_tier_grid(9, "menger").count()
+        # The dense 256 tier would be 16.7M voxels; it is skipped without being allocated.
+        assert build_cases((256,), ("dense",), work_dir=root) == []
+
+        cases = build_cases((8,), ("sparse", "dense"), work_dir=root, keyword="vox_load/dense")
+        assert [case.case_id for case in cases] == ["vox_load/dense-8"]
+        assert list(root.iterdir()) == []
+        state = cases[0].setup()
+        assert state.voxel_count == 512
+        assert len(list(root.iterdir())) == 1
+        assert cases[0].setup().path == state.path
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def test_detect_regressions_ignores_noise_and_other_machines() -> None:
+    history = _history(
+        *(
+            _run("linux", {"mesh": 0.100 + 0.004 * (index % 3), "fill": 0.050})
+            for index in range(6)
+        ),
+        _run("windows", {"mesh": 0.010}),
+    )
+
+    noisy = _run("linux", {"mesh": 0.106, "fill": 0.051})
+    assert detect_regressions(noisy, history) == []
+
+    slower = _run("linux", {"mesh": 0.180, "fill": 0.051})
+    regressions = detect_regressions(slower, history)
+    assert [regression.case_id for regression in regressions] == ["mesh"]
+    assert regressions[0].slowdown == pytest.approx(0.180 / 0.104)
+
+    unstable = _run("linux", {"mesh": 0.180}, mad=0.060)
+    assert detect_regressions(unstable, history) == []
+    assert detect_regressions(_run("mac", {"mesh": 1.0}), history) == []
+
+
+def test_benchmark_runner_cli_appends_history() -> None:
+    root = get_app_temp_dir("VoxelTool") / f"benchmark-runner-{uuid.uuid4().hex}"
+    root.mkdir(parents=True)
+    try:
+        history_path = root / "history.json"
+        args = [
+            "--sizes",
+            "6",
+            "--patterns",
+            "sparse,dense",
+            "-k",
+            "meshing",
+            "-n",
+            "2",
+            "--warmup",
+            "0",
+            "--history",
+            str(history_path),
+            "--min-slowdown",
+            "100",
+            "-q",
+        ]
+        assert main(args) == 0
+        assert main(args + ["--summary-json", str(root / "summary.json")]) == 0
+
+        runs = json.loads(history_path.read_text(encoding="utf-8"))["runs"]
+        assert len(runs) == 2
+        assert [result["case_id"] for result in runs[0]["results"]] == [
+            "meshing/sparse-6",
+            "meshing/dense-6",
+        ]
+        assert all(len(result["samples"]) == 2 for result in runs[1]["results"])
+        summary = json.loads((root / "summary.json").read_text(encoding="utf-8"))
+        assert "regressions" in summary
+        assert main(["--patterns", "solid", "--history", str(history_path)]) == 2
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pytest
+
+from core.commands.command import Command
+from core.commands.command_stack import CommandStack
+from core.commands.demo_commands import ClearVoxelsCommand, PaintVoxelCommand
+from core.commands.metrics import (
+    HISTOGRAM_BOUNDS_MS,
+    UNDO_COMMAND_BYTES,
+    UNDO_ENTRY_BYTES,
+    CommandMetrics,
+    CommandSample,
+)
+from core.project import Project
+
+
+class _Context:
+    def __init__(self) -> None:
+        self.current_project = Project(name="Metrics")
+
+
+class _NamedCommand(Command):
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def do(self, ctx) -> None:
+        del ctx
+
+    def undo(self, ctx) -> None:
+        del ctx
+
+
+def test_command_stack_records_duration_cells_and_undo_bytes_per_phase() -> None:
+    ctx = _Context()
+    stack = CommandStack()
+    # Every sample counts as slow here, so undo data is measured rather than estimated.
+    stack.metrics.slow_threshold_ms = 0.0
+    for x in range(3):
+        stack.do(PaintVoxelCommand(x, 0, 0, 1), ctx)
+    stack.undo(ctx)
+    stack.redo(ctx)
+    stack.begin_transaction("Stroke")
+    stack.do(PaintVoxelCommand(5, 0, 0, 1), ctx)
+    stack.do(PaintVoxelCommand(6, 0, 0, 1), ctx)
+    stack.end_transaction()
+    stack.undo(ctx)
+    stack.do(ClearVoxelsCommand(), ctx)
+
+    paints = stack.metrics.samples("Paint Voxel")
+    assert len(paints) == 5
+    assert all(sample.cells == 1 and sample.undo_bytes > 0 for sample in paints)
+    assert [sample.cells for sample in stack.metrics.samples("Paint Voxel", "undo")] == [1]
+    assert len(stack.metrics.samples("Paint Voxel", "redo")) == 1
+    assert stack.metrics.samples("Stroke", "undo")[0].cells == 2
+    assert stack.metrics.samples("Clear Voxels")[0].cells == 3
+
+    summaries = {(summary.command, summary.phase): summary for summary in stack.metrics.summaries()}
+    paint = summaries[("Paint Voxel", "do")]
+    assert paint.count == 5
+    assert sum(paint.histogram) == 5
+    assert paint.p50_ms <= paint.p95_ms <= paint.max_ms
+    assert paint.mean_cells == 1.0
+
+    stack.metrics.slow_threshold_ms = 1000.0
+    stack.do(PaintVoxelCommand(7, 0, 0, 1), ctx)
+    estimated = stack.metrics.samples("Paint Voxel")[-1]
+    assert estimated.undo_bytes == UNDO_COMMAND_BYTES + UNDO_ENTRY_BYTES
+
+
+def test_command_metrics_buckets_rolls_window_and_reports_slow_commands() -> None:
+    metrics = CommandMetrics(window=4, slow_threshold_ms=50.0)
+    slow: list[CommandSample] = []
+    metrics.on_slow = slow.append
+    fill = _NamedCommand("Fill")
+    for duration in (0.5, 3.0, 3.0, 60.0, 5000.0):
+        metrics.record(fill, "do", duration)
+    metrics.record(_NamedCommand("Move"), "do", 1.0)
+
+    assert [sample.duration_ms for sample in slow] == [60.0, 5000.0]
+    assert all(sample.undo_bytes > 0 for sample in slow)
+    assert [sample.undo_bytes for sample in metrics.samples("Move")] == [UNDO_COMMAND_BYTES]
+    summaries = metrics.summaries()
+    assert [summary.command for summary in summaries] == ["Fill", "Move"]
+    fill_summary = summaries[0]
+    assert fill_summary.count == 4
+    assert fill_summary.total_ms == pytest.approx(5066.0)
+    assert fill_summary.p50_ms == 3.0
+    assert fill_summary.max_ms == 5000.0
+    assert len(fill_summary.histogram) == len(HISTOGRAM_BOUNDS_MS) + 1
+    assert fill_summary.histogram[2] == 2
+    assert fill_summary.histogram[-1] == 1
+    assert fill_summary.mean_undo_bytes == (2 * UNDO_COMMAND_BYTES + 2 * slow[0].undo_bytes) / 4
+    assert summaries[1].mean_undo_bytes == UNDO_COMMAND_BYTES
+
+    metrics.reset()
+    assert metrics.summaries() == []
+    with pytest.raises(ValueError, match="Unsupported metrics window"):
+        CommandMetrics(window=0)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from core.analysis.differential import (
+    differential_scenes,
+    face_coverage,
+    is_watertight,
+    mesh_check,
+    run_differential,
+)
+from core.meshing.greedy_mesher import extract_greedy_surface_mesh
+from core.meshing.mesh import SurfaceMesh
+from core.meshing.surface_extractor import extract_surface_mesh
+from core.voxels.voxel_grid import VoxelGrid
+
+
+def test_fast_paths_agree_with_reference_implementations() -> None:
+    for seed in (0, 1):
+        mismatches = run_differential(differential_scenes(seed=seed, size=8))
+        assert mismatches == [], [
+            f"{mismatch.check} on {mismatch.scene}: {mismatch.detail} ({mismatch.voxels})"
+            for mismatch in mismatches
+        ]
+
+
+def test_face_coverage_detects_holes_regardless_of_quad_merging() -> None:
+    grid = VoxelGrid()
+    for x in range(3):
+        grid.set(x, 0, 0, 1)
+    greedy = face_coverage(extract_greedy_surface_mesh(grid))
+    assert greedy == face_coverage(extract_surface_mesh(grid))
+    assert sum(greedy.values()) == 14 and is_watertight(greedy)
+
+    mesh = extract_surface_mesh(grid)
+    del mesh.quads[0], mesh.face_colors[0]
+    assert not is_watertight(face_coverage(mesh))
+
+
+def test_run_differential_minimizes_failing_scenes() -> None:
+    def drops_color_two(voxels: VoxelGrid) -> SurfaceMesh:
+        mesh = extract_greedy_surface_mesh(voxels)
+        keep = [index for index, color in enumerate(mesh.face_colors) if color != 2]
+        return SurfaceMesh(
+            vertices=mesh.vertices,
+            quads=[mesh.quads[index] for index in keep],
+            face_colors=[mesh.face_colors[index] for index in keep],
+        )
+
+    scenes = differential_scenes(seed=3, size=8)[:2]
+    mismatches = run_differential(scenes, {"mesh:buggy": mesh_check(drops_color_two)})
+    assert [mismatch.scene for mismatch in mismatches] == [name for name, _ in scenes]
+    for mismatch in mismatches:
+        assert mismatch.voxels == [mismatch.voxels[0]] and mismatch.voxels[0][3] == 2
+        assert mismatch.detail == "face coverage differs: 6 missing, 0 extra"
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import pytest
+
+from app.app_context import AppContext
+from core.commands.demo_commands import PaintVoxelCommand
+from core.events import (
+    ACTIVE_PART_CHANGED,
+    EVENT_KINDS,
+    HISTORY_CHANGED,
+    PALETTE_CHANGED,
+    PART_TRANSFORM_CHANGED,
+    PART_VOXELS_CHANGED,
+    PARTS_CHANGED,
+    PROJECT_CHANGED,
+    TOOL_CHANGED,
+    ChangeBus,
+    ChangeEvent,
+)
+from core.project import Project
+
+
+def test_change_bus_batches_dedupes_and_filters_by_kind() -> None:
+    bus = ChangeBus()
+    received: list[list[ChangeEvent]] = []
+    unsubscribe = bus.subscribe((PART_VOXELS_CHANGED,), received.append)
+
+    with bus.batch():
+        bus.emit(PART_VOXELS_CHANGED, "a")
+        bus.emit(PALETTE_CHANGED)
+        bus.emit(PART_VOXELS_CHANGED, "a")
+        bus.emit(PART_VOXELS_CHANGED, "b")
+        assert received == []
+    assert received == [
+        [ChangeEvent(PART_VOXELS_CHANGED, "a"), ChangeEvent(PART_VOXELS_CHANGED, "b")]
+    ]
+
+    unsubscribe()
+    bus.emit(PART_VOXELS_CHANGED, "c")
+    assert len(received) == 1
+
+    with pytest.raises(ValueError):
+        bus.emit("unknown")
+    with pytest.raises(ValueError):
+        bus.subscribe(("unknown",), received.append)
+
+
+def test_publish_changes_reports_only_what_changed() -> None:
+    context = AppContext(current_project=Project(name="Events"))
+    received: list[ChangeEvent] = []
+    context.changes.subscribe(EVENT_KINDS, received.extend)
+
+    context.publish_changes()
+    assert ChangeEvent(PROJECT_CHANGED) in received
+    received.clear()
+    context.publish_changes()
+    assert received == []
+
+    part = context.active_part
+    part.position = (2.0, 0.0, 0.0)
+    context.palette[0] = (1, 2, 3)
+    context.publish_changes()
+    assert received == [
+        ChangeEvent(PART_TRANSFORM_CHANGED, part.part_id),
+        ChangeEvent(PALETTE_CHANGED),
+    ]
+
+    received.clear()
+    second = context.current_project.scene.add_part("Second")
+    context.set_active_part(second.part_id)
+    kinds = {event.kind for event in received}
+    assert kinds == {
+        PARTS_CHANGED,
+        PART_VOXELS_CHANGED,
+        PART_TRANSFORM_CHANGED,
+        ACTIVE_PART_CHANGED,
+    }
+
+    received.clear()
+    context.set_voxel_tool_mode(AppContext.TOOL_MODE_ERASE)
+    assert received == [ChangeEvent(TOOL_CHANGED)]
+
+
+def test_command_stack_publishes_history_once_per_transaction() -> None:
+    context = AppContext(current_project=Project(name="History"))
+    context.publish_changes()
+    received: list[list[ChangeEvent]] = []
+    context.changes.subscribe((PART_VOXELS_CHANGED, HISTORY_CHANGED), received.append)
+    part_id = context.active_part_id
+
+    context.command_stack.do(PaintVoxelCommand(0, 0, 0, 1), context)
+    assert received == [[ChangeEvent(PART_VOXELS_CHANGED, part_id), ChangeEvent(HISTORY_CHANGED)]]
+
+    received.clear()
+    context.command_stack.begin_transaction("Stroke")
+    context.command_stack.do(PaintVoxelCommand(1, 0, 0, 1), context)
+    context.command_stack.do(PaintVoxelCommand(2, 0, 0, 1), context)
+    assert received == []
+    context.command_stack.end_transaction()
+    assert len(received) == 1
+
+    received.clear()
+    context.command_stack.undo(context)
+    assert received == [[ChangeEvent(PART_VOXELS_CHANGED, part_id), ChangeEvent(HISTORY_CHANGED)]]
+
+
+def test_scene_records_edits_for_collect_to_drain() -> None:
+    context = AppContext(current_project=Project(name="Dirty"))
+    scene = context.current_project.scene
+    source = context.active_part
+    linked = scene.duplicate_part(source.part_id, linked=True)
+    other = scene.add_part("Other")
+    # Nothing is recorded until a tracker watches the scene.
+    assert scene.drain_changes() == []
+    context.publish_changes()
+    received: list[ChangeEvent] = []
+    context.changes.subscribe(EVENT_KINDS, received.extend)
+
+    other.visible = True
+    other.name = "Renamed"
+    source.voxels.set(0, 0, 0, 1)
+    source.voxels.set(1, 0, 0, 1)
+    context.publish_changes()
+    assert received == [
+        ChangeEvent(PARTS_CHANGED, other.part_id),
+        ChangeEvent(PART_VOXELS_CHANGED, source.part_id),
+        ChangeEvent(PART_VOXELS_CHANGED, linked.part_id),
+    ]
+
+    # The write hook is armed again by each drain.
+    received.clear()
+    linked.voxels.remove(0, 0, 0)
+    scene.make_part_unique(linked.part_id)
+    context.publish_changes()
+    assert set(received) == {
+        ChangeEvent(PART_VOXELS_CHANGED, source.part_id),
+        ChangeEvent(PART_VOXELS_CHANGED, linked.part_id),
+    }
+
+    received.clear()
+    source.voxels.set(2, 0, 0, 1)
+    scene.delete_part(other.part_id)
+    context.publish_changes()
+    assert received == [
+        ChangeEvent(PART_VOXELS_CHANGED, source.part_id),
+        ChangeEvent(PARTS_CHANGED, other.part_id),
+        ChangeEvent(PARTS_CHANGED),
+    ]
+    other.name = "Gone"
+    context.publish_changes()
+    assert len(received) == 3
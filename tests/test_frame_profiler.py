@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from app.viewport.frame_profiler import FrameProfiler
+
+
+def test_frame_profiler_rolls_stage_timings_and_percentiles() -> None:
+    profiler = FrameProfiler(window=4)
+    for frame in range(6):
+        profiler.begin_frame()
+        with profiler.stage("render_data"):
+            with profiler.stage("signature"):
+                pass
+        with profiler.stage("upload"):
+            profiler.add_upload(1024 * (frame + 1))
+        profiler.add_draw_calls(3)
+        profiler.end_frame()
+
+    frames = profiler.frames()
+    assert len(frames) == 4
+    assert [sample.upload_bytes for sample in frames] == [3072, 4096, 5120, 6144]
+    assert all(sample.draw_calls == 3 for sample in frames)
+    assert all(
+        sample.stage_ms["signature"] <= sample.stage_ms["render_data"] <= sample.total_ms
+        for sample in frames
+    )
+    totals = sorted(sample.total_ms for sample in frames)
+    assert profiler.percentiles(0.5, 0.99) == (totals[1], totals[3])
+    assert profiler.stage_means()["cull"] == 0.0
+
+
+def test_frame_profiler_reports_cache_hit_rates_in_hud() -> None:
+    profiler = FrameProfiler()
+    assert profiler.hud_lines() == []
+    # Stages outside a frame (e.g. pick buffer renders) are not attributed to any frame.
+    with profiler.stage("draw"):
+        pass
+    profiler.add_draw_calls(5)
+    profiler.begin_frame()
+    for hit in (True, True, True, False):
+        profiler.record_cache("render_data", hit)
+    profiler.record_cache("mesh_vertices", True)
+    profiler.end_frame()
+
+    assert profiler.frames()[0].draw_calls == 0
+    assert profiler.cache_hit_rates() == {"mesh_vertices": 1.0, "render_data": 0.75}
+    lines = profiler.hud_lines()
+    assert lines[0].startswith("Frame ")
+    assert "p95" in lines[0] and "(1 frames)" in lines[0]
+    assert "GL submit" in lines[2]
+    assert lines[-1] == "Cache hits: mesh vertices 100%  render data 75%"
+    with pytest.raises(ValueError, match="Unsupported frame window"):
+        FrameProfiler(window=0)
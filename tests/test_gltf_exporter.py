@@ -5,7 +5,8 @@ import base64
 import struct
 import uuid
 
-from core.export.gltf_exporter import export_voxels_to_gltf
+from core.export.gltf_exporter import export_parts_to_gltf, export_voxels_to_gltf
+from core.scene import Scene
 from core.voxels.voxel_grid import VoxelGrid
 from util.fs import get_app_temp_dir
 
@@ -116,3 +117,30 @@ def test_export_gltf_primitive_accessor_indices_are_consistent() -> None:
         assert len(payload["accessors"]) == 5
     finally:
         path.unlink(missing_ok=True)
+
+
+def test_export_parts_gltf_writes_linked_parts_as_shared_mesh() -> None:
+    scene = Scene.with_default_part()
+    source = scene.get_active_part()
+    source.voxels.set(0, 0, 0, 1)
+    first = scene.duplicate_part(source.part_id, linked=True)
+    first.position = (4.0, 0.0, 0.0)
+    first.rotation = (0.0, 90.0, 0.0)
+    unique = scene.duplicate_part(source.part_id)
+    unique.position = (0.0, 0.0, -3.0)
+    path = get_app_temp_dir("VoxelTool") / f"gltf-scene-{uuid.uuid4().hex}.gltf"
+    try:
+        parts = [part for _part_id, part in scene.iter_parts_ordered()]
+        stats = export_parts_to_gltf(parts, str(path), scale_factor=2.0)
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        assert stats.mesh_count == 2
+        assert stats.node_count == 3
+        assert len(payload["meshes"]) == 2
+        assert [node["mesh"] for node in payload["nodes"]] == [0, 0, 1]
+        assert payload["nodes"][1]["translation"] == [8.0, 0.0, 0.0]
+        x, y, z, w = payload["nodes"][1]["rotation"]
+        assert abs(y - 0.7071067811865476) < 1e-9 and abs(w - 0.7071067811865476) < 1e-9
+        assert x == 0.0 and z == 0.0
+        assert payload["scenes"][0]["nodes"] == [0, 1, 2]
+    finally:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+import uuid
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from app.jobs import JobCancelled, JobScheduler
+from core.export.vox_exporter import export_voxels_to_vox
+from core.palette import DEFAULT_PALETTE
+from core.voxels.voxel_grid import VoxelGrid
+from util.fs import get_app_temp_dir
+
+
+def _app() -> QCoreApplication:
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _drain(app: QCoreApplication, scheduler: JobScheduler) -> None:
+    assert scheduler.wait_for_done(5000)
+    for _ in range(10):
+        app.processEvents()
+
+
+def test_job_scheduler_reports_progress_and_result() -> None:
+    app = _app()
+    scheduler = JobScheduler()
+    progress: list[float] = []
+    finished: list[object] = []
+    idle: list[bool] = []
+    scheduler.job_progress.connect(lambda _job_id, fraction: progress.append(fraction))
+    scheduler.job_finished.connect(lambda _job_id, result: finished.append(result))
+    scheduler.jobs_idle.connect(lambda: idle.append(True))
+
+    def work(report) -> int:
+        for step in range(1, 5):
+            report(step / 4)
+        return 42
+
+    scheduler.submit("Work", work)
+    _drain(app, scheduler)
+    assert finished == [42]
+    assert progress[-1] == 1.0
+    assert idle == [True]
+    assert scheduler.active_jobs() == []
+
+
+def test_job_scheduler_cancels_at_next_progress_checkpoint() -> None:
+    app = _app()
+    scheduler = JobScheduler()
+    started = threading.Event()
+    release = threading.Event()
+    cancelled: list[str] = []
+    finished: list[object] = []
+    scheduler.job_cancelled.connect(cancelled.append)
+    scheduler.job_finished.connect(lambda _job_id, result: finished.append(result))
+
+    def work(report) -> str:
+        started.set()
+        release.wait(5)
+        report(0.5)
+        return "done"
+
+    job_id = scheduler.submit("Slow", work)
+    assert started.wait(5)
+    assert scheduler.cancel(job_id)
+    release.set()
+    _drain(app, scheduler)
+    assert cancelled == [job_id]
+    assert finished == []
+
+
+def test_job_scheduler_surfaces_failures() -> None:
+    app = _app()
+    scheduler = JobScheduler()
+    failures: list[str] = []
+    scheduler.job_failed.connect(lambda _job_id, message: failures.append(message))
+
+    def work(_report) -> None:
+        raise ValueError("boom")
+
+    scheduler.submit("Broken", work)
+    _drain(app, scheduler)
+    assert failures == ["ValueError: boom"]
+
+
+def test_exporter_progress_callback_aborts_before_writing() -> None:
+    voxels = VoxelGrid()
+    voxels.set(0, 0, 0, 1)
+    voxels.set(400, 0, 0, 2)
+    path = get_app_temp_dir("VoxelTool") / f"job-cancel-{uuid.uuid4().hex}.vox"
+
+    def report(fraction: float) -> None:
+        if fraction > 0.0:
+            raise JobCancelled("export")
+
+    try:
+        with pytest.raises(JobCancelled):
+            export_voxels_to_vox(voxels, list(DEFAULT_PALETTE), str(path), progress=report)
+        assert not path.exists()
+    finally:
+        path.unlink(missing_ok=True)
+
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import sys
+import tracemalloc
+
+from core.analysis.memory import (
+    MESH_CACHES,
+    UNDO_HISTORY,
+    VIEWPORT_CPU,
+    VIEWPORT_GPU,
+    VOXEL_STORAGE,
+    MemoryAccountant,
+    mesh_bytes,
+    object_bytes,
+)
+from core.commands.command import Command
+from core.commands.command_stack import CommandStack
+from core.commands.demo_commands import ClearVoxelsCommand
+from core.meshing.solidify import rebuild_part_mesh
+from core.project import Project
+from core.voxels.voxel_grid import VoxelGrid
+
+
+def _filled_grid(size: int, offset: int = 0) -> VoxelGrid:
+    grid = VoxelGrid()
+    coords = [
+        (offset + x, offset + y, offset + z)
+        for x in range(size)
+        for y in range(size)
+        for z in range(size)
+    ]
+    grid.set_many(coords, [1] * len(coords))
+    return grid
+
+
+def test_storage_bytes_measures_keys_and_skips_shared_chunks() -> None:
+    grid = _filled_grid(20)
+    measured = grid.storage_bytes()
+    # Every key is a 3-tuple, so the old 16-bytes-per-voxel constant was far too low.
+    assert measured > grid.count() * sys.getsizeof((0, 0, 0))
+    far = _filled_grid(20, offset=10_000)
+    assert far.storage_bytes() > measured
+
+    seen: set[int] = set()
+    assert grid.storage_bytes(seen) == measured
+    snapshot = grid.snapshot()
+    assert snapshot.storage_bytes(seen) == 0
+    # Writing copies one of the eight 16^3 chunks; only that copy is new storage.
+    grid.set(0, 0, 0, 2)
+    assert 0 < grid.storage_bytes(seen) < measured
+
+    grid.occupancy()
+    assert grid.storage_bytes() > grid.snapshot().storage_bytes()
+
+
+def test_memory_accountant_reports_subsystems_once_each() -> None:
+    project = Project(name="Memory")
+    part = project.scene.get_active_part()
+    part.voxels = _filled_grid(6)
+    rebuild_part_mesh(part)
+    project.scene.duplicate_part(part.part_id, linked=True)
+    stack = CommandStack()
+
+    class _Context:
+        current_project = project
+
+    stack.do(ClearVoxelsCommand(), _Context())
+    accountant = MemoryAccountant()
+    report = accountant.measure(
+        project,
+        command_stack=stack,
+        viewport_usage=lambda seen: (object_bytes([1.5, 2.5], seen), 4096),
+    )
+
+    assert report.subsystems[VOXEL_STORAGE] == part.voxels.storage_bytes()
+    assert report.subsystems[MESH_CACHES] == mesh_bytes(part.mesh_cache)
+    assert report.subsystems[UNDO_HISTORY] > 6**3 * sys.getsizeof([0, 0, 0, 0])
+    assert report.subsystems[VIEWPORT_GPU] == 4096
+    assert report.ranked()[0][0] == UNDO_HISTORY
+    assert report.total_bytes == sum(report.subsystems.values())
+
+
+def test_cached_history_sizes_still_claim_their_objects() -> None:
+    project = Project(name="Memory")
+    shared = [[index, index + 1] for index in range(1_000)]
+    stack = CommandStack()
+
+    class _Holder(Command):
+        def __init__(self) -> None:
+            self.rows = shared
+
+        def do(self, ctx) -> None:
+            del ctx
+
+        def undo(self, ctx) -> None:
+            del ctx
+
+    stack.do(_Holder(), None)
+    stack.do(_Holder(), None)
+    accountant = MemoryAccountant()
+    reports = [
+        accountant.measure(
+            project,
+            command_stack=stack,
+            viewport_usage=lambda seen: (object_bytes(shared, seen), 0),
+        )
+        for _ in range(2)
+    ]
+
+    # The second pass hits the size cache; the shared rows must not move to the viewport.
+    assert reports[0].subsystems == reports[1].subsystems
+    assert reports[0].subsystems[VIEWPORT_CPU] == 0
+    assert reports[0].subsystems[UNDO_HISTORY] > object_bytes(shared) > 0
+
+
+def test_memory_accountant_lists_allocation_sites_while_tracing() -> None:
+    project = Project(name="Traced")
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        payload = [bytearray(1024) for _ in range(64)]
+        report = MemoryAccountant().measure(project)
+    finally:
+        if started:
+            tracemalloc.stop()
+    assert payload
+    assert report.traced_current_bytes is not None
+    assert report.traced_peak_bytes >= report.traced_current_bytes
+    assert report.top_allocations
+    assert any(site.location.startswith(__file__) for site in report.top_allocations)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import uuid
+
+from core.analysis.differential import face_coverage
+from core.meshing.disk_cache import (
+    CachedMesh,
+    MeshDiskCache,
+    chunk_digests,
+    mesh_content_key,
+    mesh_options,
+    set_mesh_disk_cache,
+)
+from core.meshing.mesh import SurfaceMesh
+from core.meshing.solidify import build_solid_mesh, load_or_build_mesh, rebuild_part_mesh
+from core.part import Part
+from core.voxels.voxel_grid import VoxelGrid
+from util.fs import get_app_temp_dir
+
+
+def _cache_root():
+    return get_app_temp_dir("VoxelTool") / f"mesh-cache-{uuid.uuid4().hex}"
+
+
+def _remove_cache(cache: MeshDiskCache) -> None:
+    cache.clear()
+    if cache.root.exists():
+        cache.root.rmdir()
+
+
+def _block(size: int) -> list[tuple[int, int, int, int]]:
+    return [
+        (x, y, z, (x // 8 + z // 8) % 3)
+        for x in range(size)
+        for y in range(size // 2)
+        for z in range(size)
+    ]
+
+
+def test_unchanged_voxels_load_from_disk_in_a_fresh_cache() -> None:
+    cells = _block(20)
+    voxels = VoxelGrid()
+    for x, y, z, color in cells:
+        voxels.set(x, y, z, color)
+    reordered = VoxelGrid()
+    for x, y, z, color in reversed(cells):
+        reordered.set(x, y, z, color)
+    digests = chunk_digests(voxels)
+    assert digests == chunk_digests(reordered)
+    assert mesh_content_key(digests, mesh_options(greedy=True)) != mesh_content_key(
+        digests, mesh_options(greedy=False)
+    )
+
+    root = _cache_root()
+    first = MeshDiskCache(root)
+    try:
+        part = Part(part_id="part-1", name="Block", voxels=voxels)
+        set_mesh_disk_cache(first)
+        try:
+            built = rebuild_part_mesh(part)
+        finally:
+            set_mesh_disk_cache(None)
+        assert first.stats.misses == 1 and first.stats.stores == 1
+
+        # A new cache over the same directory stands in for reopening the project.
+        reopened = MeshDiskCache(root)
+        loaded = load_or_build_mesh(reordered, lineage="part-1", cache=reopened)
+        assert reopened.stats.hits == 1 and reopened.stats.stores == 0
+        assert loaded.vertices == built.vertices
+        assert loaded.quads == built.quads
+        assert loaded.face_colors == built.face_colors
+    finally:
+        _remove_cache(first)
+
+
+def test_edited_part_patches_only_changed_chunks_of_its_cached_mesh() -> None:
+    voxels = VoxelGrid()
+    for x, y, z, color in _block(48):
+        voxels.set(x, y, z, color)
+    cache = MeshDiskCache(_cache_root())
+    try:
+        load_or_build_mesh(voxels, lineage="part-1", cache=cache)
+        voxels.remove(5, 23, 5)
+        voxels.set(40, 24, 40, 2)
+        voxels.set(16, 10, 47, 1)
+
+        patched = load_or_build_mesh(voxels, lineage="part-1", cache=cache)
+        assert cache.stats.partial_hits == 1
+        assert face_coverage(patched) == face_coverage(build_solid_mesh(voxels))
+
+        # Another part's lineage has no previous mesh, so an unseen grid is meshed in full.
+        voxels.set(0, 30, 0, 1)
+        load_or_build_mesh(voxels, lineage="part-2", cache=cache)
+        assert cache.stats.misses == 2
+    finally:
+        _remove_cache(cache)
+
+
+def test_alternating_greedy_builds_never_patch_across_mesher_options() -> None:
+    voxels = VoxelGrid()
+    for x, y, z, color in _block(40):
+        voxels.set(x, y, z, color)
+    cache = MeshDiskCache(_cache_root())
+    try:
+        for step in range(4):
+            greedy = step % 2 == 0
+            voxels.set(step * 9, 20, 3, 2)
+            mesh = load_or_build_mesh(voxels, greedy=greedy, lineage="part-1", cache=cache)
+            full = build_solid_mesh(voxels, greedy=greedy)
+            assert mesh.face_count == full.face_count
+            assert face_coverage(mesh) == face_coverage(full)
+            # The stored entry is what later hits return, so it must match a full build too.
+            assert load_or_build_mesh(voxels, greedy=greedy, cache=cache).quads == mesh.quads
+        assert cache.stats.partial_hits == 2
+    finally:
+        _remove_cache(cache)
+
+
+def test_cache_evicts_least_recently_used_entries_and_drops_corrupt_files() -> None:
+    mesh = build_solid_mesh(VoxelGrid.from_list([[x, 0, 0, 1] for x in range(8)]))
+    cache = MeshDiskCache(_cache_root())
+    try:
+        cache.store("a", CachedMesh(mesh=mesh))
+        entry_bytes = cache.total_bytes()
+        cache.store("b", CachedMesh(mesh=mesh))
+        for key, age in (("b", 20), ("a", 10)):
+            path = cache.root / f"{key}.npz"
+            stamp = path.stat().st_mtime - age
+            os.utime(path, (stamp, stamp))
+
+        # A fresh instance orders the files it finds by mtime; lineage refs count as well.
+        cache = MeshDiskCache(cache.root, max_bytes=entry_bytes * 2 + 64)
+        cache.set_latest("part-1", "a")
+        assert cache.total_bytes() == entry_bytes * 2 + 1
+        assert cache.load("a") is not None
+        cache.store("c", CachedMesh(mesh=SurfaceMesh()))
+        assert cache.stats.evictions == 1
+        assert cache.load("b") is None
+        assert cache.load("a") is not None
+        assert cache.latest("part-1") == "a"
+        assert cache.total_bytes() <= cache.max_bytes
+
+        (cache.root / "d.npz").write_bytes(b"not a mesh")
+        assert cache.load("d") is None
+        assert not (cache.root / "d.npz").exists()
+    finally:
+        _remove_cache(cache)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from core.voxels.occupancy import OccupancyTree
+from core.voxels.raycast import traverse_voxel_ray
+from core.voxels.voxel_grid import VoxelGrid
+
+_ALL = (None, None, None)
+
+
+def _random_grid(seed: int, count: int, extent: int) -> VoxelGrid:
+    rng = random.Random(seed)
+    grid = VoxelGrid()
+    for _ in range(count):
+        grid.set(*(rng.randint(-extent, extent) for _ in range(3)), rng.randint(1, 4))
+    return grid
+
+
+def test_occupancy_tracks_grid_edits_incrementally() -> None:
+    grid = _random_grid(3, 300, 40)
+    tree = grid.occupancy()
+    rng = random.Random(4)
+    for _ in range(400):
+        cell = tuple(rng.randint(-40, 40) for _ in range(3))
+        if rng.random() < 0.5:
+            grid.remove(*cell)
+        else:
+            grid.set(*cell, 1)
+    grid.set_many([[500, 0, 0], [-500, 3, 2]], [1, 1])
+
+    assert grid.occupancy() is tree
+    expected = {key for key, _ in grid.items()}
+    assert set(tree.cells_in_box(_ALL, _ALL)) == expected
+    assert set(OccupancyTree.from_coords(sorted(expected)).cells_in_box(_ALL, _ALL)) == expected
+    assert all(tree.contains(*cell) for cell in expected)
+
+    grid.clear()
+    assert grid.occupancy().is_empty()
+
+
+def test_occupancy_region_queries_match_brute_force() -> None:
+    grid = _random_grid(7, 200, 30)
+    cells = [key for key, _ in grid.items()]
+    tree = grid.occupancy()
+
+    low, high = (-5, 0, -20), (12, 30, 4)
+    inside = {
+        cell for cell in cells if all(low[axis] <= cell[axis] <= high[axis] for axis in range(3))
+    }
+    assert set(tree.cells_in_box(low, high)) == inside
+    assert tree.is_region_empty(low, high) == (not inside)
+    assert tree.is_region_empty((100, 100, 100), (200, 200, 200))
+
+    center, radius = (3.0, -4.0, 8.0), 11.5
+    in_sphere = {
+        cell for cell in cells if sum((cell[a] - center[a]) ** 2 for a in range(3)) <= radius**2
+    }
+    assert set(tree.cells_in_sphere(center, radius)) == in_sphere
+
+    xs, ys, zs = zip(*cells)
+    assert tree.bounds() == ((min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs)))
+    plane = [cell for cell in cells if cell[2] == cells[0][2]]
+    plane_bounds = tree.bounds((None, None, cells[0][2]), (None, None, cells[0][2]))
+    assert plane_bounds == (
+        (min(c[0] for c in plane), min(c[1] for c in plane), cells[0][2]),
+        (max(c[0] for c in plane), max(c[1] for c in plane), cells[0][2]),
+    )
+    assert OccupancyTree().bounds() is None
+
+
+def test_occupancy_raycast_matches_grid_walk() -> None:
+    grid = _random_grid(11, 150, 60)
+    cells = [key for key, _ in grid.items()]
+    tree = grid.occupancy()
+    rng = random.Random(12)
+    hits = 0
+    for _ in range(200):
+        origin = tuple(rng.uniform(-90.0, 90.0) for _ in range(3))
+        # Aim near a filled cell so most rays hit something after crossing empty space.
+        target = rng.choice(cells)
+        direction = tuple(target[a] + rng.uniform(-0.6, 0.6) - origin[a] for a in range(3))
+        expected = traverse_voxel_ray(grid, origin, direction, t_end=2.0)
+        hit = tree.raycast(origin, direction, t_end=2.0)
+        if expected is None:
+            assert hit is None
+            continue
+        hits += 1
+        assert hit is not None
+        assert (hit.cell, hit.normal) == (expected.cell, expected.normal)
+        assert hit.distance == pytest.approx(expected.distance)
+    assert hits > 100
@@ -5,7 +5,8 @@ import uuid
 
 import pytest
 
-from core.io.project_io import load_project, save_project
+from core.io import project_io
+from core.io.project_io import CURRENT_PROJECT_SCHEMA_VERSION, load_project, save_project
 from core.project import Project
 from util.fs import get_app_temp_dir
 
@@ -53,7 +54,7 @@ def test_project_save_load_roundtrip() -> None:
         assert loaded.name == project.name
         assert loaded.created_utc == project.created_utc
         assert loaded.modified_utc == project.modified_utc
-        assert loaded.version == project.version
+        assert loaded.version == CURRENT_PROJECT_SCHEMA_VERSION
         assert loaded.editor_state == project.editor_state
         assert len(loaded.scene.parts) == 3
         assert loaded.scene.active_part_id == second_part.part_id
@@ -67,7 +68,7 @@ def test_project_save_load_roundtrip() -> None:
         assert loaded.scene.parts[first_part_id].voxels.get(-2, 4, 0) == 7
         assert loaded.scene.parts[first_part_id].visible is True
         assert loaded.scene.parts[first_part_id].locked is False
-        assert loaded.scene.part_order == project.scene.part_order
+        assert list(loaded.scene.part_order) == list(project.scene.part_order)
         assert len(loaded.scene.groups) == 1
         loaded_group = next(iter(loaded.scene.groups.values()))
         assert loaded_group.name == "Group A"
@@ -247,3 +248,61 @@ def test_project_save_load_roundtrip_preserves_extended_editor_state_keys() -> N
         assert loaded.editor_state == project.editor_state
     finally:
         path.unlink(missing_ok=True)
+
+
+def test_project_save_load_roundtrip_keeps_linked_parts_shared() -> None:
+    project = Project(name="Linked")
+    source = project.scene.get_active_part()
+    source.voxels.set(1, 2, 3, 4)
+    linked = project.scene.duplicate_part(source.part_id, new_name="Instance", linked=True)
+    linked.position = (4.0, 0.0, 0.0)
+    path = get_app_temp_dir("VoxelTool") / f"project-linked-{uuid.uuid4().hex}.json"
+    try:
+        save_project(project, str(path))
+        raw_parts = json.loads(path.read_text(encoding="utf-8"))["scene"]["parts"]
+        assert "voxels" not in raw_parts[1]
+        assert raw_parts[1]["linked_to"] == source.part_id
+
+        loaded = load_project(str(path))
+        loaded_source = loaded.scene.parts[source.part_id]
+        loaded_linked = loaded.scene.parts[linked.part_id]
+        assert loaded_linked.asset is loaded_source.asset
+        assert loaded_linked.voxels.get(1, 2, 3) == 4
+        assert loaded_linked.position == (4.0, 0.0, 0.0)
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def test_project_load_rejects_unknown_linked_part() -> None:
+    path = get_app_temp_dir("VoxelTool") / f"project-linked-bad-{uuid.uuid4().hex}.json"
+    payload = {
+        "name": "Broken",
+        "created_utc": "2026-02-28T00:00:00+00:00",
+        "modified_utc": "2026-02-28T00:00:00+00:00",
+        "version": 1,
+        "scene": {"parts": [{"part_id": "p1", "name": "Part 1", "linked_to": "missing"}]},
+    }
+    try:
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        with pytest.raises(ValueError, match="linked_to"):
+            load_project(str(path))
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def test_linked_project_is_refused_by_a_v1_reader(monkeypatch) -> None:
+    project = Project(name="Linked", version=1)
+    source = project.scene.get_active_part()
+    source.voxels.set(0, 0, 0, 2)
+    project.scene.duplicate_part(source.part_id, new_name="Instance", linked=True)
+    path = get_app_temp_dir("VoxelTool") / f"project-v2-{uuid.uuid4().hex}.json"
+    try:
+        save_project(project, str(path))
+        assert json.loads(path.read_text(encoding="utf-8"))["version"] == 2
+
+        # A v1 build would otherwise load the linked part with no voxels.
+        monkeypatch.setattr(project_io, "CURRENT_PROJECT_SCHEMA_VERSION", 1)
+        with pytest.raises(ValueError, match="newer than supported version 1"):
+            load_project(str(path))
+    finally:
+        path.unlink(missing_ok=True)
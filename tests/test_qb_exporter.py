@@ -39,3 +39,27 @@ def test_export_qb_empty_voxel_grid() -> None:
     finally:
         path.unlink(missing_ok=True)
 
+
+def test_export_qb_compressed_roundtrip_matches_uncompressed() -> None:
+    voxels = VoxelGrid()
+    for x in range(6):
+        voxels.set(x, 0, 0, 0)
+    voxels.set(2, 3, 1, 1)
+    voxels.set(5, 3, 1, 7)
+    palette = [(10, 20, 30), (40, 50, 60)]
+    temp_dir = get_app_temp_dir("VoxelTool")
+    packed_path = temp_dir / f"qb-export-rle-{uuid.uuid4().hex}.qb"
+    plain_path = temp_dir / f"qb-export-plain-{uuid.uuid4().hex}.qb"
+    try:
+        stats = export_voxels_to_qb(voxels, palette, str(packed_path), compressed=True)
+        export_voxels_to_qb(voxels, palette, str(plain_path))
+        assert stats.size == (6, 4, 2)
+        assert packed_path.stat().st_size < plain_path.stat().st_size
+        packed_models, packed_palette = load_qb_models(str(packed_path))
+        plain_models, plain_palette = load_qb_models(str(plain_path))
+        assert packed_models[0].to_list() == plain_models[0].to_list()
+        assert packed_palette == plain_palette == [(10, 20, 30), (40, 50, 60), (0, 0, 0)]
+        assert packed_models[0].get(5, 3, 1) == 2
+    finally:
+        packed_path.unlink(missing_ok=True)
+        plain_path.unlink(missing_ok=True)
@@ -37,11 +37,36 @@ def test_load_qb_models_parses_single_matrix_with_position_offset() -> None:
         path.unlink(missing_ok=True)
 
 
-def test_load_qb_models_with_warnings_rejects_compressed_payload() -> None:
+def test_load_qb_models_with_warnings_decodes_compressed_payload() -> None:
     path = get_app_temp_dir("VoxelTool") / f"qb-import-compressed-{uuid.uuid4().hex}.qb"
+    red = _pack_color_rgba(255, 0, 0, 255)
+    blue = _pack_color_rgba(0, 0, 255, 255)
+    empty = _pack_color_rgba(0, 0, 0, 0)
+    codeflag = struct.pack("<I", 2)
+    nextslice = struct.pack("<I", 6)
     try:
-        path.write_bytes(_build_qb_payload([], compressed=1))
-        with pytest.raises(ValueError, match="Compressed QB"):
+        header = struct.pack("<IIIIII", 257, 0, 0, 1, 0, 1)
+        matrix = struct.pack("<B", 1) + b"M" + struct.pack("<IIIiii", 4, 1, 2, 0, 0, 5)
+        slice_0 = codeflag + struct.pack("<I", 3) + red + blue + nextslice
+        slice_1 = empty + codeflag + struct.pack("<I", 2) + empty + blue + nextslice
+        path.write_bytes(header + matrix + slice_0 + slice_1)
+        models, palette, warnings = load_qb_models_with_warnings(str(path))
+        assert warnings == []
+        assert palette == [(255, 0, 0), (0, 0, 255)]
+        assert models[0].count() == 5
+        assert [models[0].get(x, 0, 5) for x in range(4)] == [0, 0, 0, 1]
+        assert [models[0].get(x, 0, 6) for x in range(4)] == [None, None, None, 1]
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def test_load_qb_models_with_warnings_rejects_truncated_compressed_payload() -> None:
+    path = get_app_temp_dir("VoxelTool") / f"qb-import-truncated-{uuid.uuid4().hex}.qb"
+    try:
+        header = struct.pack("<IIIIII", 257, 0, 0, 1, 0, 1)
+        matrix = struct.pack("<B", 1) + b"M" + struct.pack("<IIIiii", 2, 2, 1, 0, 0, 0)
+        path.write_bytes(header + matrix + struct.pack("<II", 2, 9))
+        with pytest.raises(ValueError, match="Invalid QB"):
             load_qb_models_with_warnings(str(path))
     finally:
         path.unlink(missing_ok=True)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import pytest
+
 from core.voxels.raycast import (
     intersect_axis_plane,
     raycast_voxel_surface,
     resolve_brush_target_cell,
     resolve_shape_target_cell,
+    traverse_voxel_ray,
 )
 from core.voxels.voxel_grid import VoxelGrid
 
@@ -177,3 +180,29 @@ def test_resolve_shape_target_without_plane_fallback_returns_none() -> None:
         plane_fallback_cell=None,
     )
     assert result is None
+
+
+def test_traverse_voxel_ray_reports_entry_face_and_distance() -> None:
+    voxels = VoxelGrid()
+    voxels.set(3, 1, 0, 1)
+
+    hit = traverse_voxel_ray(voxels, (0.0, 1.0, 0.0), (1.0, 0.0, 0.0), t_end=10.0)
+
+    assert hit is not None
+    assert hit.cell == (3, 1, 0)
+    assert hit.normal == (-1, 0, 0)
+    assert hit.adjacent_cell == (2, 1, 0)
+    assert hit.distance == pytest.approx(2.5)
+    assert traverse_voxel_ray(voxels, (0.0, 1.0, 0.0), (1.0, 0.0, 0.0), t_end=2.0) is None
+
+
+def test_traverse_voxel_ray_visits_diagonal_neighbours() -> None:
+    voxels = VoxelGrid()
+    voxels.set(1, 1, 0, 1)
+
+    # A stepped march can skip the corner cell; the grid walk enters through a real face.
+    hit = traverse_voxel_ray(voxels, (0.0, 0.0, 0.0), (1.0, 1.02, 0.0))
+
+    assert hit is not None
+    assert hit.cell == (1, 1, 0)
+    assert hit.normal in {(-1, 0, 0), (0, -1, 0)}
@@ -3,9 +3,11 @@ from __future__ import annotations
 from math import isclose
 
 from app.app_context import AppContext
-from core.commands.demo_commands import PaintVoxelCommand
+from core.commands.demo_commands import PaintVoxelCommand, RenamePartCommand
+from core.events import PARTS_CHANGED, ChangeEvent
 from core.project import Project
 from app.ui.panels.inspector_panel import InspectorPanel
+from app.ui.panels.outliner_model import OutlinerFilterModel, PartListModel
 from core.scene import Scene
 
 
@@ -209,3 +211,140 @@ def test_scene_delete_parts_keeps_one_minimum() -> None:
     assert next_active == first.part_id
     assert len(scene.parts) == 1
     assert first.part_id in scene.parts
+
+
+def test_scene_linked_duplicate_shares_voxels_and_mesh_cache() -> None:
+    scene = Scene.with_default_part()
+    source = scene.get_active_part()
+    source.voxels.set(1, 2, 3, 7)
+
+    linked = scene.duplicate_part(source.part_id, new_name="Instance", linked=True)
+    linked.position = (8.0, 0.0, 0.0)
+
+    assert linked.asset is source.asset
+    assert scene.is_part_linked(source.part_id)
+    assert [part.part_id for part in scene.linked_parts(linked.part_id)] == [
+        source.part_id,
+        linked.part_id,
+    ]
+    source.voxels.set(0, 0, 0, 1)
+    assert linked.voxels.get(0, 0, 0) == 1
+    linked.mesh_cache = None
+    assert source.mesh_cache is None
+    assert len(scene.iter_asset_instances()) == 1
+
+    assert scene.make_part_unique(linked.part_id) is True
+    linked.voxels.set(5, 5, 5, 2)
+    assert source.voxels.get(5, 5, 5) is None
+    assert linked.voxels.get(1, 2, 3) == 7
+    assert scene.is_part_linked(source.part_id) is False
+    assert scene.make_part_unique(source.part_id) is False
+
+
+def test_part_list_model_syncs_rows_incrementally() -> None:
+    scene = Scene.with_default_part()
+    first_id = scene.active_part_id
+    second = scene.add_part("Second")
+    third = scene.add_part("Third")
+    model = PartListModel()
+    model.set_scene(scene)
+    signals: list[str] = []
+    model.modelReset.connect(lambda: signals.append("reset"))
+    model.rowsInserted.connect(lambda _parent, first, _last: signals.append(f"insert {first}"))
+    model.rowsRemoved.connect(lambda _parent, first, _last: signals.append(f"remove {first}"))
+    model.rowsMoved.connect(lambda *_args: signals.append("move"))
+    model.dataChanged.connect(lambda top, _bottom, _roles: signals.append(f"data {top.row()}"))
+
+    scene.move_part(third.part_id, -1)
+    scene.rename_part(first_id, "Renamed")
+    model.sync()
+    scene.delete_part(second.part_id)
+    scene.add_part("Fourth")
+    model.sync()
+
+    assert signals == ["move", "data 0", "remove 2", "insert 2"]
+    ids = [model.id_at(row) for row in range(model.rowCount())]
+    assert ids == [part_id for part_id, _ in scene.iter_parts_ordered()]
+    assert model.data(model.index(0)) == "Renamed"
+
+    assert [model.row_for_id(part_id) for part_id in ids] == [0, 1, 2]
+    assert model.row_for_id(second.part_id) == -1
+
+
+def test_part_list_model_renames_through_the_command_stack() -> None:
+    ctx = AppContext(current_project=Project(name="Untitled"))
+    scene = ctx.current_project.scene
+    part = scene.add_part("Second")
+    model = PartListModel()
+    model.set_scene(scene)
+    ctx.publish_changes()
+    events: list[ChangeEvent] = []
+    ctx.changes.subscribe((PARTS_CHANGED,), events.extend)
+    assert not model.setData(model.index(1), "Edited")
+    model.rename_part = lambda part_id, name: ctx.command_stack.do(
+        RenamePartCommand(part_id, name), ctx
+    )
+
+    assert model.setData(model.index(1), "  Edited  ")
+    assert part.name == model.data(model.index(1)) == "Edited"
+    assert events == [ChangeEvent(PARTS_CHANGED, part.part_id)]
+    assert not model.setData(model.index(1), "   ")
+    ctx.command_stack.undo(ctx)
+    model.sync([part.part_id])
+    assert part.name == model.data(model.index(1)) == "Second"
+
+
+def test_outliner_filter_model_matches_inspector_filter() -> None:
+    scene = Scene.with_default_part()
+    scene.add_part("Tree Alpha")
+    scene.add_part("Rock")
+    model = PartListModel()
+    model.set_scene(scene)
+    proxy = OutlinerFilterModel()
+    proxy.setSourceModel(model)
+
+    proxy.set_text_filter("  ALPHA ")
+    assert [proxy.index(row, 0).data() for row in range(proxy.rowCount())] == ["Tree Alpha"]
+
+    scene.add_part("Alpha Rock")
+    model.sync()
+    assert proxy.rowCount() == 2
+    proxy.set_text_filter("")
+    assert proxy.rowCount() == model.rowCount() == 4
+
+
+def test_scene_indexes_stay_consistent_across_bulk_edits() -> None:
+    scene = Scene.with_default_part()
+    ids = [scene.active_part_id] + [scene.add_part(f"Part {i}").part_id for i in range(2, 8)]
+    first_group = scene.create_group("First")
+    second_group = scene.create_group("Second")
+    assert scene.assign_parts_to_group(ids[:4], second_group.group_id) == ids[:4]
+    assert scene.assign_parts_to_group(ids[2:6], first_group.group_id) == ids[2:6]
+    assert scene.assign_parts_to_group(ids[:2], second_group.group_id) == []
+    assert scene.group_names_for_part(ids[3]) == ["First", "Second"]
+
+    assert scene.move_part(ids[6], -1)
+    assert list(scene.part_order)[-2:] == [ids[6], ids[5]]
+    scene.set_active_part(ids[3])
+    scene.delete_parts([ids[3], ids[0], ids[3], ids[5]])
+
+    assert list(scene.part_order) == [ids[1], ids[2], ids[4], ids[6]]
+    assert scene.active_part_id == ids[1]
+    assert list(first_group.part_ids) == [ids[2], ids[4]]
+    assert list(second_group.part_ids) == [ids[1], ids[2]]
+
+    scene.unassign_part_from_group(ids[2], second_group.group_id)
+    scene.delete_group(first_group.group_id)
+    assert scene.group_names_for_part(ids[2]) == []
+    assert scene.group_names_for_part(ids[1]) == ["Second"]
+    assert scene.move_part(ids[6], -1)
+    assert list(scene.part_order) == [ids[1], ids[2], ids[6], ids[4]]
+
+    # Deletes drop the built indexes; the next move rebuilds them.
+    scene.delete_part(ids[2])
+    assert scene.move_part(ids[4], -1)
+    assert list(scene.part_order) == [ids[1], ids[4], ids[6]]
+    third_group = scene.create_group("Third")
+    scene.assign_parts_to_group([ids[1]], third_group.group_id)
+    assert scene.group_names_for_part(ids[1]) == ["Second", "Third"]
+    assert list(scene.group_order) == [second_group.group_id, third_group.group_id]
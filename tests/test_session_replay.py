@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import uuid
+
+import pytest
+
+from app.session_replay import main as replay_main
+from core.commands.command_stack import CommandStack
+from core.commands.demo_commands import (
+    BoxVoxelCommand,
+    FillVoxelCommand,
+    MoveSelectedVoxelsCommand,
+    PaintVoxelCommand,
+    RenameProjectCommand,
+)
+from core.commands.session import (
+    ReplayContext,
+    SessionRecorder,
+    load_session,
+    replay_session,
+    save_session,
+)
+from core.io.project_io import load_project
+from core.project import Project
+from util.fs import get_app_temp_dir
+
+
+def _record_session(project: Project) -> SessionRecorder:
+    ctx = ReplayContext(current_project=project)
+    stack = CommandStack()
+    recorder = SessionRecorder(project.name)
+    stack.recorder = recorder
+    ctx.mirror_x_enabled = True
+    ctx.mirror_x_offset = 4
+    stack.begin_transaction("Brush Stroke")
+    for x in range(3):
+        stack.do(PaintVoxelCommand(x, 0, 0, 2), ctx)
+    stack.end_transaction()
+    ctx.mirror_x_enabled = False
+    ctx.brush_size = 2
+    stack.do(PaintVoxelCommand(0, 5, 0, 3), ctx)
+    stack.undo(ctx)
+    stack.redo(ctx)
+    stack.do(BoxVoxelCommand(0, 10, 3, 12, 0, "paint", 4), ctx)
+    stack.do(FillVoxelCommand(0, 10, 0, "paint", 5), ctx)
+    stack.do(MoveSelectedVoxelsCommand({(0, 0, 0), (1, 0, 0)}, 0, 0, 2), ctx)
+    stack.do(RenameProjectCommand("Recorded"), ctx)
+    stack.begin_transaction("Cancelled")
+    stack.do(PaintVoxelCommand(20, 20, 20, 1), ctx)
+    stack.cancel_transaction(ctx)
+    return recorder
+
+
+def test_recorded_session_round_trips_and_replays_to_same_voxels() -> None:
+    original = Project(name="Session")
+    recorder = _record_session(original)
+    ops = [step.op for step in recorder.session.steps]
+    assert ops[:5] == ["begin", "do", "do", "do", "end"]
+    assert ops[-3:] == ["begin", "do", "cancel"]
+    assert recorder.session.steps[1].state["mirror_x_enabled"] is True
+    assert "mirror_x_enabled" not in recorder.session.steps[2].state
+    assert recorder.unsupported == []
+
+    path = get_app_temp_dir("VoxelTool") / f"session-{uuid.uuid4().hex}.jsonl"
+    try:
+        save_session(recorder.session, path)
+        loaded = load_session(path)
+    finally:
+        path.unlink(missing_ok=True)
+    assert loaded.project_name == "Session"
+    assert len(loaded.steps) == len(recorder.session.steps)
+
+    replayed = Project(name="Session")
+    report = replay_session(loaded, replayed)
+    assert replayed.name == "Recorded"
+    assert replayed.voxels.to_list() == original.voxels.to_list()
+    assert (8, 0, 0) in {tuple(entry[:3]) for entry in replayed.voxels.to_list()}
+    assert len(report.steps) == len(loaded.steps)
+    assert report.total_ms == pytest.approx(sum(step.duration_ms for step in report.steps))
+    undo_index = next(step.index for step in report.steps if step.op == "undo")
+    undo = report.steps[undo_index]
+    assert undo.name == "Paint Voxel"
+    assert undo.cells == report.steps[undo_index - 1].cells > 1
+    assert report.slowest(1)[0].duration_ms == max(step.duration_ms for step in report.steps)
+
+
+def test_load_session_rejects_unknown_formats_and_ops() -> None:
+    path = get_app_temp_dir("VoxelTool") / f"session-{uuid.uuid4().hex}.jsonl"
+    try:
+        path.write_text('{"format":"other"}\n', encoding="utf-8")
+        with pytest.raises(ValueError, match="Unsupported session format"):
+            load_session(path)
+        path.write_text(
+            '{"format":"voxel-tool-session","version":1}\n{"op":"explode"}\n', encoding="utf-8"
+        )
+        with pytest.raises(ValueError, match="Unsupported session op"):
+            load_session(path)
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def test_session_replay_cli_reports_step_medians(capsys) -> None:
+    recorder = _record_session(Project(name="Cli"))
+    path = get_app_temp_dir("VoxelTool") / f"session-{uuid.uuid4().hex}.jsonl"
+    try:
+        save_session(recorder.session, path)
+        assert replay_main([str(path), "--repeat", "2", "--top", "3", "--summary-json", "-"]) == 0
+    finally:
+        path.unlink(missing_ok=True)
+    out = capsys.readouterr().out
+    assert out.startswith(f"{len(recorder.session.steps)} steps replayed")
+    summary = json.loads(out[out.index("{"):])
+    assert summary["repeat"] == 2
+    assert [step["op"] for step in summary["steps"]] == [
+        step.op for step in recorder.session.steps
+    ]
+
+
+def test_session_replays_from_the_project_and_history_it_started_with(capsys) -> None:
+    project = Project(name="Start")
+    ctx = ReplayContext(current_project=project)
+    stack = CommandStack()
+    stack.do(PaintVoxelCommand(0, 0, 0, 1), ctx)
+    stack.do(PaintVoxelCommand(1, 0, 0, 1), ctx)
+    root = get_app_temp_dir("VoxelTool") / f"session-{uuid.uuid4().hex}"
+    root.mkdir()
+    paths = [root / "kept.jsonl", root / "undone.jsonl"]
+    try:
+        recorder = SessionRecorder(project=project, command_stack=stack)
+        stack.recorder = recorder
+        stack.do(PaintVoxelCommand(5, 0, 0, 1), ctx)
+        save_session(recorder.session, paths[0], project=recorder.start_project)
+        loaded = load_session(paths[0])
+        assert loaded.undo_depth == 2 and loaded.project_file is not None
+        replayed = load_project(loaded.project_file)
+        replay_session(loaded, replayed)
+        assert replayed.voxels.to_list() == project.voxels.to_list()
+        assert replay_main([str(paths[0])]) == 0
+
+        # The undo reaches a paint from before recording, so the replay refuses to diverge.
+        stack.undo(ctx)
+        stack.undo(ctx)
+        save_session(recorder.session, paths[1], project=recorder.start_project)
+        with pytest.raises(ValueError, match="before recording started"):
+            replay_session(load_session(paths[1]), load_project(str(root / "undone.start.json")))
+        capsys.readouterr()
+        assert replay_main([str(paths[1])]) == 2
+        assert "before recording started" in capsys.readouterr().err
+    finally:
+        for path in root.iterdir():
+            path.unlink()
+        root.rmdir()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from core.part import Part
+from core.spatial import (
+    Aabb,
+    Bvh,
+    SceneBoundsIndex,
+    aabb_in_frustum,
+    frustum_planes,
+    part_transform_matrix,
+    part_world_bounds,
+    raycast_scene,
+)
+from core.voxels.voxel_grid import VoxelGrid
+
+
+def _orthographic(half_extent: float) -> np.ndarray:
+    # Looks down -Z over [-half_extent, half_extent] on X/Y and z in [-100, 100].
+    return np.array(
+        [
+            [1.0 / half_extent, 0.0, 0.0, 0.0],
+            [0.0, 1.0 / half_extent, 0.0, 0.0],
+            [0.0, 0.0, -0.01, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ]
+    )
+
+
+def _part(part_id: str, position: tuple[float, float, float]) -> Part:
+    voxels = VoxelGrid()
+    voxels.set(0, 0, 0, 1)
+    return Part(part_id=part_id, name=part_id, voxels=voxels, position=position)
+
+
+def test_part_world_bounds_follow_transform() -> None:
+    part = _part("p", (100.0, 0.0, 0.0))
+    part.rotation = (0.0, 0.0, 90.0)
+    bounds = part_world_bounds(part)
+    assert bounds is not None
+    # Local bounds cover the voxel's chunk: [-0.5, 16] on each axis.
+    assert bounds.minimum == pytest.approx((84.0, -0.5, -0.5))
+    assert bounds.maximum == pytest.approx((100.5, 16.0, 16.0))
+    assert part_world_bounds(Part(part_id="empty", name="empty")) is None
+
+
+def test_part_transform_matrix_matches_translate_rotate_scale_order() -> None:
+    matrix = part_transform_matrix((1.0, 2.0, 3.0), (90.0, 0.0, 0.0), (2.0, 2.0, 2.0))
+    point = matrix @ np.array([0.0, 1.0, 0.0, 1.0])
+    assert point[:3] == pytest.approx((1.0, 2.0, 5.0))
+
+
+def test_frustum_culling_rejects_boxes_outside_view() -> None:
+    planes = frustum_planes(_orthographic(10.0))
+    assert aabb_in_frustum(planes, Aabb((-1.0, -1.0, -1.0), (1.0, 1.0, 1.0)))
+    assert aabb_in_frustum(planes, Aabb((9.0, 9.0, 0.0), (20.0, 20.0, 1.0)))
+    assert not aabb_in_frustum(planes, Aabb((11.0, 0.0, 0.0), (12.0, 1.0, 1.0)))
+    assert not aabb_in_frustum(planes, Aabb((0.0, 0.0, 150.0), (1.0, 1.0, 151.0)))
+
+
+def test_bvh_queries_match_brute_force() -> None:
+    rng = np.random.default_rng(7)
+    entries = []
+    for index in range(300):
+        low = rng.uniform(-200.0, 200.0, size=3)
+        high = low + rng.uniform(0.5, 10.0, size=3)
+        entries.append((index, Aabb(tuple(low.tolist()), tuple(high.tolist()))))
+    bvh = Bvh(entries)
+    planes = frustum_planes(_orthographic(50.0))
+
+    expected = {index for index, box in entries if aabb_in_frustum(planes, box)}
+    assert set(bvh.query_frustum(planes)) == expected
+
+    origin, direction = (-300.0, 0.0, 0.0), (1.0, 0.01, 0.0)
+    expected_ray = sorted(
+        (span[0], index)
+        for index, box in entries
+        if (span := box.intersect_ray(origin, direction)) is not None
+    )
+    assert [index for _t, index in bvh.query_ray(origin, direction)] == [
+        index for _t, index in expected_ray
+    ]
+
+
+def test_scene_bounds_index_updates_only_changed_parts() -> None:
+    first = _part("a", (0.0, 0.0, 0.0))
+    second = _part("b", (500.0, 0.0, 0.0))
+    index = SceneBoundsIndex()
+    planes = frustum_planes(_orthographic(50.0))
+
+    bvh = index.update([first, second])
+    assert bvh.query_frustum(planes) == ["a"]
+    assert index.update([first, second]) is bvh
+
+    second.position = (10.0, 0.0, 0.0)
+    moved = index.update([first, second])
+    assert moved is not bvh
+    assert sorted(moved.query_frustum(planes)) == ["a", "b"]
+
+    first.voxels.set(2000, 0, 0, 1)
+    index.update([first, second])
+    bounds = index.part_bounds("a")
+    assert bounds is not None and bounds.maximum[0] > 2000.0
+
+
+def test_raycast_scene_hits_nearest_posed_part() -> None:
+    near = _part("near", (10.0, 0.0, 0.0))
+    far = _part("far", (20.0, 0.0, 0.0))
+    posed = _part("posed", (0.0, 0.0, 30.0))
+    posed.voxels.set(0, 4, 0, 2)
+    posed.rotation = (0.0, 0.0, 90.0)
+    posed.scale = (2.0, 2.0, 2.0)
+    parts = [far, posed, near]
+
+    hit = raycast_scene(parts, (0.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert hit is not None
+    assert (hit.part_id, hit.cell, hit.normal) == ("near", (0, 0, 0), (-1, 0, 0))
+    assert hit.distance == pytest.approx(9.5)
+
+    hit = raycast_scene([far, posed], (0.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert hit is not None and hit.part_id == "far"
+
+    # Rotating +90 degrees about Z maps local +Y onto world -X; scale 2 puts (0, 4, 0) at x=-8.
+    hit = raycast_scene(parts, (-20.0, 0.0, 30.0), (1.0, 0.0, 0.0))
+    assert hit is not None
+    assert (hit.part_id, hit.cell, hit.adjacent_cell) == ("posed", (0, 4, 0), (0, 5, 0))
+    assert hit.distance == pytest.approx(11.0)
+    assert raycast_scene(parts, (0.0, 50.0, 0.0), (1.0, 0.0, 0.0)) is None
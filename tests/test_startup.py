@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import uuid
+
+from util import fs
+from util.fs import get_app_temp_dir
+from util.startup_profile import StartupProfiler, format_startup_profile
+
+from conftest import SRC_DIR
+
+
+def test_main_window_import_leaves_format_modules_unloaded() -> None:
+    script = (
+        "import sys\n"
+        f"sys.path.insert(0, {str(SRC_DIR)!r})\n"
+        "import app.ui.main_window\n"
+        "import core.export, core.io\n"
+        "lazy = ('core.export.', 'core.io.vox_io', 'core.io.qb_io')\n"
+        "print(sorted(name for name in sys.modules if name.startswith(lazy)))\n"
+        "from core.export import export_voxels_to_obj\n"
+        "print('core.export.obj_exporter' in sys.modules)\n"
+    )
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, check=True
+    )
+    assert result.stdout.splitlines() == ["[]", "True"]
+
+
+def test_startup_profiler_splits_self_and_inclusive_import_time() -> None:
+    package = f"startup_probe_{uuid.uuid4().hex}"
+    root = get_app_temp_dir("VoxelTool") / package
+    root.mkdir()
+    (root / "__init__.py").write_text("import time\ntime.sleep(0.02)\nfrom . import child\n")
+    (root / "child.py").write_text("import time\ntime.sleep(0.03)\n")
+    sys.path.insert(0, str(root.parent))
+    profiler = StartupProfiler().install()
+    try:
+        __import__(package)
+        profiler.mark("imports")
+    finally:
+        profiler.uninstall()
+        sys.path.remove(str(root.parent))
+        for name in (package, f"{package}.child"):
+            sys.modules.pop(name, None)
+        for path in (root / "__init__.py", root / "child.py"):
+            path.unlink()
+        for cached in root.glob("__pycache__/*"):
+            cached.unlink()
+        for directory in (root / "__pycache__", root):
+            if directory.exists():
+                directory.rmdir()
+
+    modules = {module.name: module for module in profiler.profile.modules}
+    parent = modules[package]
+    child = modules[f"{package}.child"]
+    assert child.self_ms >= 25.0
+    assert parent.inclusive_ms >= parent.self_ms + child.inclusive_ms - 1.0
+    assert 15.0 <= parent.self_ms < parent.inclusive_ms
+    assert profiler not in sys.meta_path
+    report = format_startup_profile(profiler.profile, limit=5)
+    assert "imports" in report
+    assert f"{package}.child" in report
+
+
+def test_app_temp_dir_is_probed_once_per_environment(monkeypatch) -> None:
+    first = get_app_temp_dir("VoxelTool")
+    probes: list[object] = []
+    monkeypatch.setattr(fs, "_is_writable_dir", lambda path: probes.append(path) or True)
+    assert get_app_temp_dir("VoxelTool") == first
+    assert probes == []
@@ -32,8 +32,10 @@ def test_compute_scene_stats_part_and_scene_totals() -> None:
     assert second.bounds_size == (1, 2, 1)
     assert first.bounds_meters == (2.0, 1.0, 1.0)
     assert second.bounds_meters == (1.0, 2.0, 1.0)
-    assert first.voxel_memory_bytes == 2 * 16
-    assert second.voxel_memory_bytes == 2 * 16
+    # Measured dict-and-tuple footprints, well above the old 16-bytes-per-voxel constant.
+    assert first.voxel_memory_bytes == part_a.voxels.storage_bytes()
+    assert second.voxel_memory_bytes == part_b.voxels.storage_bytes()
+    assert first.voxel_memory_bytes > 2 * 16
 
 
 def test_rebuild_mesh_refreshes_stats_from_cache() -> None:
@@ -93,3 +95,26 @@ def test_compute_scene_stats_memory_estimates_are_deterministic() -> None:
     stats_b = compute_scene_stats(project)
     assert stats_a.total_memory_bytes == stats_b.total_memory_bytes
     assert stats_a.parts[0].total_memory_bytes == stats_b.parts[0].total_memory_bytes
+
+
+def test_compute_scene_stats_cache_recomputes_only_changed_parts() -> None:
+    project = Project(name="Stats Incremental")
+    part_a = project.scene.get_active_part()
+    part_a.voxels.set(0, 0, 0, 1)
+    part_b = project.scene.add_part("Part 2")
+    part_b.voxels.set(0, 0, 0, 2)
+    cache: dict = {}
+
+    first = compute_scene_stats(project, cache=cache)
+    part_a.voxels.set(1, 0, 0, 4)
+    second = compute_scene_stats(project, cache=cache)
+
+    assert second.parts[1] is first.parts[1]
+    assert second.parts[0] is not first.parts[0]
+    assert second.parts[0].bounds_size == (2, 1, 1)
+    assert second.materials_used == 3
+    assert second.triangles == compute_scene_stats(project).triangles
+
+    project.scene.delete_part(part_b.part_id)
+    compute_scene_stats(project, cache=cache)
+    assert set(cache) == {part_a.part_id}
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
-from app.ui.panels.stats_panel import format_memory_label, format_runtime_stats_label
+from app.ui.panels.stats_panel import (
+    format_allocation_report,
+    format_command_summaries,
+    format_histogram,
+    format_memory_label,
+    format_memory_report,
+    format_runtime_stats_label,
+)
+from core.analysis.memory import MemoryReport
+from core.commands.metrics import CommandSummary
 
 
 def test_format_runtime_stats_label_includes_scene_and_active_scope() -> None:
@@ -20,3 +29,36 @@ def test_format_memory_label_scales_units() -> None:
     assert format_memory_label(512) == "512 B"
     assert format_memory_label(2048) == "2.00 KB"
     assert format_memory_label(3 * 1024 * 1024) == "3.00 MB"
+
+
+def test_format_memory_report_ranks_subsystems_by_size() -> None:
+    report = MemoryReport(
+        subsystems={"voxel storage": 1024, "undo history": 3 * 1024, "viewport GPU": 0}
+    )
+    assert format_memory_report(report) == (
+        "Memory: undo history 3.00 KB (75%) | voxel storage 1.00 KB (25%) | "
+        "viewport GPU 0 B (0%) | total 4.00 KB"
+    )
+    assert format_allocation_report(report) == ""
+
+
+def test_format_command_summaries_lists_histogram_sparklines() -> None:
+    assert format_histogram([0, 4, 2, 0]) == " █▄ "
+    assert format_command_summaries([]) == "Commands: -"
+    summary = CommandSummary(
+        command="Fill Voxels",
+        phase="do",
+        count=6,
+        total_ms=120.0,
+        p50_ms=12.5,
+        p95_ms=60.0,
+        max_ms=60.0,
+        mean_cells=2048.0,
+        mean_undo_bytes=4096.0,
+        histogram=[0, 4, 2, 0],
+    )
+    lines = format_command_summaries([summary]).splitlines()
+    assert lines[1] == (
+        "  Fill Voxels [do] x6: total 120.0 ms | p50 12.50 | p95 60.00 | max 60.00 | "
+        "cells 2048 | undo 4.00 KB | █▄ |"
+    )
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import shutil
+import uuid
+
+import pytest
+
+from core.io.project_io import load_project
+from core.io.qb_io import load_qb_models
+from core.io.vox_io import load_vox_models
+from core.synthetic import (
+    SCENE_KINDS,
+    checkerboard,
+    generate_scene,
+    hollow_shell,
+    menger_sponge,
+    save_fixture,
+)
+from util.fs import get_app_temp_dir
+
+
+def test_synthetic_scenes_are_seeded_and_deterministic() -> None:
+    for kind in SCENE_KINDS:
+        first = generate_scene(kind, 24, seed=3)
+        second = generate_scene(kind, 24, seed=3)
+        assert first.voxel_count() > 0
+        assert first.voxel_count() == second.voxel_count()
+        first_parts = first.project.scene.iter_parts_ordered()
+        second_parts = second.project.scene.iter_parts_ordered()
+        for (_, left), (_, right) in zip(first_parts, second_parts):
+            assert left.voxels.to_list() == right.voxels.to_list()
+            assert left.position == right.position
+
+    terrain = generate_scene("terrain", 24, seed=1).project.voxels.to_list()
+    assert terrain != generate_scene("terrain", 24, seed=2).project.voxels.to_list()
+    with pytest.raises(ValueError, match="Unsupported synthetic scene"):
+        generate_scene("castle", 8)
+
+
+def test_synthetic_shapes_match_their_definitions() -> None:
+    assert menger_sponge(2).count() == 20**2
+    assert checkerboard(4).count() == 32
+    filled = checkerboard(4, filled=True)
+    assert filled.count() == 64
+    assert filled.get(0, 0, 0) != filled.get(1, 0, 0)
+
+    shell = hollow_shell(16, thickness=2, shape="box")
+    assert shell.count() == 16**3 - 12**3
+    assert shell.get(8, 8, 8) is None
+
+    city = generate_scene("city", 96, seed=5).project.scene
+    assert len(city.parts) == 1 + (96 // 12) ** 2
+    assert any(city.is_part_linked(part_id) for part_id in city.parts)
+    assert len(generate_scene("palette_heavy", 16).palette) == 255
+
+
+def test_save_fixture_round_trips_through_vox_qb_and_project() -> None:
+    scene = generate_scene("city", 48, seed=2)
+    expected = scene.voxel_count()
+    fixture_dir = get_app_temp_dir("VoxelTool") / f"synthetic-{uuid.uuid4().hex}"
+    fixture_dir.mkdir(parents=True)
+    try:
+        assert save_fixture(scene, fixture_dir / "city.json") == "project"
+        loaded = load_project(str(fixture_dir / "city.json"))
+        assert len(loaded.scene.parts) == len(scene.project.scene.parts)
+        assert sum(part.voxels.count() for part in loaded.scene.parts.values()) == expected
+
+        assert save_fixture(scene, fixture_dir / "city.vox") == "vox"
+        models, _ = load_vox_models(str(fixture_dir / "city.vox"))
+        assert sum(model.count() for model in models) == expected
+
+        assert save_fixture(scene, fixture_dir / "city.qb") == "qb"
+        models, _ = load_qb_models(str(fixture_dir / "city.qb"))
+        assert sum(model.count() for model in models) == expected
+
+        with pytest.raises(ValueError, match="Unsupported fixture format"):
+            save_fixture(scene, fixture_dir / "city.obj")
+    finally:
+        shutil.rmtree(fixture_dir, ignore_errors=True)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import uuid
+
+from core.commands.command import Command
+from core.commands.command_stack import CommandStack
+from util.fs import get_app_temp_dir
+from util.trace import (
+    clear_trace,
+    enable_tracing,
+    span,
+    trace_events,
+    traced,
+    write_chrome_trace,
+)
+
+
+class _NoopCommand(Command):
+    def do(self, ctx) -> None:
+        del ctx
+
+    def undo(self, ctx) -> None:
+        del ctx
+
+
+@traced(category="test")
+def _traced_work() -> int:
+    with span("inner", category="test", size=3):
+        return 42
+
+
+def _complete_events() -> list[dict[str, object]]:
+    return [event for event in trace_events() if event["ph"] == "X"]
+
+
+def test_tracing_records_nothing_while_disabled() -> None:
+    clear_trace()
+    assert span("ignored") is span("also-ignored")
+    assert _traced_work() == 42
+    CommandStack().do(_NoopCommand(), None)
+    assert _complete_events() == []
+
+
+def test_spans_nest_and_capture_command_names() -> None:
+    clear_trace()
+    enable_tracing(True)
+    try:
+        assert _traced_work() == 42
+        stack = CommandStack()
+        stack.do(_NoopCommand(), None)
+        stack.undo(None)
+    finally:
+        enable_tracing(False)
+    events = {event["name"]: event for event in _complete_events()}
+    clear_trace()
+
+    outer = events["_traced_work"]
+    inner = events["inner"]
+    assert inner["args"] == {"size": 3}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert events["CommandStack.do"]["args"] == {"command": "_NoopCommand"}
+    assert events["CommandStack.undo"]["cat"] == "command"
+
+
+def test_write_chrome_trace_emits_trace_event_json() -> None:
+    clear_trace()
+    enable_tracing(True)
+    try:
+        with span("frame", category="render"):
+            pass
+    finally:
+        enable_tracing(False)
+    path = get_app_temp_dir("VoxelTool") / f"trace-{uuid.uuid4().hex}.json"
+    try:
+        assert write_chrome_trace(path) == 1
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    finally:
+        path.unlink(missing_ok=True)
+        clear_trace()
+    phases = [event["ph"] for event in payload["traceEvents"]]
+    assert phases.count("X") == 1
+    assert "M" in phases
+    frame = next(event for event in payload["traceEvents"] if event["ph"] == "X")
+    assert frame["name"] == "frame"
+    assert frame["dur"] >= 0
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.viewport.picking import PickTable, build_pick_faces, decode_pick_pixel, pick_vertices
+from core.voxels.voxel_grid import VoxelGrid
+
+
+def test_build_pick_faces_keeps_only_exposed_faces() -> None:
+    grid = VoxelGrid()
+    grid.set_many([[0, 0, 0], [1, 0, 0]], [1, 2])
+
+    faces = build_pick_faces(grid)
+
+    assert faces.face_count == 10
+    assert faces.positions.shape == (60, 3)
+    assert not any(
+        tuple(cell) == (0, 0, 0) and tuple(normal) == (1, 0, 0)
+        for cell, normal in zip(faces.cells.tolist(), faces.normals.tolist())
+    )
+    # Voxels are centred on integer coordinates, matching the CPU raycaster.
+    assert faces.positions.min(axis=0).tolist() == [-0.5, -0.5, -0.5]
+    assert faces.positions.max(axis=0).tolist() == [1.5, 0.5, 0.5]
+
+
+def test_pick_ids_round_trip_through_rgba8_pixels() -> None:
+    first = VoxelGrid()
+    first.set(0, 0, 0, 1)
+    second = VoxelGrid()
+    second.set_many([[5, 5, 5], [5, 6, 5]], [1, 1])
+    table = PickTable()
+    first_faces = build_pick_faces(first)
+    second_faces = build_pick_faces(second)
+    table.add("part-a", first_faces)
+    second_id = table.add("part-b", second_faces)
+
+    vertices = np.frombuffer(pick_vertices(second_faces, second_id).tobytes(), dtype=np.float32)
+    rows = vertices.reshape(-1, 6)
+    for face_index in range(second_faces.face_count):
+        red, green, blue = np.rint(rows[face_index * 6, 3:] * 255.0).astype(int).tolist()
+        hit = table.resolve(decode_pick_pixel(red, green, blue))
+        cell = tuple(second_faces.cells[face_index].tolist())
+        normal = second_faces.normals[face_index].tolist()
+        assert hit is not None
+        assert hit.part_id == "part-b"
+        assert hit.cell == cell
+        assert hit.adjacent_cell == tuple(c + n for c, n in zip(cell, normal))
+
+    assert table.resolve(0) is None
+    assert table.resolve(1).part_id == "part-a"
+    assert table.resolve(table.next_id) is None
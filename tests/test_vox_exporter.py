@@ -3,8 +3,14 @@ from __future__ import annotations
 import struct
 import uuid
 
-from core.export.vox_exporter import export_voxels_to_vox
+from core.export.vox_exporter import (
+    export_models_to_vox,
+    export_parts_to_vox,
+    export_voxels_to_vox,
+)
+from core.io.vox_io import load_vox_models_with_warnings
 from core.palette import DEFAULT_PALETTE
+from core.scene import Scene
 from core.voxels.voxel_grid import VoxelGrid
 from util.fs import get_app_temp_dir
 
@@ -79,6 +85,71 @@ def test_export_vox_rgba_chunk_uses_palette_prefix_and_alpha() -> None:
         path.unlink(missing_ok=True)
 
 
+def test_export_vox_splits_large_models_into_tiles_that_roundtrip() -> None:
+    voxels = VoxelGrid()
+    voxels.set(-5, 0, 0, 0)
+    voxels.set(120, 3, 1, 1)
+    voxels.set(300, 0, 0, 2)
+    voxels.set(300, 260, 7, 3)
+    path = get_app_temp_dir("VoxelTool") / f"vox-export-tiles-{uuid.uuid4().hex}.vox"
+    try:
+        stats = export_voxels_to_vox(voxels, list(DEFAULT_PALETTE), str(path))
+        assert stats.size == (306, 261, 8)
+        assert stats.tile_count == 3
+        data = path.read_bytes()
+        assert data.count(b"XYZI") == 3
+        assert b"nGRP" in data and b"nSHP" in data
+        models, _palette, warnings = load_vox_models_with_warnings(str(path))
+        assert warnings == []
+        assert len(models) == 3
+        loaded = sorted(row for model in models for row in model.to_list())
+        assert loaded == voxels.to_list()
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def test_export_models_to_vox_keeps_each_model_in_place() -> None:
+    first = VoxelGrid()
+    first.set(0, 0, 0, 0)
+    first.set(3, 1, 0, 1)
+    second = VoxelGrid()
+    second.set(-7, 4, 2, 2)
+    path = get_app_temp_dir("VoxelTool") / f"vox-export-scene-{uuid.uuid4().hex}.vox"
+    try:
+        stats = export_models_to_vox(
+            [first, VoxelGrid(), second], list(DEFAULT_PALETTE), str(path), names=["A", "B", "C"]
+        )
+        assert stats.voxel_count == 3
+        assert stats.tile_count == 2
+        models, _palette, _warnings = load_vox_models_with_warnings(str(path))
+        assert [model.to_list() for model in models] == [first.to_list(), second.to_list()]
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def test_export_parts_to_vox_writes_linked_parts_as_shared_models() -> None:
+    scene = Scene.with_default_part()
+    source = scene.get_active_part()
+    source.voxels.set_many([[0, 0, 0], [2, 1, 0], [0, 3, 1]], [1, 2, 3])
+    linked = scene.duplicate_part(source.part_id, linked=True)
+    linked.position = (10.0, 0.0, 5.0)
+    linked.rotation = (0.0, 0.0, 90.0)
+    path = get_app_temp_dir("VoxelTool") / f"vox-scene-{uuid.uuid4().hex}.vox"
+    try:
+        parts = [part for _part_id, part in scene.iter_parts_ordered()]
+        stats = export_parts_to_vox(parts, list(DEFAULT_PALETTE), str(path))
+        assert stats.tile_count == 1
+        assert path.read_bytes().count(b"XYZI") == 1
+
+        models, _palette, warnings = load_vox_models_with_warnings(str(path))
+        assert warnings == []
+        assert len(models) == 2
+        assert [row[:3] for row in models[0].to_list()] == [[0, 0, 0], [0, 3, 1], [2, 1, 0]]
+        # Rotating 90 degrees about Z maps (x, y, z) to (-y, x, z) before translating.
+        assert [row[:3] for row in models[1].to_list()] == [[7, 0, 6], [9, 2, 5], [10, 0, 5]]
+    finally:
+        path.unlink(missing_ok=True)
+
 def _read_xyzi_entries(payload: bytes) -> list[tuple[int, int, int, int]]:
     xyzi_index = payload.index(b"XYZI")
     content_size = struct.unpack("<I", payload[xyzi_index + 4 : xyzi_index + 8])[0]
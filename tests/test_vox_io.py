@@ -87,6 +87,19 @@ def test_load_vox_models_with_translation_and_unknown_chunk_reports_warning_and_
         path.unlink(missing_ok=True)
 
 
+def test_load_vox_models_resolves_scene_graph_with_rotation_and_instances() -> None:
+    path = get_app_temp_dir("VoxelTool") / f"vox-import-graph-{uuid.uuid4().hex}.vox"
+    try:
+        path.write_bytes(_build_scene_graph_vox_payload())
+        models, _palette, warnings = load_vox_models_with_warnings(str(path))
+        assert warnings == []
+        assert len(models) == 2
+        assert sorted(models[0].to_list()) == [[10, -1, 0, 0], [10, 0, 0, 1]]
+        assert sorted(models[1].to_list()) == [[-1, 0, 5, 0], [0, 0, 5, 1]]
+    finally:
+        path.unlink(missing_ok=True)
+
+
 def _chunk(chunk_id: bytes, content: bytes, children: bytes = b"") -> bytes:
     return chunk_id + struct.pack("<II", len(content), len(children)) + content + children
 
@@ -184,3 +197,27 @@ def _build_multi_model_vox_payload_with_ntrn_and_unknown_chunk() -> bytes:
     main = _chunk(b"MAIN", b"", children)
     return b"VOX " + struct.pack("<I", 150) + main
 
+
+def _node_chunk(chunk_id: bytes, node_id: int, body: bytes) -> bytes:
+    return _chunk(chunk_id, struct.pack("<i", node_id) + _vox_dict({}) + body)
+
+
+def _transform_chunk(node_id: int, child_id: int, frame: dict[str, str]) -> bytes:
+    body = struct.pack("<iiii", child_id, -1, 0, 1) + _vox_dict(frame)
+    return _node_chunk(b"nTRN", node_id, body)
+
+
+def _build_scene_graph_vox_payload() -> bytes:
+    size = _chunk(b"SIZE", struct.pack("<III", 2, 1, 1))
+    xyzi = _chunk(b"XYZI", struct.pack("<I", 2) + struct.pack("<BBBBBBBB", 0, 0, 0, 1, 1, 0, 0, 2))
+    nodes = (
+        _transform_chunk(0, 1, {})
+        + _node_chunk(b"nGRP", 1, struct.pack("<iii", 2, 2, 4))
+        + _transform_chunk(2, 3, {"_t": "10 0 0", "_r": "17"})
+        + _node_chunk(b"nSHP", 3, struct.pack("<ii", 1, 0) + _vox_dict({}))
+        + _transform_chunk(4, 5, {"_t": "0 0 5"})
+        + _node_chunk(b"nSHP", 5, struct.pack("<ii", 1, 0) + _vox_dict({}))
+        + _chunk(b"LAYR", struct.pack("<i", 0) + _vox_dict({}) + struct.pack("<i", -1))
+    )
+    main = _chunk(b"MAIN", b"", size + xyzi + nodes)
+    return b"VOX " + struct.pack("<I", 150) + main
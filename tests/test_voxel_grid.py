@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pytest
+
 from core.voxels.voxel_grid import VoxelGrid
 
 
@@ -34,3 +36,64 @@ def test_voxel_grid_revision_increments_only_on_mutation() -> None:
     grid.set(0, 0, 0, 1)
     grid.clear()
     assert grid.revision == 5
+
+
+def test_voxel_grid_snapshot_is_isolated_from_later_edits() -> None:
+    grid = VoxelGrid()
+    grid.set_many([[0, 0, 0], [1, 0, 0], [40, 0, 0]], [1, 2, 3])
+    snapshot = grid.snapshot()
+
+    grid.set(0, 0, 0, 9)
+    grid.remove(40, 0, 0)
+    grid.set(100, 100, 100, 4)
+
+    assert snapshot.to_list() == [[0, 0, 0, 1], [1, 0, 0, 2], [40, 0, 0, 3]]
+    assert snapshot.count() == 3
+    assert snapshot.revision == 1
+    assert grid.get(0, 0, 0) == 9
+    assert grid.count() == 3
+    assert grid.revision == 4
+
+
+def test_voxel_grid_snapshot_is_read_only() -> None:
+    grid = VoxelGrid()
+    grid.set(1, 1, 1, 1)
+    snapshot = grid.snapshot()
+
+    for mutate in (
+        lambda: snapshot.set(2, 2, 2, 1),
+        lambda: snapshot.remove(1, 1, 1),
+        lambda: snapshot.clear(),
+        lambda: snapshot.set_many([[3, 3, 3]], [1]),
+    ):
+        with pytest.raises(ValueError, match="read-only"):
+            mutate()
+    assert snapshot.snapshot() is snapshot
+
+
+def test_voxel_grid_copy_shares_storage_until_written() -> None:
+    grid = VoxelGrid()
+    grid.set_many([[x, 0, 0] for x in range(40)], [1] * 40)
+    duplicate = grid.copy()
+
+    duplicate.set(0, 0, 0, 7)
+    grid.set(39, 0, 0, 5)
+
+    assert grid.get(0, 0, 0) == 1
+    assert duplicate.get(39, 0, 0) == 1
+    assert duplicate.get(0, 0, 0) == 7
+    assert grid.get(39, 0, 0) == 5
+    assert grid.count() == duplicate.count() == 40
+
+
+def test_voxel_grid_tracks_revision_per_chunk() -> None:
+    grid = VoxelGrid()
+    grid.set_many([[0, 0, 0], [20, 0, 0]], [1, 1])
+    snapshot = grid.snapshot()
+    grid.set(21, 0, 0, 2)
+
+    assert grid.chunk_revision((0, 0, 0)) == 1
+    assert grid.chunk_revision((1, 0, 0)) == 2
+    assert snapshot.chunk_revision((1, 0, 0)) == 1
+    grid.remove(0, 0, 0)
+    assert grid.chunk_revision((0, 0, 0)) == 0
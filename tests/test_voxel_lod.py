@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from core.voxels.lod import VoxelLodPyramid, downsample_grid, select_lod_factor
+from core.voxels.voxel_grid import VoxelGrid
+
+
+def test_downsample_grid_keeps_majority_color_per_block() -> None:
+    grid = VoxelGrid()
+    grid.set_many([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 1]], [3, 5, 5, 3])
+    grid.set_many([[2, 0, 0], [3, 1, 1], [-1, 0, 0]], [7, 7, 2])
+
+    coarse = downsample_grid(grid, 2)
+
+    # The first block ties 3 against 5 and keeps the lower index.
+    assert coarse.to_list() == [[-1, 0, 0, 2], [0, 0, 0, 3], [1, 0, 0, 7]]
+    with pytest.raises(ValueError, match="LOD factor"):
+        downsample_grid(grid, 3)
+
+
+def test_lod_pyramid_refreshes_only_changed_chunks() -> None:
+    grid = VoxelGrid()
+    grid.set_many([[x, 0, 0] for x in range(32)], [1] * 32)
+    pyramid = VoxelLodPyramid(grid)
+
+    level = pyramid.level(4)
+    assert level.to_list() == [[x, 0, 0, 1] for x in range(8)]
+    assert pyramid.level(4) is level
+    untouched_revision = grid.chunk_revision((0, 0, 0))
+
+    for x in range(16, 20):
+        grid.remove(x, 0, 0)
+    grid.set(100, 0, 0, 6)
+
+    assert grid.chunk_revision((0, 0, 0)) == untouched_revision
+    assert pyramid.level(4).to_list() == [[x, 0, 0, 1] for x in range(8) if x != 4] + [
+        [25, 0, 0, 6]
+    ]
+    assert pyramid.level(4).to_list() == downsample_grid(grid, 4).to_list()
+
+
+def test_lod_pyramid_mesh_is_scaled_to_source_units() -> None:
+    grid = VoxelGrid()
+    grid.set_many([[x, y, z] for x in range(4) for y in range(4) for z in range(4)], [2] * 64)
+    pyramid = VoxelLodPyramid(grid)
+
+    mesh = pyramid.mesh(4)
+
+    assert mesh.face_count == 6
+    assert {axis for vertex in mesh.vertices for axis in vertex} == {0, 4}
+    assert pyramid.mesh(4) is mesh
+
+
+def test_select_lod_factor_coarsens_sub_pixel_voxels() -> None:
+    assert select_lod_factor(3.0) == 1
+    assert select_lod_factor(1.0) == 1
+    assert select_lod_factor(0.9) == 2
+    assert select_lod_factor(0.3) == 4
+    assert select_lod_factor(0.01) == 8